@@ -31,6 +31,7 @@
     LLMMessage,
     ModelFamily,
     SystemMessage,
+    UserMessage,
 )
 from autogen_core.tools import BaseTool, FunctionTool
 from pydantic import BaseModel
@@ -56,6 +57,7 @@
 from ..state import AssistantAgentState
 from ..utils import remove_images
 from ._base_chat_agent import BaseChatAgent
+from ._tool_call_scheduler import ToolCallScheduler
 
 event_logger = logging.getLogger(EVENT_LOGGER_NAME)
 
@@ -76,6 +78,12 @@ class AssistantAgentConfig(BaseModel):
     tool_call_summary_format: str
     metadata: Dict[str, str] | None = None
     structured_message_factory: ComponentModel | None = None
+    prefix_stable_memory: bool = False
+    max_concurrent_tool_calls: int | None = None
+    tool_concurrency_limits: Dict[str, int] | None = None
+    tool_call_timeout: float | None = None
+    tool_call_timeouts: Dict[str, float] | None = None
+    stream_tool_call_results: bool = False
 
 
 class AssistantAgent(BaseChatAgent, Component[AssistantAgentConfig]):
@@ -195,12 +203,36 @@ class AssistantAgent(BaseChatAgent, Component[AssistantAgentConfig]):
             For example, `"{tool_name}: {result}"` will create a summary like `"tool_name: result"`.
         memory (Sequence[Memory] | None, optional): The memory store to use for the agent. Defaults to `None`.
         metadata (Dict[str, str] | None, optional): Optional metadata for tracking.
+        prefix_stable_memory (bool, optional): If `True`, the memory retrieved for each inference is placed after
+            the messages of the model context in the request, as user messages, instead of being added to the
+            model context. The system message and the model context then form a prefix that only grows
+            from one inference to the next, which providers can serve from their prompt cache. The retrieved
+            memory is not kept in the model context. Defaults to `False`.
+        max_concurrent_tool_calls (int | None, optional): The maximum number of tool calls of a model response
+            that are executed at once. The other calls wait for a running call to complete. Defaults to `None`, meaning
+            all the calls are executed at once.
+        tool_concurrency_limits (Dict[str, int] | None, optional): The maximum number of calls to a tool that are
+            executed at once, by tool name, for tools that call rate-limited services. A call frees its slot when it
+            times out, even if the tool keeps running: a :class:`~autogen_core.tools.FunctionTool` of a synchronous
+            function cannot be stopped and runs to completion in its thread, so the limit only holds for such tools
+            if they finish within their timeout. Defaults to `None`.
+        tool_call_timeout (float | None, optional): The timeout of a tool call in seconds. When it expires, the
+            cancellation token passed to the tool is cancelled and the call gets an error result. A tool that ignores
+            the cancellation, such as a synchronous function, keeps running in the background. Defaults to `None`,
+            meaning no timeout.
+        tool_call_timeouts (Dict[str, float] | None, optional): The timeout of the calls to a tool in seconds, by tool
+            name, overriding `tool_call_timeout`. Defaults to `None`.
+        stream_tool_call_results (bool, optional): If `True`, a :class:`~autogen_agentchat.messages.ToolCallExecutionEvent`
+            is yielded for each tool call as soon as it completes, instead of a single event with the results of all the
+            calls once they have all completed. The results are added to the model context in the order of the calls
+            either way. Defaults to `False`.
 
     Raises:
         ValueError: If tool names are not unique.
         ValueError: If handoff names are not unique.
         ValueError: If handoff names are not unique from tool names.
         ValueError: If maximum number of tool iterations is less than 1.
+        ValueError: If a tool concurrency limit or timeout is not greater than 0 or refers to an unknown tool.
 
     Examples:
 
@@ -641,6 +673,12 @@ def __init__(
         output_content_type_format: str | None = None,
         memory: Sequence[Memory] | None = None,
         metadata: Dict[str, str] | None = None,
+        prefix_stable_memory: bool = False,
+        max_concurrent_tool_calls: int | None = None,
+        tool_concurrency_limits: Dict[str, int] | None = None,
+        tool_call_timeout: float | None = None,
+        tool_call_timeouts: Dict[str, float] | None = None,
+        stream_tool_call_results: bool = False,
     ):
         super().__init__(name=name, description=description)
         self._metadata = metadata or {}
@@ -660,6 +698,7 @@ def __init__(
                 self._memory = memory
             else:
                 raise TypeError(f"Expected Memory, List[Memory], or None, got {type(memory)}")
+        self._prefix_stable_memory = prefix_stable_memory
 
         self._system_messages: List[SystemMessage] = []
         if system_message is None:
@@ -710,6 +749,14 @@ def __init__(
                 f"Handoff names must be unique from tool names. "
                 f"Handoff names: {handoff_tool_names}; tool names: {tool_names}"
             )
+        self._tool_call_scheduler = ToolCallScheduler(
+            self._tools + self._handoff_tools,
+            max_concurrent_calls=max_concurrent_tool_calls,
+            concurrency_limits=tool_concurrency_limits,
+            timeout=tool_call_timeout,
+            timeouts=tool_call_timeouts,
+        )
+        self._stream_tool_call_results = stream_tool_call_results
 
         if model_context is not None:
             self._model_context = model_context
@@ -777,6 +824,8 @@ async def on_messages_stream(
         tools = self._tools
         handoff_tools = self._handoff_tools
         handoffs = self._handoffs
+        tool_call_scheduler = self._tool_call_scheduler
+        stream_tool_call_results = self._stream_tool_call_results
         model_client = self._model_client
         model_client_stream = self._model_client_stream
         reflect_on_tool_use = self._reflect_on_tool_use
@@ -792,11 +841,20 @@ async def on_messages_stream(
 
         # STEP 2: Update model context with any relevant memory
         inner_messages: List[BaseAgentEvent | BaseChatMessage] = []
-        for event_msg in await self._update_model_context_with_memory(
-            memory=memory,
-            model_context=model_context,
-            agent_name=agent_name,
-        ):
+        memory_messages: List[LLMMessage] = []
+        if self._prefix_stable_memory:
+            memory_events, memory_messages = await self._query_memory(
+                memory=memory,
+                model_context=model_context,
+                agent_name=agent_name,
+            )
+        else:
+            memory_events = await self._update_model_context_with_memory(
+                memory=memory,
+                model_context=model_context,
+                agent_name=agent_name,
+            )
+        for event_msg in memory_events:
             inner_messages.append(event_msg)
             yield event_msg
 
@@ -812,6 +870,7 @@ async def on_messages_stream(
             agent_name=agent_name,
             cancellation_token=cancellation_token,
             output_content_type=output_content_type,
+            memory_messages=memory_messages,
         ):
             if isinstance(inference_output, CreateResult):
                 model_result = inference_output
@@ -844,8 +903,8 @@ async def on_messages_stream(
             agent_name=agent_name,
             system_messages=system_messages,
             model_context=model_context,
-            tools=tools,
-            handoff_tools=handoff_tools,
+            tool_call_scheduler=tool_call_scheduler,
+            stream_tool_call_results=stream_tool_call_results,
             handoffs=handoffs,
             model_client=model_client,
             model_client_stream=model_client_stream,
@@ -853,6 +912,7 @@ async def on_messages_stream(
             tool_call_summary_format=tool_call_summary_format,
             output_content_type=output_content_type,
             format_string=format_string,
+            memory_messages=memory_messages,
         ):
             yield output_event
 
@@ -891,6 +951,31 @@ async def _update_model_context_with_memory(
                     events.append(memory_query_event_msg)
         return events
 
+    @staticmethod
+    async def _query_memory(
+        memory: Optional[Sequence[Memory]],
+        model_context: ChatCompletionContext,
+        agent_name: str,
+    ) -> Tuple[List[MemoryQueryEvent], List[LLMMessage]]:
+        """
+        Update a copy of the model context with the memory modules, leaving the model context unchanged,
+        and return the events produced and the messages the memory modules added.
+        System messages are returned as user messages, so that they can follow the model context.
+        """
+        if not memory:
+            return [], []
+        context_messages = await model_context.get_messages()
+        scratch_context = UnboundedChatCompletionContext(initial_messages=context_messages)
+        events = await AssistantAgent._update_model_context_with_memory(
+            memory=memory, model_context=scratch_context, agent_name=agent_name
+        )
+        memory_messages: List[LLMMessage] = []
+        for message in (await scratch_context.get_messages())[len(context_messages) :]:
+            if isinstance(message, SystemMessage):
+                message = UserMessage(content=message.content, source="memory")
+            memory_messages.append(message)
+        return events, memory_messages
+
     @classmethod
     async def _call_llm(
         cls,
@@ -903,12 +988,15 @@ async def _call_llm(
         agent_name: str,
         cancellation_token: CancellationToken,
         output_content_type: type[BaseModel] | None,
+        memory_messages: Sequence[LLMMessage] = (),
     ) -> AsyncGenerator[Union[CreateResult, ModelClientStreamingChunkEvent], None]:
         """
         Perform a model inference and yield either streaming chunk events or the final CreateResult.
         """
         all_messages = await model_context.get_messages()
-        llm_messages = cls._get_compatible_context(model_client=model_client, messages=system_messages + all_messages)
+        llm_messages = cls._get_compatible_context(
+            model_client=model_client, messages=system_messages + all_messages + list(memory_messages)
+        )
 
         all_tools = tools + handoff_tools
 
@@ -947,8 +1035,8 @@ async def _process_model_result(
         agent_name: str,
         system_messages: List[SystemMessage],
         model_context: ChatCompletionContext,
-        tools: List[BaseTool[Any, Any]],
-        handoff_tools: List[BaseTool[Any, Any]],
+        tool_call_scheduler: ToolCallScheduler,
+        stream_tool_call_results: bool,
         handoffs: Dict[str, HandoffBase],
         model_client: ChatCompletionClient,
         model_client_stream: bool,
@@ -956,6 +1044,7 @@ async def _process_model_result(
         tool_call_summary_format: str,
         output_content_type: type[BaseModel] | None,
         format_string: str | None = None,
+        memory_messages: Sequence[LLMMessage] = (),
     ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
         """
         Handle final or partial responses from model_result, including tool calls, handoffs,
@@ -1002,29 +1091,34 @@ async def _process_model_result(
         yield tool_call_msg
 
         # STEP 4B: Execute tool calls
-        executed_calls_and_results = await asyncio.gather(
-            *[
-                cls._execute_tool_call(
-                    tool_call=call,
-                    tools=tools,
-                    handoff_tools=handoff_tools,
-                    agent_name=agent_name,
-                    cancellation_token=cancellation_token,
+        if stream_tool_call_results:
+            # Yield a ToolCallExecutionEvent for each call as it completes
+            results: List[Tuple[FunctionCall, FunctionExecutionResult] | None] = [None] * len(model_result.content)
+            async for index, call, result in tool_call_scheduler.run(model_result.content, cancellation_token):
+                results[index] = (call, result)
+                tool_call_result_msg = ToolCallExecutionEvent(
+                    content=[result],
+                    source=agent_name,
                 )
-                for call in model_result.content
-            ]
-        )
-        exec_results = [result for _, result in executed_calls_and_results]
+                event_logger.debug(tool_call_result_msg)
+                inner_messages.append(tool_call_result_msg)
+                yield tool_call_result_msg
+            executed_calls_and_results = [item for item in results if item is not None]
+            exec_results = [result for _, result in executed_calls_and_results]
+            await model_context.add_message(FunctionExecutionResultMessage(content=exec_results))
+        else:
+            executed_calls_and_results = await tool_call_scheduler.run_all(model_result.content, cancellation_token)
+            exec_results = [result for _, result in executed_calls_and_results]
 
-        # Yield ToolCallExecutionEvent
-        tool_call_result_msg = ToolCallExecutionEvent(
-            content=exec_results,
-            source=agent_name,
-        )
-        event_logger.debug(tool_call_result_msg)
-        await model_context.add_message(FunctionExecutionResultMessage(content=exec_results))
-        inner_messages.append(tool_call_result_msg)
-        yield tool_call_result_msg
+            # Yield ToolCallExecutionEvent
+            tool_call_result_msg = ToolCallExecutionEvent(
+                content=exec_results,
+                source=agent_name,
+            )
+            event_logger.debug(tool_call_result_msg)
+            await model_context.add_message(FunctionExecutionResultMessage(content=exec_results))
+            inner_messages.append(tool_call_result_msg)
+            yield tool_call_result_msg
 
         # STEP 4C: Check for handoff
         handoff_output = cls._check_and_handle_handoff(
@@ -1048,6 +1142,7 @@ async def _process_model_result(
                 agent_name=agent_name,
                 inner_messages=inner_messages,
                 output_content_type=output_content_type,
+                memory_messages=memory_messages,
             ):
                 yield reflection_response
         else:
@@ -1142,12 +1237,13 @@ async def _reflect_on_tool_use_flow(
         agent_name: str,
         inner_messages: List[BaseAgentEvent | BaseChatMessage],
         output_content_type: type[BaseModel] | None,
+        memory_messages: Sequence[LLMMessage] = (),
     ) -> AsyncGenerator[Response | ModelClientStreamingChunkEvent | ThoughtEvent, None]:
         """
         If reflect_on_tool_use=True, we do another inference based on tool results
         and yield the final text response (or streaming chunks).
         """
-        all_messages = system_messages + await model_context.get_messages()
+        all_messages = system_messages + await model_context.get_messages() + list(memory_messages)
         llm_messages = cls._get_compatible_context(model_client=model_client, messages=all_messages)
 
         reflection_result: Optional[CreateResult] = None
@@ -1235,45 +1331,6 @@ def _summarize_tool_use(
             inner_messages=inner_messages,
         )
 
-    @staticmethod
-    async def _execute_tool_call(
-        tool_call: FunctionCall,
-        tools: List[BaseTool[Any, Any]],
-        handoff_tools: List[BaseTool[Any, Any]],
-        agent_name: str,
-        cancellation_token: CancellationToken,
-    ) -> Tuple[FunctionCall, FunctionExecutionResult]:
-        """Execute a single tool call and return the result."""
-        try:
-            all_tools = tools + handoff_tools
-            if not all_tools:
-                raise ValueError("No tools are available.")
-            tool = next((t for t in all_tools if t.name == tool_call.name), None)
-            if tool is None:
-                raise ValueError(f"The tool '{tool_call.name}' is not available.")
-            arguments: Dict[str, Any] = json.loads(tool_call.arguments) if tool_call.arguments else {}
-            result = await tool.run_json(arguments, cancellation_token)
-            result_as_str = tool.return_value_as_string(result)
-            return (
-                tool_call,
-                FunctionExecutionResult(
-                    content=result_as_str,
-                    call_id=tool_call.id,
-                    is_error=False,
-                    name=tool_call.name,
-                ),
-            )
-        except Exception as e:
-            return (
-                tool_call,
-                FunctionExecutionResult(
-                    content=f"Error: {e}",
-                    call_id=tool_call.id,
-                    is_error=True,
-                    name=tool_call.name,
-                ),
-            )
-
     async def on_reset(self, cancellation_token: CancellationToken) -> None:
         """Reset the assistant agent to its initialization state."""
         await self._model_context.clear()
@@ -1318,6 +1375,12 @@ def _to_config(self) -> AssistantAgentConfig:
             if self._structured_message_factory
             else None,
             metadata=self._metadata,
+            prefix_stable_memory=self._prefix_stable_memory,
+            max_concurrent_tool_calls=self._tool_call_scheduler.max_concurrent_calls,
+            tool_concurrency_limits=dict(self._tool_call_scheduler.concurrency_limits) or None,
+            tool_call_timeout=self._tool_call_scheduler.timeout,
+            tool_call_timeouts=dict(self._tool_call_scheduler.timeouts) or None,
+            stream_tool_call_results=self._stream_tool_call_results,
         )
 
     @classmethod
@@ -1347,4 +1410,10 @@ def _from_config(cls, config: AssistantAgentConfig) -> Self:
             output_content_type=output_content_type,
             output_content_type_format=format_string,
             metadata=config.metadata,
+            prefix_stable_memory=config.prefix_stable_memory,
+            max_concurrent_tool_calls=config.max_concurrent_tool_calls,
+            tool_concurrency_limits=config.tool_concurrency_limits,
+            tool_call_timeout=config.tool_call_timeout,
+            tool_call_timeouts=config.tool_call_timeouts,
+            stream_tool_call_results=config.stream_tool_call_results,
         )
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Sequence, Tuple
+
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.models import FunctionExecutionResult
+from autogen_core.tools import BaseTool
+
+
+class ToolCallScheduler:
+    """Executes the tool calls requested by a model concurrently, with bounded parallelism.
+
+    The tools are indexed by name. At most `max_concurrent_calls` calls run at once, and at most
+    `concurrency_limits[name]` calls to the tool `name`; the other calls wait for a slot in the
+    order they were requested. Each call runs with its own cancellation token, which is cancelled
+    when the cancellation token of the batch is cancelled or when the timeout of the tool expires,
+    so that the tool can stop the work it started. A call that times out gets an error result like
+    a call that raises, and the calls still waiting for a slot when the batch is cancelled are not started.
+
+    A slot is released as soon as its call times out or is cancelled. A tool that does not stop its work
+    when its cancellation token is cancelled, such as a :class:`~autogen_core.tools.FunctionTool` of a
+    synchronous function, which runs in a thread of the executor, keeps running after that, so more
+    calls to it than its limit can then be running at once.
+
+    Args:
+        tools (Sequence[BaseTool[Any, Any]]): The tools that can be called. Their names must be unique.
+        max_concurrent_calls (int, optional): The maximum number of calls running at once. Defaults to None, meaning no limit.
+        concurrency_limits (Mapping[str, int], optional): The maximum number of calls running at once per tool name.
+        timeout (float, optional): The timeout of a call in seconds. Defaults to None, meaning no timeout.
+        timeouts (Mapping[str, float], optional): The timeout in seconds per tool name, overriding `timeout`.
+
+    Raises:
+        ValueError: If a limit or a timeout is not greater than 0, or refers to a tool that is not available.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool[Any, Any]],
+        *,
+        max_concurrent_calls: int | None = None,
+        concurrency_limits: Mapping[str, int] | None = None,
+        timeout: float | None = None,
+        timeouts: Mapping[str, float] | None = None,
+    ) -> None:
+        self._tools: Dict[str, BaseTool[Any, Any]] = {tool.name: tool for tool in tools}
+        if max_concurrent_calls is not None and max_concurrent_calls <= 0:
+            raise ValueError("The maximum number of concurrent tool calls must be greater than 0.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("The tool call timeout must be greater than 0.")
+        for name, value in {**(concurrency_limits or {}), **(timeouts or {})}.items():
+            if name not in self._tools:
+                raise ValueError(f"The tool '{name}' is not available.")
+            if value <= 0:
+                raise ValueError(f"The concurrency limit and the timeout of the tool '{name}' must be greater than 0.")
+        self._max_concurrent_calls = max_concurrent_calls
+        self._concurrency_limits = dict(concurrency_limits or {})
+        self._timeout = timeout
+        self._timeouts = dict(timeouts or {})
+
+    @property
+    def tools(self) -> Mapping[str, BaseTool[Any, Any]]:
+        """The tools that can be called, by name."""
+        return self._tools
+
+    @property
+    def max_concurrent_calls(self) -> int | None:
+        """The maximum number of calls running at once."""
+        return self._max_concurrent_calls
+
+    @property
+    def concurrency_limits(self) -> Mapping[str, int]:
+        """The maximum number of calls running at once per tool name."""
+        return self._concurrency_limits
+
+    @property
+    def timeout(self) -> float | None:
+        """The timeout of a call in seconds."""
+        return self._timeout
+
+    @property
+    def timeouts(self) -> Mapping[str, float]:
+        """The timeout in seconds per tool name."""
+        return self._timeouts
+
+    async def run(
+        self, tool_calls: Sequence[FunctionCall], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[Tuple[int, FunctionCall, FunctionExecutionResult], None]:
+        """Execute the tool calls and yield the index, the call and the result of each call as it completes."""
+        # The semaphores are created for each batch, as the batches of an agent run one after another.
+        semaphore = asyncio.Semaphore(self._max_concurrent_calls) if self._max_concurrent_calls is not None else None
+        tool_semaphores = {name: asyncio.Semaphore(limit) for name, limit in self._concurrency_limits.items()}
+
+        async def execute(index: int, tool_call: FunctionCall) -> Tuple[int, FunctionCall, FunctionExecutionResult]:
+            async with AsyncExitStack() as stack:
+                # Wait for a slot of the tool before taking a global slot, so that the calls to a busy
+                # tool do not hold global slots that calls to other tools could use.
+                if tool_call.name in tool_semaphores:
+                    await stack.enter_async_context(tool_semaphores[tool_call.name])
+                if semaphore is not None:
+                    await stack.enter_async_context(semaphore)
+                result = await self._execute(tool_call, cancellation_token)
+            return index, tool_call, result
+
+        tasks = [asyncio.ensure_future(execute(index, tool_call)) for index, tool_call in enumerate(tool_calls)]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run_all(
+        self, tool_calls: Sequence[FunctionCall], cancellation_token: CancellationToken
+    ) -> List[Tuple[FunctionCall, FunctionExecutionResult]]:
+        """Execute the tool calls and return the calls and their results in the order of the calls."""
+        results: List[Tuple[FunctionCall, FunctionExecutionResult] | None] = [None] * len(tool_calls)
+        async for index, tool_call, result in self.run(tool_calls, cancellation_token):
+            results[index] = (tool_call, result)
+        return [result for result in results if result is not None]
+
+    async def _execute(self, tool_call: FunctionCall, cancellation_token: CancellationToken) -> FunctionExecutionResult:
+        if cancellation_token.is_cancelled():
+            raise asyncio.CancelledError(f"The call to the tool '{tool_call.name}' was cancelled.")
+        call_token = CancellationToken()
+        cancellation_token.add_callback(call_token.cancel)
+        try:
+            tool = self._tools.get(tool_call.name)
+            if tool is None:
+                if not self._tools:
+                    raise ValueError("No tools are available.")
+                raise ValueError(f"The tool '{tool_call.name}' is not available.")
+            arguments: Dict[str, Any] = json.loads(tool_call.arguments) if tool_call.arguments else {}
+            timeout = self._timeouts.get(tool_call.name, self._timeout)
+            task = asyncio.ensure_future(tool.run_json(arguments, call_token))
+            try:
+                done, _ = await asyncio.wait([task], timeout=timeout)
+            finally:
+                if not task.done():
+                    call_token.cancel()
+                    task.cancel()
+            if not done:
+                raise TimeoutError(f"The tool '{tool_call.name}' timed out after {timeout} seconds.")
+            result = task.result()
+            return FunctionExecutionResult(
+                content=tool.return_value_as_string(result),
+                call_id=tool_call.id,
+                is_error=False,
+                name=tool_call.name,
+            )
+        except Exception as e:
+            return FunctionExecutionResult(
+                content=f"Error: {e}",
+                call_id=tool_call.id,
+                is_error=True,
+                name=tool_call.name,
+            )
+        finally:
+            # The cancellation token of the batch may be reused, so it must not keep the finished calls alive.
+            cancellation_token.remove_callback(call_token.cancel)
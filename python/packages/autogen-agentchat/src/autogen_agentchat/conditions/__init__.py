@@ -3,6 +3,7 @@
 multi-agent teams.
 """
 
+from ._termination_engine import TerminationEngine
 from ._terminations import (
     ExternalTermination,
     FunctionCallTermination,
@@ -27,4 +28,5 @@
     "SourceMatchTermination",
     "TextMessageTermination",
     "FunctionCallTermination",
+    "TerminationEngine",
 ]
@@ -0,0 +1,191 @@
+import asyncio
+import re
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from ..base import AndTerminationCondition, OrTerminationCondition, TerminationCondition
+from ..messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    HandoffMessage,
+    StopMessage,
+    TextMessage,
+    ToolCallExecutionEvent,
+)
+from ._terminations import (
+    FunctionCallTermination,
+    HandoffTermination,
+    SourceMatchTermination,
+    StopMessageTermination,
+    TextMentionTermination,
+    TextMessageTermination,
+)
+
+
+class _Node:
+    """A compiled termination condition.
+
+    A leaf with a filter only changes its state when it is called with a message that passes
+    the filter, so it is only called with those messages. Other leaves are opaque and are
+    called with the whole delta. A composite without opaque leaves is skipped when none of
+    the messages of the delta has the types and sources its leaves look for."""
+
+    def __init__(self, condition: TerminationCondition) -> None:
+        self.condition = condition
+        self.children: List[_Node] = []
+        self.types: Tuple[type, ...] | None = None
+        self.sources: FrozenSet[str] | None = None
+        self.text: str | None = None
+        self.opaque = False
+        if type(condition) is AndTerminationCondition or type(condition) is OrTerminationCondition:
+            self.children = [_Node(child) for child in condition._conditions]  # pyright: ignore[reportPrivateUsage]
+            self.opaque = any(child.opaque for child in self.children)
+            if not self.opaque:
+                if all(child.types is not None for child in self.children):
+                    self.types = tuple({t for child in self.children for t in child.types or ()})
+                if all(child.sources is not None for child in self.children):
+                    self.sources = frozenset(source for child in self.children for source in child.sources or ())
+        elif type(condition) is StopMessageTermination:
+            self.types = (StopMessage,)
+        elif type(condition) is HandoffTermination:
+            self.types = (HandoffMessage,)
+        elif type(condition) is FunctionCallTermination:
+            self.types = (ToolCallExecutionEvent,)
+        elif type(condition) is TextMessageTermination:
+            self.types = (TextMessage,)
+            source = condition._source  # pyright: ignore[reportPrivateUsage]
+            self.sources = frozenset([source]) if source is not None else None
+        elif type(condition) is SourceMatchTermination:
+            self.sources = frozenset(condition._sources)  # pyright: ignore[reportPrivateUsage]
+        elif type(condition) is TextMentionTermination:
+            sources = condition._sources  # pyright: ignore[reportPrivateUsage]
+            self.sources = frozenset(sources) if sources is not None else None
+            self.text = condition._termination_text  # pyright: ignore[reportPrivateUsage]
+        else:
+            self.opaque = True
+
+    def texts(self) -> List[str]:
+        if self.text is not None:
+            return [self.text]
+        return [text for child in self.children for text in child.texts()]
+
+    def accepts(self, message: BaseAgentEvent | BaseChatMessage) -> bool:
+        return (self.types is None or isinstance(message, self.types)) and (
+            self.sources is None or message.source in self.sources
+        )
+
+
+class _Delta:
+    """The messages of a delta, with the texts of the text mention conditions each of them contains,
+    found with a single scan of its text."""
+
+    def __init__(
+        self, messages: Sequence[BaseAgentEvent | BaseChatMessage], pattern: re.Pattern[str] | None, texts: List[str]
+    ) -> None:
+        self.messages = messages
+        self._pattern = pattern
+        self._texts = texts
+        self._mentions: Dict[int, FrozenSet[str]] = {}
+
+    def mentions(self, index: int) -> FrozenSet[str]:
+        mentions = self._mentions.get(index)
+        if mentions is None:
+            assert self._pattern is not None
+            content = self.messages[index].to_text()
+            if self._pattern.search(content) is None:
+                mentions = frozenset()
+            else:
+                mentions = frozenset(text for text in self._texts if text in content)
+            self._mentions[index] = mentions
+        return mentions
+
+
+class TerminationEngine:
+    """Evaluates a termination condition, including the conditions combined in it with
+    :class:`~autogen_agentchat.base.AndTerminationCondition` and
+    :class:`~autogen_agentchat.base.OrTerminationCondition`, with the same results
+    as calling it, but at a cost that grows with the size of the messages rather than with
+    the number of conditions. Group chat teams use it to check their termination condition.
+
+    The condition is compiled once:
+
+    - The built-in conditions that look for messages of some types or from some sources, such as
+      :class:`HandoffTermination` or :class:`SourceMatchTermination`, are only called with the
+      messages they look for, and not at all when there are none.
+    - The texts of all the :class:`TextMentionTermination` conditions are matched with one pattern,
+      so the text of a message is rendered and scanned once however many of them there are.
+    - Combined conditions that cannot be reached by a delta are skipped as a whole.
+
+    Other conditions are called with every delta. The conditions keep their own state, so the
+    engine can be used alongside the condition, for example to reset it or to check whether it
+    was reached, and it must be created again if the condition is replaced.
+
+    Args:
+        condition (TerminationCondition): The termination condition to evaluate.
+    """
+
+    def __init__(self, condition: TerminationCondition) -> None:
+        self._condition = condition
+        self._root = _Node(condition)
+        self._texts = list(dict.fromkeys(self._root.texts()))
+        self._pattern = re.compile("|".join(re.escape(text) for text in self._texts)) if self._texts else None
+
+    @property
+    def condition(self) -> TerminationCondition:
+        """The evaluated termination condition."""
+        return self._condition
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        """Check if the conversation should be terminated based on the messages received since the last time
+        the condition was checked. See :meth:`TerminationCondition.__call__`."""
+        if self._condition.terminated:
+            # Let the condition raise.
+            return await self._condition(messages)
+        return await self._evaluate(self._root, _Delta(messages, self._pattern, self._texts))
+
+    async def _evaluate(self, node: _Node, delta: _Delta) -> StopMessage | None:
+        if node.opaque and not node.children:
+            return await node.condition(delta.messages)
+        if not node.opaque and not any(node.accepts(message) for message in delta.messages):
+            return None
+        if type(node.condition) is AndTerminationCondition:
+            return await self._evaluate_and(node, node.condition, delta)
+        if type(node.condition) is OrTerminationCondition:
+            return await self._evaluate_or(node, node.condition, delta)
+        messages = [
+            message
+            for index, message in enumerate(delta.messages)
+            if node.accepts(message) and (node.text is None or node.text in delta.mentions(index))
+        ]
+        if not messages:
+            return None
+        return await node.condition(messages)
+
+    async def _evaluate_children(self, children: List[_Node], delta: _Delta) -> List[StopMessage | None]:
+        if sum(child.opaque for child in children) > 1:
+            # Let the opaque conditions run concurrently, as the combined conditions do.
+            return list(await asyncio.gather(*[self._evaluate(child, delta) for child in children]))
+        return [await self._evaluate(child, delta) for child in children]
+
+    async def _evaluate_and(self, node: _Node, condition: AndTerminationCondition, delta: _Delta) -> StopMessage | None:
+        if condition.terminated:
+            return await condition(delta.messages)
+        remaining = [child for child in node.children if not child.condition.terminated]
+        results = await self._evaluate_children(remaining, delta)
+        stop_messages = condition._stop_messages  # pyright: ignore[reportPrivateUsage]
+        stop_messages.extend(stop_message for stop_message in results if stop_message is not None)
+        if any(stop_message is None for stop_message in results):
+            return None
+        content = ", ".join(stop_message.content for stop_message in stop_messages)
+        source = ", ".join(stop_message.source for stop_message in stop_messages)
+        return StopMessage(content=content, source=source)
+
+    async def _evaluate_or(self, node: _Node, condition: OrTerminationCondition, delta: _Delta) -> StopMessage | None:
+        if condition.terminated:
+            return await condition(delta.messages)
+        results = await self._evaluate_children(node.children, delta)
+        stop_messages = [stop_message for stop_message in results if stop_message is not None]
+        if len(stop_messages) > 0:
+            content = ", ".join(stop_message.content for stop_message in stop_messages)
+            source = ", ".join(stop_message.source for stop_message in stop_messages)
+            return StopMessage(content=content, source=source)
+        return None
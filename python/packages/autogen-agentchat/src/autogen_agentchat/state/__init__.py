@@ -6,6 +6,8 @@
     BaseState,
     ChatAgentContainerState,
     MagenticOneOrchestratorState,
+    MessageLogState,
+    ParallelManagerState,
     RoundRobinManagerState,
     SelectorManagerState,
     SocietyOfMindAgentState,
@@ -18,7 +20,9 @@
     "AssistantAgentState",
     "BaseGroupChatManagerState",
     "ChatAgentContainerState",
+    "MessageLogState",
     "RoundRobinManagerState",
+    "ParallelManagerState",
     "SelectorManagerState",
     "SwarmManagerState",
     "MagenticOneOrchestratorState",
@@ -1,4 +1,4 @@
-from typing import Any, List, Mapping, Optional
+from typing import Any, List, Mapping, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -24,10 +24,19 @@ class TeamState(BaseState):
     type: str = Field(default="TeamState")
 
 
+class MessageLogState(BaseModel):
+    """A reference to the messages of a message thread that were spilled to its on-disk log."""
+
+    path: str
+    segments: List[Tuple[int, int]] = Field(default_factory=list)
+    """The runs of consecutive messages in the log, as (byte offset, number of messages)."""
+
+
 class BaseGroupChatManagerState(BaseState):
     """Base state for all group chat managers."""
 
     message_thread: List[Mapping[str, Any]] = Field(default_factory=list)
+    message_log: Optional[MessageLogState] = Field(default=None)
     current_turn: int = Field(default=0)
     type: str = Field(default="BaseGroupChatManagerState")
 
@@ -37,6 +46,7 @@ class ChatAgentContainerState(BaseState):
 
     agent_state: Mapping[str, Any] = Field(default_factory=dict)
     message_buffer: List[Mapping[str, Any]] = Field(default_factory=list)
+    message_buffer_log: Optional[MessageLogState] = Field(default=None)
     type: str = Field(default="ChatAgentContainerState")
 
 
@@ -47,6 +57,12 @@ class RoundRobinManagerState(BaseGroupChatManagerState):
     type: str = Field(default="RoundRobinManagerState")
 
 
+class ParallelManagerState(BaseGroupChatManagerState):
+    """State for :class:`~autogen_agentchat.teams.ParallelGroupChat` manager."""
+
+    type: str = Field(default="ParallelManagerState")
+
+
 class SelectorManagerState(BaseGroupChatManagerState):
     """State for :class:`~autogen_agentchat.teams.SelectorGroupChat` manager."""
 
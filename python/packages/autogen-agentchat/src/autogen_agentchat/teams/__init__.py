@@ -5,6 +5,8 @@
 
 from ._group_chat._base_group_chat import BaseGroupChat
 from ._group_chat._magentic_one import MagenticOneGroupChat
+from ._group_chat._message_thread import MessageThread
+from ._group_chat._parallel_group_chat import ParallelGroupChat
 from ._group_chat._round_robin_group_chat import RoundRobinGroupChat
 from ._group_chat._selector_group_chat import SelectorGroupChat
 from ._group_chat._swarm_group_chat import Swarm
@@ -15,4 +17,6 @@
     "SelectorGroupChat",
     "Swarm",
     "MagenticOneGroupChat",
+    "ParallelGroupChat",
+    "MessageThread",
 ]
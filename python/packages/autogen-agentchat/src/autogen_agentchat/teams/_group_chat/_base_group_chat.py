@@ -1,4 +1,5 @@
 import asyncio
+import os
 import uuid
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator, Callable, Dict, List, Mapping, Sequence
@@ -7,8 +8,10 @@
     AgentId,
     AgentRuntime,
     AgentType,
+    BoundedQueue,
     CancellationToken,
     ComponentBase,
+    QueueOverflowPolicy,
     SingleThreadedAgentRuntime,
     TypeSubscription,
 )
@@ -34,6 +37,7 @@
     GroupChatTermination,
     SerializableException,
 )
+from ._message_thread import MessageThread
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
@@ -56,9 +60,15 @@ def __init__(
         runtime: AgentRuntime | None = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        output_queue_max_size: int = 0,
+        output_queue_overflow_policy: QueueOverflowPolicy = "block",
+        message_thread_window: int | None = None,
+        message_thread_spill_dir: str | None = None,
     ):
         if len(participants) == 0:
             raise ValueError("At least one participant is required.")
+        if message_thread_window is not None and message_thread_window <= 0:
+            raise ValueError("The message thread window must be greater than 0.")
         if len(participants) != len(set(participant.name for participant in participants)):
             raise ValueError("The participant names must be unique.")
         self._participants = participants
@@ -105,8 +115,12 @@ def __init__(
         self._output_topic_type = f"output_topic_{self._team_id}"
 
         # The queue for collecting the output messages.
-        self._output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination] = (
-            asyncio.Queue()
+        self._output_message_queue: BoundedQueue[BaseAgentEvent | BaseChatMessage | GroupChatTermination] = (
+            BoundedQueue(
+                f"{type(self).__name__}.output",
+                maxsize=output_queue_max_size,
+                overflow_policy=output_queue_overflow_policy,
+            )
         )
 
         # Create a runtime for the team.
@@ -128,6 +142,10 @@ def __init__(
         # Flag to track if the team events should be emitted.
         self._emit_team_events = emit_team_events
 
+        # The settings of the message threads of the group chat manager and the participants.
+        self._message_thread_window = message_thread_window
+        self._message_thread_spill_dir = message_thread_spill_dir
+
     @abstractmethod
     def _create_group_chat_manager_factory(
         self,
@@ -143,6 +161,14 @@ def _create_group_chat_manager_factory(
         message_factory: MessageFactory,
     ) -> Callable[[], SequentialRoutedAgent]: ...
 
+    def _create_message_thread(self, name: str) -> MessageThread[Any]:
+        """Create a message thread for the group chat manager or a participant, whose log is
+        named after its topic type in the spill directory."""
+        path = None
+        if self._message_thread_spill_dir is not None:
+            path = os.path.join(self._message_thread_spill_dir, f"{name}.jsonl")
+        return MessageThread(self._message_factory, window=self._message_thread_window, path=path)
+
     def _create_participant_factory(
         self,
         parent_topic_type: str,
@@ -151,7 +177,13 @@ def _create_participant_factory(
         message_factory: MessageFactory,
     ) -> Callable[[], ChatAgentContainer]:
         def _factory() -> ChatAgentContainer:
-            container = ChatAgentContainer(parent_topic_type, output_topic_type, agent, message_factory)
+            container = ChatAgentContainer(
+                parent_topic_type,
+                output_topic_type,
+                agent,
+                message_factory,
+                message_buffer=self._create_message_thread(f"{agent.name}_{self._team_id}"),
+            )
             return container
 
         return _factory
@@ -458,49 +490,51 @@ async def main() -> None:
             await self._init(self._runtime)
 
         shutdown_task: asyncio.Task[None] | None = None
-        if self._embedded_runtime:
 
-            async def stop_runtime() -> None:
-                assert isinstance(self._runtime, SingleThreadedAgentRuntime)
-                try:
-                    # This will propagate any exceptions raised.
-                    await self._runtime.stop_when_idle()
-                    # Put a termination message in the queue to indicate that the group chat is stopped for whatever reason
-                    # but not due to an exception.
-                    await self._output_message_queue.put(
-                        GroupChatTermination(
-                            message=StopMessage(
-                                content="The group chat is stopped.", source=self._group_chat_manager_name
-                            )
-                        )
+        async def stop_runtime() -> None:
+            assert isinstance(self._runtime, SingleThreadedAgentRuntime)
+            try:
+                # This will propagate any exceptions raised.
+                await self._runtime.stop_when_idle()
+                # Put a termination message in the queue to indicate that the group chat is stopped for whatever reason
+                # but not due to an exception.
+                await self._output_message_queue.put_blocking(
+                    GroupChatTermination(
+                        message=StopMessage(content="The group chat is stopped.", source=self._group_chat_manager_name)
                     )
-                except Exception as e:
-                    # Stop the consumption of messages and end the stream.
-                    # NOTE: we also need to put a GroupChatTermination event here because when the runtime
-                    # has an exception, the group chat manager may not be able to put a GroupChatTermination event in the queue.
-                    # This may not be necessary if the group chat manager is able to handle the exception and put the event in the queue.
-                    await self._output_message_queue.put(
-                        GroupChatTermination(
-                            message=StopMessage(
-                                content="An exception occurred in the runtime.", source=self._group_chat_manager_name
-                            ),
-                            error=SerializableException.from_exception(e),
-                        )
+                )
+            except Exception as e:
+                # Stop the consumption of messages and end the stream.
+                # NOTE: we also need to put a GroupChatTermination event here because when the runtime
+                # has an exception, the group chat manager may not be able to put a GroupChatTermination event in the queue.
+                # This may not be necessary if the group chat manager is able to handle the exception and put the event in the queue.
+                await self._output_message_queue.put_blocking(
+                    GroupChatTermination(
+                        message=StopMessage(
+                            content="An exception occurred in the runtime.", source=self._group_chat_manager_name
+                        ),
+                        error=SerializableException.from_exception(e),
                     )
+                )
 
-            # Create a background task to stop the runtime when the group chat
-            # is stopped or has an exception.
-            shutdown_task = asyncio.create_task(stop_runtime())
-
+        start_task: asyncio.Future[Any] | None = None
         try:
             # Run the team by sending the start message to the group chat manager.
             # The group chat manager will start the group chat by relaying the message to the participants
-            # and the group chat manager.
-            await self._runtime.send_message(
-                GroupChatStart(messages=messages),
-                recipient=AgentId(type=self._group_chat_manager_topic_type, key=self._team_id),
-                cancellation_token=cancellation_token,
+            # and the group chat manager. The output message queue is drained while the start message is
+            # handled, as the group chat manager puts the task messages in it and the queue may be bounded.
+            start_task = asyncio.ensure_future(
+                self._runtime.send_message(
+                    GroupChatStart(messages=messages),
+                    recipient=AgentId(type=self._group_chat_manager_topic_type, key=self._team_id),
+                    cancellation_token=cancellation_token,
+                )
             )
+            if self._embedded_runtime:
+                # Create a background task to stop the runtime when the group chat
+                # is stopped or has an exception. It is created after the start message
+                # is sent, so that the runtime is not idle when the task first runs.
+                shutdown_task = asyncio.create_task(stop_runtime())
             # Collect the output messages in order.
             output_messages: List[BaseAgentEvent | BaseChatMessage] = []
             stop_reason: str | None = None
@@ -509,6 +543,12 @@ async def stop_runtime() -> None:
                 message_future = asyncio.ensure_future(self._output_message_queue.get())
                 if cancellation_token is not None:
                     cancellation_token.link_future(message_future)
+                if not start_task.done():
+                    await asyncio.wait([message_future, start_task], return_when=asyncio.FIRST_COMPLETED)
+                if start_task.done() and (start_task.cancelled() or start_task.exception() is not None):
+                    # The start message failed, raise its error.
+                    message_future.cancel()
+                    start_task.result()
                 # Wait for the next message, this will raise an exception if the task is cancelled.
                 message = await message_future
                 if isinstance(message, GroupChatTermination):
@@ -528,9 +568,18 @@ async def stop_runtime() -> None:
             yield TaskResult(messages=output_messages, stop_reason=stop_reason)
 
         finally:
+            if start_task is not None and not start_task.done():
+                start_task.cancel()
             try:
                 if shutdown_task is not None:
-                    # Wait for the shutdown task to finish.
+                    # Wait for the shutdown task to finish, discarding the messages that are still
+                    # put in the output message queue, as the runtime may be waiting for room in it.
+                    while not shutdown_task.done():
+                        while not self._output_message_queue.empty():
+                            self._output_message_queue.get_nowait()
+                        discarded = asyncio.ensure_future(self._output_message_queue.get())
+                        await asyncio.wait([discarded, shutdown_task], return_when=asyncio.FIRST_COMPLETED)
+                        discarded.cancel()
                     # This will propagate any exceptions raised.
                     await shutdown_task
             finally:
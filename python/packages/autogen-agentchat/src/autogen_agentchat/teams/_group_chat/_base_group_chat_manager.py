@@ -2,9 +2,10 @@
 from abc import ABC, abstractmethod
 from typing import Any, List, Sequence
 
-from autogen_core import DefaultTopicId, MessageContext, event, rpc
+from autogen_core import BoundedQueue, CancellationToken, DefaultTopicId, MessageContext, event, rpc
 
 from ...base import TerminationCondition
+from ...conditions import TerminationEngine
 from ...messages import BaseAgentEvent, BaseChatMessage, MessageFactory, SelectSpeakerEvent, StopMessage
 from ._events import (
     GroupChatAgentResponse,
@@ -18,6 +19,7 @@
     GroupChatTermination,
     SerializableException,
 )
+from ._message_thread import MessageThread
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
@@ -46,6 +48,7 @@ def __init__(
         max_turns: int | None,
         message_factory: MessageFactory,
         emit_team_events: bool = False,
+        message_thread: MessageThread[BaseAgentEvent | BaseChatMessage] | None = None,
     ):
         super().__init__(
             description="Group chat manager",
@@ -72,9 +75,12 @@ def __init__(
             name: topic_type for name, topic_type in zip(participant_names, participant_topic_types, strict=True)
         }
         self._participant_descriptions = participant_descriptions
-        self._message_thread: List[BaseAgentEvent | BaseChatMessage] = []
+        self._message_thread = message_thread if message_thread is not None else MessageThread(message_factory)
         self._output_message_queue = output_message_queue
         self._termination_condition = termination_condition
+        self._termination_engine = (
+            TerminationEngine(termination_condition) if termination_condition is not None else None
+        )
         self._max_turns = max_turns
         self._current_turn = 0
         self._message_factory = message_factory
@@ -105,7 +111,7 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
                 topic_id=DefaultTopicId(type=self._output_topic_type),
             )
             for msg in message.messages:
-                await self._output_message_queue.put(msg)
+                await self._put_required_output(msg)
 
             # Relay all messages at once to participants
             await self.publish_message(
@@ -123,21 +129,7 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
                 return
 
         # Select a speaker to start/continue the conversation
-        speaker_name_future = asyncio.ensure_future(self.select_speaker(self._message_thread))
-        # Link the select speaker future to the cancellation token.
-        ctx.cancellation_token.link_future(speaker_name_future)
-        speaker_name = await speaker_name_future
-        if speaker_name not in self._participant_name_to_topic_type:
-            raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
-        await self._log_speaker_selection(speaker_name)
-
-        # Send the message to the next speaker
-        speaker_topic_type = self._participant_name_to_topic_type[speaker_name]
-        await self.publish_message(
-            GroupChatRequestPublish(),
-            topic_id=DefaultTopicId(type=speaker_topic_type),
-            cancellation_token=ctx.cancellation_token,
-        )
+        await self._transition_to_next_speaker(ctx.cancellation_token)
 
     @event
     async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: MessageContext) -> None:
@@ -157,21 +149,7 @@ async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: Mess
                 return
 
             # Select a speaker to continue the conversation.
-            speaker_name_future = asyncio.ensure_future(self.select_speaker(self._message_thread))
-            # Link the select speaker future to the cancellation token.
-            ctx.cancellation_token.link_future(speaker_name_future)
-            speaker_name = await speaker_name_future
-            if speaker_name not in self._participant_name_to_topic_type:
-                raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
-            await self._log_speaker_selection(speaker_name)
-
-            # Send the message to the next speakers
-            speaker_topic_type = self._participant_name_to_topic_type[speaker_name]
-            await self.publish_message(
-                GroupChatRequestPublish(),
-                topic_id=DefaultTopicId(type=speaker_topic_type),
-                cancellation_token=ctx.cancellation_token,
-            )
+            await self._transition_to_next_speaker(ctx.cancellation_token)
         except Exception as e:
             # Handle the exception and signal termination with an error.
             error = SerializableException.from_exception(e)
@@ -179,13 +157,32 @@ async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: Mess
             # Raise the exception to the runtime.
             raise
 
+    async def _transition_to_next_speaker(self, cancellation_token: CancellationToken) -> None:
+        """Select the next speaker and request it to publish a message to the group chat."""
+        speaker_name_future = asyncio.ensure_future(self.select_speaker(self._message_thread))
+        # Link the select speaker future to the cancellation token.
+        cancellation_token.link_future(speaker_name_future)
+        speaker_name = await speaker_name_future
+        if speaker_name not in self._participant_name_to_topic_type:
+            raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
+        await self._log_speaker_selection(speaker_name)
+
+        # Send the message to the next speaker
+        speaker_topic_type = self._participant_name_to_topic_type[speaker_name]
+        await self.publish_message(
+            GroupChatRequestPublish(),
+            topic_id=DefaultTopicId(type=speaker_topic_type),
+            cancellation_token=cancellation_token,
+        )
+
     async def _apply_termination_condition(
         self, delta: Sequence[BaseAgentEvent | BaseChatMessage], increment_turn_count: bool = False
     ) -> bool:
         """Apply the termination condition to the delta and return True if the conversation should be terminated.
         It also resets the termination condition and turn count, and signals termination to the caller of the team."""
         if self._termination_condition is not None:
-            stop_message = await self._termination_condition(delta)
+            assert self._termination_engine is not None
+            stop_message = await self._termination_engine(delta)
             if stop_message is not None:
                 # Reset the termination conditions and turn count.
                 await self._termination_condition.reset()
@@ -214,9 +211,10 @@ async def _apply_termination_condition(
                 return True
         return False
 
-    async def _log_speaker_selection(self, speaker_name: str) -> None:
-        """Log the selected speaker to the output message queue."""
-        select_msg = SelectSpeakerEvent(content=[speaker_name], source=self._name)
+    async def _log_speaker_selection(self, speaker_name: str | List[str]) -> None:
+        """Log the selected speaker, or speakers, to the output message queue."""
+        speaker_names = [speaker_name] if isinstance(speaker_name, str) else speaker_name
+        select_msg = SelectSpeakerEvent(content=speaker_names, source=self._name)
         if self._emit_team_events:
             await self.publish_message(
                 GroupChatMessage(message=select_msg),
@@ -232,7 +230,7 @@ async def _signal_termination(self, message: StopMessage) -> None:
             topic_id=DefaultTopicId(type=self._output_topic_type),
         )
         # Put the termination event in the output message queue.
-        await self._output_message_queue.put(termination_event)
+        await self._put_required_output(termination_event)
 
     async def _signal_termination_with_error(self, error: SerializableException) -> None:
         termination_event = GroupChatTermination(
@@ -244,7 +242,16 @@ async def _signal_termination_with_error(self, error: SerializableException) ->
             topic_id=DefaultTopicId(type=self._output_topic_type),
         )
         # Put the termination event in the output message queue.
-        await self._output_message_queue.put(termination_event)
+        await self._put_required_output(termination_event)
+
+    async def _put_required_output(self, message: BaseAgentEvent | BaseChatMessage | GroupChatTermination) -> None:
+        """Put a message that the caller of the team must receive, such as a start message or the termination
+        event, in the output message queue. It waits for a free slot whatever the overflow policy of the queue,
+        as the caller drains the queue while the team runs."""
+        if isinstance(self._output_message_queue, BoundedQueue):
+            await self._output_message_queue.put_blocking(message)
+        else:
+            await self._output_message_queue.put(message)
 
     @event
     async def handle_group_chat_message(self, message: GroupChatMessage, ctx: MessageContext) -> None:
@@ -283,7 +290,7 @@ async def validate_group_state(self, messages: List[BaseChatMessage] | None) ->
         ...
 
     @abstractmethod
-    async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> str:
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
         """Select a speaker from the participants and return the
         topic type of the selected speaker."""
         ...
@@ -293,5 +300,9 @@ async def reset(self) -> None:
         """Reset the group chat manager."""
         ...
 
+    async def close(self) -> None:
+        """Clear the message thread, which deletes its log if it is a temporary file."""
+        self._message_thread.clear()
+
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
         raise ValueError(f"Unhandled message in group chat manager: {type(message)}")
@@ -17,6 +17,7 @@
     GroupChatStart,
     SerializableException,
 )
+from ._message_thread import MessageThread
 from ._sequential_routed_agent import SequentialRoutedAgent
 
 
@@ -31,10 +32,17 @@ class ChatAgentContainer(SequentialRoutedAgent):
         agent (ChatAgent): The agent to delegate message handling to.
         message_factory (MessageFactory): The message factory to use for
             creating messages from JSON data.
+        message_buffer (MessageThread[BaseChatMessage], optional): The buffer of the messages
+            received since the agent last spoke. Defaults to a buffer kept in memory.
     """
 
     def __init__(
-        self, parent_topic_type: str, output_topic_type: str, agent: ChatAgent, message_factory: MessageFactory
+        self,
+        parent_topic_type: str,
+        output_topic_type: str,
+        agent: ChatAgent,
+        message_factory: MessageFactory,
+        message_buffer: MessageThread[BaseChatMessage] | None = None,
     ) -> None:
         super().__init__(
             description=agent.description,
@@ -48,7 +56,7 @@ def __init__(
         self._parent_topic_type = parent_topic_type
         self._output_topic_type = output_topic_type
         self._agent = agent
-        self._message_buffer: List[BaseChatMessage] = []
+        self._message_buffer = message_buffer if message_buffer is not None else MessageThread(message_factory)
         self._message_factory = message_factory
 
     @event
@@ -129,23 +137,30 @@ async def handle_resume(self, message: GroupChatResume, ctx: MessageContext) ->
         """Handle a resume event by resuming the agent."""
         await self._agent.on_resume(ctx.cancellation_token)
 
+    async def close(self) -> None:
+        """Clear the message buffer, which deletes its log if it is a temporary file."""
+        self._message_buffer.clear()
+
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
         raise ValueError(f"Unhandled message in agent container: {type(message)}")
 
     async def save_state(self) -> Mapping[str, Any]:
         agent_state = await self._agent.save_state()
         state = ChatAgentContainerState(
-            agent_state=agent_state, message_buffer=[message.dump() for message in self._message_buffer]
+            agent_state=agent_state,
+            message_buffer=self._message_buffer.dump(),
+            message_buffer_log=self._message_buffer.log,
         )
         return state.model_dump()
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
         container_state = ChatAgentContainerState.model_validate(state)
-        self._message_buffer = []
+        messages: List[BaseChatMessage] = []
         for message_data in container_state.message_buffer:
             message = self._message_factory.create(message_data)
             if isinstance(message, BaseChatMessage):
-                self._message_buffer.append(message)
+                messages.append(message)
             else:
                 raise ValueError(f"Invalid message type in message buffer: {type(message)}")
+        self._message_buffer.load(messages, container_state.message_buffer_log)
         await self._agent.load_state(container_state.agent_state)
@@ -2,7 +2,7 @@
 import logging
 from typing import Callable, List
 
-from autogen_core import AgentRuntime, Component, ComponentModel
+from autogen_core import AgentRuntime, Component, ComponentModel, QueueOverflowPolicy
 from autogen_core.models import ChatCompletionClient
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -29,6 +29,10 @@ class MagenticOneGroupChatConfig(BaseModel):
     max_stalls: int
     final_answer_prompt: str
     emit_team_events: bool = False
+    output_queue_max_size: int = 0
+    output_queue_overflow_policy: QueueOverflowPolicy = "block"
+    message_thread_window: int | None = None
+    message_thread_spill_dir: str | None = None
 
 
 class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig]):
@@ -48,6 +52,18 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
         max_stalls (int, optional): The maximum number of stalls allowed before re-planning. Defaults to 3.
         final_answer_prompt (str, optional): The LLM prompt used to generate the final answer or response from the team's transcript. A default (sensible for GPT-4o class models) is provided.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        output_queue_max_size (int, optional): The maximum number of messages buffered for :meth:`BaseGroupChat.run_stream`
+            before the overflow policy applies. 0 means unbounded. Defaults to 0.
+        output_queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is emitted while the
+            output queue is full: "block" pauses the team until the consumer catches up, "drop_oldest" discards the
+            oldest buffered message, and "raise" fails the run. The task messages and the end of the run always wait
+            for room, as they are consumed while the team runs. Defaults to "block".
+        message_thread_window (int, optional): The maximum number of messages of the conversation kept in memory by the
+            group chat manager and by each participant. Older messages are spilled to an on-disk log and read back when
+            needed. See :class:`~autogen_agentchat.teams.MessageThread`. Defaults to None, meaning all messages are kept in memory.
+        message_thread_spill_dir (str, optional): The directory of the logs of spilled messages, which saved team states
+            refer to. The logs in this directory are kept when the team is reset, and deleting them is up to the caller.
+            Defaults to None, meaning temporary files are used, which are deleted when the team is reset.
 
     Raises:
         ValueError: In orchestration logic if progress ledger does not have required keys or if next speaker is not valid.
@@ -106,6 +122,10 @@ def __init__(
         max_stalls: int = 3,
         final_answer_prompt: str = ORCHESTRATOR_FINAL_ANSWER_PROMPT,
         emit_team_events: bool = False,
+        output_queue_max_size: int = 0,
+        output_queue_overflow_policy: QueueOverflowPolicy = "block",
+        message_thread_window: int | None = None,
+        message_thread_spill_dir: str | None = None,
     ):
         super().__init__(
             participants,
@@ -115,6 +135,10 @@ def __init__(
             max_turns=max_turns,
             runtime=runtime,
             emit_team_events=emit_team_events,
+            output_queue_max_size=output_queue_max_size,
+            output_queue_overflow_policy=output_queue_overflow_policy,
+            message_thread_window=message_thread_window,
+            message_thread_spill_dir=message_thread_spill_dir,
         )
 
         # Validate the participants.
@@ -152,6 +176,7 @@ def _create_group_chat_manager_factory(
             output_message_queue,
             termination_condition,
             self._emit_team_events,
+            message_thread=self._create_message_thread(self._group_chat_manager_topic_type),
         )
 
     def _to_config(self) -> MagenticOneGroupChatConfig:
@@ -165,6 +190,10 @@ def _to_config(self) -> MagenticOneGroupChatConfig:
             max_stalls=self._max_stalls,
             final_answer_prompt=self._final_answer_prompt,
             emit_team_events=self._emit_team_events,
+            output_queue_max_size=self._output_message_queue.maxsize,
+            output_queue_overflow_policy=self._output_message_queue.overflow_policy,
+            message_thread_window=self._message_thread_window,
+            message_thread_spill_dir=self._message_thread_spill_dir,
         )
 
     @classmethod
@@ -182,4 +211,8 @@ def _from_config(cls, config: MagenticOneGroupChatConfig) -> Self:
             max_stalls=config.max_stalls,
             final_answer_prompt=config.final_answer_prompt,
             emit_team_events=config.emit_team_events,
+            output_queue_max_size=config.output_queue_max_size,
+            output_queue_overflow_policy=config.output_queue_overflow_policy,
+            message_thread_window=config.message_thread_window,
+            message_thread_spill_dir=config.message_thread_spill_dir,
         )
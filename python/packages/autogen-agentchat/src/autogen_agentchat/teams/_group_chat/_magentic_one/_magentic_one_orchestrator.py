@@ -2,7 +2,7 @@
 import json
 import logging
 import re
-from typing import Any, Dict, List, Mapping
+from typing import Any, Dict, List, Mapping, Sequence
 
 from autogen_core import AgentId, CancellationToken, DefaultTopicId, MessageContext, event, rpc
 from autogen_core.models import (
@@ -38,6 +38,7 @@
     GroupChatStart,
     GroupChatTermination,
 )
+from .._message_thread import MessageThread
 from ._prompts import (
     ORCHESTRATOR_FINAL_ANSWER_PROMPT,
     ORCHESTRATOR_PROGRESS_LEDGER_PROMPT,
@@ -70,6 +71,7 @@ def __init__(
         output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination],
         termination_condition: TerminationCondition | None,
         emit_team_events: bool,
+        message_thread: MessageThread[BaseAgentEvent | BaseChatMessage] | None = None,
     ):
         super().__init__(
             name,
@@ -83,6 +85,7 @@ def __init__(
             max_turns,
             message_factory,
             emit_team_events=emit_team_events,
+            message_thread=message_thread,
         )
         self._model_client = model_client
         self._max_stalls = max_stalls
@@ -147,7 +150,7 @@ async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> No
         await self.publish_message(message, topic_id=DefaultTopicId(type=self._output_topic_type))
         # Log the message to the output queue.
         for msg in message.messages:
-            await self._output_message_queue.put(msg)
+            await self._put_required_output(msg)
 
         # Outer Loop for first time
         # Create the initial task ledger
@@ -194,9 +197,10 @@ async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: Mess
         self._message_thread.append(message.agent_response.chat_message)
         delta.append(message.agent_response.chat_message)
 
-        if self._termination_condition is not None:
-            stop_message = await self._termination_condition(delta)
+        if self._termination_engine is not None:
+            stop_message = await self._termination_engine(delta)
             if stop_message is not None:
+                assert self._termination_condition is not None
                 # Reset the termination conditions.
                 await self._termination_condition.reset()
                 # Signal termination.
@@ -209,7 +213,8 @@ async def validate_group_state(self, messages: List[BaseChatMessage] | None) ->
 
     async def save_state(self) -> Mapping[str, Any]:
         state = MagenticOneOrchestratorState(
-            message_thread=[msg.dump() for msg in self._message_thread],
+            message_thread=self._message_thread.dump(),
+            message_log=self._message_thread.log,
             current_turn=self._current_turn,
             task=self._task,
             facts=self._facts,
@@ -221,7 +226,10 @@ async def save_state(self) -> Mapping[str, Any]:
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
         orchestrator_state = MagenticOneOrchestratorState.model_validate(state)
-        self._message_thread = [self._message_factory.create(message) for message in orchestrator_state.message_thread]
+        self._message_thread.load(
+            [self._message_factory.create(message) for message in orchestrator_state.message_thread],
+            orchestrator_state.message_log,
+        )
         self._current_turn = orchestrator_state.current_turn
         self._task = orchestrator_state.task
         self._facts = orchestrator_state.facts
@@ -229,7 +237,7 @@ async def load_state(self, state: Mapping[str, Any]) -> None:
         self._n_rounds = orchestrator_state.n_rounds
         self._n_stalls = orchestrator_state.n_stalls
 
-    async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> str:
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
         """Not used in this orchestrator, we select next speaker in _orchestrate_step."""
         return ""
 
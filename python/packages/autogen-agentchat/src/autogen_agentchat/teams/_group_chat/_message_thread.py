@@ -0,0 +1,237 @@
+import json
+import os
+import tempfile
+import weakref
+from array import array
+from typing import Any, Generic, Iterable, Iterator, List, Mapping, Sequence, TypeVar, cast, overload
+
+from pydantic_core import to_json
+
+from ...messages import BaseAgentEvent, BaseChatMessage, MessageFactory
+from ...state import MessageLogState
+
+MessageT = TypeVar("MessageT", bound=BaseAgentEvent | BaseChatMessage)
+
+
+class MessageThread(Sequence[MessageT], Generic[MessageT]):
+    """A sequence of messages that keeps the most recent messages in memory and spills
+    the older ones to an append-only JSONL log on disk.
+
+    Without a `window`, all the messages are kept in memory, like a list. With a `window`,
+    once more than `window` messages are in memory, all but the most recent half of them are
+    appended to the log at `path` in one write. Spilled messages are still part of the thread:
+    indexing, slicing and iteration read them back from the log when they are accessed, so
+    selectors can query the whole thread while its memory use stays bounded.
+
+    :meth:`dump` only dumps the messages kept in memory and :attr:`log` references the spilled
+    ones by their position in the log, so the saved state of a long thread stays small and a
+    loaded thread continues the log it was saved from.
+
+    A log at `path` belongs to the caller, who deletes it once no saved state refers to it. It is
+    never rewritten: :meth:`clear` forgets the spilled messages, and new messages are appended after
+    them. A temporary log belongs to the thread, and is deleted when the thread is cleared, when it
+    loads another log and when it is garbage collected. States saved from a thread with a temporary
+    log can therefore only be loaded until then.
+
+    Args:
+        message_factory (MessageFactory): The message factory used to create the spilled messages
+            when they are read back.
+        window (int, optional): The maximum number of messages kept in memory.
+            Defaults to None, meaning no messages are spilled.
+        path (str, optional): The path of the log. Defaults to a new temporary file
+            created when messages are first spilled.
+
+    Raises:
+        ValueError: If `window` is not greater than 0.
+    """
+
+    def __init__(
+        self, message_factory: MessageFactory, *, window: int | None = None, path: str | os.PathLike[str] | None = None
+    ) -> None:
+        if window is not None and window <= 0:
+            raise ValueError("The window of the message thread must be greater than 0.")
+        self._message_factory = message_factory
+        self._window = window
+        self._path = os.fspath(path) if path is not None else None
+        self._messages: List[MessageT] = []
+        # The offsets of the spilled messages in the log, and the runs of consecutive lines
+        # they occupy as [start offset, number of messages, end offset].
+        self._offsets = array("q")
+        self._segments: List[List[int]] = []
+        # Deletes the temporary log created by the thread, if any.
+        self._temporary_log: weakref.finalize | None = None
+
+    @property
+    def window(self) -> int | None:
+        """The maximum number of messages kept in memory."""
+        return self._window
+
+    @property
+    def path(self) -> str | None:
+        """The path of the log, or None if no messages were spilled yet to a temporary file."""
+        return self._path
+
+    @property
+    def spilled(self) -> int:
+        """The number of messages in the log."""
+        return len(self._offsets)
+
+    @property
+    def log(self) -> MessageLogState | None:
+        """The reference to the spilled messages in the log, or None if there are none."""
+        if not self._segments:
+            return None
+        assert self._path is not None
+        return MessageLogState(path=self._path, segments=[(start, count) for start, count, _ in self._segments])
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._messages)
+
+    @overload
+    def __getitem__(self, index: int) -> MessageT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[MessageT]: ...
+
+    def __getitem__(self, index: int | slice) -> MessageT | List[MessageT]:
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            spilled = iter(self._read([self._offsets[i] for i in indices if i < len(self._offsets)]))
+            return [
+                next(spilled) if i < len(self._offsets) else self._messages[i - len(self._offsets)] for i in indices
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message thread index out of range")
+        if index >= len(self._offsets):
+            return self._messages[index - len(self._offsets)]
+        return self._read([self._offsets[index]])[0]
+
+    def __iter__(self) -> Iterator[MessageT]:
+        if self._offsets:
+            assert self._path is not None
+            with open(self._path, "rb") as file:
+                for start, count, _ in self._segments:
+                    file.seek(start)
+                    for _ in range(count):
+                        yield self._create(file.readline())
+        yield from self._messages
+
+    def __reversed__(self) -> Iterator[MessageT]:
+        yield from reversed(self._messages)
+        if self._offsets:
+            assert self._path is not None
+            with open(self._path, "rb") as file:
+                for offset in reversed(self._offsets):
+                    file.seek(offset)
+                    yield self._create(file.readline())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(window={self._window}, spilled={self.spilled}, in_memory={len(self._messages)})"
+
+    def append(self, message: MessageT) -> None:
+        """Append a message to the thread."""
+        self._messages.append(message)
+        self._spill()
+
+    def extend(self, messages: Iterable[MessageT]) -> None:
+        """Append messages to the thread."""
+        self._messages.extend(messages)
+        self._spill()
+
+    def clear(self) -> None:
+        """Remove all the messages from the thread and delete its log if it is a temporary file.
+        A log at the `path` of the thread is left as it is."""
+        self._forget()
+        self._remove_temporary_log()
+
+    def dump(self) -> List[Mapping[str, Any]]:
+        """Dump the messages kept in memory. The spilled messages are referenced by :attr:`log`."""
+        return [message.dump() for message in self._messages]
+
+    def load(self, messages: Iterable[MessageT], log: MessageLogState | None = None) -> None:
+        """Replace the messages of the thread with the messages referenced by `log`, followed by `messages`.
+        The thread continues the log of `log`."""
+        self._forget()
+        if log is None or log.path != self._path:
+            self._remove_temporary_log()
+        if log is not None:
+            self._path = log.path
+            with open(log.path, "rb") as file:
+                for start, count in log.segments:
+                    file.seek(start)
+                    offset = start
+                    for _ in range(count):
+                        line = file.readline()
+                        if not line.endswith(b"\n"):
+                            raise ValueError(f"The message log {log.path} is missing messages.")
+                        self._offsets.append(offset)
+                        offset += len(line)
+                    self._add_segment(start, count, offset)
+        self.extend(messages)
+
+    def _spill(self) -> None:
+        if self._window is None or len(self._messages) <= self._window:
+            return
+        spilled = self._messages[: len(self._messages) - (self._window + 1) // 2]
+        lines = [to_json(message.dump()) + b"\n" for message in spilled]
+        if self._path is None:
+            fd, self._path = tempfile.mkstemp(prefix="message_thread_", suffix=".jsonl")
+            os.close(fd)
+            self._temporary_log = weakref.finalize(self, _remove_log, self._path)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        with open(self._path, "ab") as file:
+            start = file.tell()
+            file.write(b"".join(lines))
+        offset = start
+        for line in lines:
+            self._offsets.append(offset)
+            offset += len(line)
+        self._add_segment(start, len(lines), offset)
+        del self._messages[: len(spilled)]
+
+    def _forget(self) -> None:
+        self._messages.clear()
+        self._offsets = array("q")
+        self._segments = []
+
+    def _remove_temporary_log(self) -> None:
+        if self._temporary_log is not None:
+            self._temporary_log()
+            self._temporary_log = None
+            self._path = None
+
+    def _add_segment(self, start: int, count: int, end: int) -> None:
+        if self._segments and self._segments[-1][2] == start:
+            self._segments[-1][1] += count
+            self._segments[-1][2] = end
+        else:
+            self._segments.append([start, count, end])
+
+    def _read(self, offsets: Sequence[int]) -> List[MessageT]:
+        if not offsets:
+            return []
+        assert self._path is not None
+        with open(self._path, "rb") as file:
+            messages: List[MessageT] = []
+            for offset in offsets:
+                file.seek(offset)
+                messages.append(self._create(file.readline()))
+            return messages
+
+    def _create(self, line: bytes) -> MessageT:
+        return cast(MessageT, self._message_factory.create(json.loads(line)))
+
+
+def _remove_log(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,472 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Literal, Mapping, Sequence, Set
+
+from autogen_core import (
+    AgentRuntime,
+    CancellationToken,
+    Component,
+    ComponentModel,
+    DefaultTopicId,
+    MessageContext,
+    QueueOverflowPolicy,
+    event,
+    rpc,
+)
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from ... import TRACE_LOGGER_NAME
+from ...base import ChatAgent, Response, TerminationCondition
+from ...messages import BaseAgentEvent, BaseChatMessage, MessageFactory, StopMessage
+from ...state import ParallelManagerState
+from ._base_group_chat import BaseGroupChat
+from ._base_group_chat_manager import BaseGroupChatManager
+from ._events import GroupChatAgentResponse, GroupChatRequestPublish, GroupChatTermination, SerializableException
+from ._message_thread import MessageThread
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+JoinPolicy = Literal["all", "first_k", "quorum"]
+
+
+class _JoinTimeout(BaseModel):
+    """Sent by the manager to itself when the join timeout of a round expires."""
+
+    round: int
+
+
+class ParallelGroupChatManager(BaseGroupChatManager):
+    """A group chat manager that requests a set of speakers to respond concurrently in each round,
+    and joins their responses according to a join policy before starting the next round."""
+
+    def __init__(
+        self,
+        name: str,
+        group_topic_type: str,
+        output_topic_type: str,
+        participant_topic_types: List[str],
+        participant_names: List[str],
+        participant_descriptions: List[str],
+        output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination],
+        termination_condition: TerminationCondition | None,
+        max_turns: int | None,
+        message_factory: MessageFactory,
+        emit_team_events: bool,
+        join_policy: JoinPolicy = "all",
+        k: int | None = None,
+        join_timeout: float | None = None,
+        message_thread: MessageThread[BaseAgentEvent | BaseChatMessage] | None = None,
+    ) -> None:
+        super().__init__(
+            name,
+            group_topic_type,
+            output_topic_type,
+            participant_topic_types,
+            participant_names,
+            participant_descriptions,
+            output_message_queue,
+            termination_condition,
+            max_turns,
+            message_factory,
+            emit_team_events,
+            message_thread,
+        )
+        # The timeout of a round is processed in order with the responses of the round.
+        self._sequential_message_types = [*self._sequential_message_types, _JoinTimeout]
+        self._join_policy = join_policy
+        self._k = k
+        self._join_timeout = join_timeout
+        self._round = 0
+        # The speakers of the current round in the order they were requested, the speakers that have not
+        # responded yet, and the responses received so far.
+        self._round_speakers: List[str] = []
+        self._pending_speakers: Set[str] = set()
+        self._round_responses: Dict[str, Response] = {}
+        self._round_timed_out = False
+        self._timeout_task: asyncio.Task[None] | None = None
+        # The number of responses still to come from each speaker for rounds that were already joined.
+        self._late_responses: Dict[str, int] = {}
+        # The participants are registered with their topic types as agent types, which identifies the sender
+        # of a response whatever the source of its message.
+        self._participant_topic_type_to_name = {
+            topic_type: name for name, topic_type in self._participant_name_to_topic_type.items()
+        }
+
+    async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
+        pass
+
+    async def reset(self) -> None:
+        self._current_turn = 0
+        self._message_thread.clear()
+        if self._termination_condition is not None:
+            await self._termination_condition.reset()
+        self._cancel_timeout()
+        self._round_speakers = []
+        self._pending_speakers = set()
+        self._round_responses = {}
+        self._late_responses = {}
+
+    async def save_state(self) -> Mapping[str, Any]:
+        state = ParallelManagerState(
+            message_thread=self._message_thread.dump(),
+            message_log=self._message_thread.log,
+            current_turn=self._current_turn,
+        )
+        return state.model_dump()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        parallel_state = ParallelManagerState.model_validate(state)
+        self._message_thread.load(
+            [self._message_factory.create(message) for message in parallel_state.message_thread],
+            parallel_state.message_log,
+        )
+        self._current_turn = parallel_state.current_turn
+
+    async def select_speakers(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> List[str]:
+        """Select the speakers of the next round. All the participants are selected.
+        Subclasses can override this method to fan out to a subset of the participants.
+        The selected speakers that are still responding to a previous round are skipped."""
+        return list(self._participant_names)
+
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
+        """Select the first of the speakers of the next round."""
+        return (await self.select_speakers(thread))[0]
+
+    async def _transition_to_next_speaker(self, cancellation_token: CancellationToken) -> None:
+        """Select the speakers of the next round and request all of them to publish a message."""
+        speaker_names_future = asyncio.ensure_future(self.select_speakers(self._message_thread))
+        # Link the select speakers future to the cancellation token.
+        cancellation_token.link_future(speaker_names_future)
+        speaker_names = await speaker_names_future
+        if not speaker_names:
+            raise RuntimeError("No speakers were selected for the next round.")
+        for speaker_name in speaker_names:
+            if speaker_name not in self._participant_name_to_topic_type:
+                raise RuntimeError(f"Speaker {speaker_name} not found in participant names.")
+        # The speakers that have not responded to a previous round yet are not requested again,
+        # so that slow participants skip rounds rather than build up a backlog of requests.
+        speaker_names = [name for name in speaker_names if self._late_responses.get(name, 0) == 0]
+        if not speaker_names:
+            raise RuntimeError("All the speakers selected for the next round are still responding to a previous round.")
+        await self._log_speaker_selection(speaker_names)
+
+        self._round += 1
+        self._round_speakers = list(dict.fromkeys(speaker_names))
+        self._pending_speakers = set(self._round_speakers)
+        self._round_responses = {}
+        self._round_timed_out = False
+        if self._join_timeout is not None:
+            self._timeout_task = asyncio.create_task(self._expire_round(self._round, self._join_timeout))
+
+        # Send the message to the next speakers
+        for speaker_name in self._round_speakers:
+            await self.publish_message(
+                GroupChatRequestPublish(),
+                topic_id=DefaultTopicId(type=self._participant_name_to_topic_type[speaker_name]),
+                cancellation_token=cancellation_token,
+            )
+
+    @event
+    async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: MessageContext) -> None:  # type: ignore
+        try:
+            if ctx.sender is None or ctx.sender.type not in self._participant_topic_type_to_name:
+                raise RuntimeError(f"Response from an unknown sender: {ctx.sender}.")
+            speaker_name = self._participant_topic_type_to_name[ctx.sender.type]
+            if self._late_responses.get(speaker_name, 0) > 0:
+                # The response belongs to a round that was joined without it.
+                self._late_responses[speaker_name] -= 1
+                trace_logger.debug(f"Ignoring the late response of {speaker_name}.")
+                return
+            if speaker_name not in self._pending_speakers:
+                raise RuntimeError(f"Unexpected response from {speaker_name}.")
+            self._pending_speakers.remove(speaker_name)
+            self._round_responses[speaker_name] = message.agent_response
+            await self._join_round(ctx.cancellation_token)
+        except Exception as e:
+            # Handle the exception and signal termination with an error.
+            error = SerializableException.from_exception(e)
+            await self._signal_termination_with_error(error)
+            # Raise the exception to the runtime.
+            raise
+
+    @rpc
+    async def handle_join_timeout(self, message: _JoinTimeout, ctx: MessageContext) -> None:
+        if message.round != self._round or not self._pending_speakers:
+            return
+        self._round_timed_out = True
+        await self._join_round(ctx.cancellation_token)
+
+    async def _expire_round(self, round: int, timeout: float) -> None:
+        await asyncio.sleep(timeout)
+        await self.send_message(_JoinTimeout(round=round), self.id)
+
+    async def _signal_termination(self, message: StopMessage) -> None:
+        self._cancel_timeout()
+        await super()._signal_termination(message)
+
+    async def _signal_termination_with_error(self, error: SerializableException) -> None:
+        self._cancel_timeout()
+        await super()._signal_termination_with_error(error)
+
+    def _cancel_timeout(self) -> None:
+        if self._timeout_task is not None and asyncio.current_task() is not self._timeout_task:
+            self._timeout_task.cancel()
+        self._timeout_task = None
+
+    def _is_round_joined(self) -> bool:
+        if not self._pending_speakers:
+            return True
+        if self._join_policy == "first_k":
+            assert self._k is not None
+            return len(self._round_responses) >= self._k
+        if self._join_policy == "quorum":
+            assert self._k is not None
+            return self._round_timed_out and len(self._round_responses) >= self._k
+        return False
+
+    async def _join_round(self, cancellation_token: CancellationToken) -> None:
+        """If the current round is joined, add its responses to the thread in the order the speakers
+        were requested, apply the termination condition and start the next round."""
+        if not self._is_round_joined():
+            return
+        self._cancel_timeout()
+        for speaker_name in self._pending_speakers:
+            self._late_responses[speaker_name] = self._late_responses.get(speaker_name, 0) + 1
+        self._pending_speakers = set()
+
+        # Append the messages to the message thread and construct the delta.
+        delta: List[BaseAgentEvent | BaseChatMessage] = []
+        for speaker_name in self._round_speakers:
+            response = self._round_responses.get(speaker_name)
+            if response is None:
+                continue
+            if response.inner_messages is not None:
+                delta.extend(response.inner_messages)
+            delta.append(response.chat_message)
+        self._message_thread.extend(delta)
+
+        # Check if the conversation should be terminated.
+        if await self._apply_termination_condition(delta, increment_turn_count=True):
+            # Stop the group chat.
+            return
+
+        # Start the next round.
+        await self._transition_to_next_speaker(cancellation_token)
+
+
+class ParallelGroupChatConfig(BaseModel):
+    """The declarative configuration for ParallelGroupChat."""
+
+    participants: List[ComponentModel]
+    termination_condition: ComponentModel | None = None
+    max_turns: int | None = None
+    emit_team_events: bool = False
+    output_queue_max_size: int = 0
+    output_queue_overflow_policy: QueueOverflowPolicy = "block"
+    message_thread_window: int | None = None
+    message_thread_spill_dir: str | None = None
+    join_policy: JoinPolicy = "all"
+    k: int | None = None
+    join_timeout: float | None = None
+
+
+class ParallelGroupChat(BaseGroupChat, Component[ParallelGroupChatConfig]):
+    """A team that runs a group chat in rounds, where all the participants respond concurrently
+    to the conversation so far and their responses are published to all.
+
+    Each round requests every participant to respond at the same time, so a round takes as long as the
+    slowest participant it waits for rather than the sum of their latencies. This suits fan-out/fan-in
+    workflows such as independent reviewers. Once a round is joined, the responses are added to the
+    conversation in the order of the participants, whatever the order they arrived in, and the termination
+    condition is checked against all of them. A round counts as one turn.
+
+    The join policy decides when a round is complete:
+
+    - ``"all"``: when every participant has responded.
+    - ``"first_k"``: as soon as `k` participants have responded.
+    - ``"quorum"``: when every participant has responded, or once `join_timeout` seconds have passed
+      and at least `k` participants have responded.
+
+    With ``"first_k"`` and ``"quorum"``, the responses that arrive after their round was joined are left
+    out of the conversation thread of the team and of the termination condition. The other participants
+    still receive them with the rest of the conversation, and they are streamed from :meth:`run_stream` if
+    they arrive before the run ends. A participant is not requested again until it has responded to its
+    previous request, so a slow participant skips the rounds that start in the meantime. When the team
+    runs on its own embedded runtime, :meth:`run` returns once the late participants are done.
+
+    Args:
+        participants (List[ChatAgent]): The participants in the group chat.
+        termination_condition (TerminationCondition, optional): The termination condition for the group chat. Defaults to None.
+            Without a termination condition, the group chat will run indefinitely.
+        max_turns (int, optional): The maximum number of rounds in the group chat before stopping. Defaults to None, meaning no limit.
+        emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        output_queue_max_size (int, optional): The maximum number of messages buffered for :meth:`BaseGroupChat.run_stream`
+            before the overflow policy applies. 0 means unbounded. Defaults to 0.
+        output_queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is emitted while the
+            output queue is full: "block" pauses the team until the consumer catches up, "drop_oldest" discards the
+            oldest buffered message, and "raise" fails the run. The task messages and the end of the run always wait
+            for room, as they are consumed while the team runs. Defaults to "block".
+        message_thread_window (int, optional): The maximum number of messages of the conversation kept in memory by the
+            group chat manager and by each participant. Older messages are spilled to an on-disk log and read back when
+            needed. See :class:`~autogen_agentchat.teams.MessageThread`. Defaults to None, meaning all messages are kept in memory.
+        message_thread_spill_dir (str, optional): The directory of the logs of spilled messages, which saved team states
+            refer to. The logs in this directory are kept when the team is reset, and deleting them is up to the caller.
+            Defaults to None, meaning temporary files are used, which are deleted when the team is reset.
+        join_policy (str, optional): When a round is complete: "all", "first_k" or "quorum". Defaults to "all".
+        k (int, optional): The number of responses that complete a round with the "first_k" and "quorum" policies.
+        join_timeout (float, optional): The number of seconds after which a round with the "quorum" policy is complete
+            once `k` participants have responded.
+
+    Raises:
+        ValueError: If no participants are provided, if participant names are not unique, or if `k` and
+            `join_timeout` do not match the join policy.
+
+    Examples:
+
+    A team of reviewers that review a draft at the same time:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_agentchat.agents import AssistantAgent
+            from autogen_agentchat.teams import ParallelGroupChat
+            from autogen_agentchat.ui import Console
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+
+            async def main() -> None:
+                model_client = OpenAIChatCompletionClient(model="gpt-4o")
+
+                reviewers = [
+                    AssistantAgent(name, model_client=model_client, system_message=f"You review for {topic}.")
+                    for name, topic in [("style", "style"), ("security", "security"), ("tests", "test coverage")]
+                ]
+                team = ParallelGroupChat(reviewers, max_turns=1, join_policy="quorum", k=2, join_timeout=60)
+                await Console(team.run_stream(task="Review this change: ..."))
+
+
+            asyncio.run(main())
+    """
+
+    component_config_schema = ParallelGroupChatConfig
+    component_provider_override = "autogen_agentchat.teams.ParallelGroupChat"
+
+    def __init__(
+        self,
+        participants: List[ChatAgent],
+        termination_condition: TerminationCondition | None = None,
+        max_turns: int | None = None,
+        runtime: AgentRuntime | None = None,
+        custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
+        emit_team_events: bool = False,
+        output_queue_max_size: int = 0,
+        output_queue_overflow_policy: QueueOverflowPolicy = "block",
+        message_thread_window: int | None = None,
+        message_thread_spill_dir: str | None = None,
+        *,
+        join_policy: JoinPolicy = "all",
+        k: int | None = None,
+        join_timeout: float | None = None,
+    ) -> None:
+        super().__init__(
+            participants,
+            group_chat_manager_name="ParallelGroupChatManager",
+            group_chat_manager_class=ParallelGroupChatManager,
+            termination_condition=termination_condition,
+            max_turns=max_turns,
+            runtime=runtime,
+            custom_message_types=custom_message_types,
+            emit_team_events=emit_team_events,
+            output_queue_max_size=output_queue_max_size,
+            output_queue_overflow_policy=output_queue_overflow_policy,
+            message_thread_window=message_thread_window,
+            message_thread_spill_dir=message_thread_spill_dir,
+        )
+        if join_policy == "all":
+            if k is not None or join_timeout is not None:
+                raise ValueError('k and join_timeout are not used with the "all" join policy.')
+        elif join_policy in ("first_k", "quorum"):
+            if k is None or not 1 <= k <= len(participants):
+                raise ValueError(f"k must be between 1 and the number of participants for the {join_policy!r} policy.")
+            if join_policy == "quorum" and (join_timeout is None or join_timeout <= 0):
+                raise ValueError('join_timeout must be greater than 0 for the "quorum" join policy.')
+            if join_policy == "first_k" and join_timeout is not None:
+                raise ValueError('join_timeout is not used with the "first_k" join policy.')
+        else:
+            raise ValueError(f"Invalid join policy: {join_policy}")
+        self._join_policy: JoinPolicy = join_policy
+        self._k = k
+        self._join_timeout = join_timeout
+
+    def _create_group_chat_manager_factory(
+        self,
+        name: str,
+        group_topic_type: str,
+        output_topic_type: str,
+        participant_topic_types: List[str],
+        participant_names: List[str],
+        participant_descriptions: List[str],
+        output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination],
+        termination_condition: TerminationCondition | None,
+        max_turns: int | None,
+        message_factory: MessageFactory,
+    ) -> Callable[[], ParallelGroupChatManager]:
+        def _factory() -> ParallelGroupChatManager:
+            return ParallelGroupChatManager(
+                name,
+                group_topic_type,
+                output_topic_type,
+                participant_topic_types,
+                participant_names,
+                participant_descriptions,
+                output_message_queue,
+                termination_condition,
+                max_turns,
+                message_factory,
+                self._emit_team_events,
+                self._join_policy,
+                self._k,
+                self._join_timeout,
+                message_thread=self._create_message_thread(self._group_chat_manager_topic_type),
+            )
+
+        return _factory
+
+    def _to_config(self) -> ParallelGroupChatConfig:
+        participants = [participant.dump_component() for participant in self._participants]
+        termination_condition = self._termination_condition.dump_component() if self._termination_condition else None
+        return ParallelGroupChatConfig(
+            participants=participants,
+            termination_condition=termination_condition,
+            max_turns=self._max_turns,
+            emit_team_events=self._emit_team_events,
+            output_queue_max_size=self._output_message_queue.maxsize,
+            output_queue_overflow_policy=self._output_message_queue.overflow_policy,
+            message_thread_window=self._message_thread_window,
+            message_thread_spill_dir=self._message_thread_spill_dir,
+            join_policy=self._join_policy,
+            k=self._k,
+            join_timeout=self._join_timeout,
+        )
+
+    @classmethod
+    def _from_config(cls, config: ParallelGroupChatConfig) -> Self:
+        participants = [ChatAgent.load_component(participant) for participant in config.participants]
+        termination_condition = (
+            TerminationCondition.load_component(config.termination_condition) if config.termination_condition else None
+        )
+        return cls(
+            participants,
+            termination_condition=termination_condition,
+            max_turns=config.max_turns,
+            emit_team_events=config.emit_team_events,
+            output_queue_max_size=config.output_queue_max_size,
+            output_queue_overflow_policy=config.output_queue_overflow_policy,
+            message_thread_window=config.message_thread_window,
+            message_thread_spill_dir=config.message_thread_spill_dir,
+            join_policy=config.join_policy,
+            k=config.k,
+            join_timeout=config.join_timeout,
+        )
@@ -1,7 +1,7 @@
 import asyncio
-from typing import Any, Callable, List, Mapping
+from typing import Any, Callable, List, Mapping, Sequence
 
-from autogen_core import AgentRuntime, Component, ComponentModel
+from autogen_core import AgentRuntime, Component, ComponentModel, QueueOverflowPolicy
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -11,6 +11,7 @@
 from ._base_group_chat import BaseGroupChat
 from ._base_group_chat_manager import BaseGroupChatManager
 from ._events import GroupChatTermination
+from ._message_thread import MessageThread
 
 
 class RoundRobinGroupChatManager(BaseGroupChatManager):
@@ -29,6 +30,7 @@ def __init__(
         max_turns: int | None,
         message_factory: MessageFactory,
         emit_team_events: bool,
+        message_thread: MessageThread[BaseAgentEvent | BaseChatMessage] | None = None,
     ) -> None:
         super().__init__(
             name,
@@ -42,6 +44,7 @@ def __init__(
             max_turns,
             message_factory,
             emit_team_events,
+            message_thread,
         )
         self._next_speaker_index = 0
 
@@ -57,7 +60,8 @@ async def reset(self) -> None:
 
     async def save_state(self) -> Mapping[str, Any]:
         state = RoundRobinManagerState(
-            message_thread=[message.dump() for message in self._message_thread],
+            message_thread=self._message_thread.dump(),
+            message_log=self._message_thread.log,
             current_turn=self._current_turn,
             next_speaker_index=self._next_speaker_index,
         )
@@ -65,11 +69,14 @@ async def save_state(self) -> Mapping[str, Any]:
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
         round_robin_state = RoundRobinManagerState.model_validate(state)
-        self._message_thread = [self._message_factory.create(message) for message in round_robin_state.message_thread]
+        self._message_thread.load(
+            [self._message_factory.create(message) for message in round_robin_state.message_thread],
+            round_robin_state.message_log,
+        )
         self._current_turn = round_robin_state.current_turn
         self._next_speaker_index = round_robin_state.next_speaker_index
 
-    async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> str:
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
         """Select a speaker from the participants in a round-robin fashion."""
         current_speaker_index = self._next_speaker_index
         self._next_speaker_index = (current_speaker_index + 1) % len(self._participant_names)
@@ -84,6 +91,10 @@ class RoundRobinGroupChatConfig(BaseModel):
     termination_condition: ComponentModel | None = None
     max_turns: int | None = None
     emit_team_events: bool = False
+    output_queue_max_size: int = 0
+    output_queue_overflow_policy: QueueOverflowPolicy = "block"
+    message_thread_window: int | None = None
+    message_thread_spill_dir: str | None = None
 
 
 class RoundRobinGroupChat(BaseGroupChat, Component[RoundRobinGroupChatConfig]):
@@ -98,6 +109,18 @@ class RoundRobinGroupChat(BaseGroupChat, Component[RoundRobinGroupChatConfig]):
             Without a termination condition, the group chat will run indefinitely.
         max_turns (int, optional): The maximum number of turns in the group chat before stopping. Defaults to None, meaning no limit.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        output_queue_max_size (int, optional): The maximum number of messages buffered for :meth:`BaseGroupChat.run_stream`
+            before the overflow policy applies. 0 means unbounded. Defaults to 0.
+        output_queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is emitted while the
+            output queue is full: "block" pauses the team until the consumer catches up, "drop_oldest" discards the
+            oldest buffered message, and "raise" fails the run. The task messages and the end of the run always wait
+            for room, as they are consumed while the team runs. Defaults to "block".
+        message_thread_window (int, optional): The maximum number of messages of the conversation kept in memory by the
+            group chat manager and by each participant. Older messages are spilled to an on-disk log and read back when
+            needed. See :class:`~autogen_agentchat.teams.MessageThread`. Defaults to None, meaning all messages are kept in memory.
+        message_thread_spill_dir (str, optional): The directory of the logs of spilled messages, which saved team states
+            refer to. The logs in this directory are kept when the team is reset, and deleting them is up to the caller.
+            Defaults to None, meaning temporary files are used, which are deleted when the team is reset.
 
     Raises:
         ValueError: If no participants are provided or if participant names are not unique.
@@ -172,6 +195,10 @@ def __init__(
         runtime: AgentRuntime | None = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        output_queue_max_size: int = 0,
+        output_queue_overflow_policy: QueueOverflowPolicy = "block",
+        message_thread_window: int | None = None,
+        message_thread_spill_dir: str | None = None,
     ) -> None:
         super().__init__(
             participants,
@@ -182,6 +209,10 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            output_queue_max_size=output_queue_max_size,
+            output_queue_overflow_policy=output_queue_overflow_policy,
+            message_thread_window=message_thread_window,
+            message_thread_spill_dir=message_thread_spill_dir,
         )
 
     def _create_group_chat_manager_factory(
@@ -210,6 +241,7 @@ def _factory() -> RoundRobinGroupChatManager:
                 max_turns,
                 message_factory,
                 self._emit_team_events,
+                message_thread=self._create_message_thread(self._group_chat_manager_topic_type),
             )
 
         return _factory
@@ -222,6 +254,10 @@ def _to_config(self) -> RoundRobinGroupChatConfig:
             termination_condition=termination_condition,
             max_turns=self._max_turns,
             emit_team_events=self._emit_team_events,
+            output_queue_max_size=self._output_message_queue.maxsize,
+            output_queue_overflow_policy=self._output_message_queue.overflow_policy,
+            message_thread_window=self._message_thread_window,
+            message_thread_spill_dir=self._message_thread_spill_dir,
         )
 
     @classmethod
@@ -235,4 +271,8 @@ def _from_config(cls, config: RoundRobinGroupChatConfig) -> Self:
             termination_condition=termination_condition,
             max_turns=config.max_turns,
             emit_team_events=config.emit_team_events,
+            output_queue_max_size=config.output_queue_max_size,
+            output_queue_overflow_policy=config.output_queue_overflow_policy,
+            message_thread_window=config.message_thread_window,
+            message_thread_spill_dir=config.message_thread_spill_dir,
         )
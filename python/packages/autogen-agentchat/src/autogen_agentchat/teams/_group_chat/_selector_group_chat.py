@@ -2,9 +2,9 @@
 import logging
 import re
 from inspect import iscoroutinefunction
-from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Union, cast
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union, cast
 
-from autogen_core import AgentRuntime, Component, ComponentModel
+from autogen_core import AgentRuntime, Component, ComponentModel, QueueOverflowPolicy
 from autogen_core.models import (
     AssistantMessage,
     ChatCompletionClient,
@@ -30,6 +30,7 @@
 from ._base_group_chat import BaseGroupChat
 from ._base_group_chat_manager import BaseGroupChatManager
 from ._events import GroupChatTermination
+from ._message_thread import MessageThread
 
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
 
@@ -66,6 +67,8 @@ def __init__(
         candidate_func: Optional[CandidateFuncType],
         emit_team_events: bool,
         model_client_streaming: bool = False,
+        selector_history_token_limit: int | None = None,
+        message_thread: MessageThread[BaseAgentEvent | BaseChatMessage] | None = None,
     ) -> None:
         super().__init__(
             name,
@@ -79,6 +82,7 @@ def __init__(
             max_turns,
             message_factory,
             emit_team_events,
+            message_thread,
         )
         self._model_client = model_client
         self._selector_prompt = selector_prompt
@@ -90,6 +94,22 @@ def __init__(
         self._candidate_func = candidate_func
         self._is_candidate_func_async = iscoroutinefunction(self._candidate_func)
         self._model_client_streaming = model_client_streaming
+        self._selector_history_token_limit = selector_history_token_limit
+        # Construct agent roles.
+        # Each agent sould appear on a single line.
+        self._roles = "\n".join(
+            re.sub(r"\s+", " ", f"{name}: {description}").strip()
+            for name, description in zip(participant_names, participant_descriptions, strict=True)
+        )
+        self._mention_patterns: Dict[str, Tuple[Tuple[str, ...], re.Pattern[str]]] = {
+            name: self._mention_pattern(name) for name in participant_names
+        }
+        # The transcript entries of the chat messages of the thread, rendered once per message,
+        # with their token counts when the history is limited.
+        self._transcript: List[Tuple[str, int]] = []
+        # The thread that was rendered and the number of its messages that were rendered.
+        self._rendered_thread: Sequence[BaseAgentEvent | BaseChatMessage] | None = None
+        self._rendered_length = 0
 
     async def validate_group_state(self, messages: List[BaseChatMessage] | None) -> None:
         pass
@@ -100,10 +120,12 @@ async def reset(self) -> None:
         if self._termination_condition is not None:
             await self._termination_condition.reset()
         self._previous_speaker = None
+        self._rendered_thread = None
 
     async def save_state(self) -> Mapping[str, Any]:
         state = SelectorManagerState(
-            message_thread=[msg.dump() for msg in self._message_thread],
+            message_thread=self._message_thread.dump(),
+            message_log=self._message_thread.log,
             current_turn=self._current_turn,
             previous_speaker=self._previous_speaker,
         )
@@ -111,11 +133,48 @@ async def save_state(self) -> Mapping[str, Any]:
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
         selector_state = SelectorManagerState.model_validate(state)
-        self._message_thread = [self._message_factory.create(msg) for msg in selector_state.message_thread]
+        self._message_thread.load(
+            [self._message_factory.create(msg) for msg in selector_state.message_thread], selector_state.message_log
+        )
         self._current_turn = selector_state.current_turn
         self._previous_speaker = selector_state.previous_speaker
-
-    async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> str:
+        self._rendered_thread = None
+
+    def _render_history(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
+        """Render the history of the conversation for the selector prompt.
+
+        The message thread only grows between resets, so only the messages added since the last call are
+        rendered, and messages spilled from the thread are not read back. When the history is limited, the
+        most recent messages that fit in the limit are kept."""
+        if thread is not self._rendered_thread or self._rendered_length > len(thread):
+            self._transcript = []
+            self._rendered_thread = thread
+            self._rendered_length = 0
+        for msg in thread[self._rendered_length :]:
+            if not isinstance(msg, BaseChatMessage):
+                # Only process chat messages.
+                continue
+            message = f"{msg.source}: {msg.to_model_text()}"
+            # Create some consistency for how messages are separated in the transcript
+            entry = message.rstrip() + "\n\n"
+            token_count = 0
+            if self._selector_history_token_limit is not None:
+                token_count = self._model_client.count_tokens([UserMessage(content=entry, source="user")])
+            self._transcript.append((entry, token_count))
+        self._rendered_length = len(thread)
+
+        if self._selector_history_token_limit is None:
+            return "\n".join(entry for entry, _ in self._transcript)
+        start = len(self._transcript)
+        total_tokens = 0
+        while start > 0 and total_tokens + self._transcript[start - 1][1] <= self._selector_history_token_limit:
+            start -= 1
+            total_tokens += self._transcript[start][1]
+        # The entries that no longer fit in the limit never will again.
+        del self._transcript[:start]
+        return "\n".join(entry for entry, _ in self._transcript)
+
+    async def select_speaker(self, thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str:
         """Selects the next speaker in a group chat using a ChatCompletion client,
         with the selector function as override if it returns a speaker name.
 
@@ -164,27 +223,11 @@ async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -
         assert len(participants) > 0
 
         # Construct the history of the conversation.
-        history_messages: List[str] = []
-        for msg in thread:
-            if not isinstance(msg, BaseChatMessage):
-                # Only process chat messages.
-                continue
-            message = f"{msg.source}: {msg.to_model_text()}"
-            history_messages.append(
-                message.rstrip() + "\n\n"
-            )  # Create some consistency for how messages are separated in the transcript
-        history = "\n".join(history_messages)
-
-        # Construct agent roles.
-        # Each agent sould appear on a single line.
-        roles = ""
-        for topic_type, description in zip(self._participant_names, self._participant_descriptions, strict=True):
-            roles += re.sub(r"\s+", " ", f"{topic_type}: {description}").strip() + "\n"
-        roles = roles.strip()
+        history = self._render_history(thread)
 
         # Select the next speaker.
         if len(participants) > 1:
-            agent_name = await self._select_speaker(roles, participants, history, self._max_selector_attempts)
+            agent_name = await self._select_speaker(self._roles, participants, history, self._max_selector_attempts)
         else:
             agent_name = participants[0]
         self._previous_speaker = agent_name
@@ -280,24 +323,29 @@ def _mentioned_agents(self, message_content: str, agent_names: List[str]) -> Dic
             Dict: a counter for mentioned agents.
         """
         mentions: Dict[str, int] = dict()
+        # Pad the message to help with matching
+        padded_content = f" {message_content} "
         for name in agent_names:
-            # Finds agent mentions, taking word boundaries into account,
-            # accommodates escaping underscores and underscores as spaces
-            regex = (
-                r"(?<=\W)("
-                + re.escape(name)
-                + r"|"
-                + re.escape(name.replace("_", " "))
-                + r"|"
-                + re.escape(name.replace("_", r"\_"))
-                + r")(?=\W)"
-            )
-            # Pad the message to help with matching
-            count = len(re.findall(regex, f" {message_content} "))
+            if name in self._mention_patterns:
+                variants, regex = self._mention_patterns[name]
+            else:
+                variants, regex = self._mention_pattern(name)
+            if not any(variant in padded_content for variant in variants):
+                continue
+            count = len(regex.findall(padded_content))
             if count > 0:
                 mentions[name] = count
         return mentions
 
+    @staticmethod
+    def _mention_pattern(name: str) -> Tuple[Tuple[str, ...], re.Pattern[str]]:
+        """Return the ways `name` can be written in a message and the compiled regex that finds its mentions."""
+        # Finds agent mentions, taking word boundaries into account,
+        # accommodates escaping underscores and underscores as spaces
+        variants = (name, name.replace("_", " "), name.replace("_", r"\_"))
+        regex = r"(?<=\W)(" + "|".join(re.escape(variant) for variant in variants) + r")(?=\W)"
+        return variants, re.compile(regex)
+
 
 class SelectorGroupChatConfig(BaseModel):
     """The declarative configuration for SelectorGroupChat."""
@@ -311,7 +359,12 @@ class SelectorGroupChatConfig(BaseModel):
     # selector_func: ComponentModel | None
     max_selector_attempts: int = 3
     emit_team_events: bool = False
+    output_queue_max_size: int = 0
+    output_queue_overflow_policy: QueueOverflowPolicy = "block"
+    message_thread_window: int | None = None
+    message_thread_spill_dir: str | None = None
     model_client_streaming: bool = False
+    selector_history_token_limit: int | None = None
 
 
 class SelectorGroupChat(BaseGroupChat, Component[SelectorGroupChatConfig]):
@@ -342,7 +395,22 @@ class SelectorGroupChat(BaseGroupChat, Component[SelectorGroupChatConfig]):
             selection using model. If the function returns an empty list or `None`, `SelectorGroupChat` will raise a `ValueError`.
             This function is only used if `selector_func` is not set. The `allow_repeated_speaker` will be ignored if set.
         emit_team_events (bool, optional): Whether to emit team events through :meth:`BaseGroupChat.run_stream`. Defaults to False.
+        output_queue_max_size (int, optional): The maximum number of messages buffered for :meth:`BaseGroupChat.run_stream`
+            before the overflow policy applies. 0 means unbounded. Defaults to 0.
+        output_queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is emitted while the
+            output queue is full: "block" pauses the team until the consumer catches up, "drop_oldest" discards the
+            oldest buffered message, and "raise" fails the run. The task messages and the end of the run always wait
+            for room, as they are consumed while the team runs. Defaults to "block".
+        message_thread_window (int, optional): The maximum number of messages of the conversation kept in memory by the
+            group chat manager and by each participant. Older messages are spilled to an on-disk log and read back when
+            needed. See :class:`~autogen_agentchat.teams.MessageThread`. Defaults to None, meaning all messages are kept in memory.
+        message_thread_spill_dir (str, optional): The directory of the logs of spilled messages, which saved team states
+            refer to. The logs in this directory are kept when the team is reset, and deleting them is up to the caller.
+            Defaults to None, meaning temporary files are used, which are deleted when the team is reset.
         model_client_streaming (bool, optional): Whether to use streaming for the model client. (This is useful for reasoning models like QwQ). Defaults to False.
+        selector_history_token_limit (int, optional): The maximum number of tokens, counted with `model_client`, of the
+            conversation history in the selector prompt. When set, only the most recent messages that fit are included.
+            Defaults to None, meaning the whole conversation is included.
 
     Raises:
         ValueError: If the number of participants is less than two or if the selector prompt is invalid.
@@ -485,7 +553,12 @@ def __init__(
         candidate_func: Optional[CandidateFuncType] = None,
         custom_message_types: List[type[BaseAgentEvent | BaseChatMessage]] | None = None,
         emit_team_events: bool = False,
+        output_queue_max_size: int = 0,
+        output_queue_overflow_policy: QueueOverflowPolicy = "block",
+        message_thread_window: int | None = None,
+        message_thread_spill_dir: str | None = None,
         model_client_streaming: bool = False,
+        selector_history_token_limit: int | None = None,
     ):
         super().__init__(
             participants,
@@ -496,10 +569,16 @@ def __init__(
             runtime=runtime,
             custom_message_types=custom_message_types,
             emit_team_events=emit_team_events,
+            output_queue_max_size=output_queue_max_size,
+            output_queue_overflow_policy=output_queue_overflow_policy,
+            message_thread_window=message_thread_window,
+            message_thread_spill_dir=message_thread_spill_dir,
         )
         # Validate the participants.
         if len(participants) < 2:
             raise ValueError("At least two participants are required for SelectorGroupChat.")
+        if selector_history_token_limit is not None and selector_history_token_limit <= 0:
+            raise ValueError("selector_history_token_limit must be greater than 0.")
         self._selector_prompt = selector_prompt
         self._model_client = model_client
         self._allow_repeated_speaker = allow_repeated_speaker
@@ -507,6 +586,7 @@ def __init__(
         self._max_selector_attempts = max_selector_attempts
         self._candidate_func = candidate_func
         self._model_client_streaming = model_client_streaming
+        self._selector_history_token_limit = selector_history_token_limit
 
     def _create_group_chat_manager_factory(
         self,
@@ -540,6 +620,8 @@ def _create_group_chat_manager_factory(
             self._candidate_func,
             self._emit_team_events,
             self._model_client_streaming,
+            self._selector_history_token_limit,
+            message_thread=self._create_message_thread(self._group_chat_manager_topic_type),
         )
 
     def _to_config(self) -> SelectorGroupChatConfig:
@@ -553,7 +635,12 @@ def _to_config(self) -> SelectorGroupChatConfig:
             max_selector_attempts=self._max_selector_attempts,
             # selector_func=self._selector_func.dump_component() if self._selector_func else None,
             emit_team_events=self._emit_team_events,
+            output_queue_max_size=self._output_message_queue.maxsize,
+            output_queue_overflow_policy=self._output_message_queue.overflow_policy,
+            message_thread_window=self._message_thread_window,
+            message_thread_spill_dir=self._message_thread_spill_dir,
             model_client_streaming=self._model_client_streaming,
+            selector_history_token_limit=self._selector_history_token_limit,
         )
 
     @classmethod
@@ -572,5 +659,10 @@ def _from_config(cls, config: SelectorGroupChatConfig) -> Self:
             # if config.selector_func
             # else None,
             emit_team_events=config.emit_team_events,
+            output_queue_max_size=config.output_queue_max_size,
+            output_queue_overflow_policy=config.output_queue_overflow_policy,
+            message_thread_window=config.message_thread_window,
+            message_thread_spill_dir=config.message_thread_spill_dir,
             model_client_streaming=config.model_client_streaming,
+            selector_history_token_limit=config.selector_history_token_limit,
         )
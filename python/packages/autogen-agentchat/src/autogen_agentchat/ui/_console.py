@@ -145,6 +145,7 @@ async def Console(
                     output += f"[Prompt tokens: {message.chat_message.models_usage.prompt_tokens}, Completion tokens: {message.chat_message.models_usage.completion_tokens}]\n"
                 total_usage.completion_tokens += message.chat_message.models_usage.completion_tokens
                 total_usage.prompt_tokens += message.chat_message.models_usage.prompt_tokens
+                total_usage.cached_prompt_tokens += message.chat_message.models_usage.cached_prompt_tokens
             await aprint(output, end="", flush=True)
 
             # Print summary.
@@ -197,6 +198,7 @@ async def Console(
                         )
                     total_usage.completion_tokens += message.models_usage.completion_tokens
                     total_usage.prompt_tokens += message.models_usage.prompt_tokens
+                    total_usage.cached_prompt_tokens += message.models_usage.cached_prompt_tokens
 
     if last_processed is None:
         raise ValueError("No TaskResult or Response was processed.")
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import Dict, List
@@ -19,7 +20,7 @@
     ToolCallRequestEvent,
     ToolCallSummaryMessage,
 )
-from autogen_core import ComponentModel, FunctionCall, Image
+from autogen_core import CancellationToken, ComponentModel, FunctionCall, Image
 from autogen_core.memory import ListMemory, Memory, MemoryContent, MemoryMimeType, MemoryQueryResult
 from autogen_core.model_context import BufferedChatCompletionContext
 from autogen_core.models import (
@@ -28,6 +29,7 @@
     FunctionExecutionResult,
     FunctionExecutionResultMessage,
     LLMMessage,
+    ModelInfo,
     RequestUsage,
     SystemMessage,
     UserMessage,
@@ -401,6 +403,109 @@ async def test_run_with_parallel_tools_with_empty_call_ids() -> None:
     assert state == state2
 
 
+@pytest.mark.asyncio
+async def test_run_with_bounded_parallel_tools() -> None:
+    running: Dict[str, int] = {"all": 0, "fetch": 0}
+    peak: Dict[str, int] = {"all": 0, "fetch": 0}
+    cancelled: List[str] = []
+
+    async def fetch(input: str) -> str:
+        running["all"] += 1
+        running["fetch"] += 1
+        peak["all"] = max(peak["all"], running["all"])
+        peak["fetch"] = max(peak["fetch"], running["fetch"])
+        await asyncio.sleep(0.05)
+        running["all"] -= 1
+        running["fetch"] -= 1
+        return f"fetched {input}"
+
+    async def compute(input: str) -> str:
+        running["all"] += 1
+        peak["all"] = max(peak["all"], running["all"])
+        await asyncio.sleep(0.01)
+        running["all"] -= 1
+        return f"computed {input}"
+
+    async def hang(input: str, cancellation_token: CancellationToken) -> str:
+        cancellation_token.add_callback(lambda: cancelled.append(input))
+        await asyncio.sleep(10)
+        return "unreachable"
+
+    calls = [FunctionCall(id=str(i), arguments=json.dumps({"input": str(i)}), name="fetch") for i in range(6)]
+    calls += [FunctionCall(id=str(i), arguments=json.dumps({"input": str(i)}), name="compute") for i in range(6, 9)]
+    calls.append(FunctionCall(id="9", arguments=json.dumps({"input": "9"}), name="hang"))
+    model_info: ModelInfo = {
+        "function_calling": True,
+        "vision": True,
+        "json_output": True,
+        "family": ModelFamily.GPT_4O,
+        "structured_output": True,
+    }
+    model_client = ReplayChatCompletionClient(
+        [CreateResult(finish_reason="function_calls", content=calls, usage=RequestUsage(0, 0), cached=False)],
+        model_info=model_info,
+    )
+    agent = AssistantAgent(
+        "tool_use_agent",
+        model_client=model_client,
+        tools=[fetch, compute, hang],
+        max_concurrent_tool_calls=3,
+        tool_concurrency_limits={"fetch": 2},
+        tool_call_timeouts={"hang": 0.5},
+        stream_tool_call_results=True,
+    )
+    result = await agent.run(task="task")
+    assert peak == {"all": 3, "fetch": 2}
+
+    # A result is streamed for each call as it completes, and the timed out call is cancelled.
+    assert isinstance(result.messages[1], ToolCallRequestEvent)
+    events = result.messages[2:-1]
+    assert len(events) == len(calls)
+    assert all(isinstance(event, ToolCallExecutionEvent) and len(event.content) == 1 for event in events)
+    assert events[-1] == ToolCallExecutionEvent(
+        content=[
+            FunctionExecutionResult(
+                call_id="9", content="Error: The tool 'hang' timed out after 0.5 seconds.", is_error=True, name="hang"
+            )
+        ],
+        source="tool_use_agent",
+    )
+    assert cancelled == ["9"]
+
+    # The model context and the summary keep the order of the calls.
+    context_messages = await agent.model_context.get_messages()
+    assert isinstance(context_messages[-1], FunctionExecutionResultMessage)
+    assert [result.call_id for result in context_messages[-1].content] == [call.id for call in calls]
+    assert isinstance(result.messages[-1], ToolCallSummaryMessage)
+    assert result.messages[-1].content.splitlines()[:2] == ["fetched 0", "fetched 1"]
+
+    # The cancellation token of the batch no longer refers to the calls once they are done.
+    cancellation_token = CancellationToken()
+    results = await agent._tool_call_scheduler.run_all(calls[:2], cancellation_token)  # type: ignore[reportPrivateUsage]
+    assert [result.content for _, result in results] == ["fetched 0", "fetched 1"]
+    assert cancellation_token._callbacks == []  # type: ignore[reportPrivateUsage]
+
+    # The limits are part of the configuration.
+    agent = AssistantAgent(
+        "tool_use_agent",
+        model_client=model_client,
+        tools=[_pass_function],
+        max_concurrent_tool_calls=3,
+        tool_concurrency_limits={"_pass_function": 2},
+        tool_call_timeouts={"_pass_function": 0.2},
+    )
+    config = agent.dump_component()
+    assert config.config["tool_concurrency_limits"] == {"_pass_function": 2}
+    loaded_agent = AssistantAgent.load_component(config)
+    assert loaded_agent._tool_call_scheduler.timeouts == {"_pass_function": 0.2}  # type: ignore[reportPrivateUsage]
+    assert loaded_agent._tool_call_scheduler.max_concurrent_calls == 3  # type: ignore[reportPrivateUsage]
+
+    with pytest.raises(ValueError):
+        AssistantAgent("agent", model_client=model_client, tools=[fetch], tool_concurrency_limits={"unknown": 1})
+    with pytest.raises(ValueError):
+        AssistantAgent("agent", model_client=model_client, tools=[fetch], tool_call_timeout=0)
+
+
 @pytest.mark.asyncio
 async def test_output_format() -> None:
     class AgentResponse(BaseModel):
@@ -1077,6 +1182,37 @@ class BadMemory:
     assert isinstance(ListMemory(), Memory)
 
 
+@pytest.mark.asyncio
+async def test_run_with_prefix_stable_memory() -> None:
+    model_client = ReplayChatCompletionClient(["Response 1", "Response 2"])
+    memory = ListMemory()
+    await memory.add(MemoryContent(content="User likes pizza.", mime_type=MemoryMimeType.TEXT))
+    agent = AssistantAgent(
+        "test_agent", model_client=model_client, memory=[memory], prefix_stable_memory=True, system_message="Hi."
+    )
+
+    result = await agent.run(task="task 1")
+    assert isinstance(result.messages[1], MemoryQueryEvent)
+    await agent.run(task="task 2")
+
+    first_request = model_client.create_calls[0]["messages"]
+    second_request = model_client.create_calls[1]["messages"]
+    # The memory follows the model context as a user message, and is not kept in the model context.
+    assert isinstance(first_request[-1], UserMessage) and first_request[-1].source == "memory"
+    assert "User likes pizza." in first_request[-1].content
+    assert second_request[: len(first_request) - 1] == first_request[:-1]
+    assert isinstance(second_request[-1], UserMessage) and second_request[-1].source == "memory"
+    assert [type(message) for message in await agent.model_context.get_messages()] == [
+        UserMessage,
+        AssistantMessage,
+        UserMessage,
+        AssistantMessage,
+    ]
+
+    loaded = AssistantAgent.load_component(agent.dump_component())
+    assert loaded._prefix_stable_memory  # pyright: ignore[reportPrivateUsage]
+
+
 @pytest.mark.asyncio
 async def test_assistant_agent_declarative() -> None:
     model_client = ReplayChatCompletionClient(
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import os
 import tempfile
 from typing import Any, AsyncGenerator, List, Mapping, Sequence
 
@@ -34,12 +35,25 @@
     ToolCallRequestEvent,
     ToolCallSummaryMessage,
 )
-from autogen_agentchat.teams import MagenticOneGroupChat, RoundRobinGroupChat, SelectorGroupChat, Swarm
+from autogen_agentchat.teams import (
+    MagenticOneGroupChat,
+    ParallelGroupChat,
+    RoundRobinGroupChat,
+    SelectorGroupChat,
+    Swarm,
+)
 from autogen_agentchat.teams._group_chat._round_robin_group_chat import RoundRobinGroupChatManager
 from autogen_agentchat.teams._group_chat._selector_group_chat import SelectorGroupChatManager
 from autogen_agentchat.teams._group_chat._swarm_group_chat import SwarmGroupChatManager
 from autogen_agentchat.ui import Console
-from autogen_core import AgentId, AgentRuntime, CancellationToken, FunctionCall, SingleThreadedAgentRuntime
+from autogen_core import (
+    AgentId,
+    AgentRuntime,
+    CancellationToken,
+    FunctionCall,
+    QueueOverflowPolicy,
+    SingleThreadedAgentRuntime,
+)
 from autogen_core.models import (
     AssistantMessage,
     CreateResult,
@@ -441,6 +455,76 @@ async def test_round_robin_group_chat_state(task: TaskType, runtime: AgentRuntim
     assert manager_1._message_thread == manager_2._message_thread  # pyright: ignore
 
 
+@pytest.mark.asyncio
+async def test_round_robin_group_chat_spilled_message_thread(runtime: AgentRuntime | None) -> None:
+    with tempfile.TemporaryDirectory() as spill_dir:
+        agents = [_EchoAgent(f"agent{i}", description=f"echo agent {i}") for i in range(3)]
+        team1 = RoundRobinGroupChat(
+            participants=[*agents],
+            termination_condition=MaxMessageTermination(20),
+            runtime=runtime,
+            message_thread_window=4,
+            message_thread_spill_dir=spill_dir,
+        )
+        result = await team1.run(task="task")
+        assert len(result.messages) == 20
+        state = await team1.save_state()
+        manager_state = state["agent_states"]["RoundRobinGroupChatManager"]
+        # Only the most recent messages are dumped, the others are referenced in the log.
+        assert len(manager_state["message_thread"]) <= 4
+        assert manager_state["message_log"]["path"].startswith(spill_dir)
+        json.dumps(state)
+
+        team2 = RoundRobinGroupChat(
+            participants=[_EchoAgent(f"agent{i}", description=f"echo agent {i}") for i in range(3)],
+            termination_condition=MaxMessageTermination(20),
+            runtime=runtime,
+            message_thread_window=4,
+            message_thread_spill_dir=spill_dir,
+        )
+        await team2.load_state(state)
+        manager_1 = await team1._runtime.try_get_underlying_agent_instance(  # pyright: ignore
+            AgentId(f"{team1._group_chat_manager_name}_{team1._team_id}", team1._team_id),  # pyright: ignore
+            RoundRobinGroupChatManager,  # pyright: ignore
+        )  # pyright: ignore
+        manager_2 = await team2._runtime.try_get_underlying_agent_instance(  # pyright: ignore
+            AgentId(f"{team2._group_chat_manager_name}_{team2._team_id}", team2._team_id),  # pyright: ignore
+            RoundRobinGroupChatManager,  # pyright: ignore
+        )  # pyright: ignore
+        assert len(manager_1._message_thread) == 20  # pyright: ignore
+        assert manager_1._message_thread == manager_2._message_thread  # pyright: ignore
+        assert list(manager_2._message_thread) == result.messages  # pyright: ignore
+
+        # The loaded team continues the conversation.
+        result = await team2.run()
+        assert len(result.messages) == 20
+        assert len(manager_2._message_thread) == 40  # pyright: ignore
+
+    with pytest.raises(ValueError):
+        RoundRobinGroupChat(participants=[*agents], message_thread_window=0)
+
+
+@pytest.mark.asyncio
+async def test_round_robin_group_chat_temporary_logs_removed_on_reset(runtime: AgentRuntime | None) -> None:
+    agents = [_EchoAgent(f"agent{i}", description=f"echo agent {i}") for i in range(3)]
+    team = RoundRobinGroupChat(
+        participants=[*agents],
+        termination_condition=MaxMessageTermination(20),
+        runtime=runtime,
+        message_thread_window=4,
+    )
+    await team.run(task="task")
+    state = await team.save_state()
+    path = state["agent_states"]["RoundRobinGroupChatManager"]["message_log"]["path"]
+    assert os.path.exists(path)
+
+    await team.reset()
+    assert not os.path.exists(path)
+    # The team spills to a new temporary log when it runs again.
+    result = await team.run(task="task")
+    assert len(result.messages) == 20
+
+
 @pytest.mark.asyncio
 async def test_round_robin_group_chat_with_tools(runtime: AgentRuntime | None) -> None:
     model_client = ReplayChatCompletionClient(
@@ -615,6 +699,51 @@ async def test_round_robin_group_chat_max_turn(runtime: AgentRuntime | None) ->
     assert result.stop_reason is not None
 
 
+@pytest.mark.asyncio
+async def test_round_robin_group_chat_bounded_output_queue(runtime: AgentRuntime | None) -> None:
+    agent_1 = _EchoAgent("agent_1", description="echo agent 1")
+    agent_2 = _EchoAgent("agent_2", description="echo agent 2")
+    team = RoundRobinGroupChat(
+        participants=[agent_1, agent_2],
+        max_turns=6,
+        runtime=runtime,
+        output_queue_max_size=1,
+    )
+    sources: List[str] = []
+    async for message in team.run_stream(task="Write a program that prints 'Hello, world!'"):
+        if isinstance(message, TaskResult):
+            assert message.stop_reason is not None
+        else:
+            sources.append(message.source)
+            # Slow consumer: the team is blocked until the message is taken from the queue.
+            await asyncio.sleep(0.01)
+    assert sources == ["user", "agent_1", "agent_2", "agent_1", "agent_2", "agent_1", "agent_2"]
+    assert team._output_message_queue.metrics.high_water_mark == 1  # type: ignore[reportPrivateUsage]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow_policy", ["block", "drop_oldest", "raise"])
+async def test_round_robin_group_chat_task_larger_than_output_queue(
+    runtime: AgentRuntime | None, overflow_policy: QueueOverflowPolicy
+) -> None:
+    agent_1 = _EchoAgent("agent_1", description="echo agent 1")
+    agent_2 = _EchoAgent("agent_2", description="echo agent 2")
+    team = RoundRobinGroupChat(
+        participants=[agent_1, agent_2],
+        max_turns=2,
+        runtime=runtime,
+        output_queue_max_size=1,
+        output_queue_overflow_policy=overflow_policy,
+    )
+    task: List[BaseChatMessage] = [TextMessage(content=f"Task {i}", source="user") for i in range(3)]
+    # The task messages are drained while the team starts, and are never dropped or rejected.
+    result = await asyncio.wait_for(team.run(task=task), timeout=10)
+    assert result.messages[:3] == task
+    assert result.stop_reason == "Maximum number of turns 2 reached."
+    if overflow_policy == "block":
+        assert [message.source for message in result.messages[3:]] == ["agent_1", "agent_2"]
+
+
 @pytest.mark.asyncio
 async def test_round_robin_group_chat_cancellation(runtime: AgentRuntime | None) -> None:
     agent_1 = _EchoAgent("agent_1", description="echo agent 1")
@@ -698,6 +827,53 @@ async def test_selector_group_chat(runtime: AgentRuntime | None) -> None:
     assert result2 == result
 
 
+@pytest.mark.asyncio
+async def test_selector_group_chat_history(runtime: AgentRuntime | None) -> None:
+    model_client = ReplayChatCompletionClient(["agent2", "agent1", "agent2", "agent1"])
+    agent1 = _EchoAgent("agent1", description="echo agent 1")
+    agent2 = _EchoAgent("agent2", description="echo   agent\n 2")
+    team = SelectorGroupChat(
+        participants=[agent1, agent2],
+        model_client=model_client,
+        max_turns=2,
+        selector_prompt="{roles}|{history}",
+        allow_repeated_speaker=True,
+        runtime=runtime,
+    )
+
+    await team.run(task="task")
+    await team.run(task="next")
+    prompts = [call["messages"][0].content for call in model_client.create_calls]
+    roles = "agent1: echo agent 1\nagent2: echo agent 2"
+    assert prompts == [
+        f"{roles}|user: task\n\n",
+        f"{roles}|user: task\n\n\nagent2: task\n\n",
+        f"{roles}|user: task\n\n\nagent2: task\n\n\nagent1: task\n\n\nuser: next\n\n",
+        f"{roles}|user: task\n\n\nagent2: task\n\n\nagent1: task\n\n\nuser: next\n\n\nagent2: task\n\n",
+    ]
+
+    # The history is rendered again after a reset.
+    model_client.reset()
+    await team.reset()
+    await team.run(task="other")
+    assert model_client.create_calls[-2]["messages"][0].content == f"{roles}|user: other\n\n"
+
+    # Only the most recent messages that fit in the limit are included.
+    model_client = ReplayChatCompletionClient(["agent2", "agent1", "agent2"])
+    team = SelectorGroupChat(
+        participants=[agent1, agent2],
+        model_client=model_client,
+        max_turns=3,
+        selector_prompt="{history}",
+        allow_repeated_speaker=True,
+        selector_history_token_limit=model_client.count_tokens([UserMessage(content="user: a b c", source="user")]),
+        runtime=runtime,
+    )
+    await team.run(task="a b c")
+    prompts = [call["messages"][0].content for call in model_client.create_calls]
+    assert prompts == ["user: a b c\n\n", "agent2: a b c\n\n", "agent1: a b c\n\n"]
+
+
 @pytest.mark.asyncio
 async def test_selector_group_chat_with_team_event(runtime: AgentRuntime | None) -> None:
     model_client = ReplayChatCompletionClient(
@@ -1066,6 +1242,163 @@ def _candidate_func(messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> Lis
     )
 
 
+class _SlowEchoAgent(_EchoAgent):
+    def __init__(self, name: str, description: str, delay: float) -> None:
+        super().__init__(name, description)
+        self.delay = delay
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        await asyncio.sleep(self.delay)
+        response = await super().on_messages(messages, cancellation_token)
+        assert isinstance(response.chat_message, TextMessage)
+        return Response(
+            chat_message=TextMessage(content=f"{self.name}: {response.chat_message.content}", source=self.name)
+        )
+
+
+async def _parallel_thread_sources(team: ParallelGroupChat) -> List[str]:
+    state = await team.save_state()
+    manager_state = next(
+        value for key, value in state["agent_states"].items() if key.startswith("ParallelGroupChatManager")
+    )
+    assert manager_state["type"] == "ParallelManagerState"
+    return [message["source"] for message in manager_state["message_thread"]]
+
+
+@pytest.mark.asyncio
+async def test_parallel_group_chat(runtime: AgentRuntime | None) -> None:
+    agents = [_SlowEchoAgent(f"agent{i}", description=f"agent {i}", delay=0.3 - 0.1 * i) for i in range(3)]
+    team = ParallelGroupChat(participants=[*agents], max_turns=2, runtime=runtime)
+    start = asyncio.get_running_loop().time()
+    result = await team.run(task="task")
+    # The participants respond at the same time in each round.
+    assert asyncio.get_running_loop().time() - start < 1.2
+    assert result.stop_reason is not None and "Maximum number of turns 2 reached" in result.stop_reason
+    assert all(agent.total_messages == 2 for agent in agents)
+    # The stream is in the order of completion, the thread in the order of the participants.
+    assert [message.source for message in result.messages] == ["user"] + ["agent2", "agent1", "agent0"] * 2
+    assert sorted(
+        message.to_model_text() for message in result.messages[1:4] if isinstance(message, BaseChatMessage)
+    ) == [
+        "agent0: task",
+        "agent1: task",
+        "agent2: task",
+    ]
+    assert await _parallel_thread_sources(team) == ["user"] + ["agent0", "agent1", "agent2"] * 2
+
+    # The termination condition sees the whole round.
+    await team.reset()
+    team = ParallelGroupChat(participants=[*agents], termination_condition=MaxMessageTermination(3), runtime=runtime)
+    result = await team.run(task="task")
+    assert len(result.messages) == 4
+    assert result.stop_reason is not None and "Maximum number of messages 3 reached" in result.stop_reason
+
+
+@pytest.mark.asyncio
+async def test_parallel_group_chat_join_policies(runtime: AgentRuntime | None) -> None:
+    fast = _SlowEchoAgent("fast", description="fast agent", delay=0.0)
+    medium = _SlowEchoAgent("medium", description="medium agent", delay=0.1)
+    slow = _SlowEchoAgent("slow", description="slow agent", delay=1.0)
+
+    # The round is joined once the first k participants respond, the late responses are left out.
+    team = ParallelGroupChat(
+        participants=[slow, medium, fast], max_turns=2, join_policy="first_k", k=2, runtime=runtime
+    )
+    result = await team.run(task="task")
+    assert [message.source for message in result.messages] == ["user", "fast", "medium", "fast", "medium"]
+    assert await _parallel_thread_sources(team) == ["user", "medium", "fast", "medium", "fast"]
+
+    # The quorum waits for every participant until the timeout, then for k of them.
+    team = ParallelGroupChat(
+        participants=[slow, medium, fast], max_turns=1, join_policy="quorum", k=2, join_timeout=0.3, runtime=runtime
+    )
+    result = await team.run(task="task")
+    assert await _parallel_thread_sources(team) == ["user", "medium", "fast"]
+
+    team = ParallelGroupChat(
+        participants=[slow, medium, fast], max_turns=1, join_policy="quorum", k=2, join_timeout=5, runtime=runtime
+    )
+    result = await team.run(task="task")
+    assert await _parallel_thread_sources(team) == ["user", "slow", "medium", "fast"]
+
+    with pytest.raises(ValueError):
+        ParallelGroupChat(participants=[slow, fast], join_policy="first_k", k=3)
+    with pytest.raises(ValueError):
+        ParallelGroupChat(participants=[slow, fast], join_policy="quorum", k=1)
+    with pytest.raises(ValueError):
+        ParallelGroupChat(participants=[slow, fast], k=1)
+
+    # The configuration is preserved.
+    model_client = ReplayChatCompletionClient(["response"])
+    team = ParallelGroupChat(
+        participants=[
+            AssistantAgent("agent1", model_client=model_client),
+            AssistantAgent("agent2", model_client=model_client),
+        ],
+        termination_condition=MaxMessageTermination(4),
+        join_policy="quorum",
+        k=1,
+        join_timeout=10,
+    )
+    config = team.dump_component()
+    assert config.provider == "autogen_agentchat.teams.ParallelGroupChat"
+    assert ParallelGroupChat.load_component(config).dump_component() == config
+
+
+@pytest.mark.asyncio
+async def test_parallel_group_chat_skips_busy_speakers(runtime: AgentRuntime | None) -> None:
+    fast = _SlowEchoAgent("fast", description="fast agent", delay=0.01)
+    slow = _SlowEchoAgent("slow", description="slow agent", delay=0.3)
+    team = ParallelGroupChat(participants=[fast, slow], max_turns=5, join_policy="first_k", k=1, runtime=runtime)
+    start = asyncio.get_running_loop().time()
+    result = await team.run(task="task")
+    # The slow participant is not requested again while it responds to the first round, so the run
+    # only waits for one of its responses.
+    assert asyncio.get_running_loop().time() - start < 0.6
+    # With a runtime of the caller, the run does not wait for the slow participant.
+    await asyncio.sleep(0.7)
+    assert slow.total_messages == 1
+    assert fast.total_messages == 5
+    # Its response arrives after the run ended, so it is not streamed.
+    assert [message.source for message in result.messages] == ["user"] + ["fast"] * 5
+
+
+class _ProxyEchoAgent(_EchoAgent):
+    """An agent that responds on behalf of another source."""
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        response = await super().on_messages(messages, cancellation_token)
+        assert isinstance(response.chat_message, TextMessage)
+        return Response(chat_message=TextMessage(content=response.chat_message.content, source="proxy"))
+
+
+@pytest.mark.asyncio
+async def test_parallel_group_chat_speakers_and_timeouts(runtime: AgentRuntime | None) -> None:
+    # Responses are attributed to the participant that sent them, whatever their source.
+    agents = [_ProxyEchoAgent(f"agent{i}", description=f"agent {i}") for i in range(2)]
+    team = ParallelGroupChat(participants=[*agents], max_turns=2, runtime=runtime)
+    result = await team.run(task="task")
+    assert [message.source for message in result.messages] == ["user"] + ["proxy"] * 4
+    assert all(agent.total_messages == 2 for agent in agents)
+
+    def join_timeouts() -> List[asyncio.Task[Any]]:
+        return [task for task in asyncio.all_tasks() if "_expire_round" in repr(task.get_coro())]
+
+    # The join timeout of the round is cancelled when the run ends with an error.
+    slow = _SlowEchoAgent("slow", description="slow agent", delay=0.1)
+    team = ParallelGroupChat(
+        participants=[slow, _FlakyAgent("flaky", description="flaky agent")],
+        join_policy="quorum",
+        k=1,
+        join_timeout=10,
+        runtime=runtime,
+    )
+    with pytest.raises(RuntimeError, match="I am a flaky agent..."):
+        await team.run(task="task")
+    await asyncio.sleep(0)
+    assert join_timeouts() == []
+
+
 class _HandOffAgent(BaseChatAgent):
     def __init__(self, name: str, description: str, next_agent: str) -> None:
         super().__init__(name, description)
@@ -1584,6 +1917,7 @@ async def test_declarative_groupchats_with_config(runtime: AgentRuntime | None)
         max_turns=10,
         selector_prompt=selector_prompt,
         allow_repeated_speaker=True,
+        selector_history_token_limit=1000,
         runtime=runtime,
     )
     selector_config = selector.dump_component()
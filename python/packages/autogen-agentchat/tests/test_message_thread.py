@@ -0,0 +1,124 @@
+import gc
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, MessageFactory, StopMessage, TextMessage
+from autogen_agentchat.state import MessageLogState
+from autogen_agentchat.teams import MessageThread
+
+
+def _messages(start: int, stop: int) -> List[BaseAgentEvent | BaseChatMessage]:
+    return [TextMessage(content=f"message {i}", source=f"agent{i % 2}") for i in range(start, stop)]
+
+
+def test_message_thread_spills_to_log(tmp_path: Path) -> None:
+    path = tmp_path / "thread.jsonl"
+    thread: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(MessageFactory(), window=4, path=path)
+    messages = _messages(0, 10)
+    for message in messages[:5]:
+        thread.append(message)
+    # Once the window is exceeded, all but the most recent half of the messages are spilled at once.
+    assert thread.spilled == 3
+    assert len(path.read_text().splitlines()) == 3
+    thread.extend(messages[5:])
+    assert thread.spilled + len(thread.dump()) == len(thread) == 10
+    assert len(thread.dump()) <= 4
+
+    # The spilled messages are read back lazily.
+    assert list(thread) == messages
+    assert list(reversed(thread)) == list(reversed(messages))
+    assert thread[0] == messages[0]
+    assert thread[-1] is messages[-1]
+    assert thread[2:7] == messages[2:7]
+    assert thread[::-3] == messages[::-3]
+    assert thread == messages
+    with pytest.raises(IndexError):
+        thread[10]
+
+    # The log only references the spilled messages, in a single run of lines.
+    log = thread.log
+    assert log is not None and log.path == str(path)
+    assert log.segments == [(0, thread.spilled)]
+
+
+def test_message_thread_without_window() -> None:
+    thread: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(MessageFactory())
+    thread.extend(_messages(0, 100))
+    assert thread.spilled == 0 and thread.log is None and thread.path is None
+    assert len(thread.dump()) == 100
+
+    with pytest.raises(ValueError):
+        MessageThread(MessageFactory(), window=0)
+
+
+def test_message_thread_default_log(tmp_path: Path) -> None:
+    thread: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(MessageFactory(), window=1)
+    thread.extend(_messages(0, 3))
+    assert thread.path is not None and thread.path.endswith(".jsonl")
+    assert thread == _messages(0, 3)
+
+    # The temporary log is deleted when the thread is cleared.
+    path = thread.path
+    thread.clear()
+    assert thread.path is None and not os.path.exists(path)
+    thread.extend(_messages(0, 3))
+    assert thread.path is not None and thread.path != path and thread == _messages(0, 3)
+
+    # A state saved from the temporary log can be loaded back into the same thread.
+    path, dumped, log = thread.path, thread.dump(), thread.log
+    thread.load([MessageFactory().create(message) for message in dumped], log)
+    assert thread.path == path and thread == _messages(0, 3)
+
+    # The temporary log is deleted when the thread loads another log or is garbage collected.
+    other_path = tmp_path / "other.jsonl"
+    other: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(MessageFactory(), window=1, path=other_path)
+    other.extend(_messages(10, 13))
+    thread.load([MessageFactory().create(message) for message in other.dump()], other.log)
+    assert thread.path == str(other_path) and not os.path.exists(path)
+    thread.clear()
+    assert other_path.exists()
+
+    thread = MessageThread(MessageFactory(), window=1)
+    thread.extend(_messages(0, 3))
+    assert thread.path is not None
+    path = thread.path
+    del thread
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_message_thread_save_and_load(tmp_path: Path) -> None:
+    path = tmp_path / "thread.jsonl"
+    thread: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(MessageFactory(), window=2, path=path)
+    messages: List[BaseAgentEvent | BaseChatMessage] = [*_messages(0, 6), StopMessage(content="stop", source="agent1")]
+    thread.extend(messages)
+    dumped, log = thread.dump(), thread.log
+    assert log is not None and len(dumped) <= 2
+    # The saved state only holds the messages kept in memory.
+    log = MessageLogState.model_validate(json.loads(log.model_dump_json()))
+
+    # The log is never rewritten: a cleared thread appends after the messages it forgot.
+    thread.clear()
+    assert len(thread) == 0 and thread.log is None
+    thread.extend(_messages(10, 15))
+    assert thread == _messages(10, 15)
+    assert thread.log is not None and thread.log.segments[0][0] > 0
+
+    message_factory = MessageFactory()
+    loaded: MessageThread[BaseAgentEvent | BaseChatMessage] = MessageThread(message_factory, window=2)
+    loaded.load([message_factory.create(message) for message in dumped], log)
+    assert loaded.path == str(path)
+    assert loaded == messages
+
+    # A loaded thread continues the log, so its messages are no longer consecutive lines.
+    loaded.extend(_messages(20, 24))
+    assert loaded == messages + _messages(20, 24)
+    assert loaded.log is not None and len(loaded.log.segments) == 2
+    # The original thread is unaffected.
+    assert thread == _messages(10, 15)
+
+    with pytest.raises(ValueError):
+        MessageThread(message_factory).load([], MessageLogState(path=str(path), segments=[(0, 1000)]))
@@ -1,7 +1,8 @@
 import asyncio
+from typing import ClassVar, List
 
 import pytest
-from autogen_agentchat.base import TerminatedException
+from autogen_agentchat.base import OrTerminationCondition, TerminatedException, TerminationCondition
 from autogen_agentchat.conditions import (
     ExternalTermination,
     FunctionCallTermination,
@@ -9,12 +10,15 @@
     MaxMessageTermination,
     SourceMatchTermination,
     StopMessageTermination,
+    TerminationEngine,
     TextMentionTermination,
     TextMessageTermination,
     TimeoutTermination,
     TokenUsageTermination,
 )
 from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
     HandoffMessage,
     StopMessage,
     TextMessage,
@@ -375,3 +379,80 @@ async def test_function_call_termination() -> None:
     )
     assert not termination.terminated
     await termination.reset()
+
+
+def _termination_tree() -> TerminationCondition:
+    mentions = [TextMentionTermination(f"WORD{i}") for i in range(20)]
+    return (
+        (TextMentionTermination("APPROVE", sources=["critic"]) & SourceMatchTermination(["writer"]))
+        | (HandoffTermination("user") & MaxMessageTermination(6))
+        | (StopMessageTermination() | FunctionCallTermination("finish") | TextMessageTermination("user"))
+        | OrTerminationCondition(*mentions)
+        | TextMentionTermination("DONE")
+    )
+
+
+_DELTAS: List[List[BaseAgentEvent | BaseChatMessage]] = [
+    [TextMessage(content="draft", source="writer")],
+    [TextMessage(content="I APPROVE", source="writer"), HandoffMessage(target="user", source="critic", content="")],
+    [TextMessage(content="APPROVE", source="critic")],
+    [TextMessage(content="nothing", source="critic")] * 3,
+    [
+        ToolCallExecutionEvent(
+            content=[FunctionExecutionResult(content="", name="finish", call_id="1", is_error=False)],
+            source="writer",
+        )
+    ],
+    [TextMessage(content="WORD1 WORD12", source="writer"), TextMessage(content="DONE", source="critic")],
+    [HandoffMessage(target="user", source="writer", content="")],
+]
+
+
+@pytest.mark.asyncio
+async def test_termination_engine() -> None:
+    # The engine reaches the same results as the termination condition, whatever the order of the deltas.
+    for start in range(len(_DELTAS)):
+        deltas = _DELTAS[start:] + _DELTAS[:start]
+        expected: List[str | None] = []
+        condition = _termination_tree()
+        for delta in deltas:
+            stop_message = await condition(delta)
+            expected.append(stop_message.content if stop_message is not None else None)
+            if stop_message is not None:
+                await condition.reset()
+
+        condition = _termination_tree()
+        engine = TerminationEngine(condition)
+        for delta, expected_content in zip(deltas, expected, strict=True):
+            stop_message = await engine(delta)
+            assert (stop_message.content if stop_message is not None else None) == expected_content
+            assert condition.terminated == (stop_message is not None)
+            if stop_message is not None:
+                await condition.reset()
+
+    # A terminated condition raises.
+    condition = TextMentionTermination("DONE")
+    engine = TerminationEngine(condition)
+    assert await engine([TextMessage(content="DONE", source="user")]) is not None
+    with pytest.raises(TerminatedException):
+        await engine([])
+
+
+@pytest.mark.asyncio
+async def test_termination_engine_renders_messages_once() -> None:
+    class _CountingMessage(TextMessage):
+        rendered: ClassVar[int] = 0
+
+        def to_text(self) -> str:
+            _CountingMessage.rendered += 1
+            return super().to_text()
+
+    condition = OrTerminationCondition(*[TextMentionTermination(f"WORD{i}") for i in range(30)])
+    engine = TerminationEngine(condition)
+    delta = [_CountingMessage(content=f"message {i}", source="agent") for i in range(5)]
+    assert await engine(delta) is None
+    assert _CountingMessage.rendered == 5
+
+    _CountingMessage.rendered = 0
+    assert await condition(delta) is None
+    assert _CountingMessage.rendered == 150
@@ -10,7 +10,8 @@
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
 from ._base_agent import BaseAgent
-from ._cache_store import CacheStore, InMemoryStore
+from ._bounded_queue import BoundedQueue, QueueMetrics, QueueOverflowPolicy
+from ._cache_store import AsyncCacheStore, CacheStore, CacheStoreMetrics, InMemoryStore
 from ._cancellation_token import CancellationToken
 from ._closure_agent import ClosureAgent, ClosureContext
 from ._component_config import (
@@ -56,6 +57,7 @@
     UnknownPayload,
     try_get_known_serializers_for_type,
 )
+from ._sharded_agent_runtime import ShardedAgentRuntime
 from ._single_threaded_agent_runtime import SingleThreadedAgentRuntime
 from ._subscription import Subscription
 from ._subscription_context import SubscriptionInstantiationContext
@@ -86,7 +88,9 @@
     "AgentMetadata",
     "AgentRuntime",
     "BaseAgent",
+    "AsyncCacheStore",
     "CacheStore",
+    "CacheStoreMetrics",
     "InMemoryStore",
     "CancellationToken",
     "AgentInstantiationContext",
@@ -116,6 +120,10 @@
     "JSON_DATA_CONTENT_TYPE",
     "PROTOBUF_DATA_CONTENT_TYPE",
     "SingleThreadedAgentRuntime",
+    "ShardedAgentRuntime",
+    "BoundedQueue",
+    "QueueMetrics",
+    "QueueOverflowPolicy",
     "ROOT_LOGGER_NAME",
     "EVENT_LOGGER_NAME",
     "TRACE_LOGGER_NAME",
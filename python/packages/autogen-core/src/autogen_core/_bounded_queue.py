@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Literal, TypeVar
+
+from .logging import QueueMetricsEvent
+
+if sys.version_info >= (3, 13):
+    from asyncio import Queue as _ShutdownQueue
+else:
+    from ._queue import Queue as _ShutdownQueue  # type: ignore
+
+event_logger = logging.getLogger("autogen_core.events")
+
+T = TypeVar("T")
+
+QueueOverflowPolicy = Literal["block", "drop_oldest", "raise"]
+"""What a bounded queue does when an item is put while it is full.
+
+* ``"block"``: the sender waits until a consumer frees a slot. This applies backpressure to the producer.
+* ``"drop_oldest"``: the oldest queued item is discarded to make room for the new item.
+* ``"raise"``: :class:`asyncio.QueueFull` is raised to the sender.
+"""
+
+_OVERFLOW_POLICIES = ("block", "drop_oldest", "raise")
+
+
+@dataclass
+class QueueMetrics:
+    """A snapshot of the metrics of a :class:`BoundedQueue`."""
+
+    name: str
+    maxsize: int
+    depth: int
+    high_water_mark: int
+    dropped: int
+    rejected: int
+    blocked_puts: int
+    total_put_wait_seconds: float
+    max_put_wait_seconds: float
+
+
+class _BoundedQueueMixin(Generic[T]):
+    """Overflow policy and metrics shared by the bounded queue classes.
+
+    It relies only on the public queue interface so it can be combined with both
+    :class:`asyncio.Queue` and the shutdown-capable queue used by the runtime on Python < 3.13."""
+
+    def _init_bounded(
+        self,
+        name: str,
+        maxsize: int,
+        overflow_policy: QueueOverflowPolicy,
+        on_drop: Callable[[T], None] | None,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative.")
+        if overflow_policy not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self._name = name
+        self._overflow_policy: QueueOverflowPolicy = overflow_policy
+        self._on_drop = on_drop
+        self._high_water_mark = 0
+        # The depth at which the next high-water-mark event is logged, doubled every time it is reached.
+        self._next_reported_depth = 1
+        self._dropped = 0
+        self._rejected = 0
+        self._blocked_puts = 0
+        self._total_put_wait = 0.0
+        self._max_put_wait = 0.0
+
+    @property
+    def name(self) -> str:
+        """The name used to identify the queue in metric events."""
+        return self._name
+
+    @property
+    def overflow_policy(self) -> QueueOverflowPolicy:
+        """The policy applied when an item is put while the queue is full."""
+        return self._overflow_policy
+
+    @property
+    def metrics(self) -> QueueMetrics:
+        """The current metrics of the queue."""
+        return QueueMetrics(
+            name=self._name,
+            maxsize=self.maxsize,
+            depth=self.qsize(),
+            high_water_mark=self._high_water_mark,
+            dropped=self._dropped,
+            rejected=self._rejected,
+            blocked_puts=self._blocked_puts,
+            total_put_wait_seconds=self._total_put_wait,
+            max_put_wait_seconds=self._max_put_wait,
+        )
+
+    def log_metrics(self, reason: str = "snapshot") -> None:
+        """Log the current metrics of the queue as a :class:`~autogen_core.logging.QueueMetricsEvent`."""
+        if not event_logger.isEnabledFor(logging.INFO):
+            return
+        metrics = self.metrics
+        event_logger.info(
+            QueueMetricsEvent(
+                queue_name=metrics.name,
+                reason=reason,
+                depth=metrics.depth,
+                maxsize=metrics.maxsize,
+                high_water_mark=metrics.high_water_mark,
+                dropped=metrics.dropped,
+                rejected=metrics.rejected,
+                blocked_puts=metrics.blocked_puts,
+                total_put_wait_seconds=metrics.total_put_wait_seconds,
+                max_put_wait_seconds=metrics.max_put_wait_seconds,
+            )
+        )
+
+    async def put(self, item: T) -> None:
+        if self._overflow_policy != "block" or not self.full():
+            self.put_nowait(item)
+            return
+        await self.put_blocking(item)
+
+    async def put_blocking(self, item: T) -> None:
+        """Put an item, waiting for a free slot if the queue is full whatever the overflow policy.
+        For items that must not be dropped or rejected while a consumer is draining the queue."""
+        if not self.full():
+            self.put_nowait(item)
+            return
+        start = time.perf_counter()
+        await super().put(item)  # type: ignore[misc]
+        waited = time.perf_counter() - start
+        self._blocked_puts += 1
+        self._total_put_wait += waited
+        self._max_put_wait = max(self._max_put_wait, waited)
+        self.log_metrics("blocked")
+
+    def put_nowait(self, item: T) -> None:
+        if self.full():
+            if self._overflow_policy == "drop_oldest":
+                while self.full():
+                    dropped: T = super().get_nowait()  # type: ignore[misc]
+                    self.task_done()
+                    self._dropped += 1
+                    if self._on_drop is not None:
+                        self._on_drop(dropped)
+                self.log_metrics("dropped")
+            elif self._overflow_policy == "raise":
+                self._rejected += 1
+                self.log_metrics("rejected")
+                raise asyncio.QueueFull
+        super().put_nowait(item)  # type: ignore[misc]
+        depth = self.qsize()
+        if depth > self._high_water_mark:
+            self._high_water_mark = depth
+            if depth >= self._next_reported_depth or depth == self.maxsize:
+                while self._next_reported_depth <= depth:
+                    self._next_reported_depth *= 2
+                self.log_metrics("high_water_mark")
+
+    # Declared for type checking, provided by the queue class the mixin is combined with.
+    maxsize: Any
+    full: Callable[[], bool]
+    qsize: Callable[[], int]
+    task_done: Callable[[], None]
+
+
+class BoundedQueue(_BoundedQueueMixin[T], asyncio.Queue[T]):
+    """An :class:`asyncio.Queue` with a selectable overflow policy and metrics.
+
+    The queue tracks its depth, its high-water mark, the number of dropped and
+    rejected items, and how long senders were blocked waiting for a free slot.
+    The metrics are available from :attr:`metrics` and are logged as
+    :class:`~autogen_core.logging.QueueMetricsEvent` to the
+    :data:`~autogen_core.EVENT_LOGGER_NAME` logger whenever the queue overflows
+    and whenever the high-water mark doubles.
+
+    Args:
+        name (str): The name used to identify the queue in metric events.
+        maxsize (int, optional): The maximum number of queued items. 0 means unbounded. Defaults to 0.
+        overflow_policy (QueueOverflowPolicy, optional): What to do when an item is put while the queue is full.
+            Defaults to "block".
+        on_drop (Callable[[T], None], optional): Called with every item discarded by the "drop_oldest" policy.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 0,
+        overflow_policy: QueueOverflowPolicy = "block",
+        on_drop: Callable[[T], None] | None = None,
+    ) -> None:
+        self._init_bounded(name, maxsize, overflow_policy, on_drop)
+        asyncio.Queue.__init__(self, maxsize)  # type: ignore[arg-type]
+
+
+class _BoundedShutdownQueue(_BoundedQueueMixin[T], _ShutdownQueue[T]):  # type: ignore
+    """A :class:`BoundedQueue` that also supports ``shutdown`` on Python < 3.13."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 0,
+        overflow_policy: QueueOverflowPolicy = "block",
+        on_drop: Callable[[T], None] | None = None,
+    ) -> None:
+        self._init_bounded(name, maxsize, overflow_policy, on_drop)
+        _ShutdownQueue.__init__(self, maxsize)  # type: ignore
@@ -1,5 +1,9 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, Optional, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Mapping, Optional, Sequence, TypeVar
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -45,26 +49,200 @@ def set(self, key: str, value: T) -> None:
         ...
 
 
+class AsyncCacheStore(ABC, Generic[T], ComponentBase[BaseModel]):
+    """
+    This protocol defines the asynchronous interface for store/cache operations.
+
+    Stores backed by a network service or by files should implement it so that lookups
+    do not block the event loop. :class:`~autogen_ext.models.cache.ChatCompletionCache`
+    uses this interface in preference to :class:`CacheStore` when a store implements both.
+
+    Sub-classes should handle the lifecycle of underlying storage.
+    """
+
+    component_type = "cache_store"
+
+    @abstractmethod
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        """
+        Retrieve an item from the store.
+
+        Args:
+            key: The key identifying the item in the store.
+            default (optional): The default value to return if the key is not found.
+                                Defaults to None.
+
+        Returns:
+            The value associated with the key if found, else the default value.
+        """
+        ...
+
+    @abstractmethod
+    async def aset(self, key: str, value: T) -> None:
+        """
+        Set an item in the store.
+
+        Args:
+            key: The key under which the item is to be stored.
+            value: The value to be stored in the store.
+        """
+        ...
+
+    async def amget(self, keys: Sequence[str], default: Optional[T] = None) -> List[Optional[T]]:
+        """
+        Retrieve several items from the store.
+
+        The default implementation calls :meth:`aget` for every key concurrently.
+        Stores that support multi-key reads should override it.
+
+        Args:
+            keys: The keys identifying the items in the store.
+            default (optional): The value returned for keys that are not found. Defaults to None.
+
+        Returns:
+            The values associated with the keys, in the same order as the keys.
+        """
+        return list(await asyncio.gather(*(self.aget(key, default) for key in keys)))
+
+    async def amset(self, items: Mapping[str, T]) -> None:
+        """
+        Set several items in the store.
+
+        The default implementation calls :meth:`aset` for every item concurrently.
+        Stores that support multi-key writes should override it.
+
+        Args:
+            items: The values to store, keyed by the keys to store them under.
+        """
+        await asyncio.gather(*(self.aset(key, value) for key, value in items.items()))
+
+
+@dataclass
+class CacheStoreMetrics:
+    """A snapshot of the metrics of an :class:`InMemoryStore`."""
+
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
 class InMemoryStoreConfig(BaseModel):
-    pass
+    max_size: int | None = None
+    ttl: float | None = None
 
 
-class InMemoryStore(CacheStore[T], Component[InMemoryStoreConfig]):
+class InMemoryStore(CacheStore[T], AsyncCacheStore[T], Component[InMemoryStoreConfig]):
+    """
+    A store that keeps the items in a dictionary.
+
+    By default the store is unbounded and items never expire. A long-lived process can bound it
+    with `max_size`, in which case the least recently used item is evicted when a new item does
+    not fit, and with `ttl`, in which case an item is discarded once `ttl` seconds have passed, when it is
+    read or when any item is set. Expired items that are never read again therefore do not accumulate.
+    The number of hits, misses, evictions and expirations is available from :attr:`metrics`.
+
+    Args:
+        max_size (int | None, optional): The maximum number of items. None means unbounded. Defaults to None.
+        ttl (float | None, optional): The number of seconds an item stays valid after it is set.
+            None means items never expire. Defaults to None.
+    """
+
     component_provider_override = "autogen_core.InMemoryStore"
     component_config_schema = InMemoryStoreConfig
 
-    def __init__(self) -> None:
-        self.store: Dict[str, T] = {}
+    def __init__(self, max_size: int | None = None, ttl: float | None = None) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0.")
+        self._max_size = max_size
+        self._ttl = ttl
+        self.store: OrderedDict[str, T] = OrderedDict()
+        # The monotonic time at which each item expires, only used when ttl is set. As all the items
+        # live for the same ttl, the items are in the order in which they expire.
+        self._expires_at: OrderedDict[str, float] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def max_size(self) -> int | None:
+        """The maximum number of items, or None if the store is unbounded."""
+        return self._max_size
+
+    @property
+    def ttl(self) -> float | None:
+        """The number of seconds an item stays valid, or None if items never expire."""
+        return self._ttl
+
+    @property
+    def metrics(self) -> CacheStoreMetrics:
+        """The current metrics of the store."""
+        return CacheStoreMetrics(
+            size=len(self.store),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+        )
 
     def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
-        return self.store.get(key, default)
+        if key not in self.store:
+            self._misses += 1
+            return default
+        if self._ttl is not None and self._expires_at[key] <= time.monotonic():
+            del self.store[key]
+            del self._expires_at[key]
+            self._expirations += 1
+            self._misses += 1
+            return default
+        if self._max_size is not None:
+            self.store.move_to_end(key)
+        self._hits += 1
+        return self.store[key]
 
     def set(self, key: str, value: T) -> None:
+        if self._ttl is not None:
+            now = time.monotonic()
+            self._remove_expired(now)
+            self._expires_at.pop(key, None)
+            self._expires_at[key] = now + self._ttl
         self.store[key] = value
+        if self._max_size is not None:
+            self.store.move_to_end(key)
+            while len(self.store) > self._max_size:
+                evicted, _ = self.store.popitem(last=False)
+                self._expires_at.pop(evicted, None)
+                self._evictions += 1
+
+    def _remove_expired(self, now: float) -> None:
+        while self._expires_at:
+            key, expires_at = next(iter(self._expires_at.items()))
+            if expires_at > now:
+                break
+            del self._expires_at[key]
+            del self.store[key]
+            self._expirations += 1
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return self.get(key, default)
+
+    async def aset(self, key: str, value: T) -> None:
+        self.set(key, value)
+
+    async def amget(self, keys: Sequence[str], default: Optional[T] = None) -> List[Optional[T]]:
+        return [self.get(key, default) for key in keys]
+
+    async def amset(self, items: Mapping[str, T]) -> None:
+        for key, value in items.items():
+            self.set(key, value)
 
     def _to_config(self) -> InMemoryStoreConfig:
-        return InMemoryStoreConfig()
+        return InMemoryStoreConfig(max_size=self._max_size, ttl=self._ttl)
 
     @classmethod
     def _from_config(cls, config: InMemoryStoreConfig) -> Self:
-        return cls()
+        return cls(max_size=config.max_size, ttl=config.ttl)
@@ -14,10 +14,13 @@ def __init__(self) -> None:
     def cancel(self) -> None:
         """Cancel pending async calls linked to this cancellation token."""
         with self._lock:
-            if not self._cancelled:
-                self._cancelled = True
-                for callback in self._callbacks:
-                    callback()
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        # The callbacks are called without holding the lock, so that they can use the token.
+        for callback in callbacks:
+            callback()
 
     def is_cancelled(self) -> bool:
         """Check if the CancellationToken has been used"""
@@ -32,6 +35,15 @@ def add_callback(self, callback: Callable[[], None]) -> None:
             else:
                 self._callbacks.append(callback)
 
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Detach a callback attached with :meth:`add_callback`, once the call it cancels has finished.
+        Does nothing if the callback is not attached."""
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
     def link_future(self, future: Future[Any]) -> Future[Any]:
         """Link a pending async call to a token to allow its cancellation"""
         with self._lock:
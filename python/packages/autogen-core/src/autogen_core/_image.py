@@ -37,10 +37,24 @@ async def from_url(url: str) -> Image:
 
             image = asyncio.run(from_url("https://example.com/image"))
 
+    The base64 encoding and the data URI of the image are computed once and reused, since model clients
+    send the same images with every request of a conversation. Assigning :attr:`image` resets them; an
+    image that is modified in place should be wrapped in a new :class:`Image` instead.
+
     """
 
     def __init__(self, image: PILImage.Image):
-        self.image: PILImage.Image = image.convert("RGB")
+        self.image = image.convert("RGB")
+
+    @property
+    def image(self) -> PILImage.Image:
+        return self._image
+
+    @image.setter
+    def image(self, image: PILImage.Image) -> None:
+        self._image = image
+        self._base64: str | None = None
+        self._data_uri: str | None = None
 
     @classmethod
     def from_pil(cls, pil_image: PILImage.Image) -> Image:
@@ -60,10 +74,12 @@ def from_base64(cls, base64_str: str) -> Image:
         return cls(PILImage.open(BytesIO(base64.b64decode(base64_str))))
 
     def to_base64(self) -> str:
-        buffered = BytesIO()
-        self.image.save(buffered, format="PNG")
-        content = buffered.getvalue()
-        return base64.b64encode(content).decode("utf-8")
+        if self._base64 is None:
+            buffered = BytesIO()
+            self.image.save(buffered, format="PNG")
+            content = buffered.getvalue()
+            self._base64 = base64.b64encode(content).decode("utf-8")
+        return self._base64
 
     @classmethod
     def from_file(cls, file_path: Path) -> Image:
@@ -75,7 +91,9 @@ def _repr_html_(self) -> str:
 
     @property
     def data_uri(self) -> str:
-        return _convert_base64_to_data_uri(self.to_base64())
+        if self._data_uri is None:
+            self._data_uri = _convert_base64_to_data_uri(self.to_base64())
+        return self._data_uri
 
     # Returns openai.types.chat.ChatCompletionContentPartImageParam, which is a TypedDict
     # We don't use the explicit type annotation so that we can avoid a dependency on the OpenAI Python SDK in this package.
@@ -109,8 +127,8 @@ def serialize(value: Image) -> dict[str, Any]:
 
 def _convert_base64_to_data_uri(base64_image: str) -> str:
     def _get_mime_type_from_data_uri(base64_image: str) -> str:
-        # Decode the base64 string
-        image_data = base64.b64decode(base64_image)
+        # Decode the start of the base64 string, which holds the signature of the format
+        image_data = base64.b64decode(base64_image[:24])
         # Check the first few bytes for known signatures
         if image_data.startswith(b"\xff\xd8\xff"):
             return "image/jpeg"
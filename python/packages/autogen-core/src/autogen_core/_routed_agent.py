@@ -3,10 +3,12 @@
 from typing import (
     Any,
     Callable,
+    ClassVar,
     Coroutine,
-    DefaultDict,
+    Dict,
     List,
     Literal,
+    Mapping,
     Protocol,
     Sequence,
     Tuple,
@@ -48,7 +50,6 @@ class MessageHandler(Protocol[AgentT, ReceivesT, ProducesT]):  # type: ignore
     async def __call__(agent_instance: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT: ...
 
 
-# NOTE: this works on concrete types and not inheritance
 # TODO: Use a protocol for the outer function to check checked arg names
 
 
@@ -136,11 +137,14 @@ def decorator(
         if return_types is None:
             raise AssertionError("Return type not found")
 
+        # Subclasses of the target types are accepted, as messages are dispatched along their MRO.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -255,11 +259,14 @@ def decorator(
         if return_types is None:
             raise AssertionError("Return type not found. Please use `None` as the type hint of the return type.")
 
+        # Subclasses of the target types are accepted, as messages are dispatched along their MRO.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> None:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -376,11 +383,14 @@ def decorator(
         if return_types is None:
             raise AssertionError("Return type not found")
 
+        # Subclasses of the target types are accepted, as messages are dispatched along their MRO.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
+
         # Convert target_types to list and stash
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if type(message) not in target_types and not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
@@ -455,20 +465,20 @@ async def handle_event_message(self, message: Message, ctx: MessageContext) -> N
             @rpc(match=lambda message, ctx: message.content == "special")  # type: ignore
             async def handle_special_rpc_message(self, message: MessageWithContent, ctx: MessageContext) -> Response:
                 return Response()
-    """
 
-    def __init__(self, description: str) -> None:
-        # Self is already bound to the handlers
-        self._handlers: DefaultDict[
-            Type[Any],
-            List[MessageHandler[RoutedAgent, Any, Any]],
-        ] = DefaultDict(list)
+    A message is routed to the handlers of its type and of its base classes, most specific type first.
+    The handlers are discovered once per class, when the first instance is created.
+    """
 
-        handlers = self._discover_handlers()
-        for message_handler in handlers:
-            for target_type in message_handler.target_types:
-                self._handlers[target_type].append(message_handler)
+    _dispatch_table_cache: ClassVar[Dict[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]]]
+    _resolved_handlers_cache: ClassVar[Dict[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]]]
 
+    def __init__(self, description: str) -> None:
+        # The dispatch table is built once per class, so constructing an agent does not discover handlers.
+        # Self is not bound to the handlers, they are shared by all instances of the class.
+        cls = type(self)
+        cls._dispatch_table()
+        self._handlers = cls._resolved_handlers_cache
         super().__init__(description)
 
     async def on_message_impl(self, message: Any, ctx: MessageContext) -> Any | None:
@@ -476,13 +486,14 @@ async def on_message_impl(self, message: Any, ctx: MessageContext) -> Any | None
         Do not override this method in subclasses. Instead, add message handlers as methods decorated with
         either the :func:`event` or :func:`rpc` decorator."""
         key_type: Type[Any] = type(message)  # type: ignore
-        handlers = self._handlers.get(key_type)  # type: ignore
-        if handlers is not None:
-            # Iterate over all handlers for this matching message type.
-            # Call the first handler whose router returns True and then return the result.
-            for h in handlers:
-                if h.router(message, ctx):
-                    return await h(self, message, ctx)
+        handlers = self._handlers.get(key_type)
+        if handlers is None:
+            handlers = type(self)._resolve_handlers(key_type)
+        # Iterate over all handlers for this message type, most specific type first.
+        # Call the first handler whose router returns True and then return the result.
+        for h in handlers:
+            if h.router(message, ctx):
+                return await h(self, message, ctx)
         return await self.on_unhandled_message(message, ctx)  # type: ignore
 
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
@@ -501,6 +512,29 @@ def _discover_handlers(cls) -> Sequence[MessageHandler[Any, Any, Any]]:
                     handlers.append(cast(MessageHandler[Any, Any, Any], handler))
         return handlers
 
+    @classmethod
+    def _dispatch_table(cls) -> Mapping[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]]:
+        """Return the handlers of this class keyed by their target types, building the table on first use."""
+        # Looked up in the class dictionary so that subclasses do not share the table of their base class.
+        table = cls.__dict__.get("_dispatch_table_cache")
+        if table is None:
+            handlers_by_type: Dict[Type[Any], List[MessageHandler[Any, Any, Any]]] = {}
+            for message_handler in cls._discover_handlers():
+                for target_type in message_handler.target_types:
+                    handlers_by_type.setdefault(target_type, []).append(message_handler)
+            table = {target_type: tuple(handlers) for target_type, handlers in handlers_by_type.items()}
+            cls._dispatch_table_cache = table
+            cls._resolved_handlers_cache = {}
+        return cast(Mapping[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]], table)
+
+    @classmethod
+    def _resolve_handlers(cls, message_type: Type[Any]) -> Tuple[MessageHandler[Any, Any, Any], ...]:
+        """Return the handlers for a message type along its MRO, most specific type first, and cache the result."""
+        table = cls._dispatch_table()
+        handlers = tuple(h for base in message_type.__mro__ for h in table.get(base, ()))
+        cls._resolved_handlers_cache[message_type] = handlers
+        return handlers
+
     @classmethod
     def _handles_types(cls) -> List[Tuple[Type[Any], List[MessageSerializer[Any]]]]:
         # TODO handle deduplication
@@ -514,5 +548,5 @@ def _handles_types(cls) -> List[Tuple[Type[Any], List[MessageSerializer[Any]]]]:
                 if len(serializers) == 0:
                     raise ValueError(f"No serializers found for type {t}.")
 
-                types.append((t, try_get_known_serializers_for_type(t)))
+                types.append((t, serializers))
         return types
@@ -1,11 +1,15 @@
+import bisect
+import itertools
 from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List, Sequence, Set
+from typing import Awaitable, Callable, DefaultDict, Dict, Iterator, List, Sequence, Set, Tuple, TypeGuard
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_type import AgentType
 from ._subscription import Subscription
 from ._topic import TopicId
+from ._type_prefix_subscription import TypePrefixSubscription
+from ._type_subscription import TypeSubscription
 
 
 async def get_impl(
@@ -29,50 +33,192 @@ async def get_impl(
     return id
 
 
+class _PrefixTrie:
+    """A character trie mapping topic type prefixes to the prefix subscriptions registered for them."""
+
+    def __init__(self) -> None:
+        self._children: Dict[str, _PrefixTrie] = {}
+        self._subscriptions: List[TypePrefixSubscription] = []
+
+    def insert(self, subscription: TypePrefixSubscription) -> None:
+        node = self
+        for char in subscription.topic_type_prefix:
+            node = node._children.setdefault(char, _PrefixTrie())
+        node._subscriptions.append(subscription)
+
+    def remove(self, subscription: TypePrefixSubscription) -> None:
+        path: List[Tuple[_PrefixTrie, str]] = []
+        node = self
+        for char in subscription.topic_type_prefix:
+            path.append((node, char))
+            node = node._children[char]
+        node._subscriptions = [sub for sub in node._subscriptions if sub.id != subscription.id]
+        # Prune branches that no longer hold any subscription.
+        for parent, char in reversed(path):
+            child = parent._children[char]
+            if child._subscriptions or child._children:
+                break
+            del parent._children[char]
+
+    def matches(self, topic_type: str) -> Iterator[TypePrefixSubscription]:
+        """Yield every subscription whose prefix is a prefix of `topic_type`."""
+        node = self
+        yield from node._subscriptions
+        for char in topic_type:
+            child = node._children.get(char)
+            if child is None:
+                return
+            node = child
+            yield from node._subscriptions
+
+
+def _is_indexable_type_subscription(subscription: Subscription) -> TypeGuard[TypeSubscription]:
+    # Subclasses that override matching cannot be indexed by topic type.
+    return isinstance(subscription, TypeSubscription) and type(subscription).is_match is TypeSubscription.is_match
+
+
+def _is_indexable_prefix_subscription(subscription: Subscription) -> TypeGuard[TypePrefixSubscription]:
+    return (
+        isinstance(subscription, TypePrefixSubscription)
+        and type(subscription).is_match is TypePrefixSubscription.is_match
+    )
+
+
 class SubscriptionManager:
+    """Keeps track of subscriptions and resolves the recipients of a topic.
+
+    :class:`~autogen_core.TypeSubscription` entries are indexed by topic type and
+    :class:`~autogen_core.TypePrefixSubscription` entries by a prefix trie; other subscriptions
+    are matched linearly. Recipients are cached per topic and adding or removing a
+    subscription only updates the cached topics it affects.
+    """
+
     def __init__(self) -> None:
-        self._subscriptions: List[Subscription] = []
-        self._seen_topics: Set[TopicId] = set()
-        self._subscribed_recipients: DefaultDict[TopicId, List[AgentId]] = defaultdict(list)
+        # Insertion ordered, the order decides the order of recipients.
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._sequence: Dict[str, int] = {}
+        self._next_sequence = 0
+        self._type_index: DefaultDict[str, List[TypeSubscription]] = defaultdict(list)
+        self._type_keys: Set[Tuple[str, str]] = set()
+        self._prefix_trie = _PrefixTrie()
+        self._prefix_keys: Set[Tuple[str, str]] = set()
+        self._unindexed: List[Subscription] = []
+        # Cached recipients for each topic that has been resolved.
+        self._subscribed_recipients: Dict[TopicId, List[AgentId]] = {}
+        self._seen_topics_by_type: DefaultDict[str, Set[TopicId]] = defaultdict(set)
+        self._seen_topic_types: List[str] = []
 
     @property
     def subscriptions(self) -> Sequence[Subscription]:
-        return self._subscriptions
+        return list(self._subscriptions.values())
 
     async def add_subscription(self, subscription: Subscription) -> None:
-        # Check if the subscription already exists
-        if any(sub == subscription for sub in self._subscriptions):
-            raise ValueError("Subscription already exists")
-
-        self._subscriptions.append(subscription)
-        self._rebuild_subscriptions(self._seen_topics)
+        self.add_subscription_nowait(subscription)
 
     async def remove_subscription(self, id: str) -> None:
-        # Check if the subscription exists
-        if not any(sub.id == id for sub in self._subscriptions):
-            raise ValueError("Subscription does not exist")
+        self.remove_subscription_nowait(id)
 
-        def is_not_sub(x: Subscription) -> bool:
-            return x.id != id
+    async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
+        return self.get_subscribed_recipients_nowait(topic)
 
-        self._subscriptions = list(filter(is_not_sub, self._subscriptions))
+    def add_subscription_nowait(self, subscription: Subscription) -> None:
+        """Add a subscription without suspending, for callers that hold a thread lock."""
+        # Check if the subscription already exists
+        if self._is_duplicate(subscription):
+            raise ValueError("Subscription already exists")
 
-        # Rebuild the subscriptions
-        self._rebuild_subscriptions(self._seen_topics)
+        self._subscriptions[subscription.id] = subscription
+        self._sequence[subscription.id] = self._next_sequence
+        self._next_sequence += 1
+
+        if _is_indexable_type_subscription(subscription):
+            self._type_index[subscription.topic_type].append(subscription)
+            self._type_keys.add((subscription.agent_type, subscription.topic_type))
+            affected = self._seen_topics_by_type.get(subscription.topic_type, set())
+        elif _is_indexable_prefix_subscription(subscription):
+            self._prefix_trie.insert(subscription)
+            self._prefix_keys.add((subscription.agent_type, subscription.topic_type_prefix))
+            affected = self._seen_topics_with_prefix(subscription.topic_type_prefix)
+        else:
+            self._unindexed.append(subscription)
+            affected = set(self._subscribed_recipients.keys())
+
+        # The new subscription has the highest sequence number, so its recipient goes at the
+        # end of every cached list it matches. Lists are replaced rather than mutated as
+        # callers may still be iterating over a list returned earlier.
+        for topic in affected:
+            if subscription.is_match(topic):
+                self._subscribed_recipients[topic] = [
+                    *self._subscribed_recipients[topic],
+                    subscription.map_to_agent(topic),
+                ]
 
-    async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
-        if topic not in self._seen_topics:
-            self._build_for_new_topic(topic)
-        return self._subscribed_recipients[topic]
-
-    # TODO: optimize this...
-    def _rebuild_subscriptions(self, topics: Set[TopicId]) -> None:
-        self._subscribed_recipients.clear()
-        for topic in topics:
-            self._build_for_new_topic(topic)
-
-    def _build_for_new_topic(self, topic: TopicId) -> None:
-        self._seen_topics.add(topic)
-        for subscription in self._subscriptions:
+    def remove_subscription_nowait(self, id: str) -> None:
+        """Remove a subscription without suspending, for callers that hold a thread lock."""
+        # Check if the subscription exists
+        subscription = self._subscriptions.pop(id, None)
+        if subscription is None:
+            raise ValueError("Subscription does not exist")
+        del self._sequence[id]
+
+        if _is_indexable_type_subscription(subscription):
+            remaining = [sub for sub in self._type_index[subscription.topic_type] if sub.id != id]
+            if remaining:
+                self._type_index[subscription.topic_type] = remaining
+            else:
+                del self._type_index[subscription.topic_type]
+            self._type_keys.discard((subscription.agent_type, subscription.topic_type))
+            affected = self._seen_topics_by_type.get(subscription.topic_type, set())
+        elif _is_indexable_prefix_subscription(subscription):
+            self._prefix_trie.remove(subscription)
+            self._prefix_keys.discard((subscription.agent_type, subscription.topic_type_prefix))
+            affected = self._seen_topics_with_prefix(subscription.topic_type_prefix)
+        else:
+            self._unindexed = [sub for sub in self._unindexed if sub.id != id]
+            affected = set(self._subscribed_recipients.keys())
+
+        for topic in affected:
             if subscription.is_match(topic):
-                self._subscribed_recipients[topic].append(subscription.map_to_agent(topic))
+                self._subscribed_recipients[topic] = self._match(topic)
+
+    def get_subscribed_recipients_nowait(self, topic: TopicId) -> List[AgentId]:
+        """Resolve the recipients of a topic without suspending, for callers that hold a thread lock."""
+        recipients = self._subscribed_recipients.get(topic)
+        if recipients is None:
+            recipients = self._build_for_new_topic(topic)
+        return recipients
+
+    def _is_duplicate(self, subscription: Subscription) -> bool:
+        if subscription.id in self._subscriptions:
+            return True
+        if _is_indexable_type_subscription(subscription):
+            if (subscription.agent_type, subscription.topic_type) in self._type_keys:
+                return True
+        elif _is_indexable_prefix_subscription(subscription):
+            if (subscription.agent_type, subscription.topic_type_prefix) in self._prefix_keys:
+                return True
+        # Subscriptions with custom equality can only be compared one by one.
+        return any(sub == subscription for sub in self._unindexed)
+
+    def _seen_topics_with_prefix(self, prefix: str) -> Set[TopicId]:
+        topics: Set[TopicId] = set()
+        start = bisect.bisect_left(self._seen_topic_types, prefix)
+        for topic_type in itertools.islice(self._seen_topic_types, start, None):
+            if not topic_type.startswith(prefix):
+                break
+            topics.update(self._seen_topics_by_type[topic_type])
+        return topics
+
+    def _match(self, topic: TopicId) -> List[AgentId]:
+        matches: List[Subscription] = [*self._type_index.get(topic.type, []), *self._prefix_trie.matches(topic.type)]
+        matches.extend(sub for sub in self._unindexed if sub.is_match(topic))
+        matches.sort(key=lambda sub: self._sequence[sub.id])
+        return [sub.map_to_agent(topic) for sub in matches]
+
+    def _build_for_new_topic(self, topic: TopicId) -> List[AgentId]:
+        if topic.type not in self._seen_topics_by_type:
+            bisect.insort(self._seen_topic_types, topic.type)
+        self._seen_topics_by_type[topic.type].add(topic)
+        recipients = self._match(topic)
+        self._subscribed_recipients[topic] = recipients
+        return recipients
@@ -1,6 +1,21 @@
+import functools
 import json
+import weakref
 from dataclasses import asdict, dataclass, fields
-from typing import Any, ClassVar, Dict, List, Protocol, Sequence, TypeVar, cast, get_args, get_origin, runtime_checkable
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Hashable,
+    List,
+    Protocol,
+    Sequence,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+    runtime_checkable,
+)
 
 from google.protobuf import any_pb2
 from google.protobuf.message import Message
@@ -191,18 +206,26 @@ class UnknownPayload:
     payload: bytes
 
 
+# Type names and known serializers are resolved once per class. Both are looked up on every
+# send and publish, and resolving them involves several isinstance/issubclass checks.
+# The type names are keyed weakly so that classes created at run time can be collected.
+# The serializers reference their class, so they are kept in a bounded LRU cache instead.
+_type_name_cache: "weakref.WeakKeyDictionary[type, str]" = weakref.WeakKeyDictionary()
+_KNOWN_SERIALIZERS_CACHE_SIZE = 1024
+
+
 def _type_name(cls: type[Any] | Any) -> str:
-    # If cls is a protobuf, then we need to determine the descriptor
-    if isinstance(cls, type):
+    if not isinstance(cls, type):
+        cls = type(cls)
+    type_name = _type_name_cache.get(cls)
+    if type_name is None:
+        # If cls is a protobuf, then we need to determine the descriptor
         if issubclass(cls, Message):
-            return cast(str, cls.DESCRIPTOR.full_name)
-    elif isinstance(cls, Message):
-        return cast(str, cls.DESCRIPTOR.full_name)
-
-    if isinstance(cls, type):
-        return cls.__name__
-    else:
-        return cast(str, cls.__class__.__name__)
+            type_name = cast(str, cls.DESCRIPTOR.full_name)
+        else:
+            type_name = cls.__name__
+        _type_name_cache[cls] = type_name
+    return type_name
 
 
 V = TypeVar("V")
@@ -211,6 +234,13 @@ def _type_name(cls: type[Any] | Any) -> str:
 def try_get_known_serializers_for_type(cls: type[Any]) -> list[MessageSerializer[Any]]:
     """:meta private:"""
 
+    # The serializers are stateless and can be shared, but the list is owned by the caller.
+    # Classes are hashable, but type checkers do not match them against the Hashable arguments of lru_cache.
+    return list(_known_serializers(cast(Hashable, cls)))
+
+
+@functools.lru_cache(maxsize=_KNOWN_SERIALIZERS_CACHE_SIZE)
+def _known_serializers(cls: type[Any]) -> Sequence[MessageSerializer[Any]]:
     serializers: List[MessageSerializer[Any]] = []
     if issubclass(cls, BaseModel):
         serializers.append(PydanticJsonMessageSerializer(cls))
@@ -218,8 +248,7 @@ def try_get_known_serializers_for_type(cls: type[Any]) -> list[MessageSerializer
         serializers.append(DataclassJsonMessageSerializer(cls))
     elif issubclass(cls, Message):
         serializers.append(ProtobufMessageSerializer(cls))
-
-    return serializers
+    return tuple(serializers)
 
 
 class SerializationRegistry:
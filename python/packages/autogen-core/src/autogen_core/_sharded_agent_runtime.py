@@ -0,0 +1,555 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import itertools
+import threading
+import uuid
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any, Awaitable, Callable, Coroutine, DefaultDict, Dict, List, Mapping, Tuple, Type, TypeVar, Union
+
+from opentelemetry.trace import TracerProvider
+
+from ._agent import Agent
+from ._agent_id import AgentId
+from ._agent_instantiation import AgentInstantiationContext
+from ._agent_metadata import AgentMetadata
+from ._agent_runtime import AgentRuntime
+from ._agent_type import AgentType
+from ._bounded_queue import QueueMetrics, QueueOverflowPolicy, _BoundedShutdownQueue
+from ._cancellation_token import CancellationToken
+from ._intervention import InterventionHandler
+from ._runtime_impl_helpers import SubscriptionManager, get_impl
+from ._serialization import MessageSerializer
+from ._single_threaded_agent_runtime import (
+    PublishMessageEnvelope,
+    ResponseMessageEnvelope,
+    SendMessageEnvelope,
+    SingleThreadedAgentRuntime,
+)
+from ._subscription import Subscription
+from ._topic import TopicId
+
+T = TypeVar("T", bound=Agent)
+R = TypeVar("R")
+
+_Envelope = Union[PublishMessageEnvelope, SendMessageEnvelope, ResponseMessageEnvelope]
+
+
+class _ShardSubscriptionManager(SubscriptionManager):
+    """Subscription view of a shard: resolves recipients through the owning
+    :class:`ShardedAgentRuntime` and keeps only the agents placed on this shard."""
+
+    def __init__(self, runtime: ShardedAgentRuntime, shard_index: int) -> None:
+        super().__init__()
+        self._runtime = runtime
+        self._shard_index = shard_index
+
+    async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
+        recipients = await self._runtime._get_subscribed_recipients(topic)  # type: ignore[reportPrivateUsage]
+        return [agent_id for agent_id in recipients if self._runtime.shard_index(agent_id) == self._shard_index]
+
+
+class _ShardQueue(_BoundedShutdownQueue[_Envelope]):
+    """The message queue of a shard, which tells the owning runtime whenever a message has been processed."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        overflow_policy: QueueOverflowPolicy,
+        on_drop: Callable[[_Envelope], None],
+        on_task_done: Callable[[], None],
+    ) -> None:
+        super().__init__(name, maxsize=maxsize, overflow_policy=overflow_policy, on_drop=on_drop)
+        self._on_task_done = on_task_done
+
+    def task_done(self) -> None:
+        super().task_done()
+        self._on_task_done()
+
+
+class _Shard(SingleThreadedAgentRuntime):
+    """A single-threaded runtime that owns a subset of the agents of a :class:`ShardedAgentRuntime`."""
+
+    def __init__(
+        self,
+        runtime: ShardedAgentRuntime,
+        shard_index: int,
+        *,
+        intervention_handlers: List[InterventionHandler] | None,
+        tracer_provider: TracerProvider | None,
+        ignore_unhandled_exceptions: bool,
+        message_batch_size: int,
+        max_queue_size: int,
+        queue_overflow_policy: QueueOverflowPolicy,
+    ) -> None:
+        self._runtime = runtime
+        self._shard_index = shard_index
+        super().__init__(
+            intervention_handlers=intervention_handlers,
+            tracer_provider=tracer_provider,
+            ignore_unhandled_exceptions=ignore_unhandled_exceptions,
+            message_batch_size=message_batch_size,
+            max_queue_size=max_queue_size,
+            queue_overflow_policy=queue_overflow_policy,
+        )
+        self._subscription_manager = _ShardSubscriptionManager(runtime, shard_index)
+
+    def _create_message_queue(self) -> _ShardQueue:
+        return _ShardQueue(
+            self._message_queue_name(),
+            maxsize=self._max_queue_size,
+            overflow_policy=self._queue_overflow_policy,
+            on_drop=self._on_envelope_dropped,
+            on_task_done=self._runtime._notify_message_processed,  # type: ignore[reportPrivateUsage]
+        )
+
+    def _message_queue_name(self) -> str:
+        return f"ShardedAgentRuntime/shard-{self._shard_index}"
+
+    async def join(self) -> None:
+        await self._message_queue.join()
+
+
+class _ShardWorker:
+    """An event loop running in a dedicated thread."""
+
+    def __init__(self, name: str) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+class ShardedAgentRuntime(AgentRuntime):
+    """An agent runtime that partitions agents across several event loops, each running in its own thread.
+
+    Every agent is assigned to a shard by a stable hash of its :class:`~autogen_core.AgentId`, and each shard
+    is a :class:`~autogen_core.SingleThreadedAgentRuntime` with its own message queue and event loop.
+    Messages for an agent are always processed by the same shard, so messages sent to an agent are delivered
+    in the order they were sent, while independent agents run on different loops. Published messages are
+    resolved against a shared subscription table and only forwarded to the shards that own a recipient.
+
+    Agents created by this runtime see the sharded runtime as their :attr:`~autogen_core.BaseAgent.runtime`,
+    so sending and publishing from inside a message handler is routed across shards transparently.
+
+    .. note::
+
+        Agent handlers run on shard threads. Agent state must not be shared between agents
+        without synchronization, and objects bound to an event loop (such as :class:`asyncio.Event`)
+        must be created inside the agent. Intervention handlers are shared by all shards and are invoked
+        on the shard thread that processes the message; for published messages this is once per shard
+        that owns at least one recipient.
+
+    .. note::
+
+        Shards are threads within a single process. CPU-bound handlers only run in parallel on
+        interpreters without a global interpreter lock; I/O-bound handlers benefit on any interpreter.
+
+    Args:
+        num_shards (int, optional): The number of shards (event loops and threads). Defaults to 4.
+        intervention_handlers (List[InterventionHandler], optional): A list of intervention
+            handlers that can intercept messages before they are sent or published. Defaults to None.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+        ignore_unhandled_exceptions (bool, optional): Whether to ignore unhandled exceptions that occur in agent event handlers.
+            Any background exception will be raised from an awaited `stop`, `stop_when_idle` or `stop_when`. Defaults to True.
+        message_batch_size (int, optional): The maximum number of queued messages each shard takes from its queue
+            in one iteration. See :class:`~autogen_core.SingleThreadedAgentRuntime`. Defaults to 1.
+        max_queue_size (int, optional): The maximum number of messages waiting in the queue of each shard. 0 means
+            unbounded. Defaults to 0.
+        queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is put on a full shard
+            queue. See :class:`~autogen_core.SingleThreadedAgentRuntime`. Defaults to "block".
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+            from dataclasses import dataclass
+
+            from autogen_core import (
+                DefaultTopicId,
+                MessageContext,
+                RoutedAgent,
+                ShardedAgentRuntime,
+                default_subscription,
+                message_handler,
+            )
+
+
+            @dataclass
+            class MyMessage:
+                content: str
+
+
+            @default_subscription
+            class MyAgent(RoutedAgent):
+                @message_handler
+                async def handle_my_message(self, message: MyMessage, ctx: MessageContext) -> None:
+                    print(f"{self.id} received message: {message.content}")
+
+
+            async def main() -> None:
+                runtime = ShardedAgentRuntime(num_shards=4)
+                await MyAgent.register(runtime, "my_agent", lambda: MyAgent("My agent"))
+
+                runtime.start()
+                for i in range(10):
+                    await runtime.publish_message(MyMessage("Hello, world!"), DefaultTopicId(source=f"session_{i}"))
+                await runtime.stop_when_idle()
+
+
+            asyncio.run(main())
+
+    """
+
+    def __init__(
+        self,
+        *,
+        num_shards: int = 4,
+        intervention_handlers: List[InterventionHandler] | None = None,
+        tracer_provider: TracerProvider | None = None,
+        ignore_unhandled_exceptions: bool = True,
+        message_batch_size: int = 1,
+        max_queue_size: int = 0,
+        queue_overflow_policy: QueueOverflowPolicy = "block",
+    ) -> None:
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+        self._shards = [
+            _Shard(
+                self,
+                i,
+                intervention_handlers=intervention_handlers,
+                tracer_provider=tracer_provider,
+                ignore_unhandled_exceptions=ignore_unhandled_exceptions,
+                message_batch_size=message_batch_size,
+                max_queue_size=max_queue_size,
+                queue_overflow_policy=queue_overflow_policy,
+            )
+            for i in range(num_shards)
+        ]
+        self._workers: List[_ShardWorker] | None = None
+        self._subscription_manager = SubscriptionManager()
+        self._subscription_lock = threading.Lock()
+        # The loops and events of the stop_when calls waiting for a message to be processed.
+        self._progress_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._progress_lock = threading.Lock()
+        # Incremented every time work is handed to a shard, used to detect quiescence.
+        self._dispatch_counter = itertools.count()
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._shards)
+
+    @property
+    def unprocessed_messages_count(self) -> int:
+        return sum(shard.unprocessed_messages_count for shard in self._shards)
+
+    @property
+    def message_queue_metrics(self) -> List[QueueMetrics]:
+        """The message queue metrics of each shard, in shard order."""
+        return [shard.message_queue_metrics for shard in self._shards]
+
+    def shard_index(self, agent_id: AgentId) -> int:
+        """Return the index of the shard that owns the given agent."""
+        digest = hashlib.blake2b(f"{agent_id.type}/{agent_id.key}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % len(self._shards)
+
+    async def _get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
+        # The subscription manager is shared by all shard threads, so it is only used
+        # through its synchronous methods, which never hold the lock across an await.
+        with self._subscription_lock:
+            return list(self._subscription_manager.get_subscribed_recipients_nowait(topic))
+
+    def _notify_message_processed(self) -> None:
+        with self._progress_lock:
+            waiters = list(self._progress_waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def _run_on_shard(self, shard_index: int, coro: Coroutine[Any, Any, R]) -> R:
+        if self._workers is None:
+            coro.close()
+            raise RuntimeError("Runtime is not started")
+        next(self._dispatch_counter)
+        loop = self._workers[shard_index].loop
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if current_loop is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def _run_with_shard_token(
+        self,
+        shard_index: int,
+        cancellation_token: CancellationToken,
+        call: Callable[[CancellationToken], Coroutine[Any, Any, R]],
+    ) -> R:
+        """Run a call on a shard with a token owned by the shard's loop that follows the caller's token
+        until the call has finished."""
+        assert self._workers is not None
+        loop = self._workers[shard_index].loop
+        shard_token = CancellationToken()
+
+        def cancel() -> None:
+            loop.call_soon_threadsafe(shard_token.cancel)
+
+        cancellation_token.add_callback(cancel)
+        try:
+            return await self._run_on_shard(shard_index, call(shard_token))
+        finally:
+            cancellation_token.remove_callback(cancel)
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> Any:
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        index = self.shard_index(recipient)
+        if self._workers is None:
+            raise RuntimeError("Runtime is not started")
+        future = asyncio.ensure_future(
+            self._run_with_shard_token(
+                index,
+                cancellation_token,
+                lambda shard_token: self._shards[index].send_message(
+                    message,
+                    recipient,
+                    sender=sender,
+                    cancellation_token=shard_token,
+                    message_id=message_id,
+                ),
+            )
+        )
+
+        def cancel() -> None:
+            future.cancel()
+
+        cancellation_token.add_callback(cancel)
+        try:
+            return await future
+        finally:
+            cancellation_token.remove_callback(cancel)
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+    ) -> None:
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        if self._workers is None:
+            raise RuntimeError("Runtime is not started")
+
+        recipients = await self._get_subscribed_recipients(topic_id)
+        shard_indices = sorted(
+            {self.shard_index(agent_id) for agent_id in recipients if sender is None or agent_id != sender}
+        )
+        # Shards are enqueued one after another so that the relative order of
+        # publishes from a single sender is kept on every shard.
+        for index in shard_indices:
+            await self._run_with_shard_token(
+                index,
+                cancellation_token,
+                lambda shard_token, index=index: self._shards[index].publish_message(  # type: ignore[misc]
+                    message,
+                    topic_id,
+                    sender=sender,
+                    cancellation_token=shard_token,
+                    message_id=message_id,
+                ),
+            )
+
+    async def save_state(self) -> Mapping[str, Any]:
+        """Save the state of all instantiated agents across all shards.
+
+        Returns:
+            A dictionary mapping agent IDs to their state.
+        """
+        state: Dict[str, Any] = {}
+        for index, shard in enumerate(self._shards):
+            state.update(await self._run_on_shard(index, shard.save_state()))
+        return state
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        """Load the state of all agents, each on the shard that owns it."""
+        partitioned: DefaultDict[int, Dict[str, Any]] = defaultdict(dict)
+        for agent_id_str, agent_state in state.items():
+            partitioned[self.shard_index(AgentId.from_str(agent_id_str))][agent_id_str] = agent_state
+        for index, shard_state in partitioned.items():
+            await self._run_on_shard(index, self._shards[index].load_state(shard_state))
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        index = self.shard_index(agent)
+        return await self._run_on_shard(index, self._shards[index].agent_metadata(agent))
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        index = self.shard_index(agent)
+        return await self._run_on_shard(index, self._shards[index].agent_save_state(agent))
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        index = self.shard_index(agent)
+        await self._run_on_shard(index, self._shards[index].agent_load_state(agent, state))
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+    ) -> AgentType:
+        if isinstance(type, str):
+            type = AgentType(type)
+
+        if type.type in self._shards[0]._known_agent_names:  # type: ignore[reportPrivateUsage]
+            raise ValueError(f"Agent with type {type} already exists.")
+
+        async def sharded_factory() -> T:
+            # Agents must see this runtime, not the shard, so that their messages are routed across shards.
+            agent_id = AgentInstantiationContext.current_agent_id()
+            with AgentInstantiationContext.populate_context((self, agent_id)):
+                maybe_agent_instance = agent_factory()
+                if inspect.isawaitable(maybe_agent_instance):
+                    return await maybe_agent_instance
+                return maybe_agent_instance
+
+        for shard in self._shards:
+            await shard.register_factory(type, sharded_factory, expected_class=expected_class)
+
+        return type
+
+    async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
+        index = self.shard_index(id)
+        return await self._run_on_shard(index, self._shards[index].try_get_underlying_agent_instance(id, type))
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        with self._subscription_lock:
+            self._subscription_manager.add_subscription_nowait(subscription)
+
+    async def remove_subscription(self, id: str) -> None:
+        with self._subscription_lock:
+            self._subscription_manager.remove_subscription_nowait(id)
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        return await get_impl(
+            id_or_type=id_or_type,
+            key=key,
+            lazy=lazy,
+            instance_getter=self._get_agent,
+        )
+
+    async def _get_agent(self, agent_id: AgentId) -> Agent:
+        index = self.shard_index(agent_id)
+        return await self._run_on_shard(index, self._shards[index]._get_agent(agent_id))  # type: ignore[reportPrivateUsage]
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        for shard in self._shards:
+            shard.add_message_serializer(serializer)
+
+    def start(self) -> None:
+        """Start one event loop thread per shard and the message processing loop of every shard."""
+        if self._workers is not None:
+            raise RuntimeError("Runtime is already started")
+        self._workers = [_ShardWorker(f"autogen-shard-{i}") for i in range(len(self._shards))]
+
+        async def start_shard(shard: _Shard) -> None:
+            shard.start()
+
+        for worker, shard in zip(self._workers, self._shards, strict=True):
+            asyncio.run_coroutine_threadsafe(start_shard(shard), worker.loop).result()
+
+    async def _stop_shards(self, stop: Callable[[_Shard], Coroutine[Any, Any, None]]) -> None:
+        assert self._workers is not None
+        workers = self._workers
+        first_exception: BaseException | None = None
+        for worker, shard in zip(workers, self._shards, strict=True):
+            try:
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(stop(shard), worker.loop))
+            except BaseException as e:
+                if first_exception is None:
+                    first_exception = e
+        self._workers = None
+        for worker in workers:
+            worker.shutdown()
+        if first_exception is not None:
+            raise first_exception
+
+    async def stop(self) -> None:
+        """Immediately stop the message processing loop of every shard and shut down the shard threads."""
+        if self._workers is None:
+            raise RuntimeError("Runtime is not started")
+
+        await self._stop_shards(lambda shard: shard.stop())
+
+    async def stop_when_idle(self) -> None:
+        """Stop the runtime when no shard has an outstanding message being processed or queued."""
+        if self._workers is None:
+            raise RuntimeError("Runtime is not started")
+
+        # A shard can become busy again after it was found idle when another
+        # shard hands it work, so repeat until a full pass dispatches nothing.
+        while True:
+            marker = next(self._dispatch_counter)
+            for index, shard in enumerate(self._shards):
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(shard.join(), self._workers[index].loop))
+            if next(self._dispatch_counter) == marker + 1:
+                break
+
+        await self._stop_shards(lambda shard: shard.stop())
+
+    async def stop_when(self, condition: Callable[[], bool]) -> None:
+        """Stop the runtime when the condition is met. The condition is checked now and again every time
+        a shard has finished processing a message, so it should only depend on the agents' work."""
+        if self._workers is None:
+            raise RuntimeError("Runtime is not started")
+        progress = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), progress)
+        # Registered before the first check, so that no message processed in between is missed.
+        with self._progress_lock:
+            self._progress_waiters.append(waiter)
+        try:
+            while not condition():
+                await progress.wait()
+                progress.clear()
+        finally:
+            with self._progress_lock:
+                self._progress_waiters.remove(waiter)
+        await self.stop()
+
+    async def close(self) -> None:
+        """Stop the runtime if applicable and call :meth:`Agent.close` on all instantiated agents."""
+        if self._workers is None:
+            for shard in self._shards:
+                await shard.close()
+            return
+        await self._stop_shards(lambda shard: shard.close())
@@ -6,10 +6,10 @@
 import sys
 import uuid
 import warnings
-from asyncio import CancelledError, Future, Queue, Task
+from asyncio import CancelledError, Future, Task
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Mapping, ParamSpec, Set, Type, TypeVar, cast
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Mapping, ParamSpec, Set, Tuple, Type, TypeVar, cast
 
 from opentelemetry.trace import TracerProvider
 
@@ -23,9 +23,9 @@
 )
 
 if sys.version_info >= (3, 13):
-    from asyncio import Queue, QueueShutDown
+    from asyncio import QueueShutDown
 else:
-    from ._queue import Queue, QueueShutDown  # type: ignore
+    from ._queue import QueueShutDown  # type: ignore
 
 
 from ._agent import Agent
@@ -34,6 +34,7 @@
 from ._agent_metadata import AgentMetadata
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
+from ._bounded_queue import QueueMetrics, QueueOverflowPolicy, _BoundedShutdownQueue
 from ._cancellation_token import CancellationToken
 from ._intervention import DropMessage, InterventionHandler
 from ._message_context import MessageContext
@@ -160,6 +161,19 @@ class SingleThreadedAgentRuntime(AgentRuntime):
             handlers that can intercept messages before they are sent or published. Defaults to None.
         tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
         ignore_unhandled_exceptions (bool, optional): Whether to ignore unhandled exceptions in that occur in agent event handlers. Any background exceptions will be raised on the next call to `process_next` or from an awaited `stop`, `stop_when_idle` or `stop_when`. Note, this does not apply to RPC handlers. Defaults to True.
+        message_batch_size (int, optional): The maximum number of queued messages taken from the queue in one
+            iteration of the message loop. With a value greater than 1, intervention handlers run over the whole
+            batch, responses are resolved without spawning a task, and the published messages of a batch are
+            delivered with one task per recipient agent, which handles its messages of the batch in order. This
+            reduces scheduling overhead under bursty publish traffic. Defaults to 1, which processes one message
+            per iteration.
+        max_queue_size (int, optional): The maximum number of messages waiting in the message queue. 0 means
+            unbounded. Defaults to 0.
+        queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is sent, published or
+            responded to while the message queue is full. "block" makes the sender wait for a free slot, "drop_oldest"
+            discards the oldest queued message, and "raise" raises :class:`asyncio.QueueFull` to the sender. Senders
+            waiting on a dropped direct message or response get a :class:`~autogen_core.exceptions.MessageDroppedException`.
+            The queue metrics are logged as :class:`~autogen_core.logging.QueueMetricsEvent`. Defaults to "block".
 
     Examples:
 
@@ -250,9 +264,16 @@ def __init__(
         intervention_handlers: List[InterventionHandler] | None = None,
         tracer_provider: TracerProvider | None = None,
         ignore_unhandled_exceptions: bool = True,
+        message_batch_size: int = 1,
+        max_queue_size: int = 0,
+        queue_overflow_policy: QueueOverflowPolicy = "block",
     ) -> None:
+        if message_batch_size < 1:
+            raise ValueError("message_batch_size must be at least 1.")
         self._tracer_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("SingleThreadedAgentRuntime"))
-        self._message_queue: Queue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope] = Queue()
+        self._max_queue_size = max_queue_size
+        self._queue_overflow_policy: QueueOverflowPolicy = queue_overflow_policy
+        self._message_queue = self._create_message_queue()
         # (namespace, type) -> List[AgentId]
         self._agent_factories: Dict[
             str, Callable[[], Agent | Awaitable[Agent]] | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]]
@@ -265,6 +286,48 @@ def __init__(
         self._serialization_registry = SerializationRegistry()
         self._ignore_unhandled_handler_exceptions = ignore_unhandled_exceptions
         self._background_exception: BaseException | None = None
+        self._message_batch_size = message_batch_size
+
+    def _create_message_queue(
+        self,
+    ) -> _BoundedShutdownQueue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope]:
+        return _BoundedShutdownQueue(
+            self._message_queue_name(),
+            maxsize=self._max_queue_size,
+            overflow_policy=self._queue_overflow_policy,
+            on_drop=self._on_envelope_dropped,
+        )
+
+    def _message_queue_name(self) -> str:
+        return "SingleThreadedAgentRuntime"
+
+    def _on_envelope_dropped(
+        self, envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> None:
+        # Called by the message queue when an envelope is discarded to make room for a new one.
+        future: Future[Any] | None
+        match envelope:
+            case SendMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
+                receiver: AgentId | TopicId | None = recipient
+                kind = MessageKind.DIRECT
+            case PublishMessageEnvelope(message=message, sender=sender, topic_id=topic_id):
+                receiver = topic_id
+                kind = MessageKind.PUBLISH
+                future = None
+            case ResponseMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
+                receiver = recipient
+                kind = MessageKind.RESPOND
+        logger.info(f"Message of type {type(message).__name__} dropped because the message queue is full.")
+        event_logger.info(
+            MessageDroppedEvent(
+                payload=self._try_serialize(message),
+                sender=sender,
+                receiver=receiver,
+                kind=kind,
+            )
+        )
+        if future is not None and not future.done():
+            future.set_exception(MessageDroppedException("Message queue is full."))
 
     @property
     def unprocessed_messages_count(
@@ -272,6 +335,12 @@ def unprocessed_messages_count(
     ) -> int:
         return self._message_queue.qsize()
 
+    @property
+    def message_queue_metrics(self) -> QueueMetrics:
+        """The depth, high-water mark, overflow counts and put wait time of the message queue since the runtime
+        was created or last stopped."""
+        return self._message_queue.metrics
+
     @property
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
@@ -480,75 +549,83 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
                 )
             )
 
-            await self._message_queue.put(
-                ResponseMessageEnvelope(
-                    message=response,
-                    future=message_envelope.future,
-                    sender=message_envelope.recipient,
-                    recipient=message_envelope.sender,
-                    metadata=get_telemetry_envelope_metadata(),
+            try:
+                await self._message_queue.put(
+                    ResponseMessageEnvelope(
+                        message=response,
+                        future=message_envelope.future,
+                        sender=message_envelope.recipient,
+                        recipient=message_envelope.sender,
+                        metadata=get_telemetry_envelope_metadata(),
+                    )
                 )
-            )
+            except asyncio.QueueFull as e:
+                # The response was rejected by the "raise" overflow policy, so fail the sender instead of leaving it waiting.
+                if not message_envelope.future.done():
+                    message_envelope.future.set_exception(e)
             self._message_queue.task_done()
 
+    async def _publish_deliveries(
+        self, message_envelope: PublishMessageEnvelope
+    ) -> List[Tuple[AgentId, Coroutine[Any, Any, Any]]]:
+        """Create the handler calls that deliver a published message to each of its recipients."""
+        responses: List[Tuple[AgentId, Coroutine[Any, Any, Any]]] = []
+        recipients = await self._subscription_manager.get_subscribed_recipients(message_envelope.topic_id)
+        for agent_id in recipients:
+            # Avoid sending the message back to the sender
+            if message_envelope.sender is not None and agent_id == message_envelope.sender:
+                continue
+
+            sender_name = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
+            logger.info(
+                f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
+            )
+            event_logger.info(
+                MessageEvent(
+                    payload=self._try_serialize(message_envelope.message),
+                    sender=message_envelope.sender,
+                    receiver=None,
+                    kind=MessageKind.PUBLISH,
+                    delivery_stage=DeliveryStage.DELIVER,
+                )
+            )
+            message_context = MessageContext(
+                sender=message_envelope.sender,
+                topic_id=message_envelope.topic_id,
+                is_rpc=False,
+                cancellation_token=message_envelope.cancellation_token,
+                message_id=message_envelope.message_id,
+            )
+            agent = await self._get_agent(agent_id)
+
+            async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
+                with self._tracer_helper.trace_block("process", agent.id, parent=message_envelope.metadata):
+                    with MessageHandlerContext.populate_context(agent.id):
+                        try:
+                            return await agent.on_message(
+                                message_envelope.message,
+                                ctx=message_context,
+                            )
+                        except BaseException as e:
+                            logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
+                            event_logger.info(
+                                MessageHandlerExceptionEvent(
+                                    payload=self._try_serialize(message_envelope.message),
+                                    handling_agent=agent.id,
+                                    exception=e,
+                                )
+                            )
+                            raise e
+
+            future = _on_message(agent, message_context)
+            responses.append((agent_id, future))
+        return responses
+
     async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("publish", message_envelope.topic_id, parent=message_envelope.metadata):
             try:
-                responses: List[Awaitable[Any]] = []
-                recipients = await self._subscription_manager.get_subscribed_recipients(message_envelope.topic_id)
-                for agent_id in recipients:
-                    # Avoid sending the message back to the sender
-                    if message_envelope.sender is not None and agent_id == message_envelope.sender:
-                        continue
-
-                    sender_agent = (
-                        await self._get_agent(message_envelope.sender) if message_envelope.sender is not None else None
-                    )
-                    sender_name = str(sender_agent.id) if sender_agent is not None else "Unknown"
-                    logger.info(
-                        f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
-                    )
-                    event_logger.info(
-                        MessageEvent(
-                            payload=self._try_serialize(message_envelope.message),
-                            sender=message_envelope.sender,
-                            receiver=None,
-                            kind=MessageKind.PUBLISH,
-                            delivery_stage=DeliveryStage.DELIVER,
-                        )
-                    )
-                    message_context = MessageContext(
-                        sender=message_envelope.sender,
-                        topic_id=message_envelope.topic_id,
-                        is_rpc=False,
-                        cancellation_token=message_envelope.cancellation_token,
-                        message_id=message_envelope.message_id,
-                    )
-                    agent = await self._get_agent(agent_id)
-
-                    async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
-                        with self._tracer_helper.trace_block("process", agent.id, parent=message_envelope.metadata):
-                            with MessageHandlerContext.populate_context(agent.id):
-                                try:
-                                    return await agent.on_message(
-                                        message_envelope.message,
-                                        ctx=message_context,
-                                    )
-                                except BaseException as e:
-                                    logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
-                                    event_logger.info(
-                                        MessageHandlerExceptionEvent(
-                                            payload=self._try_serialize(message_envelope.message),
-                                            handling_agent=agent.id,
-                                            exception=e,
-                                        )
-                                    )
-                                    raise e
-
-                    future = _on_message(agent, message_context)
-                    responses.append(future)
-
-                await asyncio.gather(*responses)
+                responses = await self._publish_deliveries(message_envelope)
+                await asyncio.gather(*[response for _, response in responses])
             except BaseException as e:
                 if not self._ignore_unhandled_handler_exceptions:
                     self._background_exception = e
@@ -556,6 +633,40 @@ async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
                 self._message_queue.task_done()
             # TODO if responses are given for a publish
 
+    async def _process_publish_batch(self, message_envelopes: List[PublishMessageEnvelope]) -> None:
+        """Deliver several published messages. The handler calls of each recipient agent run
+        in order in one task, so a batch needs one task per recipient instead of one per delivery."""
+        deliveries: Dict[AgentId, List[Coroutine[Any, Any, Any]]] = {}
+        for message_envelope in message_envelopes:
+            with self._tracer_helper.trace_block(
+                "publish", message_envelope.topic_id, parent=message_envelope.metadata
+            ):
+                try:
+                    for agent_id, response in await self._publish_deliveries(message_envelope):
+                        deliveries.setdefault(agent_id, []).append(response)
+                except BaseException as e:
+                    if not self._ignore_unhandled_handler_exceptions:
+                        self._background_exception = e
+
+        async def _deliver_in_order(responses: List[Coroutine[Any, Any, Any]]) -> BaseException | None:
+            exception: BaseException | None = None
+            for response in responses:
+                try:
+                    await response
+                except BaseException as e:
+                    if exception is None:
+                        exception = e
+            return exception
+
+        try:
+            results = await asyncio.gather(*[_deliver_in_order(responses) for responses in deliveries.values()])
+            exception = next((result for result in results if result is not None), None)
+            if exception is not None and not self._ignore_unhandled_handler_exceptions:
+                self._background_exception = exception
+        finally:
+            for _ in message_envelopes:
+                self._message_queue.task_done()
+
     async def _process_response(self, message_envelope: ResponseMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("ack", message_envelope.recipient, parent=message_envelope.metadata):
             content = (
@@ -604,6 +715,49 @@ async def _process_next(self) -> None:
                 raise e from None
             return
 
+        if self._message_batch_size == 1:
+            if await self._intercept(message_envelope):
+                self._schedule(message_envelope)
+            else:
+                self._message_queue.task_done()
+            # Yield control to the message loop to allow other tasks to run
+            await asyncio.sleep(0)
+            return
+
+        batch = [message_envelope]
+        while len(batch) < self._message_batch_size and not self._message_queue.empty():
+            batch.append(self._message_queue.get_nowait())
+
+        publish_envelopes: List[PublishMessageEnvelope] = []
+        for message_envelope in batch:
+            if not await self._intercept(message_envelope):
+                self._message_queue.task_done()
+                continue
+            match message_envelope:
+                case SendMessageEnvelope():
+                    self._schedule(message_envelope)
+                case PublishMessageEnvelope():
+                    publish_envelopes.append(message_envelope)
+                case ResponseMessageEnvelope():
+                    # Resolving a response does not wait on anything, so no task is needed.
+                    await self._process_response(message_envelope)
+
+        if publish_envelopes:
+            task = asyncio.create_task(self._process_publish_batch(publish_envelopes))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        # Yield control to the message loop once per batch
+        await asyncio.sleep(0)
+
+    async def _intercept(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> bool:
+        """Run the intervention handlers on a message envelope.
+
+        Returns:
+            bool: False if the message was dropped or an intervention handler raised, True otherwise.
+        """
         match message_envelope:
             case SendMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
                 if self._intervention_handlers is not None:
@@ -625,7 +779,7 @@ async def _process_next(self) -> None:
                                 _warn_if_none(temp_message, "on_send")
                             except BaseException as e:
                                 future.set_exception(e)
-                                return
+                                return False
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                                 event_logger.info(
                                     MessageDroppedEvent(
@@ -636,12 +790,9 @@ async def _process_next(self) -> None:
                                     )
                                 )
                                 future.set_exception(MessageDroppedException())
-                                return
+                                return False
 
                         message_envelope.message = temp_message
-                task = asyncio.create_task(self._process_send(message_envelope))
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
             case PublishMessageEnvelope(
                 message=message,
                 sender=sender,
@@ -665,7 +816,7 @@ async def _process_next(self) -> None:
                             except BaseException as e:
                                 # TODO: we should raise the intervention exception to the publisher.
                                 logger.error(f"Exception raised in in intervention handler: {e}", exc_info=True)
-                                return
+                                return False
                             if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                                 event_logger.info(
                                     MessageDroppedEvent(
@@ -675,13 +826,9 @@ async def _process_next(self) -> None:
                                         kind=MessageKind.PUBLISH,
                                     )
                                 )
-                                return
+                                return False
 
                         message_envelope.message = temp_message
-
-                task = asyncio.create_task(self._process_publish(message_envelope))
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
             case ResponseMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
                 if self._intervention_handlers is not None:
                     for handler in self._intervention_handlers:
@@ -691,7 +838,7 @@ async def _process_next(self) -> None:
                         except BaseException as e:
                             # TODO: should we raise the exception to sender of the response instead?
                             future.set_exception(e)
-                            return
+                            return False
                         if temp_message is DropMessage or isinstance(temp_message, DropMessage):
                             event_logger.info(
                                 MessageDroppedEvent(
@@ -702,14 +849,23 @@ async def _process_next(self) -> None:
                                 )
                             )
                             future.set_exception(MessageDroppedException())
-                            return
+                            return False
                         message_envelope.message = temp_message
-                task = asyncio.create_task(self._process_response(message_envelope))
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
 
-        # Yield control to the message loop to allow other tasks to run
-        await asyncio.sleep(0)
+        return True
+
+    def _schedule(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> None:
+        match message_envelope:
+            case SendMessageEnvelope():
+                task = asyncio.create_task(self._process_send(message_envelope))
+            case PublishMessageEnvelope():
+                task = asyncio.create_task(self._process_publish(message_envelope))
+            case ResponseMessageEnvelope():
+                task = asyncio.create_task(self._process_response(message_envelope))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
     def start(self) -> None:
         """Start the runtime message processing loop. This runs in a background task.
@@ -757,7 +913,7 @@ async def stop(self) -> None:
             await self._run_context.stop()
         finally:
             self._run_context = None
-            self._message_queue = Queue()
+            self._message_queue = self._create_message_queue()
 
     async def stop_when_idle(self) -> None:
         """Stop the runtime message processing loop when there is
@@ -769,7 +925,7 @@ async def stop_when_idle(self) -> None:
             await self._run_context.stop_when_idle()
         finally:
             self._run_context = None
-            self._message_queue = Queue()
+            self._message_queue = self._create_message_queue()
 
     async def stop_when(self, condition: Callable[[], bool]) -> None:
         """Stop the runtime message processing loop when the condition is met.
@@ -790,7 +946,7 @@ async def stop_when(self, condition: Callable[[], bool]) -> None:
         await self._run_context.stop_when(condition)
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = self._create_message_queue()
 
     async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
         return (await self._get_agent(agent)).metadata
@@ -912,6 +1068,9 @@ def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[M
         self._serialization_registry.add_serializer(serializer)
 
     def _try_serialize(self, message: Any) -> str:
+        # The payload is only used for structured event logging, so skip the encoding when no one is listening.
+        if not event_logger.isEnabledFor(logging.INFO):
+            return ""
         try:
             type_name = self._serialization_registry.type_name(message)
             return self._serialization_registry.serialize(
@@ -292,3 +292,51 @@ def __init__(
     # This must output the event in a json serializable format
     def __str__(self) -> str:
         return json.dumps(self.kwargs)
+
+
+class QueueMetricsEvent:
+    def __init__(
+        self,
+        *,
+        queue_name: str,
+        reason: str,
+        depth: int,
+        maxsize: int,
+        high_water_mark: int,
+        dropped: int,
+        rejected: int,
+        blocked_puts: int,
+        total_put_wait_seconds: float,
+        max_put_wait_seconds: float,
+        **kwargs: Any,
+    ) -> None:
+        """Metrics of a bounded queue, logged when the queue overflows or reaches a new high-water mark.
+
+        Args:
+            queue_name (str): The name of the queue.
+            reason (str): Why the event was logged: "high_water_mark", "blocked", "dropped", "rejected" or "snapshot".
+            depth (int): The number of items in the queue.
+            maxsize (int): The maximum number of items in the queue, 0 if the queue is unbounded.
+            high_water_mark (int): The largest depth the queue has reached.
+            dropped (int): The number of items discarded by the "drop_oldest" overflow policy.
+            rejected (int): The number of puts rejected by the "raise" overflow policy.
+            blocked_puts (int): The number of puts that had to wait for a free slot.
+            total_put_wait_seconds (float): The total time puts waited for a free slot.
+            max_put_wait_seconds (float): The longest time a single put waited for a free slot.
+        """
+        self.kwargs = kwargs
+        self.kwargs["queue_name"] = queue_name
+        self.kwargs["reason"] = reason
+        self.kwargs["depth"] = depth
+        self.kwargs["maxsize"] = maxsize
+        self.kwargs["high_water_mark"] = high_water_mark
+        self.kwargs["dropped"] = dropped
+        self.kwargs["rejected"] = rejected
+        self.kwargs["blocked_puts"] = blocked_puts
+        self.kwargs["total_put_wait_seconds"] = total_put_wait_seconds
+        self.kwargs["max_put_wait_seconds"] = max_put_wait_seconds
+        self.kwargs["type"] = "QueueMetrics"
+
+    # This must output the event in a json serializable format
+    def __str__(self) -> str:
+        return json.dumps(self.kwargs)
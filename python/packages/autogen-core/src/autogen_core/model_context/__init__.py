@@ -1,6 +1,10 @@
 from ._buffered_chat_completion_context import BufferedChatCompletionContext
 from ._chat_completion_context import ChatCompletionContext, ChatCompletionContextState
 from ._head_and_tail_chat_completion_context import HeadAndTailChatCompletionContext
+from ._summarizing_chat_completion_context import (
+    SummarizingChatCompletionContext,
+    SummarizingChatCompletionContextState,
+)
 from ._token_limited_chat_completion_context import TokenLimitedChatCompletionContext
 from ._unbounded_chat_completion_context import (
     UnboundedChatCompletionContext,
@@ -13,4 +17,6 @@
     "BufferedChatCompletionContext",
     "TokenLimitedChatCompletionContext",
     "HeadAndTailChatCompletionContext",
+    "SummarizingChatCompletionContext",
+    "SummarizingChatCompletionContextState",
 ]
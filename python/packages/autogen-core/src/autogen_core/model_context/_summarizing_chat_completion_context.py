@@ -0,0 +1,274 @@
+import asyncio
+import logging
+from typing import Any, List, Mapping
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import Self
+
+from .._component_config import Component, ComponentModel
+from ..models import (
+    AssistantMessage,
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from ._chat_completion_context import ChatCompletionContext, ChatCompletionContextState
+
+logger = logging.getLogger("autogen_core")
+
+DEFAULT_SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation. You are given the current summary, which may be empty, "
+    "and the next part of the conversation. Write an updated summary that keeps the facts, decisions, open "
+    "questions and results of function calls needed to continue the conversation. Reply with the summary only."
+)
+
+_llm_message_adapter: TypeAdapter[LLMMessage] = TypeAdapter(LLMMessage)
+
+
+class SummarizingChatCompletionContextConfig(BaseModel):
+    model_client: ComponentModel
+    token_watermark: int
+    keep_recent: int = 6
+    summary_prompt: str = DEFAULT_SUMMARY_PROMPT
+    spill_path: str | None = None
+    initial_messages: List[LLMMessage] | None = None
+
+
+class SummarizingChatCompletionContextState(ChatCompletionContextState):
+    summary: str | None = None
+
+
+class SummarizingChatCompletionContext(ChatCompletionContext, Component[SummarizingChatCompletionContextConfig]):
+    """(Experimental) A chat completion context that compacts older messages into a running summary.
+
+    When the token count of the context crosses `token_watermark`, a background task asks the model client
+    to fold all but the `keep_recent` most recent messages into the summary, and the folded messages are
+    removed from memory. :meth:`get_messages` never waits for the summary: it returns the current summary,
+    as a :class:`~autogen_core.models.UserMessage` from the ``"summary"`` source, followed by the messages
+    that have not been compacted yet, including any that arrived while the summary was being written.
+
+    If `spill_path` is set, compacted messages are appended to that file, one JSON document per line,
+    before they are dropped from memory, and can be read back with :meth:`get_spilled_messages`.
+    Otherwise the summary is the only record of them.
+
+    Args:
+        model_client (ChatCompletionClient): The model client used to count tokens and to write the summary.
+        token_watermark (int): The token count above which the context is compacted.
+        keep_recent (int, optional): The number of most recent messages that are never compacted. Defaults to 6.
+        summary_prompt (str, optional): The system prompt for writing the summary.
+        spill_path (str | None, optional): A file to append compacted messages to. Defaults to None.
+        initial_messages (List[LLMMessage] | None, optional): The initial messages.
+
+    .. note::
+
+        A failed summary request is logged and leaves the messages in the context; compaction is retried
+        when the next message is added. Use :meth:`wait_for_compaction` to wait for a running compaction,
+        for example before saving the state.
+
+    """
+
+    component_config_schema = SummarizingChatCompletionContextConfig
+    component_provider_override = "autogen_core.model_context.SummarizingChatCompletionContext"
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        *,
+        token_watermark: int,
+        keep_recent: int = 6,
+        summary_prompt: str = DEFAULT_SUMMARY_PROMPT,
+        spill_path: str | None = None,
+        initial_messages: List[LLMMessage] | None = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        if token_watermark <= 0:
+            raise ValueError("token_watermark must be greater than 0.")
+        if keep_recent < 0:
+            raise ValueError("keep_recent must be non-negative.")
+        self._model_client = model_client
+        self._token_watermark = token_watermark
+        self._keep_recent = keep_recent
+        self._summary_prompt = summary_prompt
+        self._spill_path = spill_path
+        self._summary: str | None = None
+        self._summary_token_count = 0
+        # Token count of each message in self._messages, in the same order.
+        self._message_token_counts: List[int] = self._count_messages(self._messages)
+        self._compaction_task: asyncio.Task[None] | None = None
+        # Incremented by clear and load_state so that a running compaction does not apply a stale result.
+        self._generation = 0
+
+    @property
+    def summary(self) -> str | None:
+        """The summary of the compacted messages, or None if nothing has been compacted."""
+        return self._summary
+
+    @property
+    def token_count(self) -> int:
+        """The token count of the summary and the messages that have not been compacted."""
+        return self._summary_token_count + sum(self._message_token_counts)
+
+    async def add_message(self, message: LLMMessage) -> None:
+        """Add a message to the context and start compacting in the background if the watermark is crossed."""
+        await super().add_message(message)
+        self._message_token_counts.append(self._count_message(message))
+        if self.token_count > self._token_watermark and self._compaction_boundary() > 0:
+            if self._compaction_task is None or self._compaction_task.done():
+                self._compaction_task = asyncio.create_task(self._compact())
+
+    async def get_messages(self) -> List[LLMMessage]:
+        """Get the summary followed by the messages that have not been compacted."""
+        messages: List[LLMMessage] = list(self._messages)
+        if self._summary is not None:
+            messages.insert(0, self._summary_message(self._summary))
+        return messages
+
+    async def wait_for_compaction(self) -> None:
+        """Wait for a running compaction, if any, to finish."""
+        if self._compaction_task is not None:
+            await asyncio.shield(self._compaction_task)
+
+    async def get_spilled_messages(self) -> List[LLMMessage]:
+        """Read the compacted messages back from `spill_path`. Returns an empty list if it is not set."""
+        if self._spill_path is None:
+            return []
+        return await asyncio.to_thread(self._read_spill_file, self._spill_path)
+
+    async def clear(self) -> None:
+        self._cancel_compaction()
+        await super().clear()
+        self._message_token_counts = []
+        self._summary = None
+        self._summary_token_count = 0
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return SummarizingChatCompletionContextState(messages=self._messages, summary=self._summary).model_dump()
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self._cancel_compaction()
+        loaded = SummarizingChatCompletionContextState.model_validate(state)
+        self._messages = loaded.messages
+        self._message_token_counts = self._count_messages(self._messages)
+        self._set_summary(loaded.summary)
+
+    def _cancel_compaction(self) -> None:
+        self._generation += 1
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
+
+    def _count_message(self, message: LLMMessage) -> int:
+        return self._model_client.count_tokens([message])
+
+    def _count_messages(self, messages: List[LLMMessage]) -> List[int]:
+        if not messages:
+            return []
+        return self._model_client.count_tokens_batch([[message] for message in messages])
+
+    def _set_summary(self, summary: str | None) -> None:
+        self._summary = summary
+        self._summary_token_count = 0 if summary is None else self._count_message(self._summary_message(summary))
+
+    @staticmethod
+    def _summary_message(summary: str) -> LLMMessage:
+        return UserMessage(content=f"Summary of the earlier conversation:\n{summary}", source="summary")
+
+    def _compaction_boundary(self) -> int:
+        """The number of leading messages to compact, keeping function results with their function calls."""
+        boundary = max(len(self._messages) - self._keep_recent, 0)
+        # Keep the function call that a kept function result answers.
+        while 0 < boundary < len(self._messages) and isinstance(
+            self._messages[boundary], FunctionExecutionResultMessage
+        ):
+            boundary -= 1
+        return boundary
+
+    async def _compact(self) -> None:
+        generation = self._generation
+        while self.token_count > self._token_watermark:
+            boundary = self._compaction_boundary()
+            if boundary == 0:
+                return
+            segment = self._messages[:boundary]
+            try:
+                summary = await self._summarize(segment)
+                if self._spill_path is not None:
+                    await asyncio.to_thread(self._append_spill_file, self._spill_path, segment)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Failed to compact the chat completion context.", exc_info=True)
+                return
+            if generation != self._generation:
+                return
+            # Messages are only appended while the summary is written, so the segment is still at the front.
+            del self._messages[:boundary]
+            del self._message_token_counts[:boundary]
+            self._set_summary(summary)
+
+    async def _summarize(self, segment: List[LLMMessage]) -> str:
+        transcript = "\n".join(_format_message(message) for message in segment)
+        result = await self._model_client.create(
+            [
+                SystemMessage(content=self._summary_prompt),
+                UserMessage(
+                    content=f"Current summary:\n{self._summary or ''}\n\nConversation:\n{transcript}", source="user"
+                ),
+            ]
+        )
+        if not isinstance(result.content, str):
+            raise ValueError("The model client did not return a text summary.")
+        return result.content
+
+    @staticmethod
+    def _append_spill_file(path: str, messages: List[LLMMessage]) -> None:
+        with open(path, "ab") as file:
+            for message in messages:
+                file.write(_llm_message_adapter.dump_json(message) + b"\n")
+
+    @staticmethod
+    def _read_spill_file(path: str) -> List[LLMMessage]:
+        try:
+            with open(path, "rb") as file:
+                return [_llm_message_adapter.validate_json(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _to_config(self) -> SummarizingChatCompletionContextConfig:
+        return SummarizingChatCompletionContextConfig(
+            model_client=self._model_client.dump_component(),
+            token_watermark=self._token_watermark,
+            keep_recent=self._keep_recent,
+            summary_prompt=self._summary_prompt,
+            spill_path=self._spill_path,
+            initial_messages=self._initial_messages,
+        )
+
+    @classmethod
+    def _from_config(cls, config: SummarizingChatCompletionContextConfig) -> Self:
+        return cls(
+            model_client=ChatCompletionClient.load_component(config.model_client),
+            token_watermark=config.token_watermark,
+            keep_recent=config.keep_recent,
+            summary_prompt=config.summary_prompt,
+            spill_path=config.spill_path,
+            initial_messages=config.initial_messages,
+        )
+
+
+def _format_message(message: LLMMessage) -> str:
+    if isinstance(message, SystemMessage):
+        return f"system: {message.content}"
+    if isinstance(message, UserMessage):
+        if isinstance(message.content, str):
+            return f"{message.source}: {message.content}"
+        parts = [part if isinstance(part, str) else "[image]" for part in message.content]
+        return f"{message.source}: {' '.join(parts)}"
+    if isinstance(message, AssistantMessage):
+        if isinstance(message.content, str):
+            return f"{message.source}: {message.content}"
+        calls = ", ".join(f"{call.name}({call.arguments})" for call in message.content)
+        return f"{message.source}: called {calls}"
+    return "\n".join(f"result of {result.name}: {result.content}" for result in message.content)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Mapping, Tuple
 
 from pydantic import BaseModel
 from typing_extensions import Self
@@ -14,6 +14,8 @@ class TokenLimitedChatCompletionContextConfig(BaseModel):
     token_limit: int | None = None
     tool_schema: List[ToolSchema] | None = None
     initial_messages: List[LLMMessage] | None = None
+    prefix_stable: bool = False
+    trim_target: float = 0.5
 
 
 class TokenLimitedChatCompletionContext(ChatCompletionContext, Component[TokenLimitedChatCompletionContextConfig]):
@@ -33,6 +35,24 @@ class TokenLimitedChatCompletionContext(ChatCompletionContext, Component[TokenLi
             :meth:`~autogen_core.models.ChatCompletionClient.remaining_tokens` method.
         tools (List[ToolSchema] | None): A list of tool schema to use in the context.
         initial_messages (List[LLMMessage] | None): A list of initial messages to include in the context.
+        prefix_stable (bool): Whether to keep the beginning of the returned messages the same from one
+            call to the next, so that providers can serve it from their prompt cache. By default,
+            messages are removed from the middle of the context until the rest fits, which changes the
+            messages after the removed ones on every call once the context is full. With `prefix_stable`,
+            the oldest messages are removed instead, and only when the messages no longer fit, down to
+            `trim_target` of the available tokens, so that the following calls append to an unchanged
+            prefix until the context is full again. Defaults to False.
+        trim_target (float): The fraction of the available tokens the messages are trimmed to when
+            `prefix_stable` is set. Defaults to 0.5.
+
+    .. note::
+
+        The token count of each message is computed once, when the message is added, and the
+        context is trimmed using a running sum of the counts. This relies on the token count of a
+        list of messages being the sum of the counts of its messages plus a fixed overhead, which
+        is checked once against the model client. Model clients that do not count tokens this way
+        fall back to counting the whole list after each removed message. Messages should not be
+        modified after they are added, as their cached token count would no longer be accurate.
 
     """
 
@@ -46,18 +66,106 @@ def __init__(
         token_limit: int | None = None,
         tool_schema: List[ToolSchema] | None = None,
         initial_messages: List[LLMMessage] | None = None,
+        prefix_stable: bool = False,
+        trim_target: float = 0.5,
     ) -> None:
         super().__init__(initial_messages)
         if token_limit is not None and token_limit <= 0:
             raise ValueError("token_limit must be greater than 0.")
+        if not 0 < trim_target <= 1:
+            raise ValueError("trim_target must be greater than 0 and at most 1.")
+        self._prefix_stable = prefix_stable
+        self._trim_target = trim_target
+        # With `prefix_stable`, the number of oldest messages that are no longer returned.
+        self._trimmed_messages = 0
         self._token_limit = token_limit
         self._model_client = model_client
         self._tool_schema = tool_schema or []
+        # Token count of each message without the fixed overhead, keyed by the id of the message.
+        # The message is kept alongside its count so that a reused id is not mistaken for a cached message.
+        self._message_token_counts: Dict[int, Tuple[LLMMessage, int]] = {}
+        # Token counts that do not depend on the messages, computed on first use.
+        self._empty_token_count: int | None = None
+        self._available_tokens: int | None = None
+        # Whether the model client counts a list of messages as the sum of its messages, checked on first use.
+        self._additive_token_count: bool | None = None
 
-    async def get_messages(self) -> List[LLMMessage]:
-        """Get at most `token_limit` tokens in recent messages. If the token limit is not
-        provided, then return as many messages as the remaining token allowed by the model client."""
-        messages = list(self._messages)
+    async def add_message(self, message: LLMMessage) -> None:
+        """Add a message to the context and count its tokens."""
+        await super().add_message(message)
+        if self._additive_token_count is not False:
+            self._message_token_count(message)
+
+    async def clear(self) -> None:
+        await super().clear()
+        self._message_token_counts = {}
+        self._trimmed_messages = 0
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        self._message_token_counts = {}
+        self._trimmed_messages = 0
+
+    def _message_token_count(self, message: LLMMessage) -> int:
+        cached = self._message_token_counts.get(id(message))
+        if cached is not None and cached[0] is message:
+            return cached[1]
+        if self._empty_token_count is None:
+            self._empty_token_count = self._model_client.count_tokens([])
+        count = self._model_client.count_tokens([message]) - self._empty_token_count
+        self._message_token_counts[id(message)] = (message, count)
+        return count
+
+    def _count_uncached_messages(self, messages: List[LLMMessage]) -> None:
+        """Count the messages that have no cached count, such as a loaded history, with one batch call."""
+        uncached = [
+            message for message in messages if self._message_token_counts.get(id(message), (None,))[0] is not message
+        ]
+        if not uncached:
+            return
+        if self._empty_token_count is None:
+            self._empty_token_count = self._model_client.count_tokens([])
+        counts = self._model_client.count_tokens_batch([[message] for message in uncached])
+        for message, count in zip(uncached, counts, strict=True):
+            self._message_token_counts[id(message)] = (message, count - self._empty_token_count)
+
+    def _available_message_tokens(self) -> int:
+        """The number of tokens available to messages once the tool schema and the fixed overhead are counted."""
+        if self._available_tokens is None:
+            if self._token_limit is None:
+                self._available_tokens = self._model_client.remaining_tokens([], tools=self._tool_schema)
+            else:
+                self._available_tokens = self._token_limit - self._model_client.count_tokens(
+                    [], tools=self._tool_schema
+                )
+        return self._available_tokens
+
+    def _check_additive_token_count(self, messages: List[LLMMessage], message_token_count: int) -> bool:
+        if self._token_limit is None:
+            remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
+            return remaining_tokens == self._available_message_tokens() - message_token_count
+        token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
+        return token_count == self._token_limit - self._available_message_tokens() + message_token_count
+
+    def _trim_with_cached_counts(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        """Remove messages from the middle until the rest fits, using the cached count of each message."""
+        self._count_uncached_messages(messages)
+        token_counts = [self._message_token_count(message) for message in messages]
+        message_token_count = sum(token_counts)
+        if self._additive_token_count is None:
+            self._additive_token_count = self._check_additive_token_count(messages, message_token_count)
+            if not self._additive_token_count:
+                # Fall back to counting the whole list, here and from now on.
+                return self._trim_with_full_counts(messages)
+        available_tokens = self._available_message_tokens()
+        while message_token_count > available_tokens and len(messages) > 0:
+            middle_index = len(messages) // 2
+            messages.pop(middle_index)
+            message_token_count -= token_counts.pop(middle_index)
+        return messages
+
+    def _trim_with_full_counts(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        """Remove messages from the middle until the rest fits, counting the remaining list after each removal."""
         if self._token_limit is None:
             remaining_tokens = self._model_client.remaining_tokens(messages, tools=self._tool_schema)
             while remaining_tokens < 0 and len(messages) > 0:
@@ -70,6 +178,69 @@ async def get_messages(self) -> List[LLMMessage]:
                 middle_index = len(messages) // 2
                 messages.pop(middle_index)
                 token_count = self._model_client.count_tokens(messages, tools=self._tool_schema)
+        return messages
+
+    def _used_tokens(self, messages: List[LLMMessage]) -> int:
+        """The number of the available message tokens taken by the messages, counting the whole list."""
+        if self._token_limit is None:
+            return self._available_message_tokens() - self._model_client.remaining_tokens(
+                messages, tools=self._tool_schema
+            )
+        return (
+            self._model_client.count_tokens(messages, tools=self._tool_schema)
+            - self._token_limit
+            + self._available_message_tokens()
+        )
+
+    def _trim_oldest(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        """Return the messages after the trimmed ones. When they do not fit, trim the oldest messages
+        until the rest take at most `trim_target` of the available tokens."""
+        messages = messages[self._trimmed_messages :]
+        if not messages:
+            return messages
+        available_tokens = self._available_message_tokens()
+        target_tokens = available_tokens * self._trim_target
+        token_counts: List[int] = []
+        message_token_count = 0
+        if self._additive_token_count is not False:
+            self._count_uncached_messages(messages)
+            token_counts = [self._message_token_count(message) for message in messages]
+            message_token_count = sum(token_counts)
+            if self._additive_token_count is None:
+                self._additive_token_count = self._check_additive_token_count(messages, message_token_count)
+        if self._additive_token_count:
+            if message_token_count <= available_tokens:
+                return messages
+            trimmed = 0
+            while trimmed < len(messages) and message_token_count > target_tokens:
+                message_token_count -= token_counts[trimmed]
+                trimmed += 1
+        else:
+            if self._used_tokens(messages) <= available_tokens:
+                return messages
+            trimmed = 0
+            while trimmed < len(messages) and self._used_tokens(messages[trimmed:]) > target_tokens:
+                trimmed += 1
+        self._trimmed_messages += trimmed
+        return messages[trimmed:]
+
+    async def get_messages(self) -> List[LLMMessage]:
+        """Get at most `token_limit` tokens in recent messages. If the token limit is not
+        provided, then return as many messages as the remaining token allowed by the model client."""
+        messages = list(self._messages)
+        if len(self._message_token_counts) > 2 * len(messages):
+            # Drop the counts of messages that are no longer in the context.
+            self._message_token_counts = {
+                id(message): self._message_token_counts[id(message)]
+                for message in messages
+                if id(message) in self._message_token_counts
+            }
+        if self._prefix_stable:
+            messages = self._trim_oldest(messages)
+        elif messages and self._additive_token_count is not False:
+            messages = self._trim_with_cached_counts(messages)
+        else:
+            messages = self._trim_with_full_counts(messages)
         if messages and isinstance(messages[0], FunctionExecutionResultMessage):
             # Handle the first message is a function call result message.
             # Remove the first message from the list.
@@ -82,6 +253,8 @@ def _to_config(self) -> TokenLimitedChatCompletionContextConfig:
             token_limit=self._token_limit,
             tool_schema=self._tool_schema,
             initial_messages=self._initial_messages,
+            prefix_stable=self._prefix_stable,
+            trim_target=self._trim_target,
         )
 
     @classmethod
@@ -91,4 +264,6 @@ def _from_config(cls, config: TokenLimitedChatCompletionContextConfig) -> Self:
             token_limit=config.token_limit,
             tool_schema=config.tool_schema,
             initial_messages=config.initial_messages,
+            prefix_stable=config.prefix_stable,
+            trim_target=config.trim_target,
         )
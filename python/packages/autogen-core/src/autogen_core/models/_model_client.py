@@ -2,7 +2,7 @@
 
 import warnings
 from abc import ABC, abstractmethod
-from typing import Literal, Mapping, Optional, Sequence, TypeAlias
+from typing import List, Literal, Mapping, Optional, Sequence, TypeAlias
 
 from pydantic import BaseModel
 from typing_extensions import Any, AsyncGenerator, Required, TypedDict, Union, deprecated
@@ -228,6 +228,25 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
     @abstractmethod
     def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int: ...
 
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        """Count the tokens of several message sequences at once.
+
+        Each element of ``messages`` is counted as if it was passed to :meth:`count_tokens`
+        with the same ``tools``, and the counts are returned in the same order.
+        The default implementation calls :meth:`count_tokens` for every sequence; clients
+        that tokenize locally override it to encode all the text of the batch in one pass.
+
+        Args:
+            messages (Sequence[Sequence[LLMMessage]]): The message sequences to count.
+            tools (Sequence[Tool | ToolSchema], optional): The tools included in every count. Defaults to [].
+
+        Returns:
+            List[int]: The token count of each message sequence.
+        """
+        return [self.count_tokens(item, tools=tools) for item in messages]
+
     # Deprecated
     @property
     @abstractmethod
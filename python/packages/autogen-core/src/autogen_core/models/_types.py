@@ -86,6 +86,13 @@ class FunctionExecutionResultMessage(BaseModel):
 class RequestUsage:
     prompt_tokens: int
     completion_tokens: int
+    cached_prompt_tokens: int = 0
+    """The number of prompt tokens read from the prompt cache of the provider, included in `prompt_tokens`."""
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """The fraction of the prompt tokens that were read from the prompt cache of the provider."""
+        return self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
 
 
 FinishReasons = Literal["stop", "length", "function_calls", "content_filter", "unknown"]
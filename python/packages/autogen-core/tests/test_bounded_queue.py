@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+from typing import List
+
+import pytest
+from autogen_core import EVENT_LOGGER_NAME, BoundedQueue
+from autogen_core.logging import QueueMetricsEvent
+
+
+class _EventCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: List[QueueMetricsEvent] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.msg, QueueMetricsEvent):
+            self.events.append(record.msg)
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_block() -> None:
+    queue = BoundedQueue[int]("test", maxsize=2)
+    await queue.put(1)
+    await queue.put(2)
+    assert queue.full()
+
+    put_task = asyncio.create_task(queue.put(3))
+    await asyncio.sleep(0.01)
+    assert not put_task.done()
+    assert await queue.get() == 1
+    await put_task
+
+    assert [queue.get_nowait(), queue.get_nowait()] == [2, 3]
+    metrics = queue.metrics
+    assert metrics.blocked_puts == 1
+    assert metrics.total_put_wait_seconds > 0
+    assert metrics.max_put_wait_seconds == metrics.total_put_wait_seconds
+    assert metrics.high_water_mark == 2
+    assert metrics.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drop_oldest() -> None:
+    dropped: List[int] = []
+    queue = BoundedQueue[int]("test", maxsize=2, overflow_policy="drop_oldest", on_drop=dropped.append)
+    for i in range(5):
+        await queue.put(i)
+
+    assert dropped == [0, 1, 2]
+    assert [queue.get_nowait(), queue.get_nowait()] == [3, 4]
+    queue.task_done()
+    queue.task_done()
+    # Dropped items are marked as done, so join does not wait for them.
+    await asyncio.wait_for(queue.join(), timeout=1)
+    assert queue.metrics.dropped == 3
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_raise() -> None:
+    queue = BoundedQueue[int]("test", maxsize=1, overflow_policy="raise")
+    await queue.put(1)
+    with pytest.raises(asyncio.QueueFull):
+        await queue.put(2)
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait(2)
+    assert queue.metrics.rejected == 2
+
+    # put_blocking waits for a free slot whatever the policy.
+    put_task = asyncio.create_task(queue.put_blocking(2))
+    await asyncio.sleep(0.01)
+    assert not put_task.done()
+    assert queue.get_nowait() == 1
+    await put_task
+    assert queue.get_nowait() == 2
+    assert queue.metrics.rejected == 2
+    assert queue.metrics.blocked_puts == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_metrics_events() -> None:
+    handler = _EventCollector()
+    logger = logging.getLogger(EVENT_LOGGER_NAME)
+    logger.addHandler(handler)
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        queue = BoundedQueue[int]("metrics", maxsize=6, overflow_policy="drop_oldest")
+        for i in range(7):
+            await queue.put(i)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+
+    events = [json.loads(str(event)) for event in handler.events]
+    # High-water marks are reported at powers of two and at the maximum size, then the overflow.
+    assert [(event["reason"], event["high_water_mark"]) for event in events] == [
+        ("high_water_mark", 1),
+        ("high_water_mark", 2),
+        ("high_water_mark", 4),
+        ("high_water_mark", 6),
+        ("dropped", 6),
+    ]
+    assert all(event["queue_name"] == "metrics" and event["type"] == "QueueMetrics" for event in events)
+
+
+def test_bounded_queue_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        BoundedQueue[int]("test", maxsize=-1)
+    with pytest.raises(ValueError):
+        BoundedQueue[int]("test", overflow_policy="unknown")  # type: ignore[arg-type]
@@ -1,6 +1,8 @@
+from typing import Dict, Optional
 from unittest.mock import Mock
 
-from autogen_core import CacheStore, InMemoryStore
+import pytest
+from autogen_core import AsyncCacheStore, CacheStore, CacheStoreMetrics, InMemoryStore
 
 
 def test_set_and_get_object_key_value() -> None:
@@ -46,3 +48,86 @@ def test_inmemory_store() -> None:
     key = "non_existent_key"
     default_value = 99
     assert store.get(key, default_value) == default_value
+
+
+@pytest.mark.asyncio
+async def test_inmemory_store_async() -> None:
+    store = InMemoryStore[int]()
+    await store.aset("a", 1)
+    assert await store.aget("a") == 1
+    assert store.get("a") == 1
+    assert await store.aget("b", 99) == 99
+
+    await store.amset({"b": 2, "c": 3})
+    assert await store.amget(["a", "b", "c", "d"]) == [1, 2, 3, None]
+    assert await store.amget(["d"], 0) == [0]
+
+
+class _DictAsyncStore(AsyncCacheStore[int]):
+    def __init__(self) -> None:
+        self.data: Dict[str, int] = {}
+
+    async def aget(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return self.data.get(key, default)
+
+    async def aset(self, key: str, value: int) -> None:
+        self.data[key] = value
+
+
+@pytest.mark.asyncio
+async def test_async_store_default_multi_key_operations() -> None:
+    store = _DictAsyncStore()
+    await store.amset({"a": 1, "b": 2})
+    assert store.data == {"a": 1, "b": 2}
+    assert await store.amget(["b", "a", "c"], -1) == [2, 1, -1]
+    assert await store.amget([]) == []
+
+
+def test_inmemory_store_lru_eviction() -> None:
+    store = InMemoryStore[int](max_size=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    # Reading "a" makes "b" the least recently used item.
+    assert store.get("a") == 1
+    store.set("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+    assert store.metrics == CacheStoreMetrics(size=2, hits=3, misses=1, evictions=1, expirations=0)
+
+
+def test_inmemory_store_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 100.0
+    monkeypatch.setattr("autogen_core._cache_store.time.monotonic", lambda: now)
+    store = InMemoryStore[int](ttl=10)
+    store.set("a", 1)
+    now = 105.0
+    assert store.get("a") == 1
+    now = 110.0
+    assert store.get("a", 0) == 0
+    assert store.metrics == CacheStoreMetrics(size=0, hits=1, misses=1, evictions=0, expirations=1)
+
+    # Setting an item again restarts its time to live.
+    store.set("a", 2)
+    now = 119.0
+    assert store.get("a") == 2
+
+    # Expired items that are never read again are discarded when items are set.
+    for key in ["b", "c", "d"]:
+        store.set(key, 3)
+    store.set("a", 4)
+    now = 129.5
+    store.set("e", 5)
+    assert list(store.store) == ["e"]
+    assert store.metrics.expirations == 5
+
+
+def test_inmemory_store_config() -> None:
+    store = InMemoryStore[int](max_size=5, ttl=1.5)
+    loaded = InMemoryStore[int].load_component(store.dump_component())
+    assert loaded.max_size == 5
+    assert loaded.ttl == 1.5
+    with pytest.raises(ValueError):
+        InMemoryStore[int](max_size=0)
+    with pytest.raises(ValueError):
+        InMemoryStore[int](ttl=0)
@@ -155,3 +155,28 @@ async def on_response(
 
     long_running_agent = await runtime.try_get_underlying_agent_instance(loopback, type=LoopbackAgent)
     assert long_running_agent.num_calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("message_batch_size", [1, 4])
+async def test_intervention_drop_publish_then_stop_when_idle(message_batch_size: int) -> None:
+    class DropPublishInterventionHandler(DefaultInterventionHandler):
+        async def on_publish(self, message: Any, *, message_context: MessageContext) -> Any | type[DropMessage]:
+            return DropMessage
+
+    runtime = SingleThreadedAgentRuntime(
+        intervention_handlers=[DropPublishInterventionHandler()], message_batch_size=message_batch_size
+    )
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(DefaultSubscription(agent_type="name"))
+    runtime.start()
+
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    # Dropped messages are marked as done so the runtime can become idle.
+    await runtime.stop_when_idle()
+
+    long_running_agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("name", key="default"), type=LoopbackAgent
+    )
+    assert long_running_agent.num_calls == 0
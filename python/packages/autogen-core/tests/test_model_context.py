@@ -1,21 +1,27 @@
-from typing import List
+from pathlib import Path
+from typing import List, Sequence
 
 import pytest
+from autogen_core import FunctionCall
 from autogen_core.model_context import (
     BufferedChatCompletionContext,
     HeadAndTailChatCompletionContext,
+    SummarizingChatCompletionContext,
     TokenLimitedChatCompletionContext,
     UnboundedChatCompletionContext,
 )
 from autogen_core.models import (
     AssistantMessage,
     ChatCompletionClient,
+    FunctionExecutionResult,
     FunctionExecutionResultMessage,
     LLMMessage,
     UserMessage,
 )
+from autogen_core.tools import Tool, ToolSchema
 from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
 
 
 @pytest.mark.asyncio
@@ -205,3 +211,193 @@ async def test_token_limited_model_context_openai_with_function_result(
     assert type(retrieved[0]) == UserMessage  # Function result should be removed
     assert type(retrieved[1]) == AssistantMessage
     assert type(retrieved[2]) == UserMessage
+
+
+class _CountingReplayClient(ReplayChatCompletionClient):
+    """Counts one token per word and records how many messages were tokenized."""
+
+    def __init__(self, overhead_per_call: int = 0) -> None:
+        super().__init__([])
+        self.tokenized_messages = 0
+        self.batch_calls = 0
+        self._overhead_per_call = overhead_per_call
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        self.tokenized_messages += len(messages)
+        # A non-zero overhead per call makes the count of a list differ from the sum of its messages.
+        overhead = self._overhead_per_call * len(messages) ** 2
+        return super().count_tokens(messages, tools=tools) + overhead
+
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        self.batch_calls += 1
+        return super().count_tokens_batch(messages, tools=tools)
+
+
+def _trim_by_full_count(client: ChatCompletionClient, messages: List[LLMMessage], token_limit: int) -> List[LLMMessage]:
+    messages = list(messages)
+    while client.count_tokens(messages) > token_limit and len(messages) > 0:
+        messages.pop(len(messages) // 2)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_token_limited_model_context_incremental_token_count() -> None:
+    model_client = _CountingReplayClient()
+    model_context = TokenLimitedChatCompletionContext(model_client=model_client, token_limit=500)
+    messages: List[LLMMessage] = [
+        UserMessage(content=" ".join(["word"] * (i % 7 + 1)), source="user") for i in range(300)
+    ]
+    for message in messages:
+        await model_context.add_message(message)
+
+    model_client.tokenized_messages = 0
+    retrieved = await model_context.get_messages()
+    assert retrieved == _trim_by_full_count(_CountingReplayClient(), messages, 500)
+    # Only the first call checks the counts against the whole list, without retokenizing per removed message.
+    assert model_client.tokenized_messages == len(messages)
+
+    model_client.tokenized_messages = 0
+    assert await model_context.get_messages() == retrieved
+    assert model_client.tokenized_messages == 0
+
+    # Counts are recomputed for messages loaded from state.
+    state = await model_context.save_state()
+    await model_context.clear()
+    await model_context.load_state(state)
+    model_client.batch_calls = 0
+    assert await model_context.get_messages() == retrieved
+    # The loaded messages are counted together in one batch.
+    assert model_client.batch_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_token_limited_model_context_non_additive_token_count() -> None:
+    model_client = _CountingReplayClient(overhead_per_call=1)
+    model_context = TokenLimitedChatCompletionContext(model_client=model_client, token_limit=60)
+    messages: List[LLMMessage] = [UserMessage(content="two words", source="user") for _ in range(20)]
+    for message in messages:
+        await model_context.add_message(message)
+
+    retrieved = await model_context.get_messages()
+    assert retrieved == _trim_by_full_count(_CountingReplayClient(overhead_per_call=1), messages, 60)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overhead_per_call", [0, 1])
+async def test_token_limited_model_context_prefix_stable(overhead_per_call: int) -> None:
+    model_client = _CountingReplayClient(overhead_per_call=overhead_per_call)
+    model_context = TokenLimitedChatCompletionContext(
+        model_client=model_client, token_limit=200, prefix_stable=True, trim_target=0.5
+    )
+    previous: List[LLMMessage] = []
+    trims = 0
+    for i in range(60):
+        await model_context.add_message(UserMessage(content=f"message {i} " + " ".join(["word"] * 8), source="user"))
+        if i < 4:
+            # Checking whether counts add up needs more than one message.
+            continue
+        retrieved = await model_context.get_messages()
+        assert model_client.count_tokens(retrieved) <= 200
+        if retrieved[: len(previous)] != previous:
+            # When the messages no longer fit, the oldest ones are removed down to about half the limit.
+            trims += 1
+            assert retrieved == (await model_context.get_messages())
+            assert model_client.count_tokens(retrieved) <= 100 + 10 * len(retrieved) ** 2 * overhead_per_call
+            assert retrieved[-1].content.startswith(f"message {i} ")  # type: ignore
+        previous = retrieved
+    # Between trims, the returned messages only grow at the end.
+    assert 0 < trims < 20
+
+    await model_context.clear()
+    await model_context.add_message(UserMessage(content="Hello!", source="user"))
+    assert len(await model_context.get_messages()) == 1
+
+    with pytest.raises(ValueError):
+        TokenLimitedChatCompletionContext(model_client=model_client, trim_target=0)
+
+
+def _words(count: int) -> str:
+    return " ".join(["word"] * count)
+
+
+@pytest.mark.asyncio
+async def test_summarizing_model_context(tmp_path: Path) -> None:
+    model_client = ReplayChatCompletionClient(["first summary", "second summary"])
+    spill_path = str(tmp_path / "spill.jsonl")
+    model_context = SummarizingChatCompletionContext(
+        model_client=model_client, token_watermark=20, keep_recent=2, spill_path=spill_path
+    )
+    messages: List[LLMMessage] = [UserMessage(content=_words(5), source="user") for _ in range(5)]
+    for message in messages:
+        await model_context.add_message(message)
+
+    # The compaction runs in the background, so the messages are returned as they are until it completes.
+    assert await model_context.get_messages() == messages
+    await model_context.wait_for_compaction()
+
+    retrieved = await model_context.get_messages()
+    assert model_context.summary == "first summary"
+    assert retrieved[1:] == messages[3:]
+    assert isinstance(retrieved[0], UserMessage) and "first summary" in retrieved[0].content
+    assert len(model_client.create_calls) == 1
+    assert await model_context.get_spilled_messages() == messages[:3]
+
+    # The next compaction folds the previous summary into the new one.
+    for message in messages:
+        await model_context.add_message(message)
+    await model_context.wait_for_compaction()
+    assert model_context.summary == "second summary"
+    assert "first summary" in model_client.create_calls[1]["messages"][1].content
+    assert (await model_context.get_messages())[1:] == messages[3:]
+    assert await model_context.get_spilled_messages() == messages[:3] + messages[3:] + messages[:3]
+
+    state = await model_context.save_state()
+    await model_context.clear()
+    assert await model_context.get_messages() == []
+    await model_context.load_state(state)
+    assert model_context.summary == "second summary"
+    assert (await model_context.get_messages())[1:] == messages[3:]
+
+
+@pytest.mark.asyncio
+async def test_summarizing_model_context_keeps_function_results_with_calls() -> None:
+    model_client = ReplayChatCompletionClient(["summary"])
+    model_context = SummarizingChatCompletionContext(model_client=model_client, token_watermark=10, keep_recent=1)
+    messages: List[LLMMessage] = [
+        UserMessage(content=_words(10), source="user"),
+        AssistantMessage(content=[FunctionCall(id="1", arguments="{}", name="tool")], source="assistant"),
+        FunctionExecutionResultMessage(
+            content=[FunctionExecutionResult(content=_words(5), call_id="1", is_error=False, name="tool")]
+        ),
+    ]
+    for message in messages:
+        await model_context.add_message(message)
+    await model_context.wait_for_compaction()
+
+    assert (await model_context.get_messages())[1:] == messages[1:]
+
+
+@pytest.mark.asyncio
+async def test_summarizing_model_context_failed_compaction() -> None:
+    # No responses are available, so the summary request fails and the messages are kept.
+    model_client = ReplayChatCompletionClient([])
+    model_context = SummarizingChatCompletionContext(model_client=model_client, token_watermark=5, keep_recent=1)
+    messages: List[LLMMessage] = [UserMessage(content=_words(5), source="user") for _ in range(3)]
+    for message in messages:
+        await model_context.add_message(message)
+    await model_context.wait_for_compaction()
+
+    assert model_context.summary is None
+    assert await model_context.get_messages() == messages
+
+
+def test_summarizing_model_context_serialization() -> None:
+    model_context = SummarizingChatCompletionContext(
+        model_client=ReplayChatCompletionClient(["summary"]), token_watermark=100, keep_recent=3
+    )
+    config = model_context.dump_component()
+    loaded = SummarizingChatCompletionContext.load_component(config)
+    assert isinstance(loaded, SummarizingChatCompletionContext)
+    assert loaded.dump_component() == config
@@ -1,6 +1,6 @@
 import logging
 from dataclasses import dataclass
-from typing import Callable, cast
+from typing import Callable, List, Tuple, cast
 
 import pytest
 from autogen_core import (
@@ -219,3 +219,61 @@ async def test_rpc() -> None:
     agent = await runtime.try_get_underlying_agent_instance(agent_id, type=RPCAgent)
     assert agent.num_calls[0] == 1
     assert agent.num_calls[1] == 1
+
+
+@dataclass
+class BaseEventMessage:
+    value: str
+
+
+@dataclass
+class DerivedEventMessage(BaseEventMessage):
+    pass
+
+
+class InheritanceAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that handles a message type and its subclasses.")
+        self.handled: List[Tuple[str, str]] = []
+
+    @rpc
+    async def on_base(self, message: BaseEventMessage, ctx: MessageContext) -> str:
+        self.handled.append(("base", message.value))
+        return "base"
+
+    @rpc(match=lambda msg, ctx: msg.value == "special")  # type: ignore
+    async def on_derived(self, message: DerivedEventMessage, ctx: MessageContext) -> str:
+        self.handled.append(("derived", message.value))
+        return "derived"
+
+
+class InheritanceAgentSubclass(InheritanceAgent):
+    @rpc
+    async def on_derived(self, message: DerivedEventMessage, ctx: MessageContext) -> str:  # type: ignore[override]
+        self.handled.append(("subclass", message.value))
+        return "subclass"
+
+
+@pytest.mark.asyncio
+async def test_routed_agent_dispatch_along_mro() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await InheritanceAgent.register(runtime, "inheritance", InheritanceAgent)
+    await InheritanceAgentSubclass.register(runtime, "subclass", InheritanceAgentSubclass)
+    runtime.start()
+
+    agent_id = AgentId("inheritance", "default")
+    assert await runtime.send_message(BaseEventMessage("a"), agent_id) == "base"
+    # The handler of the most specific type is tried first.
+    assert await runtime.send_message(DerivedEventMessage("special"), agent_id) == "derived"
+    # A subclass message falls back to the handler of its base class.
+    assert await runtime.send_message(DerivedEventMessage("b"), agent_id) == "base"
+
+    # A subclass of the agent has its own dispatch table.
+    subclass_id = AgentId("subclass", "default")
+    assert await runtime.send_message(DerivedEventMessage("c"), subclass_id) == "subclass"
+    assert await runtime.send_message(BaseEventMessage("d"), subclass_id) == "base"
+    await runtime.stop()
+
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=InheritanceAgent)
+    assert agent.handled == [("base", "a"), ("derived", "special"), ("base", "b")]
+    assert InheritanceAgent._dispatch_table() is not InheritanceAgentSubclass._dispatch_table()  # type: ignore[reportPrivateUsage]
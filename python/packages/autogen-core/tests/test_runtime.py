@@ -1,7 +1,9 @@
+import asyncio
 import logging
 
 import pytest
 from autogen_core import (
+    EVENT_LOGGER_NAME,
     AgentId,
     AgentInstantiationContext,
     AgentType,
@@ -16,9 +18,11 @@
     type_subscription,
 )
 from autogen_core._default_subscription import default_subscription
+from autogen_core.exceptions import MessageDroppedException
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
+    ContentMessage,
     LoopbackAgent,
     LoopbackAgentWithDefaultSubscription,
     MessageType,
@@ -142,7 +146,8 @@ async def agent_factory() -> LoopbackAgent:
 
 
 @pytest.mark.asyncio
-async def test_register_receives_publish_cascade() -> None:
+@pytest.mark.parametrize("message_batch_size", [1, 16])
+async def test_register_receives_publish_cascade(message_batch_size: int) -> None:
     num_agents = 5
     num_initial_messages = 5
     max_rounds = 5
@@ -150,7 +155,7 @@ async def test_register_receives_publish_cascade() -> None:
     for i in range(0, max_rounds):
         total_num_calls_expected += num_initial_messages * ((num_agents - 1) ** i)
 
-    runtime = SingleThreadedAgentRuntime()
+    runtime = SingleThreadedAgentRuntime(message_batch_size=message_batch_size)
 
     # Register agents
     for i in range(num_agents):
@@ -310,3 +315,130 @@ async def test_event_handler_exception_multi_message() -> None:
         await runtime.stop_when_idle()
 
     await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_batched_send_and_publish() -> None:
+    runtime = SingleThreadedAgentRuntime(message_batch_size=8)
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+    runtime.start()
+
+    # Responses and published messages are drained from the queue in the same batches.
+    responses = await asyncio.gather(
+        *[runtime.send_message(ContentMessage(content=str(i)), AgentId("name", str(i))) for i in range(20)]
+    )
+    assert [response.content for response in responses] == [str(i) for i in range(20)]
+
+    for i in range(20):
+        await runtime.publish_message(ContentMessage(content=str(i)), topic_id=TopicId("default", "default"))
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert [message.content for message in agent.received_messages] == [str(i) for i in range(20)]
+
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(message_batch_size=0)
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_batched_event_handler_exception_propogates() -> None:
+    runtime = SingleThreadedAgentRuntime(ignore_unhandled_exceptions=False, message_batch_size=4)
+    await FailingAgent.register(runtime, "name", FailingAgent)
+
+    with pytest.raises(ValueError, match="Test exception"):
+        runtime.start()
+        await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+        await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+        await runtime.stop_when_idle()
+
+    await runtime.close()
+
+
+def test_try_serialize_skipped_without_event_listener() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    message = ContentMessage(content="hello")
+
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    previous_level = event_logger.level
+    try:
+        event_logger.setLevel(logging.WARNING)
+        assert runtime._try_serialize(message) == ""  # type: ignore[reportPrivateUsage]
+        event_logger.setLevel(logging.INFO)
+        assert runtime._try_serialize(message) == '{"content": "hello"}'  # type: ignore[reportPrivateUsage]
+    finally:
+        event_logger.setLevel(previous_level)
+
+
+@pytest.mark.asyncio
+async def test_bounded_message_queue_blocks_sender() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2)
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+
+    # The runtime is not started, so the queue fills up and the third publish waits for a free slot.
+    for i in range(2):
+        await runtime.publish_message(ContentMessage(content=str(i)), topic_id=TopicId("default", "default"))
+    blocked_publish = asyncio.create_task(
+        runtime.publish_message(ContentMessage(content="2"), topic_id=TopicId("default", "default"))
+    )
+    await asyncio.sleep(0.01)
+    assert not blocked_publish.done()
+    assert runtime.unprocessed_messages_count == 2
+
+    runtime.start()
+    await blocked_publish
+    metrics = runtime.message_queue_metrics
+    assert metrics.blocked_puts == 1
+    assert metrics.high_water_mark == 2
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert [message.content for message in agent.received_messages] == ["0", "1", "2"]
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_message_queue_drop_oldest() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=1, queue_overflow_policy="drop_oldest")
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+
+    dropped_send = asyncio.create_task(runtime.send_message(ContentMessage(content="send"), AgentId("name", "default")))
+    await asyncio.sleep(0.01)
+    await runtime.publish_message(ContentMessage(content="publish"), topic_id=TopicId("default", "default"))
+
+    # The sender of a dropped message is not left waiting.
+    with pytest.raises(MessageDroppedException):
+        await dropped_send
+    assert runtime.message_queue_metrics.dropped == 1
+
+    runtime.start()
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert [message.content for message in agent.received_messages] == ["publish"]
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_message_queue_raise() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=1, queue_overflow_policy="raise")
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+
+    await runtime.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    with pytest.raises(asyncio.QueueFull):
+        await runtime.publish_message(MessageType(), topic_id=TopicId("default", "default"))
+    assert runtime.message_queue_metrics.rejected == 1
+
+    runtime.start()
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert agent.num_calls == 1
+
+    await runtime.close()
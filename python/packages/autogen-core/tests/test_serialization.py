@@ -1,15 +1,19 @@
+import gc
+import weakref
 from dataclasses import dataclass
 from typing import Union
 
 import pytest
 from autogen_core import Image
 from autogen_core._serialization import (
+    _KNOWN_SERIALIZERS_CACHE_SIZE,
     JSON_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     DataclassJsonMessageSerializer,
     MessageSerializer,
     PydanticJsonMessageSerializer,
     SerializationRegistry,
+    _known_serializers,
     try_get_known_serializers_for_type,
 )
 from PIL import Image as PILImage
@@ -188,6 +192,20 @@ class PydanticImageMessage(BaseModel):
     assert deserialized.image.image == image.image
 
 
+def test_image_encoding_is_cached() -> None:
+    image = Image(PILImage.new("RGB", (10, 10)))
+    encoded = image.to_base64()
+    assert image.to_base64() is encoded
+    assert image.data_uri.startswith("data:image/png;base64,")
+    assert image.data_uri is image.data_uri
+    assert Image.from_uri(image.data_uri).image.size == (10, 10)
+
+    # Assigning a new image resets the encoding.
+    image.image = PILImage.new("RGB", (20, 20))
+    assert image.to_base64() != encoded
+    assert Image.from_base64(image.to_base64()).image.size == (20, 20)
+
+
 def test_type_name_for_protos() -> None:
     type_name = SerializationRegistry().type_name(ProtoMessage())
     assert type_name == "agents.ProtoMessage"
@@ -200,3 +218,49 @@ def test_type_name_for_protos() -> None:
 
     type_name = SerializationRegistry().type_name(NestingProtoMessage)
     assert type_name == "agents.NestingProtoMessage"
+
+
+def test_known_serializers_are_cached() -> None:
+    serializers = try_get_known_serializers_for_type(PydanticMessage)
+    serializers_again = try_get_known_serializers_for_type(PydanticMessage)
+    # The serializer objects are reused, but each caller gets its own list.
+    assert serializers[0] is serializers_again[0]
+    assert serializers is not serializers_again
+    serializers.clear()
+    assert len(try_get_known_serializers_for_type(PydanticMessage)) == 1
+
+    assert try_get_known_serializers_for_type(int) == []
+
+    # Unsupported types are not cached and keep raising.
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            try_get_known_serializers_for_type(NestingDataclassMessage)
+
+
+def test_type_name_for_classes_and_instances() -> None:
+    registry = SerializationRegistry()
+    assert registry.type_name(DataclassMessage) == "DataclassMessage"
+    assert registry.type_name(DataclassMessage(message="hello")) == "DataclassMessage"
+    assert registry.type_name(PydanticMessage(message="hello")) == "PydanticMessage"
+    assert registry.type_name("a string") == "str"
+
+
+def test_serialization_caches_are_bounded() -> None:
+    registry = SerializationRegistry()
+
+    def create_message_type() -> "weakref.ref[type]":
+        message_type: type[object] = dataclass(type("DynamicMessage", (), {"__annotations__": {"message": str}}))
+        assert registry.type_name(message_type) == "DynamicMessage"
+        assert len(try_get_known_serializers_for_type(message_type)) == 1
+        return weakref.ref(message_type)
+
+    # The type name cache does not keep classes created at run time alive.
+    message_type_ref = create_message_type()
+    _known_serializers.cache_clear()
+    gc.collect()
+    assert message_type_ref() is None
+
+    # The serializer cache only keeps the most recently used classes.
+    for _ in range(_KNOWN_SERIALIZERS_CACHE_SIZE + 10):
+        create_message_type()
+    assert _known_serializers.cache_info().currsize == _KNOWN_SERIALIZERS_CACHE_SIZE
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+from autogen_core import (
+    AgentId,
+    AgentType,
+    CancellationToken,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    ShardedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    default_subscription,
+    message_handler,
+)
+from autogen_test_utils import (
+    CascadingAgent,
+    CascadingMessageType,
+    ContentMessage,
+    LoopbackAgent,
+    MessageType,
+)
+
+
+@dataclass
+class ThreadNameMessage:
+    pass
+
+
+class ThreadRecordingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that records the thread it runs on.")
+        self.thread_names: List[str] = []
+
+    @message_handler
+    async def handle_thread_name(self, message: ThreadNameMessage, ctx: MessageContext) -> str:
+        self.thread_names.append(threading.current_thread().name)
+        return threading.current_thread().name
+
+
+@default_subscription
+class RelayAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that forwards content to its peer by direct message.")
+
+    @message_handler
+    async def handle_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        response = await self.send_message(message, AgentId("loopback", self.id.key))
+        assert isinstance(response, ContentMessage)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_sharded_send_message_runs_on_owning_shard() -> None:
+    runtime = ShardedAgentRuntime(num_shards=3)
+    await ThreadRecordingAgent.register(runtime, "recorder", ThreadRecordingAgent)
+    runtime.start()
+
+    for key in ["a", "b", "c", "d", "e", "f"]:
+        agent_id = AgentId("recorder", key)
+        thread_name = await runtime.send_message(ThreadNameMessage(), agent_id)
+        assert thread_name == f"autogen-shard-{runtime.shard_index(agent_id)}"
+        # Messages for the same agent are always handled by the same shard.
+        assert await runtime.send_message(ThreadNameMessage(), agent_id) == thread_name
+
+    await runtime.stop()
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_publish_fans_out_across_shards() -> None:
+    runtime = ShardedAgentRuntime(num_shards=4)
+    await runtime.register_factory(type=AgentType("name"), agent_factory=LoopbackAgent, expected_class=LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+    runtime.start()
+
+    sources = [f"source_{i}" for i in range(20)]
+    for source in sources:
+        await runtime.publish_message(MessageType(), topic_id=TopicId("default", source))
+    await runtime.stop_when_idle()
+
+    runtime.start()
+    for source in sources:
+        agent = await runtime.try_get_underlying_agent_instance(AgentId("name", source), type=LoopbackAgent)
+        assert agent.num_calls == 1
+    assert len({runtime.shard_index(AgentId("name", source)) for source in sources}) > 1
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_per_agent_ordering() -> None:
+    runtime = ShardedAgentRuntime(num_shards=4)
+    await runtime.register_factory(type=AgentType("name"), agent_factory=LoopbackAgent, expected_class=LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+    runtime.start()
+
+    for i in range(50):
+        await runtime.publish_message(ContentMessage(content=str(i)), topic_id=TopicId("default", "default"))
+    await runtime.stop_when_idle()
+
+    runtime.start()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert [message.content for message in agent.received_messages] == [str(i) for i in range(50)]
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_cross_shard_send_from_handler() -> None:
+    runtime = ShardedAgentRuntime(num_shards=4)
+    await RelayAgent.register(runtime, "relay", RelayAgent)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+
+    keys = [f"key_{i}" for i in range(10)]
+    for key in keys:
+        response = await runtime.send_message(ContentMessage(content=key), AgentId("relay", key))
+        assert response == ContentMessage(content=key)
+    assert any(
+        runtime.shard_index(AgentId("relay", key)) != runtime.shard_index(AgentId("loopback", key)) for key in keys
+    )
+
+    await runtime.stop()
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_publish_cascade() -> None:
+    num_agents = 5
+    num_initial_messages = 5
+    max_rounds = 5
+    total_num_calls_expected = 0
+    for i in range(0, max_rounds):
+        total_num_calls_expected += num_initial_messages * ((num_agents - 1) ** i)
+
+    runtime = ShardedAgentRuntime(num_shards=3)
+    for i in range(num_agents):
+        await CascadingAgent.register(runtime, f"name{i}", lambda: CascadingAgent(max_rounds))
+
+    runtime.start()
+    for _ in range(num_initial_messages):
+        await runtime.publish_message(CascadingMessageType(round=1), DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    runtime.start()
+    for i in range(num_agents):
+        agent = await runtime.try_get_underlying_agent_instance(AgentId(f"name{i}", "default"), CascadingAgent)
+        assert agent.num_calls == total_num_calls_expected
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_save_and_load_state() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    runtime.start()
+
+    for key in ["a", "b", "c"]:
+        await runtime.send_message(MessageType(), AgentId("name", key))
+    state = await runtime.save_state()
+    assert set(state.keys()) == {"name/a", "name/b", "name/c"}
+    await runtime.load_state(state)
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_requires_start() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    with pytest.raises(RuntimeError):
+        await runtime.send_message(MessageType(), AgentId("name", "default"))
+    with pytest.raises(ValueError):
+        ShardedAgentRuntime(num_shards=0)
+
+
+@pytest.mark.asyncio
+async def test_sharded_stop_when() -> None:
+    runtime = ShardedAgentRuntime(num_shards=3)
+    await runtime.register_factory(type=AgentType("name"), agent_factory=LoopbackAgent, expected_class=LoopbackAgent)
+    await runtime.add_subscription(TypeSubscription("default", "name"))
+    runtime.start()
+
+    agents: List[LoopbackAgent] = []
+    cancellation_token = CancellationToken()
+    for i in range(10):
+        agent_id = AgentId("name", f"source_{i}")
+        await runtime.send_message(MessageType(), agent_id, cancellation_token=cancellation_token)
+        agents.append(await runtime.try_get_underlying_agent_instance(agent_id, type=LoopbackAgent))
+        await runtime.publish_message(MessageType(), TopicId("default", f"source_{i}"))
+    # The callbacks linking the caller's token to the shards are removed once the calls finish.
+    assert cancellation_token._callbacks == []  # type: ignore[reportPrivateUsage]
+
+    # The condition is checked as the shards process messages, rather than polled.
+    await asyncio.wait_for(runtime.stop_when(lambda: sum(agent.num_calls for agent in agents) == 20), timeout=5)
+    assert sum(agent.num_calls for agent in agents) == 20
@@ -5,8 +5,10 @@
     DefaultTopicId,
     SingleThreadedAgentRuntime,
     TopicId,
+    TypePrefixSubscription,
     TypeSubscription,
 )
+from autogen_core._runtime_impl_helpers import SubscriptionManager
 from autogen_core.exceptions import CantHandleException
 from autogen_test_utils import LoopbackAgent, MessageType
 
@@ -120,3 +122,92 @@ async def test_subscription_deduplication() -> None:
     default_subscription = DefaultSubscription(agent_type=agent_type)
     with pytest.raises(ValueError, match="Subscription already exists"):
         await runtime.add_subscription(default_subscription)
+
+
+class SourceSubscription:
+    """A subscription that is not indexed by topic type."""
+
+    def __init__(self, source: str, agent_type: str) -> None:
+        self._source = source
+        self._agent_type = agent_type
+
+    @property
+    def id(self) -> str:
+        return f"source-{self._source}-{self._agent_type}"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SourceSubscription) and self.id == other.id
+
+    def is_match(self, topic_id: TopicId) -> bool:
+        return topic_id.source == self._source
+
+    def map_to_agent(self, topic_id: TopicId) -> AgentId:
+        return AgentId(type=self._agent_type, key=topic_id.source)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_indexed_matching() -> None:
+    manager = SubscriptionManager()
+    topic = TopicId(type="chat:room", source="s1")
+
+    # Resolve once so the topic is cached before subscriptions change.
+    assert await manager.get_subscribed_recipients(topic) == []
+
+    type_sub = TypeSubscription("chat:room", "exact")
+    prefix_sub = TypePrefixSubscription("chat:", "prefix")
+    empty_prefix_sub = TypePrefixSubscription("", "everything")
+    other_prefix_sub = TypePrefixSubscription("chat:other", "other")
+    source_sub = SourceSubscription("s1", "source")
+    for sub in [type_sub, prefix_sub, empty_prefix_sub, other_prefix_sub, source_sub]:
+        await manager.add_subscription(sub)
+
+    # Recipients are ordered by when their subscription was added.
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("exact", "s1"),
+        AgentId("prefix", "s1"),
+        AgentId("everything", "s1"),
+        AgentId("source", "s1"),
+    ]
+    assert await manager.get_subscribed_recipients(TopicId(type="chat", source="s2")) == [
+        AgentId("everything", "s2"),
+    ]
+
+    await manager.remove_subscription(prefix_sub.id)
+    await manager.remove_subscription(source_sub.id)
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("exact", "s1"),
+        AgentId("everything", "s1"),
+    ]
+
+    # Re-adding puts the recipient at the end.
+    await manager.add_subscription(TypePrefixSubscription("chat:", "prefix"))
+    assert await manager.get_subscribed_recipients(topic) == [
+        AgentId("exact", "s1"),
+        AgentId("everything", "s1"),
+        AgentId("prefix", "s1"),
+    ]
+    assert len(manager.subscriptions) == 4
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_deduplication_and_removal() -> None:
+    manager = SubscriptionManager()
+
+    await manager.add_subscription(TypePrefixSubscription("a:", "agent"))
+    with pytest.raises(ValueError, match="Subscription already exists"):
+        await manager.add_subscription(TypePrefixSubscription("a:", "agent"))
+
+    source_sub = SourceSubscription("s1", "agent")
+    await manager.add_subscription(source_sub)
+    with pytest.raises(ValueError, match="Subscription already exists"):
+        await manager.add_subscription(SourceSubscription("s1", "agent"))
+
+    with pytest.raises(ValueError, match="Subscription does not exist"):
+        await manager.remove_subscription("missing")
+
+    recipients = await manager.get_subscribed_recipients(TopicId(type="a:b", source="s1"))
+    assert recipients == [AgentId("agent", "s1"), AgentId("agent", "s1")]
+    await manager.remove_subscription(source_sub.id)
+    # Lists returned earlier are not mutated.
+    assert len(recipients) == 2
+    assert await manager.get_subscribed_recipients(TopicId(type="a:b", source="s1")) == [AgentId("agent", "s1")]
@@ -442,6 +442,7 @@ async def on_messages_stream(
             final_usage = RequestUsage(
                 prompt_tokens=sum([u.prompt_tokens for u in self.model_usage]),
                 completion_tokens=sum([u.completion_tokens for u in self.model_usage]),
+                cached_prompt_tokens=sum([u.cached_prompt_tokens for u in self.model_usage]),
             )
             if isinstance(content, str):
                 yield Response(
@@ -1,7 +1,8 @@
-from typing import Any, Optional, TypeVar, cast
+import asyncio
+from typing import Any, List, Mapping, Optional, Sequence, TypeVar, cast
 
 import diskcache
-from autogen_core import CacheStore, Component
+from autogen_core import AsyncCacheStore, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -15,11 +16,15 @@ class DiskCacheStoreConfig(BaseModel):
     # Could add other diskcache.Cache parameters like size_limit, etc.
 
 
-class DiskCacheStore(CacheStore[T], Component[DiskCacheStoreConfig]):
+class DiskCacheStore(CacheStore[T], AsyncCacheStore[T], Component[DiskCacheStoreConfig]):
     """
     A typed CacheStore implementation that uses diskcache as the underlying storage.
     See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
 
+    The asynchronous methods of :class:`~autogen_core.AsyncCacheStore` run the SQLite
+    reads and writes of diskcache in a worker thread, so they do not block the event loop.
+    Multi-key operations use a single worker thread call.
+
     Args:
         cache_instance: An instance of diskcache.Cache.
                         The user is responsible for managing the DiskCache instance's lifetime.
@@ -37,6 +42,24 @@ def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
     def set(self, key: str, value: T) -> None:
         self.cache.set(key, cast(Any, value))  # type: ignore[reportUnknownMemberType]
 
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: T) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    async def amget(self, keys: Sequence[str], default: Optional[T] = None) -> List[Optional[T]]:
+        return await asyncio.to_thread(lambda: [self.get(key, default) for key in keys])
+
+    async def amset(self, items: Mapping[str, T]) -> None:
+        def _set_all() -> None:
+            # One transaction for all the items instead of one per item.
+            with self.cache.transact():  # type: ignore[reportUnknownMemberType]
+                for key, value in items.items():
+                    self.set(key, value)
+
+        await asyncio.to_thread(_set_all)
+
     def _to_config(self) -> DiskCacheStoreConfig:
         # Get directory from cache instance
         return DiskCacheStoreConfig(directory=self.cache.directory)
@@ -1,7 +1,8 @@
-from typing import Any, Dict, Optional, TypeVar, cast
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypeVar, cast
 
 import redis
-from autogen_core import CacheStore, Component
+import redis.asyncio
+from autogen_core import AsyncCacheStore, CacheStore, Component
 from pydantic import BaseModel
 from typing_extensions import Self
 
@@ -78,3 +79,91 @@ def _from_config(cls, config: RedisStoreConfig) -> Self:
             socket_timeout=config.socket_timeout,
         )
         return cls(redis_instance=redis_instance)
+
+
+class AsyncRedisStoreConfig(RedisStoreConfig):
+    """Configuration for AsyncRedisStore"""
+
+    max_connections: Optional[int] = None
+
+
+class AsyncRedisStore(AsyncCacheStore[T], Component[AsyncRedisStoreConfig]):
+    """
+    A typed AsyncCacheStore implementation that uses the asyncio client of redis as the underlying storage.
+    Lookups do not block the event loop, and multi-key operations use a single round trip.
+    See :class:`~autogen_ext.models.cache.ChatCompletionCache` for an example of usage.
+
+    Args:
+        redis_instance: An instance of `redis.asyncio.Redis`. Its connection pool is shared by
+                        all concurrent operations of the store.
+                        The user is responsible for managing the Redis instance's lifetime,
+                        unless the store was created from a configuration, in which case
+                        :meth:`close` closes it.
+    """
+
+    component_config_schema = AsyncRedisStoreConfig
+    component_provider_override = "autogen_ext.cache_store.redis.AsyncRedisStore"
+
+    def __init__(self, redis_instance: redis.asyncio.Redis):
+        self.cache = redis_instance
+        # Whether the store created the redis instance, and so closes it.
+        self._owns_instance = False
+
+    async def aget(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        value = cast(Optional[T], await self.cache.get(key))
+        if value is None:
+            return default
+        return value
+
+    async def aset(self, key: str, value: T) -> None:
+        await self.cache.set(key, cast(Any, value))
+
+    async def amget(self, keys: Sequence[str], default: Optional[T] = None) -> List[Optional[T]]:
+        if not keys:
+            return []
+        values = cast(List[Optional[T]], await self.cache.mget(keys))
+        return [default if value is None else value for value in values]
+
+    async def amset(self, items: Mapping[str, T]) -> None:
+        if items:
+            await self.cache.mset(cast(Any, dict(items)))
+
+    async def close(self) -> None:
+        """Close the redis instance and its connection pool, if the store was created from a configuration."""
+        if self._owns_instance:
+            await self.cache.aclose()
+
+    def _to_config(self) -> AsyncRedisStoreConfig:
+        connection_pool = self.cache.connection_pool
+        connection_kwargs: Dict[str, Any] = connection_pool.connection_kwargs  # type: ignore[reportUnknownMemberType]
+
+        username = connection_kwargs.get("username")
+        password = connection_kwargs.get("password")
+        socket_timeout = connection_kwargs.get("socket_timeout")
+
+        return AsyncRedisStoreConfig(
+            host=str(connection_kwargs.get("host", "localhost")),
+            port=int(connection_kwargs.get("port", 6379)),
+            db=int(connection_kwargs.get("db", 0)),
+            username=str(username) if username is not None else None,
+            password=str(password) if password is not None else None,
+            ssl=issubclass(connection_pool.connection_class, redis.asyncio.SSLConnection),
+            socket_timeout=float(socket_timeout) if socket_timeout is not None else None,
+            max_connections=connection_pool.max_connections,  # type: ignore[reportUnknownMemberType]
+        )
+
+    @classmethod
+    def _from_config(cls, config: AsyncRedisStoreConfig) -> Self:
+        redis_instance = redis.asyncio.Redis(
+            host=config.host,
+            port=config.port,
+            db=config.db,
+            username=config.username,
+            password=config.password,
+            ssl=config.ssl,
+            socket_timeout=config.socket_timeout,
+            max_connections=config.max_connections,
+        )
+        store = cls(redis_instance=redis_instance)
+        store._owns_instance = True
+        return store
@@ -0,0 +1,97 @@
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Generic, Hashable, List, Tuple, TypeVar
+
+from autogen_core.models import LLMMessage
+
+from .tokenizer import LRUCache
+
+T = TypeVar("T")
+
+_CacheKey = Tuple[int, Hashable]
+# Each field of a message, along with a copy of its items if it is a list.
+_FieldSnapshot = Tuple[Tuple[Any, Tuple[Any, ...] | None], ...]
+
+
+def _snapshot(message: LLMMessage) -> _FieldSnapshot:
+    return tuple((value, tuple(value) if isinstance(value, list) else None) for value in vars(message).values())
+
+
+def _is_unchanged(snapshot: _FieldSnapshot, cached_snapshot: _FieldSnapshot) -> bool:
+    if len(snapshot) != len(cached_snapshot):
+        return False
+    for (value, items), (cached_value, cached_items) in zip(snapshot, cached_snapshot, strict=True):
+        if value is not cached_value:
+            return False
+        if items is not None and (
+            cached_items is None
+            or len(items) != len(cached_items)
+            or not all(a is b for a, b in zip(items, cached_items, strict=True))
+        ):
+            return False
+    return True
+
+
+class MessageConversionCache(Generic[T]):
+    """Remembers what messages were converted to, so that a conversation history is not converted again
+    every time it is sent to a model or its tokens are counted.
+
+    Entries are keyed by the identity of the message and a key for the conversion, such as the model and
+    the model family. An entry is only used while none of the message's fields has been reassigned since it
+    was converted. Lists, such as the content of a message, are compared item by item, so items that are
+    appended, removed or replaced in place are noticed; the items themselves must not be modified. An entry
+    is dropped when its message is garbage collected. Values are shared by every caller and must not be
+    modified.
+
+    Args:
+        maxsize (int, optional): The number of conversions to keep. Defaults to 4096.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._entries: LRUCache[_CacheKey, Tuple["weakref.ref[LLMMessage]", _FieldSnapshot, T]] = LRUCache(maxsize)
+        # Entries of collected messages that could not be removed right away.
+        self._collected: Deque[_CacheKey] = deque()
+
+    def get_or_convert(self, message: LLMMessage, key: Hashable, convert: Callable[[LLMMessage], T]) -> T:
+        """Return the cached conversion of `message` for `key`, converting it with `convert` on a miss."""
+        self._remove_collected(blocking=True)
+        cache_key = (id(message), key)
+        snapshot = _snapshot(message)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            message_ref, cached_snapshot, value = entry
+            if message_ref() is message and _is_unchanged(snapshot, cached_snapshot):
+                return value
+        value = convert(message)
+        self._entries.put(cache_key, (weakref.ref(message, self._on_collected(cache_key)), snapshot, value))
+        return value
+
+    def _on_collected(self, cache_key: _CacheKey) -> Callable[["weakref.ref[LLMMessage]"], None]:
+        # Hold the cache weakly, so that the callbacks of live messages do not keep it alive.
+        cache_ref = weakref.ref(self)
+
+        def callback(_: "weakref.ref[LLMMessage]") -> None:
+            cache = cache_ref()
+            if cache is not None:
+                cache._collected.append(cache_key)
+                # The message can be collected while the cache is in use, including on this thread, so the
+                # entry is left for the next call rather than waiting for the cache.
+                cache._remove_collected(blocking=False)
+
+        return callback
+
+    def _remove_collected(self, blocking: bool) -> None:
+        keys: List[_CacheKey] = []
+        while self._collected:
+            try:
+                keys.append(self._collected.popleft())
+            except IndexError:
+                break
+        if keys and not self._entries.remove(keys, blocking=blocking):
+            self._collected.extend(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
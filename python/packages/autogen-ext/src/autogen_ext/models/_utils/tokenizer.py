@@ -0,0 +1,173 @@
+import functools
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Generic, Hashable, Iterable, List, Mapping, Protocol, Sequence, TypeVar
+
+from autogen_core import TRACE_LOGGER_NAME
+from autogen_core.tools import Tool, ToolSchema
+
+if TYPE_CHECKING:
+    import tiktoken
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Below this many uncached texts, encoding them one by one is cheaper than starting the thread pool of encode_batch.
+_MIN_ENCODE_BATCH_SIZE = 16
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A thread-safe mapping that keeps at most `maxsize` entries, evicting the least recently used one."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive.")
+        self._maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def remove(self, keys: Iterable[K], blocking: bool = True) -> bool:
+        """Remove the entries of `keys` that are present. If `blocking` is False and another caller holds the
+        cache, nothing is removed and False is returned."""
+        if not self._lock.acquire(blocking):
+            return False
+        try:
+            for key in keys:
+                self._data.pop(key, None)
+        finally:
+            self._lock.release()
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class Encoding(Protocol):
+    """The part of :class:`tiktoken.Encoding` used by :class:`TokenCounter`, so that the tokenizers of local
+    models can be counted with the same cache."""
+
+    def encode(self, text: str, /) -> Sequence[int]: ...
+
+    def encode_batch(self, text: List[str], /) -> Sequence[Sequence[int]]: ...
+
+
+class TokenCounter:
+    """Counts the tokens of strings with an encoding, remembering the counts of recently seen strings.
+
+    Chat histories are counted over and over as they grow, so most of the strings a client is asked to count
+    were already counted by a previous call. Strings are immutable, which makes them safe cache keys regardless
+    of what happens to the message objects that hold them.
+
+    Args:
+        encoding (Encoding): The encoding used to tokenize strings, such as a :class:`tiktoken.Encoding`.
+        maxsize (int, optional): The number of string counts to keep. Defaults to 8192.
+    """
+
+    def __init__(self, encoding: Encoding, maxsize: int = 8192) -> None:
+        self.encoding = encoding
+        self._text_counts: LRUCache[str, int] = LRUCache(maxsize)
+        # Keyed by a caller-chosen namespace and the serialized tool schema.
+        self._tool_counts: LRUCache[tuple[str, str], int] = LRUCache(1024)
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in `text`."""
+        cached = self._text_counts.get(text)
+        if cached is not None:
+            return cached
+        count = len(self.encoding.encode(text))
+        self._text_counts.put(text, count)
+        return count
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Return the number of tokens of every string in `texts`.
+
+        Strings that are not cached are encoded together with the `encode_batch` method of the encoding
+        when there are enough of them to make it worthwhile."""
+        counts: List[int | None] = [self._text_counts.get(text) for text in texts]
+        missing: Dict[str, List[int]] = {}
+        for index, count in enumerate(counts):
+            if count is None:
+                missing.setdefault(texts[index], []).append(index)
+        if missing:
+            missing_texts = list(missing)
+            if len(missing_texts) >= _MIN_ENCODE_BATCH_SIZE:
+                encoded = [len(tokens) for tokens in self.encoding.encode_batch(missing_texts)]
+            else:
+                encoded = [len(self.encoding.encode(text)) for text in missing_texts]
+            for text, count in zip(missing_texts, encoded, strict=True):
+                self._text_counts.put(text, count)
+                for index in missing[text]:
+                    counts[index] = count
+        return [count for count in counts if count is not None]
+
+    def get_tool_count(self, namespace: str, tool_schema: Mapping[str, Any]) -> int | None:
+        """Return the cached token count of a tool schema, as previously stored with :meth:`put_tool_count`."""
+        return self._tool_counts.get((namespace, _tool_schema_key(tool_schema)))
+
+    def put_tool_count(self, namespace: str, tool_schema: Mapping[str, Any], count: int) -> None:
+        """Store the token count of a tool schema.
+
+        Clients count tools differently, so `namespace` identifies the counting scheme that produced `count`."""
+        self._tool_counts.put((namespace, _tool_schema_key(tool_schema)), count)
+
+
+def _tool_schema_key(tool_schema: Mapping[str, Any]) -> str:
+    return json.dumps(tool_schema, sort_keys=True, default=str)
+
+
+def get_tool_schema(tool: Tool | ToolSchema) -> ToolSchema:
+    if isinstance(tool, Tool):
+        return tool.schema
+    assert isinstance(tool, dict)
+    return tool
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    """Return the tiktoken encoding for `model`, falling back to cl100k_base for unknown models.
+
+    Looking up the encoding of a model is done once per model name."""
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        trace_logger.warning(f"Model {model} not found. Using {DEFAULT_ENCODING} encoding.")
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+@functools.lru_cache(maxsize=None)
+def get_token_counter_for_encoding(encoding_name: str) -> TokenCounter:
+    """Return the :class:`TokenCounter` for the tiktoken encoding named `encoding_name`."""
+    import tiktoken
+
+    return TokenCounter(tiktoken.get_encoding(encoding_name))
+
+
+def get_token_counter(model: str) -> TokenCounter:
+    """Return the :class:`TokenCounter` for `model`. Models that share an encoding share a counter and its cache."""
+    return get_token_counter_for_encoding(get_encoding(model).name)
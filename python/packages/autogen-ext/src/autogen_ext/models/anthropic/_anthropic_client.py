@@ -19,12 +19,12 @@
     Optional,
     Sequence,
     Set,
+    Tuple,
     Union,
     cast,
     overload,
 )
 
-import tiktoken
 from anthropic import AsyncAnthropic, AsyncStream
 from anthropic.types import (
     Base64ImageSourceParam,
@@ -66,6 +66,8 @@
 from pydantic import BaseModel, SecretStr
 from typing_extensions import Self, Unpack
 
+from .._utils.message_cache import MessageConversionCache
+from .._utils.tokenizer import get_token_counter_for_encoding
 from . import _model_info
 from .config import AnthropicClientConfiguration, AnthropicClientConfigurationConfigModel
 
@@ -124,11 +126,8 @@ def type_to_role(message: LLMMessage) -> str:
 
 def get_mime_type_from_image(image: Image) -> Literal["image/jpeg", "image/png", "image/gif", "image/webp"]:
     """Get a valid Anthropic media type from an Image object."""
-    # Get base64 data first
-    base64_data = image.to_base64()
-
-    # Decode the base64 string
-    image_data = base64.b64decode(base64_data)
+    # Decode the start of the base64 data, which holds the signature of the format
+    image_data = base64.b64decode(image.to_base64()[:24])
 
     # Check the first few bytes for known signatures
     if image_data.startswith(b"\xff\xd8\xff"):
@@ -282,6 +281,16 @@ def to_anthropic_type(message: LLMMessage) -> Union[str, List[MessageParam], Mes
         return tool_message_to_anthropic(message)
 
 
+_anthropic_message_cache: MessageConversionCache[Union[str, List[MessageParam], MessageParam]] = (
+    MessageConversionCache()
+)
+
+
+def _to_anthropic_type_cached(message: LLMMessage) -> Union[str, List[MessageParam], MessageParam]:
+    """Like :func:`to_anthropic_type`, but reuses the conversion of a message that was converted before."""
+    return _anthropic_message_cache.get_or_convert(message, None, to_anthropic_type)
+
+
 def convert_tools(tools: Sequence[Tool | ToolSchema]) -> List[ToolParam]:
     result: List[ToolParam] = []
 
@@ -404,9 +413,50 @@ def _add_usage(usage1: RequestUsage, usage2: RequestUsage) -> RequestUsage:
     return RequestUsage(
         prompt_tokens=usage1.prompt_tokens + usage2.prompt_tokens,
         completion_tokens=usage1.completion_tokens + usage2.completion_tokens,
+        cached_prompt_tokens=usage1.cached_prompt_tokens + usage2.cached_prompt_tokens,
     )
 
 
+def _prompt_usage(usage: Any) -> Tuple[int, int]:
+    """The number of prompt tokens and of prompt tokens read from the prompt cache in an Anthropic usage.
+
+    Anthropic reports the tokens read from and written to the prompt cache separately from the other
+    input tokens, so they are added back to get the size of the whole prompt."""
+    input_tokens: int = getattr(usage, "input_tokens", 0) or 0
+    cache_creation_tokens: int = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    cache_read_tokens: int = getattr(usage, "cache_read_input_tokens", 0) or 0
+    return input_tokens + cache_creation_tokens + cache_read_tokens, cache_read_tokens
+
+
+def _with_cache_control(block: Any) -> Dict[str, Any]:
+    if isinstance(block, BaseModel):
+        block = block.model_dump(exclude_none=True)
+    return {**block, "cache_control": {"type": "ephemeral"}}
+
+
+def _add_cache_control(request_args: Dict[str, Any]) -> None:
+    """Mark the end of the tools, of the system prompt and of the messages of a request as
+    `prompt cache breakpoints <https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching>`_.
+
+    The request is read from the cache up to the longest marked prefix that was cached by an
+    earlier request, and the prefix ending at each marker is written to the cache. Converted
+    messages are shared between requests, so the marked blocks are copies."""
+    tools = request_args.get("tools")
+    if tools:
+        request_args["tools"] = [*tools[:-1], _with_cache_control(tools[-1])]
+    system = request_args.get("system")
+    if system:
+        request_args["system"] = [_with_cache_control({"type": "text", "text": system})]
+    messages = request_args["messages"]
+    if messages:
+        last_message = messages[-1]
+        content = last_message["content"]
+        blocks = [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+        if blocks:
+            blocks[-1] = _with_cache_control(blocks[-1])
+            request_args["messages"] = [*messages[:-1], {**last_message, "content": blocks}]
+
+
 class BaseAnthropicChatCompletionClient(ChatCompletionClient):
     def __init__(
         self,
@@ -414,8 +464,10 @@ def __init__(
         *,
         create_args: Dict[str, Any],
         model_info: Optional[ModelInfo] = None,
+        prompt_caching: bool = False,
     ):
         self._client = client
+        self._prompt_caching = prompt_caching
 
         if model_info is None:
             try:
@@ -534,9 +586,9 @@ async def create(
                 if system_message is not None:
                     # if that case, system message is must only one
                     raise ValueError("Multiple system messages are not supported")
-                system_message = to_anthropic_type(message)
+                system_message = _to_anthropic_type_cached(message)
             else:
-                anthropic_message = to_anthropic_type(message)
+                anthropic_message = _to_anthropic_type_cached(message)
                 if isinstance(anthropic_message, list):
                     anthropic_messages.extend(anthropic_message)
                 elif isinstance(anthropic_message, str):
@@ -579,6 +631,9 @@ async def create(
             if param in create_args:
                 request_args[param] = create_args[param]
 
+        if self._prompt_caching:
+            _add_cache_control(request_args)
+
         # Execute the request
         future: asyncio.Task[Message] = asyncio.ensure_future(self._client.messages.create(**request_args))  # type: ignore
 
@@ -588,9 +643,11 @@ async def create(
         result: Message = cast(Message, await future)  # type: ignore
 
         # Extract usage statistics
+        prompt_tokens, cached_prompt_tokens = _prompt_usage(result.usage)
         usage = RequestUsage(
-            prompt_tokens=result.usage.input_tokens,
+            prompt_tokens=prompt_tokens,
             completion_tokens=result.usage.output_tokens,
+            cached_prompt_tokens=cached_prompt_tokens,
         )
         serializable_messages: List[Dict[str, Any]] = [self._serialize_message(msg) for msg in anthropic_messages]
 
@@ -702,9 +759,9 @@ async def create_stream(
                 if system_message is not None:
                     # if that case, system message is must only one
                     raise ValueError("Multiple system messages are not supported")
-                system_message = to_anthropic_type(message)
+                system_message = _to_anthropic_type_cached(message)
             else:
-                anthropic_message = to_anthropic_type(message)
+                anthropic_message = _to_anthropic_type_cached(message)
                 if isinstance(anthropic_message, list):
                     anthropic_messages.extend(anthropic_message)
                 elif isinstance(anthropic_message, str):
@@ -748,6 +805,9 @@ async def create_stream(
             if param in create_args:
                 request_args[param] = create_args[param]
 
+        if self._prompt_caching:
+            _add_cache_control(request_args)
+
         # Stream the response
         stream_future: asyncio.Task[AsyncStream[RawMessageStreamEvent]] = asyncio.ensure_future(
             cast(Coroutine[Any, Any, AsyncStream[RawMessageStreamEvent]], self._client.messages.create(**request_args))
@@ -762,6 +822,7 @@ async def create_stream(
         tool_calls: Dict[str, Dict[str, Any]] = {}  # Track tool calls by ID
         current_tool_id: Optional[str] = None
         input_tokens: int = 0
+        cached_input_tokens: int = 0
         output_tokens: int = 0
         stop_reason: Optional[str] = None
 
@@ -818,7 +879,7 @@ async def create_stream(
             elif chunk.type == "message_start":
                 if hasattr(chunk, "message") and hasattr(chunk.message, "usage"):
                     if hasattr(chunk.message.usage, "input_tokens"):
-                        input_tokens = chunk.message.usage.input_tokens
+                        input_tokens, cached_input_tokens = _prompt_usage(chunk.message.usage)
                     if hasattr(chunk.message.usage, "output_tokens"):
                         output_tokens = chunk.message.usage.output_tokens
 
@@ -826,6 +887,7 @@ async def create_stream(
         usage = RequestUsage(
             prompt_tokens=input_tokens,
             completion_tokens=output_tokens,
+            cached_prompt_tokens=cached_input_tokens,
         )
 
         # Determine content based on what was received
@@ -899,9 +961,9 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
         """
         # Use cl100k_base encoding as an approximation for Claude's tokenizer
         try:
-            encoding = tiktoken.get_encoding("cl100k_base")
+            counter = get_token_counter_for_encoding("cl100k_base")
         except Exception:
-            encoding = tiktoken.get_encoding("gpt2")  # Fallback
+            counter = get_token_counter_for_encoding("gpt2")  # Fallback
 
         num_tokens = 0
 
@@ -913,7 +975,7 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
                 break
 
         if system_content:
-            num_tokens += len(encoding.encode(system_content)) + 15  # Approximate system message overhead
+            num_tokens += counter.count(system_content) + 15  # Approximate system message overhead
 
         # Message tokens
         for message in messages:
@@ -926,22 +988,22 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
             # Content tokens
             if isinstance(message, UserMessage) or isinstance(message, AssistantMessage):
                 if isinstance(message.content, str):
-                    num_tokens += len(encoding.encode(message.content))
+                    num_tokens += counter.count(message.content)
                 elif isinstance(message.content, list):
                     # Handle different content types
                     for part in message.content:
                         if isinstance(part, str):
-                            num_tokens += len(encoding.encode(part))
+                            num_tokens += counter.count(part)
                         elif isinstance(part, Image):
                             # Estimate vision tokens (simplified)
                             num_tokens += 512  # Rough estimation for image tokens
                         elif isinstance(part, FunctionCall):
-                            num_tokens += len(encoding.encode(part.name))
-                            num_tokens += len(encoding.encode(part.arguments))
+                            num_tokens += counter.count(part.name)
+                            num_tokens += counter.count(part.arguments)
                             num_tokens += 10  # Function call overhead
             elif isinstance(message, FunctionExecutionResultMessage):
                 for result in message.content:
-                    num_tokens += len(encoding.encode(result.content))
+                    num_tokens += counter.count(result.content)
                     num_tokens += 10  # Function result overhead
 
         # Tool tokens
@@ -952,9 +1014,9 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
                 tool_schema = tool
 
             # Name and description
-            num_tokens += len(encoding.encode(tool_schema["name"]))
+            num_tokens += counter.count(tool_schema["name"])
             if "description" in tool_schema:
-                num_tokens += len(encoding.encode(tool_schema["description"]))
+                num_tokens += counter.count(tool_schema["description"])
 
             # Parameters
             if "parameters" in tool_schema:
@@ -962,19 +1024,19 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
 
                 if "properties" in params:
                     for prop_name, prop_schema in params["properties"].items():
-                        num_tokens += len(encoding.encode(prop_name))
+                        num_tokens += counter.count(prop_name)
 
                         if "type" in prop_schema:
-                            num_tokens += len(encoding.encode(prop_schema["type"]))
+                            num_tokens += counter.count(prop_schema["type"])
 
                         if "description" in prop_schema:
-                            num_tokens += len(encoding.encode(prop_schema["description"]))
+                            num_tokens += counter.count(prop_schema["description"])
 
                         # Special handling for enums
                         if "enum" in prop_schema:
                             for value in prop_schema["enum"]:
                                 if isinstance(value, str):
-                                    num_tokens += len(encoding.encode(value))
+                                    num_tokens += counter.count(value)
                                 else:
                                     num_tokens += 2  # Non-string enum values
 
@@ -1019,6 +1081,11 @@ class AnthropicChatCompletionClient(
         top_p (float, optional): Controls diversity via nucleus sampling. Default is 1.0.
         top_k (int, optional): Controls diversity via top-k sampling. Default is -1 (disabled).
         model_info (ModelInfo, optional): The capabilities of the model. Required if using a custom model.
+        prompt_caching (bool, optional): Whether to mark the end of the tools, of the system prompt and of the
+            messages of each request as `prompt cache <https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching>`_
+            breakpoints, so that a request that repeats the beginning of an earlier one reads it from the cache.
+            The tokens read from the cache are reported in :attr:`~autogen_core.models.RequestUsage.cached_prompt_tokens`.
+            Default is False.
 
     To use this client, you must install the Anthropic extension:
 
@@ -1078,6 +1145,8 @@ def __init__(self, **kwargs: Unpack[AnthropicClientConfiguration]):
             model_info = kwargs["model_info"]
             del copied_args["model_info"]
 
+        prompt_caching = kwargs.get("prompt_caching") or False
+
         client = _anthropic_client_from_config(copied_args)
         create_args = _create_args_from_config(copied_args)
 
@@ -1085,6 +1154,7 @@ def __init__(self, **kwargs: Unpack[AnthropicClientConfiguration]):
             client=client,
             create_args=create_args,
             model_info=model_info,
+            prompt_caching=prompt_caching,
         )
 
     def __getstate__(self) -> Dict[str, Any]:
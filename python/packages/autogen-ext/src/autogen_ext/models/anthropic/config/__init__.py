@@ -29,6 +29,8 @@ class BaseAnthropicClientConfiguration(CreateArguments, total=False):
     timeout: Optional[float]
     max_retries: Optional[int]
     default_headers: Optional[Dict[str, str]]
+    prompt_caching: bool
+    """Whether to mark the tools, the system prompt and the messages of each request as prompt cache breakpoints."""
 
 
 class AnthropicClientConfiguration(BaseAnthropicClientConfiguration, total=False):
@@ -56,6 +58,7 @@ class BaseAnthropicClientConfigurationConfigModel(CreateArgumentsConfigModel):
     timeout: float | None = None
     max_retries: int | None = None
     default_headers: Dict[str, str] | None = None
+    prompt_caching: bool | None = None
 
 
 class AnthropicClientConfigurationConfigModel(BaseAnthropicClientConfigurationConfigModel):
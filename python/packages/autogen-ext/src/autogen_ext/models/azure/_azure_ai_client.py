@@ -60,6 +60,7 @@
     AzureAIChatCompletionClientConfig,
 )
 
+from .._utils.message_cache import MessageConversionCache
 from .._utils.parse_r1_content import parse_r1_content
 
 create_kwargs = set(getfullargspec(ChatCompletionsClient.complete).kwonlyargs)
@@ -154,6 +155,14 @@ def to_azure_message(message: LLMMessage) -> Sequence[AzureMessage]:
         return _tool_message_to_azure(message)
 
 
+_azure_message_cache: MessageConversionCache[Sequence[AzureMessage]] = MessageConversionCache()
+
+
+def _to_azure_message_cached(message: LLMMessage) -> Sequence[AzureMessage]:
+    """Like :func:`to_azure_message`, but reuses the conversion of a message that was converted before."""
+    return _azure_message_cache.get_or_convert(message, None, to_azure_message)
+
+
 def normalize_name(name: str) -> str:
     """
     LLMs sometimes ask functions while ignoring their own format requirements, this function should be used to replace invalid characters with "_".
@@ -320,6 +329,7 @@ def add_usage(self, usage: RequestUsage) -> None:
         self._total_usage = RequestUsage(
             self._total_usage.prompt_tokens + usage.prompt_tokens,
             self._total_usage.completion_tokens + usage.completion_tokens,
+            self._total_usage.cached_prompt_tokens + usage.cached_prompt_tokens,
         )
 
     def _validate_model_info(
@@ -370,7 +380,7 @@ async def create(
 
         self._validate_model_info(messages, tools, json_output, create_args)
 
-        azure_messages_nested = [to_azure_message(msg) for msg in messages]
+        azure_messages_nested = [_to_azure_message_cached(msg) for msg in messages]
         azure_messages = [item for sublist in azure_messages_nested for item in sublist]
 
         task: Task[ChatCompletions]
@@ -465,7 +475,7 @@ async def create_stream(
         self._validate_model_info(messages, tools, json_output, create_args)
 
         # azure_messages = [to_azure_message(m) for m in messages]
-        azure_messages_nested = [to_azure_message(msg) for msg in messages]
+        azure_messages_nested = [_to_azure_message_cached(msg) for msg in messages]
         azure_messages = [item for sublist in azure_messages_nested for item in sublist]
 
         if len(tools) > 0:
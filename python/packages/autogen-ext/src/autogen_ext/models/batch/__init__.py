@@ -0,0 +1,17 @@
+from ._batch_client import (
+    BatchBackend,
+    BatchChatCompletionClient,
+    BatchChatCompletionClientConfig,
+    BatchMetrics,
+    BatchRequest,
+    LocalBatchBackend,
+)
+
+__all__ = [
+    "BatchBackend",
+    "BatchChatCompletionClient",
+    "BatchChatCompletionClientConfig",
+    "BatchMetrics",
+    "BatchRequest",
+    "LocalBatchBackend",
+]
@@ -0,0 +1,461 @@
+import asyncio
+import logging
+import time
+import uuid
+import warnings
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Coroutine, Dict, List, Mapping, Optional, Sequence, Set, Union
+
+from autogen_core import TRACE_LOGGER_NAME, CancellationToken, Component, ComponentModel
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+from typing_extensions import Self
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+@dataclass
+class BatchRequest:
+    """A :meth:`~autogen_core.models.ChatCompletionClient.create` call submitted as part of a batch."""
+
+    custom_id: str
+    """The id of the request in its batch, which the batch results are keyed by."""
+    messages: Sequence[LLMMessage]
+    tools: Sequence[Tool | ToolSchema] = field(default_factory=list)
+    json_output: Optional[bool | type[BaseModel]] = None
+    extra_create_args: Mapping[str, Any] = field(default_factory=dict)
+
+
+class BatchBackend(ABC):
+    """Runs batches of requests as jobs, for example on the batch endpoint of a provider."""
+
+    @abstractmethod
+    async def submit(self, requests: Sequence[BatchRequest]) -> str:
+        """Submit a batch of requests and return the id of the batch job."""
+        ...
+
+    @abstractmethod
+    async def retrieve(self, batch_id: str) -> Optional[Mapping[str, Union[CreateResult, BaseException]]]:
+        """Return None while the batch job is running, and the result or the error of each request,
+        keyed by its custom id, once it has finished. Requests missing from the results are sent again
+        without batching."""
+        ...
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        """Cancel a batch job whose results are no longer needed."""
+        ...
+
+
+class LocalBatchBackend(BatchBackend):
+    """A :class:`BatchBackend` that runs each batch as concurrent
+    :meth:`~autogen_core.models.ChatCompletionClient.create` calls of a model client.
+
+    It stands in for a batch endpoint in tests and for providers without one.
+
+    Args:
+        client (ChatCompletionClient): The client that runs the requests.
+        max_concurrency (int | None): The maximum number of requests of a batch that run at once. Defaults to None, for no limit.
+    """
+
+    def __init__(self, client: ChatCompletionClient, *, max_concurrency: Optional[int] = None) -> None:
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self._client = client
+        self._max_concurrency = max_concurrency
+        self._jobs: Dict[str, asyncio.Task[Dict[str, Union[CreateResult, BaseException]]]] = {}
+
+    async def submit(self, requests: Sequence[BatchRequest]) -> str:
+        batch_id = uuid.uuid4().hex
+        self._jobs[batch_id] = asyncio.create_task(self._run(requests))
+        return batch_id
+
+    async def retrieve(self, batch_id: str) -> Optional[Mapping[str, Union[CreateResult, BaseException]]]:
+        job = self._jobs[batch_id]
+        if not job.done():
+            return None
+        del self._jobs[batch_id]
+        return job.result()
+
+    async def cancel(self, batch_id: str) -> None:
+        job = self._jobs.pop(batch_id, None)
+        if job is not None:
+            job.cancel()
+
+    async def _run(self, requests: Sequence[BatchRequest]) -> Dict[str, Union[CreateResult, BaseException]]:
+        semaphore = asyncio.Semaphore(self._max_concurrency) if self._max_concurrency is not None else None
+
+        async def _create(request: BatchRequest) -> CreateResult:
+            if semaphore is None:
+                return await self._client.create(
+                    request.messages,
+                    tools=request.tools,
+                    json_output=request.json_output,
+                    extra_create_args=request.extra_create_args,
+                )
+            async with semaphore:
+                return await self._client.create(
+                    request.messages,
+                    tools=request.tools,
+                    json_output=request.json_output,
+                    extra_create_args=request.extra_create_args,
+                )
+
+        results = await asyncio.gather(*[_create(request) for request in requests], return_exceptions=True)
+        return {request.custom_id: result for request, result in zip(requests, results, strict=True)}
+
+
+@dataclass(frozen=True)
+class BatchMetrics:
+    """A snapshot of the metrics of a :class:`BatchChatCompletionClient`."""
+
+    batches: int
+    """The number of batch jobs submitted."""
+    batched_requests: int
+    """The number of requests submitted in batch jobs."""
+    batch_results: int
+    """The number of requests resolved from the results of a batch job."""
+    fallbacks: int
+    """The number of requests sent to the underlying client without batching."""
+    pending: int
+    """The number of requests waiting to be submitted or for the results of their batch job."""
+
+
+@dataclass
+class _PendingRequest:
+    request: BatchRequest
+    future: "asyncio.Future[CreateResult]"
+    cancellation_token: Optional[CancellationToken]
+    fallback_timer: Optional[asyncio.TimerHandle] = None
+    fallback_started: bool = False
+
+
+class BatchChatCompletionClientConfig(BaseModel):
+    client: ComponentModel
+    max_batch_size: int = 1000
+    max_wait: float = 1.0
+    poll_interval: float = 10.0
+    latency_budget: Optional[float] = None
+
+
+class BatchChatCompletionClient(ChatCompletionClient, Component[BatchChatCompletionClientConfig]):
+    """A wrapper around a :class:`~autogen_core.models.ChatCompletionClient` that collects the
+    :meth:`create` calls made through it and submits them as batch jobs.
+
+    This suits offline workloads such as evaluations and data labeling, which make many independent
+    requests and do not need their results right away. Batch endpoints such as the
+    `OpenAI Batch API <https://platform.openai.com/docs/guides/batch>`_ cost less than regular requests
+    and do not count toward the regular rate limits.
+
+    A request waits until `max_batch_size` requests have been collected or the first of them has
+    waited `max_wait` seconds, and the collected requests are then submitted together to the `backend`.
+    The batch job is polled every `poll_interval` seconds, and each caller gets the result of its own
+    request once the job has finished. Requests that fail to be submitted, that are missing from the
+    results of their job, or that are still waiting `latency_budget` seconds after they were made are
+    sent to the underlying client without batching; whichever answer comes first is returned.
+
+    :meth:`create_stream` is not batched and goes straight to the underlying client. Usage is tracked
+    by the underlying client.
+
+    Args:
+        client (ChatCompletionClient): The client to wrap, used for requests that are not batched.
+        backend (BatchBackend | None): Runs the batch jobs. Defaults to None, for a
+            :class:`LocalBatchBackend` that runs them with `client`. The backend is not part of the
+            component config, so a client loaded from a config uses a :class:`LocalBatchBackend`.
+        max_batch_size (int): The maximum number of requests in a batch. Defaults to 1000.
+        max_wait (float): How long to wait for more requests before submitting a batch, in seconds. Defaults to 1.
+        poll_interval (float): How often to poll a batch job for its results, in seconds. Defaults to 10.
+        latency_budget (float | None): How long a request may wait for its batch before it is sent
+            without batching, in seconds. Defaults to None, for no limit.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_core.models import UserMessage
+            from autogen_ext.models.batch import BatchChatCompletionClient
+            from autogen_ext.models.openai import OpenAIBatchBackend, OpenAIChatCompletionClient
+
+
+            async def main() -> None:
+                openai_client = OpenAIChatCompletionClient(model="gpt-4o-mini")
+                client = BatchChatCompletionClient(
+                    openai_client,
+                    backend=OpenAIBatchBackend(openai_client),
+                    poll_interval=60,
+                    latency_budget=6 * 3600,
+                )
+                questions = [f"What is {i} squared?" for i in range(1000)]
+                results = await asyncio.gather(
+                    *[client.create([UserMessage(content=question, source="user")]) for question in questions]
+                )
+                print(client.metrics)
+
+
+            asyncio.run(main())
+    """
+
+    component_type = "model"
+    component_provider_override = "autogen_ext.models.batch.BatchChatCompletionClient"
+    component_config_schema = BatchChatCompletionClientConfig
+
+    def __init__(
+        self,
+        client: ChatCompletionClient,
+        *,
+        backend: Optional[BatchBackend] = None,
+        max_batch_size: int = 1000,
+        max_wait: float = 1.0,
+        poll_interval: float = 10.0,
+        latency_budget: Optional[float] = None,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be greater than 0.")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative.")
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be greater than 0.")
+        if latency_budget is not None and latency_budget < 0:
+            raise ValueError("latency_budget must not be negative.")
+        self.client = client
+        self.backend = backend if backend is not None else LocalBatchBackend(client)
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._poll_interval = poll_interval
+        self._latency_budget = latency_budget
+        self._queue: List[_PendingRequest] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._batches = 0
+        self._batched_requests = 0
+        self._batch_results = 0
+        self._fallbacks = 0
+        self._pending = 0
+
+    @property
+    def metrics(self) -> BatchMetrics:
+        return BatchMetrics(
+            batches=self._batches,
+            batched_requests=self._batched_requests,
+            batch_results=self._batch_results,
+            fallbacks=self._fallbacks,
+            pending=self._pending,
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        loop = asyncio.get_running_loop()
+        pending = _PendingRequest(
+            request=BatchRequest(
+                custom_id=uuid.uuid4().hex,
+                messages=messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+            ),
+            future=loop.create_future(),
+            cancellation_token=cancellation_token,
+        )
+        if cancellation_token is not None:
+            cancellation_token.link_future(pending.future)
+        if self._latency_budget is not None:
+            pending.fallback_timer = loop.call_later(self._latency_budget, self._fallback, pending)
+        self._pending += 1
+        self._queue.append(pending)
+        if len(self._queue) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self._max_wait, self._flush)
+        try:
+            return await pending.future
+        finally:
+            self._pending -= 1
+            if pending.fallback_timer is not None:
+                pending.fallback_timer.cancel()
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        while self._queue:
+            batch = [pending for pending in self._queue[: self._max_batch_size] if not pending.future.done()]
+            del self._queue[: self._max_batch_size]
+            if batch:
+                self._start(self._run_batch(batch))
+
+    def _start(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task: asyncio.Task[None] = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_PendingRequest]) -> None:
+        start = time.monotonic()
+        batch_id: Optional[str] = None
+        try:
+            try:
+                batch_id = await self.backend.submit([pending.request for pending in batch])
+            except Exception:
+                trace_logger.exception(
+                    f"Failed to submit a batch of {len(batch)} requests, sending them without batching."
+                )
+                for pending in batch:
+                    self._fallback(pending)
+                return
+            self._batches += 1
+            self._batched_requests += len(batch)
+            trace_logger.info(f"Submitted batch {batch_id} of {len(batch)} requests.")
+
+            results: Optional[Mapping[str, Union[CreateResult, BaseException]]] = None
+            while results is None:
+                if all(pending.future.done() for pending in batch):
+                    # Every request was answered without batching or cancelled.
+                    await self.backend.cancel(batch_id)
+                    return
+                await asyncio.sleep(self._poll_interval)
+                try:
+                    results = await self.backend.retrieve(batch_id)
+                except Exception:
+                    trace_logger.exception(
+                        f"Failed to retrieve batch {batch_id}, sending its requests without batching."
+                    )
+                    results = {}
+        except asyncio.CancelledError:
+            # The client was closed, so the requests of the batch will not be answered.
+            for pending in batch:
+                pending.future.cancel()
+            if batch_id is not None:
+                await self.backend.cancel(batch_id)
+            raise
+        trace_logger.info(f"Batch {batch_id} finished after {time.monotonic() - start:.1f} seconds.")
+
+        for pending in batch:
+            if pending.future.done():
+                continue
+            result = results.get(pending.request.custom_id)
+            if result is None:
+                self._fallback(pending)
+            elif isinstance(result, BaseException):
+                if not pending.fallback_started:
+                    pending.future.set_exception(result)
+            else:
+                self._batch_results += 1
+                pending.future.set_result(result)
+
+    def _fallback(self, pending: _PendingRequest) -> None:
+        if pending.future.done() or pending.fallback_started:
+            return
+        pending.fallback_started = True
+        self._fallbacks += 1
+        self._start(self._create_unbatched(pending))
+
+    async def _create_unbatched(self, pending: _PendingRequest) -> None:
+        request = pending.request
+        try:
+            result = await self.client.create(
+                request.messages,
+                tools=request.tools,
+                json_output=request.json_output,
+                extra_create_args=request.extra_create_args,
+                cancellation_token=pending.cancellation_token,
+            )
+        except asyncio.CancelledError:
+            pending.future.cancel()
+            raise
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        for pending in self._queue:
+            pending.future.cancel()
+        self._queue.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.count_tokens(messages, tools=tools)
+
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return self.client.count_tokens_batch(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn("capabilities is deprecated, use model_info instead", DeprecationWarning, stacklevel=2)
+        return self.client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.client.model_info
+
+    def _to_config(self) -> BatchChatCompletionClientConfig:
+        return BatchChatCompletionClientConfig(
+            client=self.client.dump_component(),
+            max_batch_size=self._max_batch_size,
+            max_wait=self._max_wait,
+            poll_interval=self._poll_interval,
+            latency_budget=self._latency_budget,
+        )
+
+    @classmethod
+    def _from_config(cls, config: BatchChatCompletionClientConfig) -> Self:
+        return cls(
+            ChatCompletionClient.load_component(config.client),
+            max_batch_size=config.max_batch_size,
+            max_wait=config.max_wait,
+            poll_interval=config.poll_interval,
+            latency_budget=config.latency_budget,
+        )
@@ -1,6 +1,11 @@
-from ._chat_completion_cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache
+from ._chat_completion_cache import CHAT_CACHE_VALUE_TYPE, CachedStream, ChatCompletionCache
+from ._semantic_cache import SemanticCache, SemanticCacheMetrics, normalize_prompt
 
 __all__ = [
     "CHAT_CACHE_VALUE_TYPE",
+    "CachedStream",
     "ChatCompletionCache",
+    "SemanticCache",
+    "SemanticCacheMetrics",
+    "normalize_prompt",
 ]
@@ -1,9 +1,21 @@
+import asyncio
 import hashlib
 import json
+import logging
+import uuid
 import warnings
-from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Union, cast
-
-from autogen_core import CacheStore, CancellationToken, Component, ComponentModel, InMemoryStore
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union, cast
+
+from autogen_core import (
+    TRACE_LOGGER_NAME,
+    AsyncCacheStore,
+    CacheStore,
+    CancellationToken,
+    Component,
+    ComponentLoader,
+    ComponentModel,
+    InMemoryStore,
+)
 from autogen_core.models import (
     ChatCompletionClient,
     CreateResult,
@@ -11,12 +23,55 @@
     ModelCapabilities,  # type: ignore
     ModelInfo,
     RequestUsage,
+    UserMessage,
 )
 from autogen_core.tools import Tool, ToolSchema
 from pydantic import BaseModel
 from typing_extensions import Self
 
-CHAT_CACHE_VALUE_TYPE = Union[CreateResult, List[Union[str, CreateResult]]]
+from ._semantic_cache import SemanticCache
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+class CachedStream(BaseModel):
+    """A completed stream as stored by :class:`ChatCompletionCache`.
+
+    The text chunks are kept as one string with the length of every chunk, so a
+    stream costs a single value in the store and can still be replayed chunk by chunk."""
+
+    text: str
+    chunk_lengths: List[int]
+    result: CreateResult
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[Union[str, CreateResult]]) -> Optional["CachedStream"]:
+        """Build a cached stream from the chunks of a stream. Returns None if the stream did not end
+        with a :class:`~autogen_core.models.CreateResult`."""
+        if not chunks or not isinstance(chunks[-1], CreateResult):
+            return None
+        text_chunks = [chunk for chunk in chunks[:-1] if isinstance(chunk, str)]
+        return cls(text="".join(text_chunks), chunk_lengths=[len(chunk) for chunk in text_chunks], result=chunks[-1])
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[str]:
+        """Iterate over the text chunks, as they were streamed or, if `chunk_size` is set, in chunks of that size."""
+        if chunk_size is None:
+            start = 0
+            for length in self.chunk_lengths:
+                yield self.text[start : start + length]
+                start += length
+        else:
+            yield from _split_text(self.text, chunk_size)
+
+
+CHAT_CACHE_VALUE_TYPE = Union[CreateResult, List[Union[str, CreateResult]], CachedStream]
+
+V = TypeVar("V")
+
+
+def _split_text(text: str, chunk_size: int) -> Iterator[str]:
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
 
 
 class ChatCompletionCacheConfig(BaseModel):
@@ -24,6 +79,7 @@ class ChatCompletionCacheConfig(BaseModel):
 
     client: ComponentModel
     store: Optional[ComponentModel] = None
+    stream_replay_chunk_size: Optional[int] = None
 
 
 class ChatCompletionCache(ChatCompletionClient, Component[ChatCompletionCacheConfig]):
@@ -66,6 +122,10 @@ async def main():
                 # import redis
                 # redis_instance = redis.Redis()
                 # cache_store = RedisCacheStore[CHAT_CACHE_VALUE_TYPE](redis_instance)
+                # Or, to keep redis lookups from blocking the event loop:
+                # from autogen_ext.cache_store.redis import AsyncRedisStore
+                # import redis.asyncio
+                # cache_store = AsyncRedisStore[CHAT_CACHE_VALUE_TYPE](redis.asyncio.Redis())
                 cache_store = DiskCacheStore[CHAT_CACHE_VALUE_TYPE](Cache(tmpdirname))
                 cache_client = ChatCompletionCache(openai_model_client, cache_store)
 
@@ -79,11 +139,56 @@ async def main():
 
     You can now use the `cached_client` as you would the original client, but with caching enabled.
 
+    Stores that implement :class:`~autogen_core.AsyncCacheStore`, such as
+    :class:`~autogen_ext.cache_store.diskcache.DiskCacheStore` and
+    :class:`~autogen_ext.cache_store.redis.AsyncRedisStore`, are accessed through their
+    asynchronous methods, so a cache lookup does not block the other agents sharing the event loop.
+    Stores that only implement :class:`~autogen_core.CacheStore` are called synchronously.
+
+    A stream is stored once it has completed, as a :class:`CachedStream` that holds the text of
+    all the chunks and the final result, so streams that fail or are abandoned are not cached.
+    A cached stream is replayed with the chunk boundaries of the original stream, or with chunks of
+    `stream_replay_chunk_size` characters if it is set. Streams and non-streamed calls with the
+    same arguments share their cache entry.
+
+    With a :class:`~autogen_ext.models.cache.SemanticCache`, a request that misses the exact cache
+    is looked up by the similarity of its final user message to the final user messages of cached
+    requests. Only cached requests with the same scope and the same earlier messages, tools,
+    `json_output` and `extra_create_args` are considered, so a similar question asked in a different
+    conversation is not answered from the cache. The scope defaults to this cache instance; set
+    `semantic_scope` to share entries between caches of the same model, or to separate agents.
+    Results are still read from `store`, so the semantic tier costs no extra storage.
+
+    .. code-block:: python
+
+        import asyncio
+
+        from autogen_ext.models.cache import ChatCompletionCache, SemanticCache
+
+
+        async def embed(text: str) -> list[float]:
+            # Run a local embedding model in a thread, so it does not block the event loop.
+            return await asyncio.to_thread(lambda: embedding_model.encode(text).tolist())
+
+
+        cache_client = ChatCompletionCache(
+            openai_model_client,
+            semantic_cache=SemanticCache(embed, similarity_threshold=0.95),
+            semantic_scope="gpt-4o",
+        )
+
     Args:
         client (ChatCompletionClient): The original ChatCompletionClient to wrap.
-        store (CacheStore): A store object that implements get and set methods.
+        store (CacheStore | AsyncCacheStore): A store object that implements get and set methods,
+            or their asynchronous counterparts aget and aset.
             The user is responsible for managing the store's lifecycle & clearing it (if needed).
             Defaults to using in-memory cache.
+        stream_replay_chunk_size (int | None): The number of characters in each text chunk when
+            a cached stream is replayed. Defaults to None, which replays the original chunks.
+        semantic_cache (SemanticCache | None): An index to look up similar requests in when the exact
+            lookup misses. Defaults to None. It is not included in the component configuration.
+        semantic_scope (str | None): The scope of the entries this cache adds to and looks up in
+            `semantic_cache`. Defaults to None, which uses a scope of its own.
     """
 
     component_type = "chat_completion_cache"
@@ -93,23 +198,42 @@ async def main():
     def __init__(
         self,
         client: ChatCompletionClient,
-        store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = None,
+        store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE] | AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]] = None,
+        *,
+        stream_replay_chunk_size: Optional[int] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        semantic_scope: Optional[str] = None,
     ):
+        if stream_replay_chunk_size is not None and stream_replay_chunk_size <= 0:
+            raise ValueError("stream_replay_chunk_size must be greater than 0.")
         self.client = client
         self.store = store or InMemoryStore[CHAT_CACHE_VALUE_TYPE]()
-
-    def _check_cache(
+        self._stream_replay_chunk_size = stream_replay_chunk_size
+        self.semantic_cache = semantic_cache
+        self._semantic_scope = semantic_scope if semantic_scope is not None else uuid.uuid4().hex
+        # Requests sent to the underlying client and not finished yet, keyed by cache key.
+        # Identical requests made in the meantime wait for these instead of calling the client again.
+        self._inflight_creates: Dict[str, asyncio.Future[CreateResult]] = {}
+        self._inflight_streams: Dict[str, asyncio.Future[Optional[CachedStream]]] = {}
+
+    async def _store_get(self, key: str) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        if isinstance(self.store, AsyncCacheStore):
+            return await self.store.aget(key)
+        return self.store.get(key)
+
+    async def _store_set(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        if isinstance(self.store, AsyncCacheStore):
+            await self.store.aset(key, value)
+        else:
+            self.store.set(key, value)
+
+    def _cache_key(
         self,
         messages: Sequence[LLMMessage],
         tools: Sequence[Tool | ToolSchema],
         json_output: Optional[bool | type[BaseModel]],
         extra_create_args: Mapping[str, Any],
-    ) -> tuple[Optional[Union[CreateResult, List[Union[str, CreateResult]]]], str]:
-        """
-        Helper function to check the cache for a result.
-        Returns a tuple of (cached_result, cache_key).
-        """
-
+    ) -> str:
         json_output_data: str | bool | None = None
 
         if isinstance(json_output, type) and issubclass(json_output, BaseModel):
@@ -124,13 +248,92 @@ def _check_cache(
             "extra_create_args": extra_create_args,
         }
         serialized_data = json.dumps(data, sort_keys=True)
-        cache_key = hashlib.sha256(serialized_data.encode()).hexdigest()
-
-        cached_result = cast(Optional[CreateResult], self.store.get(cache_key))
-        if cached_result is not None:
-            return cached_result, cache_key
+        return hashlib.sha256(serialized_data.encode()).hexdigest()
 
-        return None, cache_key
+    async def _semantic_query(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+    ) -> Optional[Tuple[str, Tuple[float, ...]]]:
+        """The scope and embedding to look up a request with in the semantic cache, or None if the
+        request does not end with a text user message."""
+        if self.semantic_cache is None or not messages or not isinstance(messages[-1], UserMessage):
+            return None
+        content = messages[-1].content
+        if isinstance(content, str):
+            text = content
+        elif all(isinstance(part, str) for part in content):
+            text = "\n".join(cast(List[str], content))
+        else:
+            return None
+        try:
+            vector = await self.semantic_cache.embed(text)
+        except Exception:
+            trace_logger.warning("Failed to embed the prompt for the semantic cache.", exc_info=True)
+            return None
+        if vector is None:
+            return None
+        # Everything but the final user message must match exactly.
+        context_key = self._cache_key(messages[:-1], tools, json_output, extra_create_args)
+        return f"{self._semantic_scope}:{context_key}", vector
+
+    async def _semantic_lookup(
+        self, semantic_query: Optional[Tuple[str, Tuple[float, ...]]]
+    ) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        if semantic_query is None or self.semantic_cache is None:
+            return None
+        scope, vector = semantic_query
+        return await self.semantic_cache.lookup(scope, vector, self._store_get)
+
+    def _semantic_add(self, semantic_query: Optional[Tuple[str, Tuple[float, ...]]], cache_key: str) -> None:
+        if semantic_query is not None and self.semantic_cache is not None:
+            scope, vector = semantic_query
+            self.semantic_cache.add(scope, vector, cache_key)
+
+    @staticmethod
+    def _cached_create_result(cached_result: CHAT_CACHE_VALUE_TYPE) -> CreateResult:
+        if isinstance(cached_result, CachedStream):
+            return cached_result.result.model_copy(update={"cached": True})
+        if isinstance(cached_result, list):
+            # Stored by an older version that kept every chunk of a stream.
+            assert isinstance(cached_result[-1], CreateResult)
+            return cached_result[-1].model_copy(update={"cached": True})
+        cached_result.cached = True
+        return cached_result
+
+    @staticmethod
+    async def _wait_for_inflight(
+        future: "asyncio.Future[V]", cancellation_token: Optional[CancellationToken]
+    ) -> Optional[V]:
+        """Wait for an identical request in flight. Returns None if that request was cancelled.
+        Cancelling `cancellation_token` stops the wait, but not the request in flight."""
+        waiter = asyncio.shield(future)
+
+        def cancel() -> None:
+            waiter.cancel()
+
+        if cancellation_token is not None:
+            cancellation_token.add_callback(cancel)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if future.cancelled():
+                return None
+            raise
+        finally:
+            if cancellation_token is not None:
+                cancellation_token.remove_callback(cancel)
+
+    @staticmethod
+    def _finish_inflight(future: "asyncio.Future[V]", error: BaseException) -> None:
+        if isinstance(error, Exception):
+            future.set_exception(error)
+            # The requests waiting for the future receive the error; nobody else needs to retrieve it.
+            future.exception()
+        else:
+            future.cancel()
 
     async def create(
         self,
@@ -144,24 +347,54 @@ async def create(
         """
         Cached version of ChatCompletionClient.create.
         If the result of a call to create has been cached, it will be returned immediately
-        without invoking the underlying client.
+        without invoking the underlying client. If an identical call is already waiting for
+        the underlying client, the result of that call is shared instead of sending the request again.
+        Otherwise, if a semantic cache is set, the result of a similar call is returned.
 
         NOTE: cancellation_token is ignored for cached results.
         """
-        cached_result, cache_key = self._check_cache(messages, tools, json_output, extra_create_args)
-        if cached_result:
-            assert isinstance(cached_result, CreateResult)
-            cached_result.cached = True
-            return cached_result
-
-        result = await self.client.create(
-            messages,
-            tools=tools,
-            json_output=json_output,
-            extra_create_args=extra_create_args,
-            cancellation_token=cancellation_token,
-        )
-        self.store.set(cache_key, result)
+        cache_key = self._cache_key(messages, tools, json_output, extra_create_args)
+        semantic_query: Optional[Tuple[str, Tuple[float, ...]]] = None
+        semantic_checked = False
+        while True:
+            inflight = self._inflight_creates.get(cache_key)
+            if inflight is not None:
+                shared_result = await self._wait_for_inflight(inflight, cancellation_token)
+                if shared_result is not None:
+                    return shared_result.model_copy(update={"cached": True})
+                # The request in flight was cancelled, send our own.
+                continue
+            cached_result = await self._store_get(cache_key)
+            if cached_result:
+                return self._cached_create_result(cached_result)
+            if not semantic_checked:
+                semantic_checked = True
+                semantic_query = await self._semantic_query(messages, tools, json_output, extra_create_args)
+                similar_result = await self._semantic_lookup(semantic_query)
+                if similar_result:
+                    return self._cached_create_result(similar_result)
+            # Another identical request may have started while the store was read.
+            if cache_key not in self._inflight_creates:
+                break
+
+        future: asyncio.Future[CreateResult] = asyncio.get_running_loop().create_future()
+        self._inflight_creates[cache_key] = future
+        try:
+            result = await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            await self._store_set(cache_key, result)
+            self._semantic_add(semantic_query, cache_key)
+        except BaseException as e:
+            self._finish_inflight(future, e)
+            raise
+        finally:
+            del self._inflight_creates[cache_key]
+        future.set_result(result)
         return result
 
     def create_stream(
@@ -176,43 +409,102 @@ def create_stream(
         """
         Cached version of ChatCompletionClient.create_stream.
         If the result of a call to create_stream has been cached, it will be returned
-        without streaming from the underlying client.
+        without streaming from the underlying client. If an identical call is already streaming
+        from the underlying client, its chunks are replayed once it completes instead of
+        sending the request again. Otherwise, if a semantic cache is set, the result of a similar
+        call is replayed.
 
         NOTE: cancellation_token is ignored for cached results.
         """
 
         async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
-            cached_result, cache_key = self._check_cache(
-                messages,
-                tools,
-                json_output,
-                extra_create_args,
-            )
-            if cached_result:
-                assert isinstance(cached_result, list)
-                for result in cached_result:
+            cache_key = self._cache_key(messages, tools, json_output, extra_create_args)
+            semantic_query: Optional[Tuple[str, Tuple[float, ...]]] = None
+            semantic_checked = False
+            while True:
+                inflight = self._inflight_streams.get(cache_key)
+                if inflight is not None:
+                    shared_stream = await self._wait_for_inflight(inflight, cancellation_token)
+                    if shared_stream is not None:
+                        for chunk in self._replay(shared_stream):
+                            yield chunk
+                        return
+                    # The stream in flight was abandoned, start our own.
+                    continue
+                cached_result = await self._store_get(cache_key)
+                if cached_result:
+                    for chunk in self._replay(cached_result):
+                        yield chunk
+                    return
+                if not semantic_checked:
+                    semantic_checked = True
+                    semantic_query = await self._semantic_query(messages, tools, json_output, extra_create_args)
+                    similar_result = await self._semantic_lookup(semantic_query)
+                    if similar_result:
+                        for chunk in self._replay(similar_result):
+                            yield chunk
+                        return
+                # Another identical stream may have started while the store was read.
+                if cache_key not in self._inflight_streams:
+                    break
+
+            future: asyncio.Future[Optional[CachedStream]] = asyncio.get_running_loop().create_future()
+            self._inflight_streams[cache_key] = future
+            try:
+                result_stream = self.client.create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+
+                output_results: List[Union[str, CreateResult]] = []
+                async for result in result_stream:
+                    output_results.append(result)
                     if isinstance(result, CreateResult):
-                        result.cached = True
+                        # The stream is complete: store it with a single write before yielding the final result,
+                        # so it is cached even if the consumer stops iterating once it has the result.
+                        cached_stream = CachedStream.from_chunks(output_results)
+                        assert cached_stream is not None
+                        await self._store_set(cache_key, cached_stream)
+                        self._semantic_add(semantic_query, cache_key)
+                        future.set_result(cached_stream)
                     yield result
-                return
-
-            result_stream = self.client.create_stream(
-                messages,
-                tools=tools,
-                json_output=json_output,
-                extra_create_args=extra_create_args,
-                cancellation_token=cancellation_token,
-            )
-
-            output_results: List[Union[str, CreateResult]] = []
-            self.store.set(cache_key, output_results)
-
-            async for result in result_stream:
-                output_results.append(result)
-                yield result
+            except BaseException as e:
+                if not future.done():
+                    self._finish_inflight(future, e)
+                raise
+            finally:
+                del self._inflight_streams[cache_key]
+                if not future.done():
+                    # The stream ended without a result, so there is nothing to share.
+                    future.set_result(None)
 
         return _generator()
 
+    def _replay(self, cached_result: CHAT_CACHE_VALUE_TYPE) -> Iterator[Union[str, CreateResult]]:
+        """The chunks of a cached stream or of a cached non-streamed result, ending with the result."""
+        chunk_size = self._stream_replay_chunk_size
+        if isinstance(cached_result, CachedStream):
+            yield from cached_result.iter_chunks(chunk_size)
+            result = cached_result.result
+        elif isinstance(cached_result, list):
+            # Stored by an older version that kept every chunk of a stream.
+            *chunks, last = cached_result
+            assert isinstance(last, CreateResult)
+            result = last
+            text_chunks = [chunk for chunk in chunks if isinstance(chunk, str)]
+            if chunk_size is None:
+                yield from text_chunks
+            else:
+                yield from _split_text("".join(text_chunks), chunk_size)
+        else:
+            result = cached_result
+            if isinstance(result.content, str):
+                yield from _split_text(result.content, chunk_size or max(len(result.content), 1))
+        yield result.model_copy(update={"cached": True})
+
     async def close(self) -> None:
         await self.client.close()
 
@@ -222,6 +514,11 @@ def actual_usage(self) -> RequestUsage:
     def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
         return self.client.count_tokens(messages, tools=tools)
 
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return self.client.count_tokens_batch(messages, tools=tools)
+
     @property
     def capabilities(self) -> ModelCapabilities:  # type: ignore
         warnings.warn("capabilities is deprecated, use model_info instead", DeprecationWarning, stacklevel=2)
@@ -237,16 +534,26 @@ def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[To
     def total_usage(self) -> RequestUsage:
         return self.client.total_usage()
 
+    def _has_default_store(self) -> bool:
+        return isinstance(self.store, InMemoryStore) and self.store.max_size is None and self.store.ttl is None
+
     def _to_config(self) -> ChatCompletionCacheConfig:
         return ChatCompletionCacheConfig(
             client=self.client.dump_component(),
-            store=self.store.dump_component() if not isinstance(self.store, InMemoryStore) else None,
+            store=self.store.dump_component() if not self._has_default_store() else None,
+            stream_replay_chunk_size=self._stream_replay_chunk_size,
         )
 
     @classmethod
     def _from_config(cls, config: ChatCompletionCacheConfig) -> Self:
         client = ChatCompletionClient.load_component(config.client)
-        store: Optional[CacheStore[CHAT_CACHE_VALUE_TYPE]] = (
-            CacheStore.load_component(config.store) if config.store else InMemoryStore()
+        if config.store is None:
+            return cls(client=client, store=InMemoryStore(), stream_replay_chunk_size=config.stream_replay_chunk_size)
+        store = ComponentLoader.load_component(config.store)
+        if not isinstance(store, (CacheStore, AsyncCacheStore)):
+            raise TypeError(f"Expected a CacheStore or an AsyncCacheStore, got {type(store)}")
+        return cls(
+            client=client,
+            store=cast(CacheStore[CHAT_CACHE_VALUE_TYPE], store),
+            stream_replay_chunk_size=config.stream_replay_chunk_size,
         )
-        return cls(client=client, store=store)
@@ -0,0 +1,183 @@
+import math
+import operator
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
+
+V = TypeVar("V")
+
+Embedder = Callable[[str], Awaitable[Sequence[float]]]
+"""An asynchronous function that returns the embedding of a text."""
+
+# A date followed by a time, as in "2024-05-01T12:30:00Z" or "2024-05-01 12:30".
+_TIMESTAMP_PATTERN = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?(?![\w:])"
+)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """The default prompt normalization of :class:`SemanticCache`: timestamps are replaced with a
+    placeholder and runs of whitespace are collapsed into a single space."""
+    text = _TIMESTAMP_PATTERN.sub("<timestamp>", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class SemanticCacheMetrics:
+    """A snapshot of the metrics of a :class:`SemanticCache`."""
+
+    entries: int
+    lookups: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that were hits, or 0.0 if there were no lookups."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    scope: str
+    vector: Tuple[float, ...]
+
+
+class SemanticCache:
+    """An in-memory index that finds cached requests whose prompt is similar to a new prompt.
+
+    :class:`~autogen_ext.models.cache.ChatCompletionCache` uses it as a second tier after the lookup
+    by exact cache key: the final user message of a request is normalized with `normalize`, embedded
+    with `embedder`, and compared by cosine similarity with the entries of the same scope. An entry
+    is a match if its similarity is at least `similarity_threshold`. The index only holds embeddings
+    and cache keys; the results themselves stay in the store of the chat completion cache.
+
+    The index keeps at most `max_entries` entries and evicts the least recently used one when it is full.
+    The embeddings of the most recently embedded prompts are kept as well, so a repeated prompt is not
+    embedded again.
+
+    Args:
+        embedder (Callable[[str], Awaitable[Sequence[float]]]): Returns the embedding of a text. Embedders
+            that run locally and block should be wrapped with :func:`asyncio.to_thread`.
+        similarity_threshold (float, optional): The minimum cosine similarity of a match. Defaults to 0.95.
+        max_entries (int, optional): The maximum number of entries in the index. Defaults to 1024.
+        normalize (Callable[[str], str], optional): Normalizes a prompt before it is embedded.
+            Defaults to :func:`normalize_prompt`.
+
+    .. note::
+
+        Similar prompts do not always have the same answer, for example prompts that only differ in a number.
+        Choose a threshold that suits the prompts and the embedder, and a scope per agent or per model.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 1024,
+        normalize: Callable[[str], str] = normalize_prompt,
+    ) -> None:
+        if not -1.0 <= similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be between -1 and 1.")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        self._embedder = embedder
+        self._similarity_threshold = similarity_threshold
+        self._max_entries = max_entries
+        self._normalize = normalize
+        # Keyed by the cache key of the result, in least recently used order.
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._scopes: Dict[str, Set[str]] = {}
+        # Unit-length embeddings of recently embedded prompts, keyed by the normalized prompt.
+        self._embeddings: OrderedDict[str, Tuple[float, ...]] = OrderedDict()
+        self._lookups = 0
+        self._hits = 0
+
+    @property
+    def similarity_threshold(self) -> float:
+        return self._similarity_threshold
+
+    @property
+    def metrics(self) -> SemanticCacheMetrics:
+        return SemanticCacheMetrics(
+            entries=len(self._entries),
+            lookups=self._lookups,
+            hits=self._hits,
+            misses=self._lookups - self._hits,
+        )
+
+    async def embed(self, text: str) -> Optional[Tuple[float, ...]]:
+        """Normalize and embed `text`. Returns a unit-length vector, or None if the embedding is all zeros."""
+        normalized = self._normalize(text)
+        vector = self._embeddings.get(normalized)
+        if vector is not None:
+            self._embeddings.move_to_end(normalized)
+            return vector
+        embedding = await self._embedder(normalized)
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if norm == 0.0:
+            return None
+        vector = tuple(x / norm for x in embedding)
+        self._embeddings[normalized] = vector
+        if len(self._embeddings) > self._max_entries:
+            self._embeddings.popitem(last=False)
+        return vector
+
+    async def lookup(
+        self, scope: str, vector: Tuple[float, ...], fetch: Callable[[str], Awaitable[Optional[V]]]
+    ) -> Optional[V]:
+        """Return the value of the most similar entry of `scope` that matches `vector`.
+
+        The value of a match is read with `fetch`, which takes the cache key of the entry. A match whose
+        value is no longer available, for example because the store evicted it, is removed from the index
+        and the next best match is tried."""
+        self._lookups += 1
+        for _, key in self._matches(scope, vector):
+            value = await fetch(key)
+            if value is None:
+                self.discard(key)
+                continue
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+        return None
+
+    def add(self, scope: str, vector: Tuple[float, ...], key: str) -> None:
+        """Add the embedding of a prompt whose result is cached under `key`."""
+        self.discard(key)
+        self._entries[key] = _Entry(scope=scope, vector=vector)
+        self._scopes.setdefault(scope, set()).add(key)
+        if len(self._entries) > self._max_entries:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, key: str) -> None:
+        """Remove the entry for `key`, if any."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._scopes[entry.scope]
+        keys.discard(key)
+        if not keys:
+            del self._scopes[entry.scope]
+
+    def clear(self) -> None:
+        """Remove all entries and reset the metrics."""
+        self._entries.clear()
+        self._scopes.clear()
+        self._embeddings.clear()
+        self._lookups = 0
+        self._hits = 0
+
+    def _matches(self, scope: str, vector: Tuple[float, ...]) -> List[Tuple[float, str]]:
+        matches: List[Tuple[float, str]] = []
+        for key in self._scopes.get(scope, ()):
+            # Both vectors have unit length, so their dot product is the cosine similarity.
+            similarity = sum(map(operator.mul, vector, self._entries[key].vector))
+            if similarity >= self._similarity_threshold:
+                matches.append((similarity, key))
+        matches.sort(reverse=True)
+        return matches
@@ -1,6 +1,7 @@
 import asyncio
 import logging  # added import
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, AsyncGenerator, Dict, List, Literal, Mapping, Optional, Sequence, TypedDict, Union, cast
 
 from autogen_core import EVENT_LOGGER_NAME, CancellationToken, FunctionCall, MessageHandlerContext
@@ -35,6 +36,8 @@
 from pydantic import BaseModel
 from typing_extensions import Unpack
 
+from .._utils.tokenizer import TokenCounter
+
 logger = logging.getLogger(EVENT_LOGGER_NAME)  # initialize logger
 
 
@@ -110,6 +113,19 @@ def convert_tools(
     return result
 
 
+class _LlamaEncoding:
+    """Tokenizes strings with the tokenizer of a Llama model, for a :class:`TokenCounter`."""
+
+    def __init__(self, llm: Llama) -> None:
+        self._llm = llm
+
+    def encode(self, text: str, /) -> List[int]:
+        return self._llm.tokenize(text.encode("utf-8"))
+
+    def encode_batch(self, text: List[str], /) -> List[List[int]]:
+        return [self.encode(item) for item in text]
+
+
 class LlamaCppParams(TypedDict, total=False):
     # from_pretrained parameters:
     repo_id: Optional[str]
@@ -174,6 +190,12 @@ class LlamaCppChatCompletionClient(ChatCompletionClient):
 
     This client allows you to interact with LlamaCpp models, either by specifying a local model path or by downloading a model from Hugging Face Hub.
 
+    The model runs on a thread of its own rather than on the default executor of the event loop, which
+    is shared with other blocking work such as synchronous function tools. Requests from agents that share
+    the client are run one at a time, in the order they were made, without blocking the event loop or
+    waiting behind other work. Token counts of message contents are cached, so counting a growing chat
+    history only tokenizes the new messages.
+
     Args:
         model_info (optional, ModelInfo): The information about the model. Defaults to :attr:`~LlamaCppChatCompletionClient.DEFAULT_MODEL_INFO`.
         model_path (optional, str): The path to the LlamaCpp model file. Required if repo_id and filename are not provided.
@@ -258,6 +280,9 @@ def __init__(
         else:
             raise ValueError("Please provide model_path if ... or provide repo_id and filename if ....")
         self._total_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        # A Llama instance runs one completion at a time, so a single thread runs them in order.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llama_cpp")
+        self._token_counter = TokenCounter(_LlamaEncoding(self.llm))
 
     async def create(
         self,
@@ -303,16 +328,17 @@ async def create(
             raise ValueError("json_output must be a boolean, a BaseModel subclass or None.")
 
         if self.model_info["function_calling"]:
-            # Run this in on the event loop to avoid blocking.
-            response_future = asyncio.get_event_loop().run_in_executor(
-                None,
+            # Run this on the thread of the model to avoid blocking the event loop.
+            response_future = asyncio.get_running_loop().run_in_executor(
+                self._executor,
                 lambda: self.llm.create_chat_completion(
                     messages=converted_messages, tools=convert_tools(tools), stream=False, **create_args
                 ),
             )
         else:
-            response_future = asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.llm.create_chat_completion(messages=converted_messages, stream=False, **create_args)
+            response_future = asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                lambda: self.llm.create_chat_completion(messages=converted_messages, stream=False, **create_args),
             )
         if cancellation_token:
             cancellation_token.link_future(response_future)
@@ -422,12 +448,16 @@ def count_tokens(
         messages: Sequence[SystemMessage | UserMessage | AssistantMessage | FunctionExecutionResultMessage],
         **kwargs: Any,
     ) -> int:
-        total = 0
-        for msg in messages:
-            # Use the Llama model's tokenizer to encode the content
-            tokens = self.llm.tokenize(str(msg.content).encode("utf-8"))
-            total += len(tokens)
-        return total
+        # Use the Llama model's tokenizer to encode the content
+        return sum(self._token_counter.count_batch([str(msg.content) for msg in messages]))
+
+    def count_tokens_batch(
+        self,
+        messages: Sequence[Sequence[LLMMessage]],
+        **kwargs: Any,
+    ) -> List[int]:
+        counts = iter(self._token_counter.count_batch([str(msg.content) for item in messages for msg in item]))
+        return [sum(next(counts) for _ in item) for item in messages]
 
     @property
     def model_info(self) -> ModelInfo:
@@ -451,4 +481,6 @@ async def close(self) -> None:
         """
         Close the LlamaCpp client.
         """
-        self.llm.close()
+        # Close the model after the requests that are already queued on its thread.
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.llm.close)
+        self._executor.shutdown(wait=False)
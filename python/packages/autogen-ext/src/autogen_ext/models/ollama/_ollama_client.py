@@ -15,11 +15,11 @@
     Mapping,
     Optional,
     Sequence,
+    Tuple,
     Union,
     cast,
 )
 
-import tiktoken
 from autogen_core import (
     EVENT_LOGGER_NAME,
     TRACE_LOGGER_NAME,
@@ -52,6 +52,8 @@
 from pydantic.json_schema import JsonSchemaValue
 from typing_extensions import Self, Unpack
 
+from .._utils.message_cache import MessageConversionCache
+from .._utils.tokenizer import TokenCounter, get_token_counter, get_tool_schema
 from . import _model_info
 from .config import BaseOllamaClientConfiguration, BaseOllamaClientConfigurationConfigModel
 
@@ -242,6 +244,14 @@ def to_ollama_type(message: LLMMessage) -> Sequence[Message]:
         return tool_message_to_ollama(message)
 
 
+_ollama_message_cache: MessageConversionCache[Sequence[Message]] = MessageConversionCache()
+
+
+def _to_ollama_type_cached(message: LLMMessage) -> Sequence[Message]:
+    """Like :func:`to_ollama_type`, but reuses the conversion of a message that was converted before."""
+    return _ollama_message_cache.get_or_convert(message, None, to_ollama_type)
+
+
 # TODO: Is this correct? Do we need this?
 def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     MAX_LONG_EDGE = 2048
@@ -296,6 +306,7 @@ def _add_usage(usage1: RequestUsage, usage2: RequestUsage) -> RequestUsage:
     return RequestUsage(
         prompt_tokens=usage1.prompt_tokens + usage2.prompt_tokens,
         completion_tokens=usage1.completion_tokens + usage2.completion_tokens,
+        cached_prompt_tokens=usage1.cached_prompt_tokens + usage2.cached_prompt_tokens,
     )
 
 
@@ -389,64 +400,90 @@ def normalize_stop_reason(stop_reason: str | None) -> FinishReasons:
 
 # TODO: probably needs work
 def count_tokens_ollama(messages: Sequence[LLMMessage], model: str, *, tools: Sequence[Tool | ToolSchema] = []) -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    return count_tokens_ollama_batch([messages], model, tools=tools)[0]
+
+
+def count_tokens_ollama_batch(
+    messages: Sequence[Sequence[LLMMessage]], model: str, *, tools: Sequence[Tool | ToolSchema] = []
+) -> List[int]:
+    """Count the tokens of several message sequences, encoding the text of all of them in one batch."""
+    counter = get_token_counter(model)
+    tool_tokens = sum(_count_tool_tokens_ollama(tool, counter) for tool in tools) + 12
+
+    fixed_tokens: List[int] = []
+    texts: List[str] = []
+    text_ranges: List[Tuple[int, int]] = []
+    for item in messages:
+        text_start = len(texts)
+        fixed_tokens.append(_collect_message_texts_ollama(item, texts))
+        text_ranges.append((text_start, len(texts)))
+    text_tokens = counter.count_batch(texts)
+
+    return [
+        fixed + sum(text_tokens[text_start:text_end]) + tool_tokens
+        for fixed, (text_start, text_end) in zip(fixed_tokens, text_ranges, strict=True)
+    ]
+
+
+def _collect_message_texts_ollama(messages: Sequence[LLMMessage], texts: List[str]) -> int:
+    """Append the texts of `messages` that need to be encoded to `texts` and return the tokens that do not."""
     tokens_per_message = 3
     num_tokens = 0
 
     # Message tokens.
     for message in messages:
         num_tokens += tokens_per_message
-        ollama_message = to_ollama_type(message)
+        ollama_message = _to_ollama_type_cached(message)
         for ollama_message_part in ollama_message:
             if isinstance(message.content, Image):
                 num_tokens += calculate_vision_tokens(message.content)
             elif ollama_message_part.content is not None:
-                num_tokens += len(encoding.encode(ollama_message_part.content))
+                texts.append(ollama_message_part.content)
     # TODO: every model family has its own message sequence.
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-
-    # Tool tokens.
-    ollama_tools = convert_tools(tools)
-    for tool in ollama_tools:
-        function = tool["function"]
-        tool_tokens = len(encoding.encode(function["name"]))
-        if "description" in function:
-            tool_tokens += len(encoding.encode(function["description"]))
-        tool_tokens -= 2
-        if "parameters" in function:
-            parameters = function["parameters"]
-            if "properties" in parameters:
-                assert isinstance(parameters["properties"], dict)
-                for propertiesKey in parameters["properties"]:  # pyright: ignore
-                    assert isinstance(propertiesKey, str)
-                    tool_tokens += len(encoding.encode(propertiesKey))
-                    v = parameters["properties"][propertiesKey]  # pyright: ignore
-                    for field in v:  # pyright: ignore
-                        if field == "type":
-                            tool_tokens += 2
-                            tool_tokens += len(encoding.encode(v["type"]))  # pyright: ignore
-                        elif field == "description":
-                            tool_tokens += 2
-                            tool_tokens += len(encoding.encode(v["description"]))  # pyright: ignore
-                        elif field == "enum":
-                            tool_tokens -= 3
-                            for o in v["enum"]:  # pyright: ignore
-                                tool_tokens += 3
-                                tool_tokens += len(encoding.encode(o))  # pyright: ignore
-                        else:
-                            trace_logger.warning(f"Not supported field {field}")
-                tool_tokens += 11
-                if len(parameters["properties"]) == 0:  # pyright: ignore
-                    tool_tokens -= 2
-        num_tokens += tool_tokens
-    num_tokens += 12
     return num_tokens
 
 
+def _count_tool_tokens_ollama(tool: Tool | ToolSchema, counter: TokenCounter) -> int:
+    tool_schema = get_tool_schema(tool)
+    cached = counter.get_tool_count("ollama", tool_schema)
+    if cached is not None:
+        return cached
+
+    function = convert_tools([tool_schema])[0]["function"]
+    tool_tokens = counter.count(function["name"])
+    if "description" in function:
+        tool_tokens += counter.count(function["description"])
+    tool_tokens -= 2
+    if "parameters" in function:
+        parameters = function["parameters"]
+        if "properties" in parameters:
+            assert isinstance(parameters["properties"], dict)
+            for propertiesKey in parameters["properties"]:  # pyright: ignore
+                assert isinstance(propertiesKey, str)
+                tool_tokens += counter.count(propertiesKey)
+                v = parameters["properties"][propertiesKey]  # pyright: ignore
+                for field in v:  # pyright: ignore
+                    if field == "type":
+                        tool_tokens += 2
+                        tool_tokens += counter.count(v["type"])  # pyright: ignore
+                    elif field == "description":
+                        tool_tokens += 2
+                        tool_tokens += counter.count(v["description"])  # pyright: ignore
+                    elif field == "enum":
+                        tool_tokens -= 3
+                        for o in v["enum"]:  # pyright: ignore
+                            tool_tokens += 3
+                            tool_tokens += counter.count(o)  # pyright: ignore
+                    else:
+                        trace_logger.warning(f"Not supported field {field}")
+            tool_tokens += 11
+            if len(parameters["properties"]) == 0:  # pyright: ignore
+                tool_tokens -= 2
+    counter.put_tool_count("ollama", tool_schema, tool_tokens)
+    return tool_tokens
+
+
 @dataclass
 class CreateParams:
     messages: Sequence[Message]
@@ -578,7 +615,7 @@ def _process_create_args(
         if self.model_info["json_output"] is False and json_output is True:
             raise ValueError("Model does not support JSON output.")
 
-        ollama_messages_nested = [to_ollama_type(m) for m in messages]
+        ollama_messages_nested = [_to_ollama_type_cached(m) for m in messages]
         ollama_messages = [item for sublist in ollama_messages_nested for item in sublist]
 
         if self.model_info["function_calling"] is False and len(tools) > 0:
@@ -856,6 +893,11 @@ def total_usage(self) -> RequestUsage:
     def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
         return count_tokens_ollama(messages, self._create_args["model"], tools=tools)
 
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return count_tokens_ollama_batch(messages, self._create_args["model"], tools=tools)
+
     def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
         token_limit = _model_info.get_token_limit(self._create_args["model"])
         return token_limit - self.count_tokens(messages, tools=tools)
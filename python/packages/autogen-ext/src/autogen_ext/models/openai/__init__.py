@@ -1,4 +1,5 @@
 from . import _message_transform
+from ._batch_backend import OpenAIBatchBackend
 from ._openai_client import (
     AZURE_OPENAI_USER_AGENT,
     AzureOpenAIChatCompletionClient,
@@ -16,6 +17,7 @@
     "OpenAIChatCompletionClient",
     "AzureOpenAIChatCompletionClient",
     "BaseOpenAIChatCompletionClient",
+    "OpenAIBatchBackend",
     "AzureOpenAIClientConfigurationConfigModel",
     "OpenAIClientConfigurationConfigModel",
     "BaseOpenAIClientConfigurationConfigModel",
@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+from autogen_core.models import CreateResult
+from openai.lib._parsing._completions import type_to_response_format_param  # type: ignore
+from openai.types.chat import ChatCompletion
+
+from ..batch import BatchBackend, BatchRequest
+from ._openai_client import BaseOpenAIChatCompletionClient, CreateParams
+
+_RUNNING_STATUSES = {"validating", "in_progress", "finalizing", "cancelling"}
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """A :class:`~autogen_ext.models.batch.BatchBackend` that runs batches on the
+    `OpenAI Batch API <https://platform.openai.com/docs/guides/batch>`_ with the client and the
+    create arguments of an OpenAI or Azure OpenAI model client.
+
+    Requests are uploaded as a JSONL input file, and the output file of a finished batch is parsed
+    into a :class:`~autogen_core.models.CreateResult` per request, which is counted in the usage of
+    `model_client`. Requests that failed come back as errors, and requests missing from an expired
+    or cancelled batch are sent again without batching by
+    :class:`~autogen_ext.models.batch.BatchChatCompletionClient`.
+
+    Args:
+        model_client (BaseOpenAIChatCompletionClient): The client whose OpenAI client and create arguments are used.
+        endpoint (str): The endpoint of the requests. Defaults to ``"/v1/chat/completions"``;
+            Azure OpenAI uses ``"/chat/completions"``.
+        completion_window (str): The time frame within which a batch should be processed. Defaults to ``"24h"``.
+    """
+
+    def __init__(
+        self,
+        model_client: BaseOpenAIChatCompletionClient,
+        *,
+        endpoint: str = "/v1/chat/completions",
+        completion_window: str = "24h",
+    ) -> None:
+        self._model_client = model_client
+        self._endpoint = endpoint
+        self._completion_window = completion_window
+        # The create params of the requests of each running batch, used to parse their results.
+        self._create_params: Dict[str, Dict[str, CreateParams]] = {}
+
+    async def submit(self, requests: Sequence[BatchRequest]) -> str:
+        create_params: Dict[str, CreateParams] = {}
+        lines = []
+        for request in requests:
+            params = self._model_client._process_create_args(  # pyright: ignore[reportPrivateUsage]
+                request.messages, request.tools, request.json_output, request.extra_create_args
+            )
+            body: Dict[str, Any] = {"messages": params.messages, **params.create_args}
+            if len(params.tools) > 0:
+                body["tools"] = params.tools
+            if params.response_format is not None:
+                body["response_format"] = type_to_response_format_param(params.response_format)
+            create_params[request.custom_id] = params
+            lines.append(
+                json.dumps({"custom_id": request.custom_id, "method": "POST", "url": self._endpoint, "body": body})
+            )
+
+        client = self._model_client._client  # pyright: ignore[reportPrivateUsage]
+        input_file = await client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self._endpoint,  # type: ignore
+            completion_window=self._completion_window,  # type: ignore
+        )
+        self._create_params[batch.id] = create_params
+        return batch.id
+
+    async def retrieve(self, batch_id: str) -> Optional[Mapping[str, Union[CreateResult, BaseException]]]:
+        client = self._model_client._client  # pyright: ignore[reportPrivateUsage]
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in _RUNNING_STATUSES:
+            return None
+        create_params = self._create_params.pop(batch_id, {})
+        results: Dict[str, Union[CreateResult, BaseException]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                output = json.loads(line)
+                custom_id = output["custom_id"]
+                if custom_id not in create_params:
+                    continue
+                results[custom_id] = self._parse_output(output, create_params[custom_id])
+        return results
+
+    async def cancel(self, batch_id: str) -> None:
+        self._create_params.pop(batch_id, None)
+        await self._model_client._client.batches.cancel(batch_id)  # pyright: ignore[reportPrivateUsage]
+
+    def _parse_output(
+        self, output: Mapping[str, Any], create_params: CreateParams
+    ) -> Union[CreateResult, BaseException]:
+        response = output.get("response") or {}
+        if output.get("error") is None and response.get("status_code") == 200:
+            completion = ChatCompletion.model_validate(response["body"])
+            return self._model_client._create_result(completion, create_params)  # pyright: ignore[reportPrivateUsage]
+        error = output.get("error") or response.get("body", {}).get("error") or response
+        return RuntimeError(f"Batch request {output['custom_id']} failed: {json.dumps(error)}")
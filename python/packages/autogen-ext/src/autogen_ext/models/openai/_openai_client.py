@@ -5,6 +5,7 @@
 import math
 import os
 import re
+import time
 import warnings
 from asyncio import Task
 from dataclasses import dataclass
@@ -19,12 +20,12 @@
     Optional,
     Sequence,
     Set,
+    Tuple,
     Type,
     Union,
     cast,
 )
 
-import tiktoken
 from autogen_core import (
     EVENT_LOGGER_NAME,
     TRACE_LOGGER_NAME,
@@ -63,6 +64,7 @@
     completion_create_params,
 )
 from openai.types.chat.chat_completion import Choice
+from openai.types.completion_usage import CompletionUsage
 from openai.types.shared_params import (
     FunctionDefinition,
     FunctionParameters,
@@ -72,8 +74,10 @@
 from pydantic import BaseModel, SecretStr
 from typing_extensions import Self, Unpack
 
+from .._utils.message_cache import MessageConversionCache
 from .._utils.normalize_stop_reason import normalize_stop_reason
 from .._utils.parse_r1_content import parse_r1_content
+from .._utils.tokenizer import TokenCounter, get_token_counter, get_tool_schema
 from . import _model_info
 from ._transformation import (
     get_transformer,
@@ -179,6 +183,20 @@ def raise_value_error(message: LLMMessage, context: Dict[str, Any]) -> Sequence[
     return result
 
 
+_oai_message_cache: MessageConversionCache[Sequence[ChatCompletionMessageParam]] = MessageConversionCache()
+
+
+def _to_oai_type_cached(
+    message: LLMMessage, prepend_name: bool, model: str, model_family: str
+) -> Sequence[ChatCompletionMessageParam]:
+    """Like :func:`to_oai_type`, but reuses the conversion of a message that was converted before."""
+    return _oai_message_cache.get_or_convert(
+        message,
+        (prepend_name, model, model_family),
+        lambda m: to_oai_type(m, prepend_name=prepend_name, model=model, model_family=model_family),
+    )
+
+
 def calculate_vision_tokens(image: Image, detail: str = "auto") -> int:
     MAX_LONG_EDGE = 2048
     BASE_TOKEN_COUNT = 85
@@ -232,9 +250,17 @@ def _add_usage(usage1: RequestUsage, usage2: RequestUsage) -> RequestUsage:
     return RequestUsage(
         prompt_tokens=usage1.prompt_tokens + usage2.prompt_tokens,
         completion_tokens=usage1.completion_tokens + usage2.completion_tokens,
+        cached_prompt_tokens=usage1.cached_prompt_tokens + usage2.cached_prompt_tokens,
     )
 
 
+def _cached_prompt_tokens(usage: Optional[CompletionUsage]) -> int:
+    """The number of prompt tokens the API reports as read from its prompt cache."""
+    if usage is None or usage.prompt_tokens_details is None:
+        return 0
+    return usage.prompt_tokens_details.cached_tokens or 0
+
+
 def convert_tools(
     tools: Sequence[Tool | ToolSchema],
 ) -> List[ChatCompletionToolParam]:
@@ -282,11 +308,46 @@ def count_tokens_openai(
     tools: Sequence[Tool | ToolSchema] = [],
     model_family: str = ModelFamily.UNKNOWN,
 ) -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        trace_logger.warning(f"Model {model} not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    return count_tokens_openai_batch(
+        [messages], model, add_name_prefixes=add_name_prefixes, tools=tools, model_family=model_family
+    )[0]
+
+
+def count_tokens_openai_batch(
+    messages: Sequence[Sequence[LLMMessage]],
+    model: str,
+    *,
+    add_name_prefixes: bool = False,
+    tools: Sequence[Tool | ToolSchema] = [],
+    model_family: str = ModelFamily.UNKNOWN,
+) -> List[int]:
+    """Count the tokens of several message sequences, encoding the text of all of them in one batch."""
+    counter = get_token_counter(model)
+    tool_tokens = sum(_count_tool_tokens_openai(tool, counter) for tool in tools) + 12
+
+    fixed_tokens: List[int] = []
+    texts: List[str] = []
+    text_ranges: List[Tuple[int, int]] = []
+    for item in messages:
+        text_start = len(texts)
+        fixed_tokens.append(_collect_message_texts_openai(item, model, add_name_prefixes, model_family, texts))
+        text_ranges.append((text_start, len(texts)))
+    text_tokens = counter.count_batch(texts)
+
+    return [
+        fixed + sum(text_tokens[text_start:text_end]) + tool_tokens
+        for fixed, (text_start, text_end) in zip(fixed_tokens, text_ranges, strict=True)
+    ]
+
+
+def _collect_message_texts_openai(
+    messages: Sequence[LLMMessage],
+    model: str,
+    add_name_prefixes: bool,
+    model_family: str,
+    texts: List[str],
+) -> int:
+    """Append the texts of `messages` that need to be encoded to `texts` and return the tokens that do not."""
     tokens_per_message = 3
     tokens_per_name = 1
     num_tokens = 0
@@ -294,7 +355,7 @@ def count_tokens_openai(
     # Message tokens.
     for message in messages:
         num_tokens += tokens_per_message
-        oai_message = to_oai_type(message, prepend_name=add_name_prefixes, model=model, model_family=model_family)
+        oai_message = _to_oai_type_cached(message, add_name_prefixes, model, model_family)
         for oai_message_part in oai_message:
             for key, value in oai_message_part.items():
                 if value is None:
@@ -313,11 +374,10 @@ def count_tokens_openai(
                             # TODO: add detail parameter
                             num_tokens += calculate_vision_tokens(content_part)
                         elif isinstance(part, str):
-                            num_tokens += len(encoding.encode(part))
+                            texts.append(part)
                         else:
                             try:
-                                serialized_part = json.dumps(part)
-                                num_tokens += len(encoding.encode(serialized_part))
+                                texts.append(json.dumps(part))
                             except TypeError:
                                 trace_logger.warning(f"Could not convert {part} to string, skipping.")
                 else:
@@ -327,49 +387,53 @@ def count_tokens_openai(
                         except TypeError:
                             trace_logger.warning(f"Could not convert {value} to string, skipping.")
                             continue
-                    num_tokens += len(encoding.encode(value))
+                    texts.append(value)
                     if key == "name":
                         num_tokens += tokens_per_name
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-
-    # Tool tokens.
-    oai_tools = convert_tools(tools)
-    for tool in oai_tools:
-        function = tool["function"]
-        tool_tokens = len(encoding.encode(function["name"]))
-        if "description" in function:
-            tool_tokens += len(encoding.encode(function["description"]))
-        tool_tokens -= 2
-        if "parameters" in function:
-            parameters = function["parameters"]
-            if "properties" in parameters:
-                assert isinstance(parameters["properties"], dict)
-                for propertiesKey in parameters["properties"]:  # pyright: ignore
-                    assert isinstance(propertiesKey, str)
-                    tool_tokens += len(encoding.encode(propertiesKey))
-                    v = parameters["properties"][propertiesKey]  # pyright: ignore
-                    for field in v:  # pyright: ignore
-                        if field == "type":
-                            tool_tokens += 2
-                            tool_tokens += len(encoding.encode(v["type"]))  # pyright: ignore
-                        elif field == "description":
-                            tool_tokens += 2
-                            tool_tokens += len(encoding.encode(v["description"]))  # pyright: ignore
-                        elif field == "enum":
-                            tool_tokens -= 3
-                            for o in v["enum"]:  # pyright: ignore
-                                tool_tokens += 3
-                                tool_tokens += len(encoding.encode(o))  # pyright: ignore
-                        else:
-                            trace_logger.warning(f"Not supported field {field}")
-                tool_tokens += 11
-                if len(parameters["properties"]) == 0:  # pyright: ignore
-                    tool_tokens -= 2
-        num_tokens += tool_tokens
-    num_tokens += 12
     return num_tokens
 
 
+def _count_tool_tokens_openai(tool: Tool | ToolSchema, counter: TokenCounter) -> int:
+    tool_schema = get_tool_schema(tool)
+    cached = counter.get_tool_count("openai", tool_schema)
+    if cached is not None:
+        return cached
+
+    function = convert_tools([tool_schema])[0]["function"]
+    tool_tokens = counter.count(function["name"])
+    if "description" in function:
+        tool_tokens += counter.count(function["description"])
+    tool_tokens -= 2
+    if "parameters" in function:
+        parameters = function["parameters"]
+        if "properties" in parameters:
+            assert isinstance(parameters["properties"], dict)
+            for propertiesKey in parameters["properties"]:  # pyright: ignore
+                assert isinstance(propertiesKey, str)
+                tool_tokens += counter.count(propertiesKey)
+                v = parameters["properties"][propertiesKey]  # pyright: ignore
+                for field in v:  # pyright: ignore
+                    if field == "type":
+                        tool_tokens += 2
+                        tool_tokens += counter.count(v["type"])  # pyright: ignore
+                    elif field == "description":
+                        tool_tokens += 2
+                        tool_tokens += counter.count(v["description"])  # pyright: ignore
+                    elif field == "enum":
+                        tool_tokens -= 3
+                        for o in v["enum"]:  # pyright: ignore
+                            tool_tokens += 3
+                            tool_tokens += counter.count(o)  # pyright: ignore
+                    else:
+                        trace_logger.warning(f"Not supported field {field}")
+            tool_tokens += 11
+            if len(parameters["properties"]) == 0:  # pyright: ignore
+                tool_tokens -= 2
+    counter.put_tool_count("openai", tool_schema, tool_tokens)
+    return tool_tokens
+
+
 @dataclass
 class CreateParams:
     messages: List[ChatCompletionMessageParam]
@@ -378,6 +442,69 @@ class CreateParams:
     create_args: Dict[str, Any]
 
 
+class _StreamCancellationLink:
+    """Links a cancellation token to a whole stream with a single callback.
+
+    Linking a new future to the token for every chunk costs a task and a token callback per chunk.
+    Instead, the task consuming the stream is cancelled if the token is cancelled while it waits
+    for the next chunk, and the token is checked whenever the consumer resumes the stream."""
+
+    def __init__(self, cancellation_token: CancellationToken) -> None:
+        self._cancellation_token = cancellation_token
+        self._waiting_task: Optional[Task[Any]] = asyncio.current_task()
+        cancellation_token.add_callback(self._cancel)
+
+    def _cancel(self) -> None:
+        if self._waiting_task is not None:
+            self._waiting_task.cancel()
+
+    def suspend(self) -> None:
+        """Called before a chunk is handed to the consumer."""
+        self._waiting_task = None
+
+    def resume(self) -> None:
+        """Called when the consumer asks for the next chunk."""
+        if self._cancellation_token.is_cancelled():
+            raise asyncio.CancelledError()
+        self._waiting_task = asyncio.current_task()
+
+    def close(self) -> None:
+        """Called when the stream ends, so that the token no longer holds on to it."""
+        self._waiting_task = None
+        self._cancellation_token.remove_callback(self._cancel)
+
+
+class _StreamCoalescer:
+    """Buffers streamed text deltas and releases them in larger pieces.
+
+    Text is released once `max_chars` characters are pending or the oldest pending delta
+    is `max_delay` seconds old. The delay is checked as deltas arrive."""
+
+    def __init__(self, max_chars: Optional[int], max_delay: Optional[float]) -> None:
+        self._max_chars = max_chars if max_chars is not None else math.inf
+        self._max_delay = max_delay if max_delay is not None else math.inf
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._pending_since = 0.0
+
+    def push(self, text: str) -> Optional[str]:
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= self._max_chars or time.monotonic() - self._pending_since >= self._max_delay:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        if not self._pending:
+            return None
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        return text
+
+
 class BaseOpenAIChatCompletionClient(ChatCompletionClient):
     def __init__(
         self,
@@ -387,9 +514,17 @@ def __init__(
         model_capabilities: Optional[ModelCapabilities] = None,  # type: ignore
         model_info: Optional[ModelInfo] = None,
         add_name_prefixes: bool = False,
+        stream_coalesce_chars: Optional[int] = None,
+        stream_coalesce_interval: Optional[float] = None,
     ):
         self._client = client
         self._add_name_prefixes = add_name_prefixes
+        if stream_coalesce_chars is not None and stream_coalesce_chars < 1:
+            raise ValueError("stream_coalesce_chars must be at least 1")
+        if stream_coalesce_interval is not None and stream_coalesce_interval < 0:
+            raise ValueError("stream_coalesce_interval must not be negative")
+        self._stream_coalesce_chars = stream_coalesce_chars
+        self._stream_coalesce_interval = stream_coalesce_interval
         if model_capabilities is None and model_info is None:
             try:
                 self._model_info = _model_info.get_info(create_args["model"])
@@ -558,14 +693,9 @@ def _process_create_args(
             # When Claude models last message is AssistantMessage, It could not end with whitespace
             messages = self._rstrip_last_assistant_message(messages)
 
+        model = create_args.get("model", "unknown")
         oai_messages_nested = [
-            to_oai_type(
-                m,
-                prepend_name=self._add_name_prefixes,
-                model=create_args.get("model", "unknown"),
-                model_family=self._model_info["family"],
-            )
-            for m in messages
+            _to_oai_type_cached(m, self._add_name_prefixes, model, self._model_info["family"]) for m in messages
         ]
 
         oai_messages = [item for sublist in oai_messages_nested for item in sublist]
@@ -624,11 +754,18 @@ async def create(
         result: Union[ParsedChatCompletion[BaseModel], ChatCompletion] = await future
         if create_params.response_format is not None:
             result = cast(ParsedChatCompletion[Any], result)
+        return self._create_result(result, create_params)
 
+    def _create_result(
+        self, result: Union[ParsedChatCompletion[Any], ChatCompletion], create_params: CreateParams
+    ) -> CreateResult:
+        """Convert a chat completion returned for `create_params` into a :class:`CreateResult`
+        and add its usage to the usage of this client."""
         usage = RequestUsage(
             # TODO backup token counting
             prompt_tokens=result.usage.prompt_tokens if result.usage is not None else 0,
             completion_tokens=(result.usage.completion_tokens if result.usage is not None else 0),
+            cached_prompt_tokens=_cached_prompt_tokens(result.usage),
         )
 
         logger.info(
@@ -806,6 +943,9 @@ async def create_stream(
         empty_chunk_count = 0
         first_chunk = True
         is_reasoning = False
+        coalescer: _StreamCoalescer | None = None
+        if self._stream_coalesce_chars is not None or self._stream_coalesce_interval is not None:
+            coalescer = _StreamCoalescer(self._stream_coalesce_chars, self._stream_coalesce_interval)
 
         # Process the stream of chunks.
         async for chunk in chunks:
@@ -862,19 +1002,27 @@ async def create_stream(
                     reasoning_content = "<think>" + reasoning_content
                     is_reasoning = True
                 thought_deltas.append(reasoning_content)
-                yield reasoning_content
+                if coalescer is None:
+                    yield reasoning_content
+                elif (text := coalescer.push(reasoning_content)) is not None:
+                    yield text
             elif is_reasoning:
                 # Exit reasoning mode.
                 reasoning_content = "</think>"
                 thought_deltas.append(reasoning_content)
                 is_reasoning = False
-                yield reasoning_content
+                if coalescer is None:
+                    yield reasoning_content
+                elif (text := coalescer.push(reasoning_content)) is not None:
+                    yield text
 
             # First try get content
             if choice.delta.content:
                 content_deltas.append(choice.delta.content)
-                if len(choice.delta.content) > 0:
+                if coalescer is None:
                     yield choice.delta.content
+                elif (text := coalescer.push(choice.delta.content)) is not None:
+                    yield text
                 # NOTE: for OpenAI, tool_calls and content are mutually exclusive it seems, so we can skip the rest of the loop.
                 # However, this may not be the case for other APIs -- we should expect this may need to be updated.
                 continue
@@ -905,6 +1053,10 @@ async def create_stream(
                     for x in choice.logprobs.content
                 ]
 
+        # Release any text still held back by the coalescer.
+        if coalescer is not None and (text := coalescer.flush()) is not None:
+            yield text
+
         # Finalize the CreateResult.
 
         # TODO: can we remove this?
@@ -925,6 +1077,7 @@ async def create_stream(
         usage = RequestUsage(
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
+            cached_prompt_tokens=_cached_prompt_tokens(chunk.usage if chunk else None),
         )
 
         # Detect whether it is a function call or just text.
@@ -1000,15 +1153,19 @@ async def _create_stream_chunks(
         if cancellation_token is not None:
             cancellation_token.link_future(stream_future)
         stream = await stream_future
-        while True:
-            try:
-                chunk_future = asyncio.ensure_future(anext(stream))
-                if cancellation_token is not None:
-                    cancellation_token.link_future(chunk_future)
-                chunk = await chunk_future
+        if cancellation_token is None:
+            async for chunk in stream:
                 yield chunk
-            except StopAsyncIteration:
-                break
+            return
+        # Link the token once for the whole stream rather than once per chunk.
+        link = _StreamCancellationLink(cancellation_token)
+        try:
+            async for chunk in stream:
+                link.suspend()
+                yield chunk
+                link.resume()
+        finally:
+            link.close()
 
     async def _create_stream_chunks_beta_client(
         self,
@@ -1024,23 +1181,24 @@ async def _create_stream_chunks_beta_client(
             response_format=(response_format if response_format is not None else NOT_GIVEN),
             **create_args_no_response_format,
         ) as stream:
-            while True:
-                try:
-                    event_future = asyncio.ensure_future(anext(stream))
-                    if cancellation_token is not None:
-                        cancellation_token.link_future(event_future)
-                    event = await event_future
-
+            link = _StreamCancellationLink(cancellation_token) if cancellation_token is not None else None
+            try:
+                async for event in stream:
                     if event.type == "chunk":
-                        chunk = event.chunk
-                        yield chunk
+                        if link is None:
+                            yield event.chunk
+                        else:
+                            link.suspend()
+                            yield event.chunk
+                            link.resume()
                     # We don't handle other event types from the beta client stream.
                     # As the other event types are auxiliary to the chunk event.
                     # See: https://github.com/openai/openai-python/blob/main/helpers.md#chat-completions-events.
                     # Once the beta client is stable, we can move all the logic to the beta client.
                     # Then we can consider handling other event types which may simplify the code overall.
-                except StopAsyncIteration:
-                    break
+            finally:
+                if link is not None:
+                    link.close()
 
     async def close(self) -> None:
         await self._client.close()
@@ -1060,6 +1218,17 @@ def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool |
             model_family=self._model_info["family"],
         )
 
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return count_tokens_openai_batch(
+            messages,
+            self._create_args["model"],
+            add_name_prefixes=self._add_name_prefixes,
+            tools=tools,
+            model_family=self._model_info["family"],
+        )
+
     def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
         token_limit = _model_info.get_token_limit(self._create_args["model"])
         return token_limit - self.count_tokens(messages, tools=tools)
@@ -1159,6 +1328,11 @@ class OpenAIChatCompletionClient(BaseOpenAIChatCompletionClient, Component[OpenA
             This can be useful for models that do not support the `name` field in
             message. Defaults to False.
         stream_options (optional, dict): Additional options for streaming. Currently only `include_usage` is supported.
+        stream_coalesce_chars (optional, int): When streaming, buffer text deltas and yield them
+            once this many characters are pending. Defaults to None, which yields every delta as it arrives.
+        stream_coalesce_interval (optional, float): When streaming, yield buffered text deltas once
+            the oldest pending delta is this many seconds old. The interval is checked as deltas arrive.
+            Can be combined with `stream_coalesce_chars`. Defaults to None.
 
     Examples:
 
@@ -1357,6 +1531,9 @@ def __init__(self, **kwargs: Unpack[OpenAIClientConfiguration]):
         if "add_name_prefixes" in kwargs:
             add_name_prefixes = kwargs["add_name_prefixes"]
 
+        stream_coalesce_chars = kwargs.get("stream_coalesce_chars")
+        stream_coalesce_interval = kwargs.get("stream_coalesce_interval")
+
         # Special handling for Gemini model.
         assert "model" in copied_args and isinstance(copied_args["model"], str)
         if copied_args["model"].startswith("gemini-"):
@@ -1379,6 +1556,8 @@ def __init__(self, **kwargs: Unpack[OpenAIClientConfiguration]):
             model_capabilities=model_capabilities,
             model_info=model_info,
             add_name_prefixes=add_name_prefixes,
+            stream_coalesce_chars=stream_coalesce_chars,
+            stream_coalesce_interval=stream_coalesce_interval,
         )
 
     def __getstate__(self) -> Dict[str, Any]:
@@ -1480,6 +1659,11 @@ class AzureOpenAIChatCompletionClient(
         top_p (optional, float):
         user (optional, str):
         default_headers (optional, dict[str, str]):  Custom headers; useful for authentication or other custom requirements.
+        stream_coalesce_chars (optional, int): When streaming, buffer text deltas and yield them
+            once this many characters are pending. Defaults to None, which yields every delta as it arrives.
+        stream_coalesce_interval (optional, float): When streaming, yield buffered text deltas once
+            the oldest pending delta is this many seconds old. The interval is checked as deltas arrive.
+            Can be combined with `stream_coalesce_chars`. Defaults to None.
 
 
     To use the client, you need to provide your deployment name, Azure Cognitive Services endpoint, and api version.
@@ -1571,6 +1755,9 @@ def __init__(self, **kwargs: Unpack[AzureOpenAIClientConfiguration]):
         if "add_name_prefixes" in kwargs:
             add_name_prefixes = kwargs["add_name_prefixes"]
 
+        stream_coalesce_chars = kwargs.get("stream_coalesce_chars")
+        stream_coalesce_interval = kwargs.get("stream_coalesce_interval")
+
         client = _azure_openai_client_from_config(copied_args)
         create_args = _create_args_from_config(copied_args)
         self._raw_config: Dict[str, Any] = copied_args
@@ -1580,6 +1767,8 @@ def __init__(self, **kwargs: Unpack[AzureOpenAIClientConfiguration]):
             model_capabilities=model_capabilities,
             model_info=model_info,
             add_name_prefixes=add_name_prefixes,
+            stream_coalesce_chars=stream_coalesce_chars,
+            stream_coalesce_interval=stream_coalesce_interval,
         )
 
     def __getstate__(self) -> Dict[str, Any]:
@@ -64,6 +64,10 @@ class BaseOpenAIClientConfiguration(CreateArguments, total=False):
     add_name_prefixes: bool
     """What functionality the model supports, determined by default from model name but is overriden if value passed."""
     default_headers: Dict[str, str] | None
+    stream_coalesce_chars: int
+    """Buffer streamed text until this many characters are pending before yielding it."""
+    stream_coalesce_interval: float
+    """Yield buffered streamed text once the oldest pending delta is this many seconds old."""
 
 
 # See OpenAI docs for explanation of these parameters
@@ -106,6 +110,8 @@ class BaseOpenAIClientConfigurationConfigModel(CreateArgumentsConfigModel):
     model_info: ModelInfo | None = None
     add_name_prefixes: bool | None = None
     default_headers: Dict[str, str] | None = None
+    stream_coalesce_chars: int | None = None
+    stream_coalesce_interval: float | None = None
 
 
 # See OpenAI docs for explanation of these parameters
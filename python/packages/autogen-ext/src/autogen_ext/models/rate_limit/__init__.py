@@ -0,0 +1,11 @@
+from ._rate_limited_client import (
+    RateLimitedChatCompletionClient,
+    RateLimitedChatCompletionClientConfig,
+    RateLimiterMetrics,
+)
+
+__all__ = [
+    "RateLimitedChatCompletionClient",
+    "RateLimitedChatCompletionClientConfig",
+    "RateLimiterMetrics",
+]
@@ -0,0 +1,481 @@
+import asyncio
+import copy
+import heapq
+import itertools
+import logging
+import re
+import time
+import warnings
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from autogen_core import TRACE_LOGGER_NAME, CancellationToken, Component, ComponentModel
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+from typing_extensions import Self
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+# How long to stop sending requests after a rate limit error that does not say when to retry.
+_DEFAULT_RETRY_AFTER = 1.0
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@dataclass(frozen=True)
+class RateLimiterMetrics:
+    """A snapshot of the metrics of a :class:`RateLimitedChatCompletionClient` and the lanes that share its limits."""
+
+    requests: int
+    """The number of requests that were let through."""
+    waiting: int
+    """The number of requests waiting to be let through."""
+    in_flight: int
+    """The number of requests sent to the underlying client and not finished yet."""
+    rate_limit_errors: int
+    """The number of rate limit errors returned by the underlying client."""
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """The mean time a request waited before it was let through."""
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+
+class _TokenBucket:
+    """A bucket that refills at `per_minute / 60` units per second and holds at most one second's worth."""
+
+    def __init__(self, per_minute: float, now: float) -> None:
+        self.set_limit(per_minute)
+        self.level = self.capacity
+        self.updated = now
+
+    def set_limit(self, per_minute: float) -> None:
+        self.rate = per_minute / 60
+        # Sending at most one second's worth at once spreads requests evenly over the minute, which keeps
+        # providers that enforce their limits over shorter periods from rejecting bursts.
+        self.capacity = max(self.rate, 1.0)
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """The time until `amount` can be taken. Amounts above the capacity only wait for a full bucket."""
+        missing = min(amount, self.capacity) - self.level
+        return max(missing, 0.0) / self.rate
+
+
+class _RateLimiter:
+    """Lets requests through in priority order as the request and token buckets and the concurrency limit allow."""
+
+    def __init__(
+        self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float], max_concurrency: Optional[int]
+    ) -> None:
+        now = time.monotonic()
+        self.requests = _TokenBucket(requests_per_minute, now) if requests_per_minute is not None else None
+        self.tokens = _TokenBucket(tokens_per_minute, now) if tokens_per_minute is not None else None
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        # Waiting requests ordered by descending priority, then by arrival.
+        self._waiters: List[Tuple[int, int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self._requests = 0
+        self._rate_limit_errors = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def metrics(self) -> RateLimiterMetrics:
+        return RateLimiterMetrics(
+            requests=self._requests,
+            waiting=sum(1 for *_, future in self._waiters if not future.done()),
+            in_flight=self._in_flight,
+            rate_limit_errors=self._rate_limit_errors,
+            total_wait_seconds=self._total_wait,
+            max_wait_seconds=self._max_wait,
+        )
+
+    async def acquire(self, tokens: int, priority: int, cancellation_token: Optional[CancellationToken]) -> None:
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+        def cancel() -> None:
+            future.cancel()
+
+        if cancellation_token is not None:
+            cancellation_token.add_callback(cancel)
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The request was let through just as its caller was cancelled.
+                self.release(tokens, 0, refund=True)
+            else:
+                # Let the next request through if this one was blocking the queue.
+                self._dispatch()
+            raise
+        finally:
+            if cancellation_token is not None:
+                cancellation_token.remove_callback(cancel)
+        wait = time.monotonic() - start
+        self._requests += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def release(self, estimated_tokens: int, used_tokens: Optional[int], refund: bool = False) -> None:
+        """Finish a request. The token bucket is charged the difference between the tokens it used, if known,
+        and the estimate it was let through with; a refunded request gives its request and tokens back."""
+        self._in_flight -= 1
+        if refund:
+            used_tokens = 0
+            if self.requests is not None:
+                self.requests.level = min(self.requests.capacity, self.requests.level + 1)
+        if self.tokens is not None and used_tokens is not None:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + estimated_tokens - used_tokens)
+        self._dispatch()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        now = time.monotonic()
+        headers = {key.lower(): value for key, value in headers.items()}
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            if bucket is None:
+                continue
+            bucket.refill(now)
+            limit = _parse_number(headers.get(f"x-ratelimit-limit-{kind}"))
+            if limit is not None and limit > 0:
+                bucket.set_limit(limit)
+            remaining = _parse_number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is not None:
+                bucket.level = min(bucket.level, remaining)
+                reset = _parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if remaining < 1 and reset is not None:
+                    self._paused_until = max(self._paused_until, now + reset)
+        retry_after = _retry_after(headers)
+        if retry_after is not None:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        self._dispatch()
+
+    def on_rate_limit_error(self, headers: Mapping[str, str]) -> None:
+        self._rate_limit_errors += 1
+        if _retry_after({key.lower(): value for key, value in headers.items()}) is None:
+            self._paused_until = max(self._paused_until, time.monotonic() + _DEFAULT_RETRY_AFTER)
+        self.update_from_headers(headers)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.refill(now)
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                # Cancelled while waiting.
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+                # A finished request dispatches again.
+                return
+            wait = self._paused_until - now
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(tokens))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= tokens
+            self._in_flight += 1
+            future.set_result(None)
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a duration such as ``"1s"``, ``"6m0s"`` or ``"120ms"``, or a number of seconds."""
+    if value is None:
+        return None
+    seconds = _parse_number(value)
+    if seconds is not None:
+        return seconds
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    retry_after_ms = _parse_number(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return _parse_number(headers.get("retry-after"))
+
+
+def _rate_limit_error_headers(error: Exception) -> Optional[Mapping[str, str]]:
+    """The response headers of a rate limit error raised by a model client, or None for other errors.
+
+    The OpenAI, Anthropic and Azure SDKs all raise errors with a ``status_code`` and a ``response``."""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    return headers if isinstance(headers, Mapping) else {}
+
+
+class RateLimitedChatCompletionClientConfig(BaseModel):
+    client: ComponentModel
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    priority: int = 0
+
+
+class RateLimitedChatCompletionClient(ChatCompletionClient, Component[RateLimitedChatCompletionClientConfig]):
+    """A wrapper around a :class:`~autogen_core.models.ChatCompletionClient` that keeps the requests
+    sent to it within the rate limits of the provider.
+
+    Requests wait in a queue until the request and token buckets have room for them and fewer than
+    `max_concurrency` requests are in flight. The buckets refill evenly at `requests_per_minute` and
+    `tokens_per_minute`, so when many agents share a client their throughput levels off at the provider
+    limit instead of swinging through bursts of rate limit errors and retries. A request takes the
+    token estimate of :meth:`count_tokens` from the token bucket when it is sent, and the bucket is
+    corrected with the usage reported in the result. Cached results give back what they took.
+
+    Agents that should not wait behind others, such as the orchestrator of a team, can use a lane with a
+    higher priority created by :meth:`with_priority`. Lanes share the limits and the queue; the waiting
+    request with the highest priority is sent first, and requests with the same priority are sent in
+    the order they arrived.
+
+    When the underlying client raises a rate limit error, which is any error with a ``status_code`` of 429,
+    no request is sent until the ``retry-after`` time of the response, or for one second if there is none,
+    and the ``x-ratelimit-*`` headers of the response update the limits and the remaining capacity.
+    Headers of successful responses can be passed to :meth:`update_from_headers`, for example from a
+    response hook of the HTTP client.
+
+    Args:
+        client (ChatCompletionClient): The client to wrap.
+        requests_per_minute (float | None): The maximum number of requests per minute. Defaults to None, for no limit.
+        tokens_per_minute (float | None): The maximum number of tokens per minute. Defaults to None, for no limit.
+        max_concurrency (int | None): The maximum number of requests in flight. Defaults to None, for no limit.
+        priority (int): The priority of the requests made through this client. Defaults to 0.
+
+    Example:
+
+        .. code-block:: python
+
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+            from autogen_ext.models.rate_limit import RateLimitedChatCompletionClient
+
+            worker_client = RateLimitedChatCompletionClient(
+                OpenAIChatCompletionClient(model="gpt-4o"),
+                requests_per_minute=500,
+                tokens_per_minute=30_000,
+                max_concurrency=16,
+            )
+            orchestrator_client = worker_client.with_priority(10)
+            print(worker_client.metrics)
+    """
+
+    component_type = "model"
+    component_provider_override = "autogen_ext.models.rate_limit.RateLimitedChatCompletionClient"
+    component_config_schema = RateLimitedChatCompletionClientConfig
+
+    def __init__(
+        self,
+        client: ChatCompletionClient,
+        *,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        priority: int = 0,
+    ) -> None:
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be greater than 0.")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be greater than 0.")
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self.client = client
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._limiter = _RateLimiter(requests_per_minute, tokens_per_minute, max_concurrency)
+        self._priority = priority
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def metrics(self) -> RateLimiterMetrics:
+        """The metrics of the limits shared by this client and its lanes."""
+        return self._limiter.metrics
+
+    def with_priority(self, priority: int) -> "RateLimitedChatCompletionClient":
+        """Return a lane that shares the underlying client, the limits and the queue of this client,
+        and whose requests have the given priority."""
+        lane = copy.copy(self)
+        lane._priority = priority
+        return lane
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Update the limits and the remaining capacity from the ``x-ratelimit-*`` and ``retry-after``
+        headers of a response of the provider."""
+        self._limiter.update_from_headers(headers)
+
+    def _estimate_tokens(self, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema]) -> int:
+        if self._limiter.tokens is None:
+            return 0
+        try:
+            return self.client.count_tokens(messages, tools=tools)
+        except Exception:
+            # The usage in the result corrects the token bucket after the request.
+            trace_logger.warning("Failed to count the tokens of a request, sending it without an estimate.")
+            return 0
+
+    def _on_error(self, error: Exception) -> None:
+        headers = _rate_limit_error_headers(error)
+        if headers is not None:
+            self._limiter.on_rate_limit_error(headers)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        estimated_tokens = self._estimate_tokens(messages, tools)
+        await self._limiter.acquire(estimated_tokens, self._priority, cancellation_token)
+        result: Optional[CreateResult] = None
+        try:
+            result = await self.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            return result
+        except Exception as e:
+            self._on_error(e)
+            raise
+        finally:
+            self._release(estimated_tokens, result)
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            estimated_tokens = self._estimate_tokens(messages, tools)
+            await self._limiter.acquire(estimated_tokens, self._priority, cancellation_token)
+            result: Optional[CreateResult] = None
+            try:
+                async for chunk in self.client.create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    if isinstance(chunk, CreateResult):
+                        result = chunk
+                    yield chunk
+            except Exception as e:
+                self._on_error(e)
+                raise
+            finally:
+                self._release(estimated_tokens, result)
+
+        return _generator()
+
+    def _release(self, estimated_tokens: int, result: Optional[CreateResult]) -> None:
+        if result is None:
+            self._limiter.release(estimated_tokens, None)
+        elif result.cached:
+            self._limiter.release(estimated_tokens, 0, refund=True)
+        else:
+            used_tokens = result.usage.prompt_tokens + result.usage.completion_tokens
+            self._limiter.release(estimated_tokens, used_tokens)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.client.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.client.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.count_tokens(messages, tools=tools)
+
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return self.client.count_tokens_batch(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self.client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn("capabilities is deprecated, use model_info instead", DeprecationWarning, stacklevel=2)
+        return self.client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.client.model_info
+
+    def _to_config(self) -> RateLimitedChatCompletionClientConfig:
+        return RateLimitedChatCompletionClientConfig(
+            client=self.client.dump_component(),
+            requests_per_minute=self._requests_per_minute,
+            tokens_per_minute=self._tokens_per_minute,
+            max_concurrency=self._limiter.max_concurrency,
+            priority=self._priority,
+        )
+
+    @classmethod
+    def _from_config(cls, config: RateLimitedChatCompletionClientConfig) -> Self:
+        return cls(
+            ChatCompletionClient.load_component(config.client),
+            requests_per_minute=config.requests_per_minute,
+            tokens_per_minute=config.tokens_per_minute,
+            max_concurrency=config.max_concurrency,
+            priority=config.priority,
+        )
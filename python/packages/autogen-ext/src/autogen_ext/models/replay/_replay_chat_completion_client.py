@@ -180,7 +180,9 @@ async def create(
             )
         else:
             self._cur_usage = RequestUsage(
-                prompt_tokens=prompt_token_count, completion_tokens=response.usage.completion_tokens
+                prompt_tokens=prompt_token_count,
+                completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=min(response.usage.cached_prompt_tokens, prompt_token_count),
             )
 
         self._update_total_usage()
@@ -226,7 +228,9 @@ async def create_stream(
             self._update_total_usage()
         else:
             self._cur_usage = RequestUsage(
-                prompt_tokens=prompt_token_count, completion_tokens=response.usage.completion_tokens
+                prompt_tokens=prompt_token_count,
+                completion_tokens=response.usage.completion_tokens,
+                cached_prompt_tokens=min(response.usage.cached_prompt_tokens, prompt_token_count),
             )
             yield response
             self._update_total_usage()
@@ -281,6 +285,7 @@ def _tokenize(self, messages: Union[str, LLMMessage, Sequence[LLMMessage]]) -> t
     def _update_total_usage(self) -> None:
         self._total_usage.completion_tokens += self._cur_usage.completion_tokens
         self._total_usage.prompt_tokens += self._cur_usage.prompt_tokens
+        self._total_usage.cached_prompt_tokens += self._cur_usage.cached_prompt_tokens
 
     @property
     def capabilities(self) -> ModelCapabilities:  # type: ignore
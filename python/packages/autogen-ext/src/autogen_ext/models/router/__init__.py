@@ -0,0 +1,11 @@
+from ._router_client import (
+    RouterChatCompletionClient,
+    RouterChatCompletionClientConfig,
+    RouterMemberStats,
+)
+
+__all__ = [
+    "RouterChatCompletionClient",
+    "RouterChatCompletionClientConfig",
+    "RouterMemberStats",
+]
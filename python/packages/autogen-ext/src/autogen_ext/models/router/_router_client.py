@@ -0,0 +1,456 @@
+import asyncio
+import logging
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Deque, Dict, List, Literal, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from autogen_core import TRACE_LOGGER_NAME, CancellationToken, Component, ComponentModel
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+from typing_extensions import Self
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+RoutingStrategy = Literal["least_outstanding", "latency_ewma"]
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+# Weight of the newest latency in the moving average.
+_EWMA_ALPHA = 0.2
+# Number of latencies kept per member to estimate the 95th percentile.
+_LATENCY_WINDOW = 100
+# Hedging waits for this many latencies of a member before it uses their 95th percentile as the delay.
+_MIN_HEDGE_SAMPLES = 10
+
+
+@dataclass(frozen=True)
+class RouterMemberStats:
+    """A snapshot of the statistics of a member client of a :class:`RouterChatCompletionClient`."""
+
+    index: int
+    """The position of the member in `model_clients`."""
+    outstanding: int
+    requests: int
+    errors: int
+    ewma_latency_seconds: Optional[float]
+    """The exponentially weighted moving average of the latency of successful requests."""
+    p95_latency_seconds: Optional[float]
+    """The 95th percentile of the latency of the latest successful requests."""
+    circuit_state: CircuitState
+
+
+class _Member:
+    def __init__(self, index: int, client: ChatCompletionClient) -> None:
+        self.index = index
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ewma_latency: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.circuit_state: CircuitState = "closed"
+        self.opened_at = 0.0
+        # Whether the trial request of a half-open circuit is in flight.
+        self.probing = False
+
+    def p95_latency(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def stats(self) -> RouterMemberStats:
+        return RouterMemberStats(
+            index=self.index,
+            outstanding=self.outstanding,
+            requests=self.requests,
+            errors=self.errors,
+            ewma_latency_seconds=self.ewma_latency,
+            p95_latency_seconds=self.p95_latency(),
+            circuit_state=self.circuit_state,
+        )
+
+
+class RouterChatCompletionClientConfig(BaseModel):
+    model_clients: List[ComponentModel]
+    strategy: RoutingStrategy = "least_outstanding"
+    hedging: bool = False
+    hedge_delay: Optional[float] = None
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+
+
+class RouterChatCompletionClient(ChatCompletionClient, Component[RouterChatCompletionClientConfig]):
+    """A client that spreads requests over several clients of the same model, for example deployments
+    in different regions and a local fallback.
+
+    Each request goes to the member with the best score among those whose circuit is not open:
+
+    * ``"least_outstanding"``: the member with the fewest requests in flight.
+    * ``"latency_ewma"``: the member with the lowest moving average of its latency, multiplied by the number
+      of its requests in flight plus one. Members without a measured latency are tried first.
+
+    If the member fails, the request is sent to the next best member that has not been tried yet, and the
+    error of the last member is raised if they all fail. A stream only fails over until its first chunk.
+
+    After `failure_threshold` consecutive failures the circuit of a member opens and it receives no
+    requests for `recovery_timeout` seconds. Then one trial request is let through: the circuit closes
+    if it succeeds and opens again if it fails. If every circuit is open, the member whose circuit opened
+    first is tried anyway.
+
+    With `hedging`, a :meth:`create` request that has not finished after `hedge_delay` seconds is also sent
+    to the next best member. The first result is returned and the other request is cancelled through its
+    :class:`~autogen_core.CancellationToken`. If `hedge_delay` is None, the 95th percentile of the latency
+    of the first member is used, once it has completed enough requests to estimate it.
+
+    Per-member statistics are available from :attr:`member_stats`. The model info, the token counting and
+    the remaining tokens are those of the first member; the usage is the sum over all members.
+
+    Args:
+        model_clients (Sequence[ChatCompletionClient]): The member clients. They should serve the same model.
+        strategy (str): ``"least_outstanding"`` or ``"latency_ewma"``. Defaults to ``"least_outstanding"``.
+        hedging (bool): Whether to send slow requests to a second member. Defaults to False.
+        hedge_delay (float | None): The seconds to wait before hedging. Defaults to None, to use the 95th
+            percentile of the latency.
+        failure_threshold (int): The number of consecutive failures that opens the circuit of a member.
+            Defaults to 5.
+        recovery_timeout (float): The seconds a circuit stays open. Defaults to 30.
+
+    Example:
+
+        .. code-block:: python
+
+            from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+            from autogen_ext.models.ollama import OllamaChatCompletionClient
+            from autogen_ext.models.router import RouterChatCompletionClient
+
+            deployments = [
+                AzureOpenAIChatCompletionClient(
+                    azure_deployment="gpt-4o",
+                    model="gpt-4o",
+                    api_version="2024-06-01",
+                    azure_endpoint=endpoint,
+                    api_key="...",
+                )
+                for endpoint in ["https://eastus.example.com/", "https://westus.example.com/"]
+            ]
+            router = RouterChatCompletionClient(
+                [*deployments, OllamaChatCompletionClient(model="llama3.1")],
+                strategy="latency_ewma",
+                hedging=True,
+            )
+    """
+
+    component_type = "model"
+    component_provider_override = "autogen_ext.models.router.RouterChatCompletionClient"
+    component_config_schema = RouterChatCompletionClientConfig
+
+    def __init__(
+        self,
+        model_clients: Sequence[ChatCompletionClient],
+        *,
+        strategy: RoutingStrategy = "least_outstanding",
+        hedging: bool = False,
+        hedge_delay: Optional[float] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ) -> None:
+        if not model_clients:
+            raise ValueError("At least one model client is required.")
+        if strategy not in ("least_outstanding", "latency_ewma"):
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        if hedge_delay is not None and hedge_delay < 0:
+            raise ValueError("hedge_delay must be non-negative.")
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be greater than 0.")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must be non-negative.")
+        self._members = [_Member(index, client) for index, client in enumerate(model_clients)]
+        self._strategy: RoutingStrategy = strategy
+        self._hedging = hedging
+        self._hedge_delay = hedge_delay
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+
+    @property
+    def model_clients(self) -> List[ChatCompletionClient]:
+        return [member.client for member in self._members]
+
+    @property
+    def member_stats(self) -> List[RouterMemberStats]:
+        """The statistics of the member clients, in the order of `model_clients`."""
+        return [member.stats() for member in self._members]
+
+    def _available(self, member: _Member, now: float) -> bool:
+        if member.circuit_state == "open" and now - member.opened_at >= self._recovery_timeout:
+            member.circuit_state = "half_open"
+        if member.circuit_state == "half_open":
+            return not member.probing
+        return member.circuit_state == "closed"
+
+    def _score(self, member: _Member) -> Tuple[float, ...]:
+        if self._strategy == "latency_ewma":
+            return ((member.ewma_latency or 0.0) * (member.outstanding + 1), member.outstanding, member.requests)
+        return (member.outstanding, member.ewma_latency or 0.0, member.requests)
+
+    def _select(self, tried: Set[int]) -> Optional[_Member]:
+        """The best member that has not been tried yet, or None if all were tried."""
+        now = time.monotonic()
+        untried = [member for member in self._members if member.index not in tried]
+        if not untried:
+            return None
+        available = [member for member in untried if self._available(member, now)]
+        if not available:
+            # Every circuit is open: try the member that has been resting the longest.
+            return min(untried, key=lambda member: member.opened_at)
+        return min(available, key=self._score)
+
+    def _on_start(self, member: _Member) -> float:
+        member.outstanding += 1
+        member.requests += 1
+        if member.circuit_state == "half_open":
+            member.probing = True
+        return time.monotonic()
+
+    def _on_success(self, member: _Member, start: float) -> None:
+        member.outstanding -= 1
+        latency = time.monotonic() - start
+        member.latencies.append(latency)
+        if member.ewma_latency is None:
+            member.ewma_latency = latency
+        else:
+            member.ewma_latency = _EWMA_ALPHA * latency + (1 - _EWMA_ALPHA) * member.ewma_latency
+        member.consecutive_failures = 0
+        member.circuit_state = "closed"
+        member.probing = False
+
+    def _on_failure(self, member: _Member, error: Exception) -> None:
+        member.outstanding -= 1
+        member.errors += 1
+        member.consecutive_failures += 1
+        member.probing = False
+        if member.circuit_state == "half_open" or member.consecutive_failures >= self._failure_threshold:
+            if member.circuit_state != "open":
+                trace_logger.warning(f"Opening the circuit of model client {member.index} after error: {error}")
+            member.circuit_state = "open"
+            member.opened_at = time.monotonic()
+
+    def _on_cancel(self, member: _Member) -> None:
+        member.outstanding -= 1
+        member.probing = False
+
+    def _hedge_delay_for(self, member: _Member) -> Optional[float]:
+        if not self._hedging:
+            return None
+        if self._hedge_delay is not None:
+            return self._hedge_delay
+        if len(member.latencies) < _MIN_HEDGE_SAMPLES:
+            return None
+        return member.p95_latency()
+
+    async def _create_with(
+        self,
+        member: _Member,
+        start: float,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        json_output: Optional[bool | type[BaseModel]],
+        extra_create_args: Mapping[str, Any],
+        cancellation_token: CancellationToken,
+    ) -> CreateResult:
+        try:
+            result = await member.client.create(
+                messages,
+                tools=tools,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        except asyncio.CancelledError:
+            self._on_cancel(member)
+            raise
+        except Exception as e:
+            if cancellation_token.is_cancelled():
+                self._on_cancel(member)
+            else:
+                self._on_failure(member, e)
+            raise
+        self._on_success(member, start)
+        return result
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tried: Set[int] = set()
+        attempts: Dict[asyncio.Task[CreateResult], CancellationToken] = {}
+        attempt_tokens: List[CancellationToken] = []
+        last_error: Optional[Exception] = None
+
+        def start_attempt() -> Optional[_Member]:
+            member = self._select(tried)
+            if member is None:
+                return None
+            tried.add(member.index)
+            # Counted as outstanding right away, so that concurrent requests pick other members.
+            start = self._on_start(member)
+            attempt_token = CancellationToken()
+            if cancellation_token is not None:
+                cancellation_token.add_callback(attempt_token.cancel)
+                attempt_tokens.append(attempt_token)
+            task = asyncio.create_task(
+                self._create_with(member, start, messages, tools, json_output, extra_create_args, attempt_token)
+            )
+            attempts[task] = attempt_token
+            return member
+
+        first_member = start_attempt()
+        assert first_member is not None
+        hedge_delay = self._hedge_delay_for(first_member)
+        try:
+            while attempts:
+                done, _ = await asyncio.wait(attempts, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The request is slow: hedge it with the next best member, once.
+                    hedge_delay = None
+                    start_attempt()
+                    continue
+                for task in done:
+                    del attempts[task]
+                    if task.cancelled():
+                        raise asyncio.CancelledError()
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not isinstance(error, Exception):
+                        raise error
+                    last_error = error
+                if cancellation_token is not None and cancellation_token.is_cancelled():
+                    break
+                if not attempts and start_attempt() is None:
+                    break
+        finally:
+            # Cancel the requests that lost the race.
+            for task, attempt_token in attempts.items():
+                attempt_token.cancel()
+                task.cancel()
+            # The caller's token may outlive this request, so it must not keep the attempts alive.
+            if cancellation_token is not None:
+                for attempt_token in attempt_tokens:
+                    cancellation_token.remove_callback(attempt_token.cancel)
+        assert last_error is not None
+        raise last_error
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def _generator() -> AsyncGenerator[Union[str, CreateResult], None]:
+            tried: Set[int] = set()
+            while True:
+                member = self._select(tried)
+                assert member is not None
+                tried.add(member.index)
+                start = self._on_start(member)
+                started = False
+                try:
+                    async for chunk in member.client.create_stream(
+                        messages,
+                        tools=tools,
+                        json_output=json_output,
+                        extra_create_args=extra_create_args,
+                        cancellation_token=cancellation_token,
+                    ):
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    self._on_failure(member, e)
+                    if started or len(tried) == len(self._members):
+                        raise
+                    continue
+                except BaseException:
+                    self._on_cancel(member)
+                    raise
+                self._on_success(member, start)
+                return
+
+        return _generator()
+
+    async def close(self) -> None:
+        await asyncio.gather(*[member.client.close() for member in self._members])
+
+    def actual_usage(self) -> RequestUsage:
+        return _sum_usage([member.client.actual_usage() for member in self._members])
+
+    def total_usage(self) -> RequestUsage:
+        return _sum_usage([member.client.total_usage() for member in self._members])
+
+    def count_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._members[0].client.count_tokens(messages, tools=tools)
+
+    def count_tokens_batch(
+        self, messages: Sequence[Sequence[LLMMessage]], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> List[int]:
+        return self._members[0].client.count_tokens_batch(messages, tools=tools)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []) -> int:
+        return self._members[0].client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        warnings.warn("capabilities is deprecated, use model_info instead", DeprecationWarning, stacklevel=2)
+        return self._members[0].client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._members[0].client.model_info
+
+    def _to_config(self) -> RouterChatCompletionClientConfig:
+        return RouterChatCompletionClientConfig(
+            model_clients=[member.client.dump_component() for member in self._members],
+            strategy=self._strategy,
+            hedging=self._hedging,
+            hedge_delay=self._hedge_delay,
+            failure_threshold=self._failure_threshold,
+            recovery_timeout=self._recovery_timeout,
+        )
+
+    @classmethod
+    def _from_config(cls, config: RouterChatCompletionClientConfig) -> Self:
+        return cls(
+            [ChatCompletionClient.load_component(client) for client in config.model_clients],
+            strategy=config.strategy,
+            hedging=config.hedging,
+            hedge_delay=config.hedge_delay,
+            failure_threshold=config.failure_threshold,
+            recovery_timeout=config.recovery_timeout,
+        )
+
+
+def _sum_usage(usages: List[RequestUsage]) -> RequestUsage:
+    return RequestUsage(
+        prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+        completion_tokens=sum(usage.completion_tokens for usage in usages),
+        cached_prompt_tokens=sum(usage.cached_prompt_tokens for usage in usages),
+    )
@@ -40,10 +40,13 @@
     AgentMetadata,
     AgentRuntime,
     AgentType,
+    BoundedQueue,
     CancellationToken,
     MessageContext,
     MessageHandlerContext,
     MessageSerializer,
+    QueueMetrics,
+    QueueOverflowPolicy,
     Subscription,
     TopicId,
 )
@@ -115,10 +118,20 @@ class HostConnection:
         )
     ]
 
-    def __init__(self, channel: grpc.aio.Channel, stub: Any) -> None:  # type: ignore
+    def __init__(
+        self,
+        channel: grpc.aio.Channel,  # type: ignore
+        stub: Any,
+        max_queue_size: int = 0,
+        queue_overflow_policy: QueueOverflowPolicy = "block",
+    ) -> None:
         self._channel = channel
-        self._send_queue = asyncio.Queue[agent_worker_pb2.Message]()
-        self._recv_queue = asyncio.Queue[agent_worker_pb2.Message]()
+        self._send_queue = BoundedQueue[agent_worker_pb2.Message](
+            "HostConnection.send", maxsize=max_queue_size, overflow_policy=queue_overflow_policy
+        )
+        self._recv_queue = BoundedQueue[agent_worker_pb2.Message](
+            "HostConnection.recv", maxsize=max_queue_size, overflow_policy=queue_overflow_policy
+        )
         self._connection_task: Task[None] | None = None
         self._stub: AgentRpcAsyncStub = stub
         self._client_id = str(uuid.uuid4())
@@ -131,9 +144,18 @@ def stub(self) -> Any:
     def metadata(self) -> Sequence[Tuple[str, str]]:
         return [("client-id", self._client_id)]
 
+    @property
+    def queue_metrics(self) -> List[QueueMetrics]:
+        """The metrics of the send and receive queues."""
+        return [self._send_queue.metrics, self._recv_queue.metrics]
+
     @classmethod
     async def from_host_address(
-        cls, host_address: str, extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG
+        cls,
+        host_address: str,
+        extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG,
+        max_queue_size: int = 0,
+        queue_overflow_policy: QueueOverflowPolicy = "block",
     ) -> Self:
         logger.info("Connecting to %s", host_address)
         #  Always use DEFAULT_GRPC_CONFIG and override it with provided grpc_config
@@ -146,7 +168,7 @@ async def from_host_address(
             options=merged_options,
         )
         stub: AgentRpcAsyncStub = agent_worker_pb2_grpc.AgentRpcStub(channel)  # type: ignore
-        instance = cls(channel, stub)
+        instance = cls(channel, stub, max_queue_size=max_queue_size, queue_overflow_policy=queue_overflow_policy)
 
         instance._connection_task = await instance._connect(
             stub, instance._send_queue, instance._recv_queue, instance._client_id
@@ -184,7 +206,12 @@ async def read_loop() -> None:
                     logger.info("EOF")
                     break
                 logger.info(f"Received a message from host: {message}")
-                await receive_queue.put(message)
+                try:
+                    await receive_queue.put(message)
+                except asyncio.QueueFull:
+                    # Rejected by the "raise" overflow policy, keep reading so the stream does not stall.
+                    logger.warning("Receive queue is full, dropping message from host")
+                    continue
                 logger.info("Put message in receive queue")
 
         return asyncio.create_task(read_loop())
@@ -223,6 +250,17 @@ class GrpcWorkerAgentRuntime(AgentRuntime):
 
     .. _cloudevent.proto: https://github.com/microsoft/autogen/blob/main/protos/cloudevent.proto
 
+    Args:
+        host_address (str): The address of the host runtime.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+        extra_grpc_config (ChannelArgumentType, optional): Extra gRPC channel options. Defaults to None.
+        payload_serialization_format (str, optional): The content type used to serialize payloads. Defaults to JSON.
+        max_queue_size (int, optional): The maximum number of messages waiting in each of the send and receive
+            queues of the host connection. 0 means unbounded. Defaults to 0.
+        queue_overflow_policy (QueueOverflowPolicy, optional): What happens when a message is put on a full send or
+            receive queue: "block", "drop_oldest" or "raise". The queue metrics are logged as
+            :class:`~autogen_core.logging.QueueMetricsEvent`. Defaults to "block".
+
     """
 
     # TODO: Needs to handle agent close() call
@@ -232,6 +270,8 @@ def __init__(
         tracer_provider: TracerProvider | None = None,
         extra_grpc_config: ChannelArgumentType | None = None,
         payload_serialization_format: str = JSON_DATA_CONTENT_TYPE,
+        max_queue_size: int = 0,
+        queue_overflow_policy: QueueOverflowPolicy = "block",
     ) -> None:
         self._host_address = host_address
         self._trace_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("Worker Runtime"))
@@ -251,6 +291,8 @@ def __init__(
         self._subscription_manager = SubscriptionManager()
         self._serialization_registry = SerializationRegistry()
         self._extra_grpc_config = extra_grpc_config or []
+        self._max_queue_size = max_queue_size
+        self._queue_overflow_policy: QueueOverflowPolicy = queue_overflow_policy
 
         if payload_serialization_format not in {JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE}:
             raise ValueError(f"Unsupported payload serialization format: {payload_serialization_format}")
@@ -263,7 +305,10 @@ async def start(self) -> None:
             raise ValueError("Runtime is already running.")
         logger.info(f"Connecting to host: {self._host_address}")
         self._host_connection = await HostConnection.from_host_address(
-            self._host_address, extra_grpc_config=self._extra_grpc_config
+            self._host_address,
+            extra_grpc_config=self._extra_grpc_config,
+            max_queue_size=self._max_queue_size,
+            queue_overflow_policy=self._queue_overflow_policy,
         )
         logger.info("Connection established")
         if self._read_task is None:
@@ -160,6 +160,7 @@ async def RichConsole(
                     )
                 total_usage.completion_tokens += message.chat_message.models_usage.completion_tokens
                 total_usage.prompt_tokens += message.chat_message.models_usage.prompt_tokens
+                total_usage.cached_prompt_tokens += message.chat_message.models_usage.cached_prompt_tokens
 
             await _aprint_message_content(
                 rich_console,
@@ -202,6 +203,7 @@ async def RichConsole(
                     )
                 total_usage.completion_tokens += message.models_usage.completion_tokens
                 total_usage.prompt_tokens += message.models_usage.prompt_tokens
+                total_usage.cached_prompt_tokens += message.models_usage.cached_prompt_tokens
 
             await _aprint_message_content(
                 rich_console,
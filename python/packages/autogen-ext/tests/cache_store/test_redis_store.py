@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -56,3 +56,54 @@ def test_redis_with_different_instances() -> None:
     store_1_config = store_1.dump_component()
     assert store_1_config.component_type == "cache_store"
     assert store_1_config.component_version == 1
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store_basic() -> None:
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+
+    redis_instance = AsyncMock()
+    store = AsyncRedisStore[int](redis_instance)
+    await store.aset("test_key", 42)
+    redis_instance.set.assert_awaited_with("test_key", 42)
+    redis_instance.get.return_value = 42
+    assert await store.aget("test_key") == 42
+
+    redis_instance.get.return_value = None
+    assert await store.aget("non_existent_key", 99) == 99
+
+    # Multi-key operations use a single command.
+    redis_instance.mget.return_value = [1, None, 3]
+    assert await store.amget(["a", "b", "c"], 0) == [1, 0, 3]
+    redis_instance.mget.assert_awaited_once_with(["a", "b", "c"])
+    await store.amset({"a": 1, "c": 3})
+    redis_instance.mset.assert_awaited_once_with({"a": 1, "c": 3})
+
+    # Empty multi-key operations do not reach redis.
+    assert await store.amget([]) == []
+    await store.amset({})
+    assert redis_instance.mget.await_count == 1
+    assert redis_instance.mset.await_count == 1
+
+    # The redis instance is managed by the user.
+    await store.close()
+    redis_instance.aclose.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store_serialization() -> None:
+    from autogen_ext.cache_store.redis import AsyncRedisStore
+
+    store = AsyncRedisStore[int](redis.asyncio.Redis(host="redis.example.com", port=6380, db=2, max_connections=8))
+    config = store.dump_component()
+    assert config.component_type == "cache_store"
+    assert config.config["max_connections"] == 8
+
+    loaded = AsyncRedisStore[int].load_component(config)
+    assert loaded.dump_component() == config
+    # The redis instance created from the configuration is closed with the store.
+    with patch.object(loaded.cache, "aclose") as aclose:
+        await loaded.close()
+    aclose.assert_awaited_once()
+    await store.cache.aclose()
+    await loaded.cache.aclose()
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 import os
-from typing import List, Sequence
+from typing import Any, Dict, List, Sequence
 
 import pytest
 from autogen_core import CancellationToken, FunctionCall
@@ -652,3 +652,53 @@ def test_rstrip_railing_whitespace_at_last_assistant_content() -> None:
 
     assert isinstance(result[-1].content, str)
     assert result[-1].content == "foobar"
+
+
+@pytest.mark.asyncio
+async def test_anthropic_prompt_caching() -> None:
+    from anthropic.types import Message, TextBlock, Usage
+
+    requests: List[Dict[str, Any]] = []
+
+    async def _create(**kwargs: Any) -> Message:
+        requests.append(kwargs)
+        return Message(
+            id="msg",
+            type="message",
+            role="assistant",
+            model="claude-3-haiku-20240307",
+            content=[TextBlock(type="text", text="Hello!")],
+            stop_reason="end_turn",
+            usage=Usage(input_tokens=10, output_tokens=5, cache_creation_input_tokens=0, cache_read_input_tokens=90),
+        )
+
+    client = AnthropicChatCompletionClient(model="claude-3-haiku-20240307", api_key="dummy-key", prompt_caching=True)
+    client._client.messages.create = _create  # type: ignore
+    messages: List[LLMMessage] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content="Hi!", source="user"),
+    ]
+    tool = FunctionTool(_pass_function, description="Process input text", name="process_text")
+
+    result = await client.create(messages, tools=[tool])
+    assert result.usage.prompt_tokens == 100 and result.usage.cached_prompt_tokens == 90
+    assert result.usage.cache_hit_rate == 0.9
+    assert client.total_usage().cached_prompt_tokens == 90
+    request = requests[0]
+    assert request["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert request["system"] == [
+        {"type": "text", "text": "You are a helpful assistant.", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert request["messages"][-1]["content"] == [
+        {"type": "text", "text": "Hi!", "cache_control": {"type": "ephemeral"}}
+    ]
+    # The cache markers are not kept in the converted messages that are reused by later requests.
+    await client.create(messages + [AssistantMessage(content="Hello!", source="assistant")])
+    assert requests[1]["messages"][0]["content"] in ("Hi!", [{"type": "text", "text": "Hi!"}])
+
+    # Without prompt caching, the request is sent as is.
+    client = AnthropicChatCompletionClient(model="claude-3-haiku-20240307", api_key="dummy-key")
+    client._client.messages.create = _create  # type: ignore
+    await client.create(messages)
+    assert requests[-1]["system"] == "You are a helpful assistant."
+    assert client.dump_component().config.get("prompt_caching") is None
@@ -0,0 +1,204 @@
+import asyncio
+from typing import Any, List, Mapping, Optional, Sequence, Union
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.batch import BatchChatCompletionClient, BatchRequest, LocalBatchBackend
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+
+class _EchoClient(ReplayChatCompletionClient):
+    """A replay client that answers each request with its prompt."""
+
+    def __init__(self) -> None:
+        super().__init__(["streamed"])
+        self.prompts: List[str] = []
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        assert isinstance(messages[-1].content, str)
+        self.prompts.append(messages[-1].content)
+        return CreateResult(
+            finish_reason="stop",
+            content=f"echo: {messages[-1].content}",
+            usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+            cached=False,
+        )
+
+
+class _RecordingBackend(LocalBatchBackend):
+    """A local backend that records its batches and can hold their results back or drop some of them."""
+
+    def __init__(self, client: ChatCompletionClient) -> None:
+        super().__init__(client)
+        self.batches: List[List[str]] = []
+        self.cancelled: List[str] = []
+        self.hold = False
+        self.drop: List[str] = []
+
+    async def submit(self, requests: Sequence[BatchRequest]) -> str:
+        self.batches.append([str(request.messages[-1].content) for request in requests])
+        return await super().submit(requests)
+
+    async def retrieve(self, batch_id: str) -> Optional[Mapping[str, Union[CreateResult, BaseException]]]:
+        if self.hold:
+            return None
+        results = await super().retrieve(batch_id)
+        if results is None:
+            return None
+        return {
+            key: value
+            for key, value in results.items()
+            if not (isinstance(value, CreateResult) and value.content in self.drop)
+        }
+
+    async def cancel(self, batch_id: str) -> None:
+        self.cancelled.append(batch_id)
+        await super().cancel(batch_id)
+
+
+def _request(prompt: str) -> List[LLMMessage]:
+    return [UserMessage(content=prompt, source="user")]
+
+
+@pytest.mark.asyncio
+async def test_batch_client_collects_requests() -> None:
+    backend = _RecordingBackend(_EchoClient())
+    client = BatchChatCompletionClient(
+        _EchoClient(), backend=backend, max_batch_size=3, max_wait=0.01, poll_interval=0.01
+    )
+
+    results = await asyncio.gather(*[client.create(_request(f"prompt {i}")) for i in range(5)])
+    assert [result.content for result in results] == [f"echo: prompt {i}" for i in range(5)]
+    # A full batch is submitted right away, the rest after `max_wait`.
+    assert backend.batches == [["prompt 0", "prompt 1", "prompt 2"], ["prompt 3", "prompt 4"]]
+    metrics = client.metrics
+    assert metrics.batches == 2 and metrics.batched_requests == 5 and metrics.batch_results == 5
+    assert metrics.fallbacks == 0 and metrics.pending == 0
+
+    # Streams are not batched.
+    chunks = [chunk async for chunk in client.create_stream(_request("stream"))]
+    assert isinstance(chunks[-1], CreateResult)
+    assert client.metrics.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_client_latency_budget() -> None:
+    fallback_client = _EchoClient()
+    backend = _RecordingBackend(_EchoClient())
+    backend.hold = True
+    client = BatchChatCompletionClient(
+        fallback_client, backend=backend, max_wait=0.01, poll_interval=0.01, latency_budget=0.1
+    )
+
+    result = await client.create(_request("urgent"))
+    assert result.content == "echo: urgent"
+    assert fallback_client.prompts == ["urgent"]
+    assert client.metrics.fallbacks == 1 and client.metrics.batch_results == 0
+    # The batch job whose results are no longer needed is cancelled.
+    await asyncio.sleep(0.05)
+    assert len(backend.cancelled) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_client_falls_back_on_failures() -> None:
+    class _FailingBackend(LocalBatchBackend):
+        async def submit(self, requests: Sequence[BatchRequest]) -> str:
+            raise RuntimeError("The batch endpoint is unavailable.")
+
+    fallback_client = _EchoClient()
+    client = BatchChatCompletionClient(
+        fallback_client, backend=_FailingBackend(_EchoClient()), max_wait=0.01, poll_interval=0.01
+    )
+    assert (await client.create(_request("a"))).content == "echo: a"
+    assert fallback_client.prompts == ["a"] and client.metrics.fallbacks == 1
+
+    # Requests missing from the results of their batch are sent without batching.
+    fallback_client = _EchoClient()
+    backend = _RecordingBackend(_EchoClient())
+    backend.drop = ["echo: b"]
+    client = BatchChatCompletionClient(fallback_client, backend=backend, max_wait=0.01, poll_interval=0.01)
+    results = await asyncio.gather(client.create(_request("b")), client.create(_request("c")))
+    assert [result.content for result in results] == ["echo: b", "echo: c"]
+    assert fallback_client.prompts == ["b"]
+    assert client.metrics.batch_results == 1 and client.metrics.fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_client_errors_and_cancellation() -> None:
+    class _ErrorClient(_EchoClient):
+        async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+            if messages[-1].content == "bad":
+                raise ValueError("Invalid request.")
+            return await super().create(messages, **kwargs)
+
+    backend = _RecordingBackend(_ErrorClient())
+    client = BatchChatCompletionClient(_EchoClient(), backend=backend, max_wait=0.05, poll_interval=0.01)
+
+    cancellation_token = CancellationToken()
+    cancelled = asyncio.create_task(client.create(_request("cancelled"), cancellation_token=cancellation_token))
+    bad = asyncio.create_task(client.create(_request("bad")))
+    good = asyncio.create_task(client.create(_request("good")))
+    await asyncio.sleep(0)
+    cancellation_token.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    # The error of a request in the batch is raised to its caller only.
+    with pytest.raises(ValueError):
+        await bad
+    assert (await good).content == "echo: good"
+    # The cancelled request was not submitted.
+    assert backend.batches == [["bad", "good"]]
+    assert client.metrics.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_client_close() -> None:
+    backend = _RecordingBackend(_EchoClient())
+    client = BatchChatCompletionClient(_EchoClient(), backend=backend, max_wait=10)
+    task = asyncio.create_task(client.create(_request("waiting")))
+    await asyncio.sleep(0)
+    await client.close()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert backend.batches == []
+
+    # Requests already submitted in a batch are cancelled along with their batch job.
+    backend = _RecordingBackend(_EchoClient())
+    backend.hold = True
+    client = BatchChatCompletionClient(_EchoClient(), backend=backend, max_wait=0, poll_interval=0.01)
+    task = asyncio.create_task(client.create(_request("submitted")))
+    await asyncio.sleep(0.05)
+    assert backend.batches == [["submitted"]]
+    await client.close()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, timeout=1)
+    assert len(backend.cancelled) == 1
+    assert client.metrics.pending == 0
+
+
+def test_batch_client_serialization() -> None:
+    client = BatchChatCompletionClient(
+        ReplayChatCompletionClient(["response"]), max_batch_size=50, max_wait=2, poll_interval=30, latency_budget=600
+    )
+    config = client.dump_component()
+    assert config.provider == "autogen_ext.models.batch.BatchChatCompletionClient"
+
+    loaded = ChatCompletionClient.load_component(config)
+    assert isinstance(loaded, BatchChatCompletionClient)
+    assert isinstance(loaded.backend, LocalBatchBackend)
+    assert loaded.dump_component().config == config.config
+
+    with pytest.raises(ValueError):
+        BatchChatCompletionClient(ReplayChatCompletionClient([]), max_batch_size=0)
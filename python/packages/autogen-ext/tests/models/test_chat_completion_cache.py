@@ -1,7 +1,9 @@
+import asyncio
 import copy
-from typing import List, Tuple, Union
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 import pytest
+from autogen_core import AsyncCacheStore, CacheStore, CancellationToken, InMemoryStore
 from autogen_core.models import (
     ChatCompletionClient,
     CreateResult,
@@ -9,7 +11,13 @@
     SystemMessage,
     UserMessage,
 )
-from autogen_ext.models.cache import ChatCompletionCache
+from autogen_ext.models.cache import (
+    CHAT_CACHE_VALUE_TYPE,
+    CachedStream,
+    ChatCompletionCache,
+    SemanticCache,
+    normalize_prompt,
+)
 from autogen_ext.models.replay import ReplayChatCompletionClient
 from pydantic import BaseModel
 
@@ -112,6 +120,9 @@ async def test_cache_model_and_count_api() -> None:
 
     messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
     assert replay_client.count_tokens(messages) == cached_client.count_tokens(messages)
+    assert replay_client.count_tokens_batch([messages, messages[:1]]) == cached_client.count_tokens_batch(
+        [messages, messages[:1]]
+    )
     assert replay_client.remaining_tokens(messages) == cached_client.remaining_tokens(messages)
 
 
@@ -184,3 +195,310 @@ async def test_cache_create_stream() -> None:
     # cached_client_config = cached_client.dump_component()
     # loaded_client = ChatCompletionCache.load_component(cached_client_config)
     # assert loaded_client.client == cached_client.client
+
+
+class _AsyncOnlyStore(AsyncCacheStore[CHAT_CACHE_VALUE_TYPE]):
+    def __init__(self) -> None:
+        self.data: Dict[str, CHAT_CACHE_VALUE_TYPE] = {}
+        self.calls: List[str] = []
+
+    async def aget(self, key: str, default: Optional[CHAT_CACHE_VALUE_TYPE] = None) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        self.calls.append("aget")
+        return self.data.get(key, default)
+
+    async def aset(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        self.calls.append("aset")
+        self.data[key] = value
+
+
+@pytest.mark.asyncio
+async def test_cache_with_async_store() -> None:
+    responses, prompts, system_prompt, replay_client, _ = get_test_data()
+    store = _AsyncOnlyStore()
+    cached_client = ChatCompletionCache(replay_client, store)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    response0 = await cached_client.create(messages)
+    assert not response0.cached
+    response1 = await cached_client.create(messages)
+    assert response1.cached
+    assert response1.content == responses[0]
+    assert store.calls == ["aget", "aset", "aget"]
+
+    stream_messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[1], source="user")]
+    async for _ in cached_client.create_stream(stream_messages):
+        pass
+    async for chunk in cached_client.create_stream(stream_messages):
+        if isinstance(chunk, CreateResult):
+            assert chunk.cached
+            assert chunk.content == responses[1]
+    assert store.calls[3:] == ["aget", "aset", "aget"]
+
+
+class _GatedReplayClient(ReplayChatCompletionClient):
+    """Holds every request until the gate is opened and counts the requests it receives."""
+
+    def __init__(self, responses: List[str]) -> None:
+        super().__init__(responses)
+        self.set_cached_bool_value(False)
+        self.gate = asyncio.Event()
+        self.requests = 0
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        self.requests += 1
+        await self.gate.wait()
+        return await super().create(messages, **kwargs)
+
+    async def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        self.requests += 1
+        await self.gate.wait()
+        async for chunk in super().create_stream(messages, **kwargs):
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_creates() -> None:
+    client = _GatedReplayClient(["response"])
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    tasks = [asyncio.create_task(cached_client.create(messages)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    client.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert client.requests == 1
+    assert [result.content for result in results] == ["response"] * 5
+    assert sorted(result.cached for result in results) == [False, True, True, True, True]
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesced_create_errors_and_cancellation() -> None:
+    client = _GatedReplayClient([])
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    # The error of the request in flight is shared with the requests waiting for it.
+    tasks = [asyncio.create_task(cached_client.create(messages)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    client.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert client.requests == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    # If the request in flight is cancelled, a waiting request sends its own.
+    client.gate.clear()
+    client.chat_completions = ["response"]
+    leader = asyncio.create_task(cached_client.create(messages))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(cached_client.create(messages))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    client.gate.set()
+    result = await follower
+    assert result.content == "response"
+    assert not result.cached
+    assert client.requests == 3
+
+    # Cancelling a waiting request does not cancel the request in flight.
+    client.gate.clear()
+    client.chat_completions = ["response", "other response"]
+    other_messages: List[LLMMessage] = [UserMessage(content="other prompt", source="user")]
+    leader = asyncio.create_task(cached_client.create(other_messages))
+    await asyncio.sleep(0.01)
+    token = CancellationToken()
+    follower = asyncio.create_task(cached_client.create(other_messages, cancellation_token=token))
+    await asyncio.sleep(0.01)
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    client.gate.set()
+    result = await leader
+    assert result.content == "other response"
+    assert client.requests == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_streams() -> None:
+    client = _GatedReplayClient(["streamed response"])
+    cached_client = ChatCompletionCache(client)
+    messages: List[LLMMessage] = [UserMessage(content="prompt", source="user")]
+
+    async def consume() -> List[Union[str, CreateResult]]:
+        return [chunk async for chunk in cached_client.create_stream(messages)]
+
+    tasks = [asyncio.create_task(consume()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    client.gate.set()
+    streams = await asyncio.gather(*tasks)
+
+    assert client.requests == 1
+    for chunks in streams:
+        assert "".join(chunk for chunk in chunks if isinstance(chunk, str)) == "streamed response"
+        assert isinstance(chunks[-1], CreateResult)
+    assert sorted(cast(CreateResult, chunks[-1]).cached for chunks in streams) == [False, True, True]
+
+
+def test_cache_serialization_with_bounded_store() -> None:
+    cached_client = ChatCompletionCache(
+        ReplayChatCompletionClient(["response"]), InMemoryStore[CHAT_CACHE_VALUE_TYPE](max_size=10, ttl=60)
+    )
+    loaded = ChatCompletionCache.load_component(cached_client.dump_component())
+    assert isinstance(loaded.store, InMemoryStore)
+    assert loaded.store.max_size == 10
+    assert loaded.store.ttl == 60
+
+
+class _CopyingStore(CacheStore[CHAT_CACHE_VALUE_TYPE]):
+    """Copies values on every read and write, like a store that persists them."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, CHAT_CACHE_VALUE_TYPE] = {}
+        self.writes = 0
+
+    def get(self, key: str, default: Optional[CHAT_CACHE_VALUE_TYPE] = None) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        return copy.deepcopy(self.data.get(key, default))
+
+    def set(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        self.writes += 1
+        self.data[key] = copy.deepcopy(value)
+
+
+@pytest.mark.asyncio
+async def test_cache_stream_with_persistent_store() -> None:
+    responses, prompts, system_prompt, replay_client, _ = get_test_data()
+    store = _CopyingStore()
+    cached_client = ChatCompletionCache(replay_client, store)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    original = [chunk async for chunk in cached_client.create_stream(messages)]
+    assert store.writes == 1
+    (stored,) = store.data.values()
+    assert isinstance(stored, CachedStream)
+    assert stored.text == responses[0]
+
+    replayed = [chunk async for chunk in cached_client.create_stream(messages)]
+    assert replayed[:-1] == original[:-1]
+    assert isinstance(replayed[-1], CreateResult) and replayed[-1].cached
+    assert store.writes == 1
+
+    # Non-streamed calls with the same arguments hit the cached stream.
+    result = await cached_client.create(messages)
+    assert result.cached
+    assert result.content == responses[0]
+
+
+@pytest.mark.asyncio
+async def test_cache_stream_replay_chunk_size() -> None:
+    responses, prompts, system_prompt, replay_client, _ = get_test_data()
+    cached_client = ChatCompletionCache(replay_client, stream_replay_chunk_size=4)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    # A result cached by create is replayed as a stream.
+    await cached_client.create(messages)
+    replayed = [chunk async for chunk in cached_client.create_stream(messages)]
+    text_chunks = [chunk for chunk in replayed if isinstance(chunk, str)]
+    assert "".join(text_chunks) == responses[0]
+    assert all(len(chunk) == 4 for chunk in text_chunks[:-1])
+    assert isinstance(replayed[-1], CreateResult) and replayed[-1].cached
+
+    with pytest.raises(ValueError):
+        ChatCompletionCache(replay_client, stream_replay_chunk_size=0)
+
+
+@pytest.mark.asyncio
+async def test_cache_abandoned_stream_is_not_stored() -> None:
+    responses, prompts, system_prompt, replay_client, _ = get_test_data()
+    store = _CopyingStore()
+    cached_client = ChatCompletionCache(replay_client, store)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content=prompts[0], source="user")]
+
+    stream = cached_client.create_stream(messages)
+    assert isinstance(await anext(stream), str)
+    await stream.aclose()
+    assert store.writes == 0
+
+    chunks = [chunk async for chunk in cached_client.create_stream(messages)]
+    assert isinstance(chunks[-1], CreateResult) and not chunks[-1].cached
+    assert store.writes == 1
+
+
+async def _bag_of_words_embedder(text: str) -> List[float]:
+    vector = [0.0] * 64
+    for word in text.lower().split():
+        vector[sum(word.encode()) % 64] += 1.0
+    return vector
+
+
+@pytest.mark.asyncio
+async def test_cache_semantic_tier() -> None:
+    responses, _, system_prompt, replay_client, _ = get_test_data(num_messages=4)
+    semantic_cache = SemanticCache(_bag_of_words_embedder, similarity_threshold=0.9)
+    cached_client = ChatCompletionCache(replay_client, semantic_cache=semantic_cache)
+
+    def request(prompt: str, system: SystemMessage = system_prompt) -> List[LLMMessage]:
+        return [system, UserMessage(content=prompt, source="user")]
+
+    response0 = await cached_client.create(request("Summarize the news at 2024-05-01T10:00:00Z"))
+    assert not response0.cached
+
+    # Only whitespace and the timestamp differ.
+    similar = await cached_client.create(request("Summarize  the news at 2024-05-02 11:30\n"))
+    assert similar.cached
+    assert similar.content == responses[0]
+    streamed = [
+        chunk async for chunk in cached_client.create_stream(request("summarize the news at 2024-05-03T08:00Z"))
+    ]
+    assert isinstance(streamed[-1], CreateResult) and streamed[-1].cached
+    assert streamed[-1].content == responses[0]
+
+    # A different prompt, or the same prompt in a different conversation, is sent to the client.
+    response1 = await cached_client.create(request("Write a poem about the sea"))
+    assert not response1.cached and response1.content == responses[1]
+    response2 = await cached_client.create(
+        request("Summarize the news at 2024-05-01T10:00:00Z", SystemMessage(content="Another system prompt"))
+    )
+    assert not response2.cached and response2.content == responses[2]
+
+    metrics = semantic_cache.metrics
+    assert (metrics.lookups, metrics.hits, metrics.misses, metrics.entries) == (5, 2, 3, 3)
+    assert metrics.hit_rate == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_cache_semantic_tier_scopes_and_eviction() -> None:
+    responses, _, system_prompt, replay_client, _ = get_test_data(num_messages=4)
+    store = InMemoryStore[CHAT_CACHE_VALUE_TYPE]()
+    semantic_cache = SemanticCache(_bag_of_words_embedder, max_entries=1)
+    messages: List[LLMMessage] = [system_prompt, UserMessage(content="What is the capital of France?", source="user")]
+    similar: List[LLMMessage] = [system_prompt, UserMessage(content="what is the capital of france?", source="user")]
+
+    first_agent = ChatCompletionCache(replay_client, store, semantic_cache=semantic_cache, semantic_scope="gpt-4o")
+    second_agent = ChatCompletionCache(replay_client, store, semantic_cache=semantic_cache, semantic_scope="gpt-4o")
+    other_model = ChatCompletionCache(replay_client, store, semantic_cache=semantic_cache)
+    assert not (await first_agent.create(messages)).cached
+    assert (await second_agent.create(similar)).cached
+    # Caches without a scope do not share entries.
+    response = await other_model.create(similar)
+    assert not response.cached and response.content == responses[1]
+
+    # The entry of the first request was evicted to make room for the last one.
+    assert semantic_cache.metrics.entries == 1
+    shouted: List[LLMMessage] = [system_prompt, UserMessage(content="WHAT IS THE CAPITAL OF FRANCE?", source="user")]
+    assert not (await second_agent.create(shouted)).cached
+
+    # An entry whose result is not in the store is dropped.
+    other_store = ChatCompletionCache(replay_client, semantic_cache=semantic_cache, semantic_scope="gpt-4o")
+    response = await other_store.create(similar)
+    assert not response.cached
+    assert semantic_cache.metrics.hits == 1
+
+
+def test_normalize_prompt() -> None:
+    assert normalize_prompt("  Time:\t2024-05-01T10:00:00.123+02:00\n\nDone ") == "Time: <timestamp> Done"
+    assert normalize_prompt("On 2024-05-01 at noon") == "On 2024-05-01 at noon"
+    with pytest.raises(ValueError):
+        SemanticCache(_bag_of_words_embedder, similarity_threshold=2.0)
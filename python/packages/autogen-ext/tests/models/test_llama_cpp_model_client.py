@@ -1,5 +1,7 @@
+import asyncio
 import contextlib
 import sys
+import threading
 from typing import TYPE_CHECKING, Any, ContextManager, Generator, List, Sequence, Union
 
 import pytest
@@ -163,6 +165,41 @@ async def test_count_and_remaining_tokens(
         assert remaining == max(1024 - token_count, 0)
 
 
+@pytest.mark.asyncio
+async def test_llama_cpp_dedicated_thread_and_token_cache(
+    get_completion_client: "ContextManager[type[LlamaCppChatCompletionClient]]",
+) -> None:
+    with get_completion_client as Client:
+        client = Client(model_path="dummy")
+        threads: List[str] = []
+        tokenized: List[bytes] = []
+        create_chat_completion = client.llm.create_chat_completion
+        tokenize = client.llm.tokenize
+
+        def _create_chat_completion(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            threads.append(threading.current_thread().name)
+            return create_chat_completion(*args, **kwargs)
+
+        def _tokenize(b: bytes) -> list[int]:
+            tokenized.append(b)
+            return tokenize(b)
+
+        client.llm.create_chat_completion = _create_chat_completion  # type: ignore
+        client.llm.tokenize = _tokenize  # type: ignore
+
+        messages = [UserMessage(content="Test user", source="user")]
+        results = await asyncio.gather(*[client.create(messages=messages) for _ in range(3)])
+        assert all(result.content == "Fake response" for result in results)
+        # Completions run on the thread of the model, not on the default executor.
+        assert len(threads) == 3 and all(name.startswith("llama_cpp") for name in threads)
+
+        history = [SystemMessage(content="Test system"), UserMessage(content="Test user", source="user")]
+        assert client.count_tokens(history) == len(b"Test system") + len(b"Test user")
+        assert client.count_tokens_batch([history[:1], history]) == [len(b"Test system"), client.count_tokens(history)]
+        # Each content is tokenized once.
+        assert tokenized == [b"Test system", b"Test user"]
+
+
 @pytest.mark.asyncio
 async def test_llama_cpp_integration_non_streaming() -> None:
     if not ((hasattr(torch.backends, "mps") and torch.backends.mps.is_available()) or torch.cuda.is_available()):
@@ -2,11 +2,13 @@
 import json
 import logging
 import os
+from types import SimpleNamespace
 from typing import Annotated, Any, AsyncGenerator, Dict, List, Literal, Tuple, TypeVar
 from unittest.mock import MagicMock
 
 import httpx
 import pytest
+import tiktoken
 from autogen_core import CancellationToken, FunctionCall, Image
 from autogen_core.models import (
     AssistantMessage,
@@ -21,7 +23,9 @@
 )
 from autogen_core.models._model_client import ModelFamily
 from autogen_core.tools import BaseTool, FunctionTool
-from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIChatCompletionClient
+from autogen_ext.models._utils.tokenizer import TokenCounter
+from autogen_ext.models.batch import BatchChatCompletionClient
+from autogen_ext.models.openai import AzureOpenAIChatCompletionClient, OpenAIBatchBackend, OpenAIChatCompletionClient
 from autogen_ext.models.openai._model_info import resolve_model
 from autogen_ext.models.openai._openai_client import (
     BaseOpenAIChatCompletionClient,
@@ -57,7 +61,8 @@
 )
 from openai.types.chat.parsed_chat_completion import ParsedChatCompletion, ParsedChatCompletionMessage, ParsedChoice
 from openai.types.chat.parsed_function_tool_call import ParsedFunction, ParsedFunctionToolCall
-from openai.types.completion_usage import CompletionUsage
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+from PIL import Image as PILImage
 from pydantic import BaseModel, Field
 
 ResponseFormatT = TypeVar("ResponseFormatT", bound=BaseModel)
@@ -365,6 +370,66 @@ async def test_openai_chat_completion_client_create_stream_cancel(monkeypatch: p
             pass
 
 
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_stream_cancel_while_waiting(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    cancellation_token = CancellationToken()
+    stream = client.create_stream(
+        messages=[UserMessage(content="Hello", source="user")], cancellation_token=cancellation_token
+    )
+    assert await anext(stream) == "Hello"
+    assert await anext(stream) == " Another Hello"
+    # The token is linked once for the request and once for the stream, not once per chunk.
+    assert len(cancellation_token._callbacks) == 2  # type: ignore[reportPrivateUsage]
+
+    async def _consume() -> None:
+        async for _ in stream:
+            pass
+
+    task = asyncio.create_task(_consume())
+    await asyncio.sleep(0.05)
+    cancellation_token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_stream_unlinks_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    cancellation_token = CancellationToken()
+    async for _ in client.create_stream(
+        messages=[UserMessage(content="Hello", source="user")], cancellation_token=cancellation_token
+    ):
+        pass
+    # The stream no longer holds on to the token once it has ended; only the link of the request remains.
+    assert len(cancellation_token._callbacks) == 1  # type: ignore[reportPrivateUsage]
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_create_stream_coalesce(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key", stream_coalesce_chars=10)
+    chunks: List[str | CreateResult] = []
+    async for chunk in client.create_stream(messages=[UserMessage(content="Hello", source="user")]):
+        chunks.append(chunk)
+    assert chunks[:-1] == ["Hello Another Hello", " Yet Another Hello"]
+    assert isinstance(chunks[-1], CreateResult)
+    assert chunks[-1].content == "Hello Another Hello Yet Another Hello"
+
+    # A long interval holds everything back until the end of the stream.
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key", stream_coalesce_interval=60)
+    chunks = [chunk async for chunk in client.create_stream(messages=[UserMessage(content="Hello", source="user")])]
+    assert chunks[:-1] == ["Hello Another Hello Yet Another Hello"]
+    assert client.dump_component().config["stream_coalesce_interval"] == 60
+
+    with pytest.raises(ValueError):
+        OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key", stream_coalesce_chars=0)
+
+
 @pytest.mark.asyncio
 async def test_openai_chat_completion_client_count_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
     client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
@@ -407,6 +472,60 @@ def tool2(test1: int, test2: List[int]) -> str:
     assert remaining_tokens
 
 
+def test_openai_chat_completion_client_reuses_message_conversions() -> None:
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+    image = Image.from_pil(PILImage.new("RGB", (10, 10)))
+    messages: List[LLMMessage] = [
+        SystemMessage(content="You are a helpful assistant."),
+        UserMessage(content=["Describe this image.", image], source="user"),
+    ]
+
+    first = client._process_create_args(messages, [], None, {}).messages  # pyright: ignore[reportPrivateUsage]
+    second = client._process_create_args(messages, [], None, {}).messages  # pyright: ignore[reportPrivateUsage]
+    assert first == second
+    assert all(a is b for a, b in zip(first, second, strict=True))
+
+    # A message whose content is replaced is converted again.
+    messages[0].content = "You are a concise assistant."
+    third = client._process_create_args(messages, [], None, {}).messages  # pyright: ignore[reportPrivateUsage]
+    assert third[0]["content"] == "You are a concise assistant."
+    assert third[1] is first[1]
+
+
+def test_openai_chat_completion_client_count_tokens_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    # One token per byte, so the test does not need to download an encoding.
+    encoding = tiktoken.Encoding(
+        name="test_bytes", pat_str=r"\S+|\s+", mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={}
+    )
+    counter = TokenCounter(encoding)
+    monkeypatch.setattr("autogen_ext.models.openai._openai_client.get_token_counter", lambda model: counter)  # type: ignore
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key")
+
+    def tool1(test: str, test2: str) -> str:
+        return test + test2
+
+    tools = [FunctionTool(tool1, description="example tool 1")]
+    batch: List[List[LLMMessage]] = [
+        [],
+        [SystemMessage(content="You are a helpful assistant.")],
+        [
+            SystemMessage(content="You are a helpful assistant."),
+            UserMessage(content="Hello", source="user"),
+            AssistantMessage(
+                content=[FunctionCall(id="1", arguments='{"test": "a"}', name="tool1")], source="assistant"
+            ),
+            FunctionExecutionResultMessage(
+                content=[FunctionExecutionResult(content="a", call_id="1", is_error=False, name="tool1")]
+            ),
+        ],
+    ]
+    expected = [client.count_tokens(messages, tools=tools) for messages in batch]
+    assert expected[0] < expected[1] < expected[2]
+    assert client.count_tokens_batch(batch, tools=tools) == expected
+    # Counting again is served from the cache and gives the same result.
+    assert client.count_tokens_batch(batch, tools=tools) == expected
+
+
 @pytest.mark.parametrize(
     "mock_size, expected_num_tokens",
     [
@@ -465,6 +584,62 @@ async def run(self, args: MyArgs, cancellation_token: CancellationToken) -> MyRe
     assert converted_tool_schema[0] == converted_tool_schema[1]
 
 
+@pytest.mark.asyncio
+async def test_openai_chat_completion_client_cached_prompt_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    model = "gpt-4o-2024-11-20"
+    usage = CompletionUsage(
+        prompt_tokens=100,
+        completion_tokens=5,
+        total_tokens=105,
+        prompt_tokens_details=PromptTokensDetails(cached_tokens=80),
+    )
+
+    async def _mock_create(*args: Any, **kwargs: Any) -> ChatCompletion | AsyncGenerator[ChatCompletionChunk, None]:
+        if kwargs.get("stream", False):
+
+            async def _stream() -> AsyncGenerator[ChatCompletionChunk, None]:
+                yield ChatCompletionChunk(
+                    id="id",
+                    choices=[
+                        ChunkChoice(
+                            finish_reason="stop",
+                            index=0,
+                            delta=ChoiceDelta(content="Hello", role="assistant"),
+                        )
+                    ],
+                    created=0,
+                    model=model,
+                    object="chat.completion.chunk",
+                    usage=usage,
+                )
+
+            return _stream()
+        return ChatCompletion(
+            id="id1",
+            choices=[
+                Choice(finish_reason="stop", index=0, message=ChatCompletionMessage(content="Hello", role="assistant"))
+            ],
+            created=0,
+            model=model,
+            object="chat.completion",
+            usage=usage,
+        )
+
+    monkeypatch.setattr(AsyncCompletions, "create", _mock_create)
+    model_client = OpenAIChatCompletionClient(model=model, api_key="api_key")
+    messages = [UserMessage(content="Hi!", source="user")]
+
+    result = await model_client.create(messages)
+    assert result.usage.prompt_tokens == 100 and result.usage.cached_prompt_tokens == 80
+    assert result.usage.cache_hit_rate == 0.8
+
+    chunks = [chunk async for chunk in model_client.create_stream(messages)]
+    assert isinstance(chunks[-1], CreateResult)
+    assert chunks[-1].usage.cached_prompt_tokens == 80
+    assert model_client.total_usage().cached_prompt_tokens == 160
+    assert model_client.total_usage().cache_hit_rate == 0.8
+
+
 @pytest.mark.asyncio
 async def test_json_mode(monkeypatch: pytest.MonkeyPatch) -> None:
     model = "gpt-4o-2024-11-20"
@@ -2459,4 +2634,75 @@ def test_find_model_family() -> None:
     assert _find_model_family("openai", "error") == ModelFamily.UNKNOWN
 
 
+@pytest.mark.asyncio
+async def test_openai_batch_backend() -> None:
+    model_client = OpenAIChatCompletionClient(model="gpt-4o", api_key="api_key", temperature=0.5)
+    files: Dict[str, bytes] = {}
+    batch_status = {"status": "in_progress"}
+
+    async def _create_file(file: Tuple[str, bytes], purpose: str) -> Any:
+        assert purpose == "batch"
+        files["input"] = file[1]
+        return SimpleNamespace(id="input")
+
+    async def _create_batch(input_file_id: str, endpoint: str, completion_window: str) -> Any:
+        assert input_file_id == "input" and endpoint == "/v1/chat/completions" and completion_window == "24h"
+        return SimpleNamespace(id="batch")
+
+    async def _retrieve_batch(batch_id: str) -> Any:
+        return SimpleNamespace(id=batch_id, output_file_id="output", error_file_id="errors", **batch_status)
+
+    async def _file_content(file_id: str) -> Any:
+        return SimpleNamespace(text=files[file_id].decode())
+
+    model_client._client = SimpleNamespace(  # type: ignore
+        files=SimpleNamespace(create=_create_file, content=_file_content),
+        batches=SimpleNamespace(create=_create_batch, retrieve=_retrieve_batch),
+    )
+    client = BatchChatCompletionClient(
+        model_client, backend=OpenAIBatchBackend(model_client), max_wait=0.01, poll_interval=0.01
+    )
+    tasks = [
+        asyncio.create_task(client.create([UserMessage(content=prompt, source="user")])) for prompt in ("Hello", "Fail")
+    ]
+    await asyncio.sleep(0.05)
+
+    # The requests are uploaded as one batch with the create args of the client.
+    requests = [json.loads(line) for line in files["input"].decode().splitlines()]
+    assert [request["url"] for request in requests] == ["/v1/chat/completions"] * 2
+    assert [request["body"]["messages"][-1]["content"] for request in requests] == ["Hello", "Fail"]
+    assert all(request["body"]["model"] == "gpt-4o" and request["body"]["temperature"] == 0.5 for request in requests)
+
+    completion = ChatCompletion(
+        id="id",
+        choices=[Choice(finish_reason="stop", index=0, message=ChatCompletionMessage(content="Hi", role="assistant"))],
+        created=0,
+        model="gpt-4o-2024-08-06",
+        object="chat.completion",
+        usage=CompletionUsage(prompt_tokens=5, completion_tokens=1, total_tokens=6),
+    )
+    files["output"] = json.dumps(
+        {
+            "custom_id": requests[0]["custom_id"],
+            "response": {"status_code": 200, "body": completion.model_dump()},
+            "error": None,
+        }
+    ).encode()
+    files["errors"] = json.dumps(
+        {
+            "custom_id": requests[1]["custom_id"],
+            "response": {"status_code": 400, "body": {"error": {"message": "Invalid request."}}},
+            "error": None,
+        }
+    ).encode()
+    batch_status["status"] = "completed"
+
+    result = await tasks[0]
+    assert result.content == "Hi"
+    assert result.usage == RequestUsage(prompt_tokens=5, completion_tokens=1)
+    assert model_client.total_usage() == RequestUsage(prompt_tokens=5, completion_tokens=1)
+    with pytest.raises(RuntimeError, match="Invalid request"):
+        await tasks[1]
+
+
 # TODO: add integration tests for Azure OpenAI using AAD token.
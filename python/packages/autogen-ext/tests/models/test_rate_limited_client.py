@@ -0,0 +1,211 @@
+import asyncio
+import time
+from typing import Any, List, Mapping, Optional, Sequence
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.rate_limit import RateLimitedChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers: Mapping[str, str]) -> None:
+        super().__init__("Rate limit reached.")
+        self.response = type("Response", (), {"headers": headers})()
+
+
+class _GatedReplayClient(ReplayChatCompletionClient):
+    """A replay client that records the order of the requests and holds each one until the gate opens."""
+
+    def __init__(self, chat_completions: Sequence[str]) -> None:
+        super().__init__(chat_completions)
+        self.set_cached_bool_value(False)
+        self.gate = asyncio.Event()
+        self.prompts: List[str] = []
+        self.errors: List[Exception] = []
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        assert isinstance(messages[-1].content, str)
+        self.prompts.append(messages[-1].content)
+        await self.gate.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        return await super().create(messages, tools=tools, cancellation_token=cancellation_token)
+
+
+def _request(prompt: str) -> List[LLMMessage]:
+    return [UserMessage(content=prompt, source="user")]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_paces_requests() -> None:
+    replay_client = ReplayChatCompletionClient([f"response {i}" for i in range(6)])
+    replay_client.set_cached_bool_value(False)
+    # Ten requests per second, at most one second's worth at once.
+    client = RateLimitedChatCompletionClient(replay_client, requests_per_minute=600)
+
+    start = time.monotonic()
+    results = await asyncio.gather(*[client.create(_request(f"prompt {i}")) for i in range(6)])
+    assert time.monotonic() - start < 0.1
+    assert [result.content for result in results] == [f"response {i}" for i in range(6)]
+
+    replay_client.reset()
+    start = time.monotonic()
+    await asyncio.gather(*[client.create(_request(f"prompt {i}")) for i in range(6)])
+    # Four requests were left in the bucket, the others wait for it to refill.
+    assert time.monotonic() - start >= 0.15
+    metrics = client.metrics
+    assert metrics.requests == 12 and metrics.waiting == 0 and metrics.in_flight == 0
+    assert metrics.max_wait_seconds >= 0.15
+    assert 0 < metrics.mean_wait_seconds < metrics.max_wait_seconds
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_token_bucket_uses_reported_usage() -> None:
+    replay_client = ReplayChatCompletionClient(
+        [
+            CreateResult(
+                finish_reason="stop",
+                content="a",
+                usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+                cached=False,
+            ),
+            CreateResult(
+                finish_reason="stop",
+                content="b",
+                usage=RequestUsage(prompt_tokens=1, completion_tokens=130),
+                cached=False,
+            ),
+            CreateResult(
+                finish_reason="stop",
+                content="c",
+                usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+                cached=False,
+            ),
+            CreateResult(
+                finish_reason="stop",
+                content="d",
+                usage=RequestUsage(prompt_tokens=1, completion_tokens=1),
+                cached=True,
+            ),
+        ]
+    )
+    # A hundred tokens per second.
+    client = RateLimitedChatCompletionClient(replay_client, tokens_per_minute=6000)
+
+    start = time.monotonic()
+    await client.create(_request("one"))
+    await client.create(_request("two"))
+    assert time.monotonic() - start < 0.1
+    # The second request used 131 tokens instead of the estimated 1, so the next one waits for the bucket to refill.
+    await client.create(_request("three"))
+    assert time.monotonic() - start >= 0.25
+    # Streams are limited the same way.
+    stream = [chunk async for chunk in client.create_stream(_request("four"))]
+    assert isinstance(stream[-1], CreateResult) and stream[-1].cached
+    assert client.metrics.requests == 4 and client.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_priority_lanes() -> None:
+    replay_client = _GatedReplayClient([f"response {i}" for i in range(4)])
+    worker = RateLimitedChatCompletionClient(replay_client, max_concurrency=1)
+    orchestrator = worker.with_priority(10)
+    assert orchestrator.priority == 10 and worker.priority == 0
+
+    tasks = [asyncio.create_task(worker.create(_request("worker 0")))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(worker.create(_request("worker 1"))))
+    tasks.append(asyncio.create_task(worker.create(_request("worker 2"))))
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(orchestrator.create(_request("orchestrator"))))
+    await asyncio.sleep(0.01)
+    assert worker.metrics.waiting == 3 and orchestrator.metrics.in_flight == 1
+
+    replay_client.gate.set()
+    await asyncio.gather(*tasks)
+    assert replay_client.prompts == ["worker 0", "orchestrator", "worker 1", "worker 2"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_cancelled_waiter() -> None:
+    replay_client = _GatedReplayClient(["first", "second"])
+    client = RateLimitedChatCompletionClient(replay_client, max_concurrency=1)
+
+    first = asyncio.create_task(client.create(_request("first")))
+    cancelled = asyncio.create_task(client.create(_request("cancelled")))
+    cancellation_token = CancellationToken()
+    cancelled_by_token = asyncio.create_task(
+        client.create(_request("cancelled by token"), cancellation_token=cancellation_token)
+    )
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    # A request waiting for its turn stops when its cancellation token is cancelled.
+    cancellation_token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled_by_token
+    second = asyncio.create_task(client.create(_request("second")))
+    replay_client.gate.set()
+    await asyncio.gather(first, second)
+    assert cancelled.cancelled()
+    assert replay_client.prompts == ["first", "second"]
+    assert client.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_backs_off_after_rate_limit_error() -> None:
+    replay_client = _GatedReplayClient(["response"])
+    replay_client.gate.set()
+    replay_client.errors.append(_RateLimitError({"Retry-After": "0.2", "x-ratelimit-remaining-requests": "0"}))
+    client = RateLimitedChatCompletionClient(replay_client, requests_per_minute=6000)
+
+    with pytest.raises(_RateLimitError):
+        await client.create(_request("rejected"))
+    start = time.monotonic()
+    result = await client.create(_request("accepted"))
+    assert time.monotonic() - start >= 0.15
+    assert result.content == "response"
+    assert client.metrics.rate_limit_errors == 1
+
+    # Headers of successful responses update the limits as well.
+    client.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "600",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "150ms",
+        }
+    )
+    replay_client.reset()
+    start = time.monotonic()
+    await client.create(_request("paused"))
+    assert time.monotonic() - start >= 0.1
+
+
+def test_rate_limited_client_serialization() -> None:
+    replay_client = ReplayChatCompletionClient(["response"])
+    client = RateLimitedChatCompletionClient(
+        replay_client, requests_per_minute=100, tokens_per_minute=1000, max_concurrency=4
+    ).with_priority(5)
+    config = client.dump_component()
+    assert config.provider == "autogen_ext.models.rate_limit.RateLimitedChatCompletionClient"
+
+    loaded = ChatCompletionClient.load_component(config)
+    assert isinstance(loaded, RateLimitedChatCompletionClient)
+    assert loaded.priority == 5
+    assert loaded.dump_component().config == config.config
+
+    with pytest.raises(ValueError):
+        RateLimitedChatCompletionClient(replay_client, max_concurrency=0)
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Mapping, Optional, Sequence, Union
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage, UserMessage
+from autogen_core.tools import Tool, ToolSchema
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from autogen_ext.models.router import RouterChatCompletionClient
+from pydantic import BaseModel
+
+_MESSAGES: Sequence[LLMMessage] = [UserMessage(content="Hello", source="user")]
+
+
+class _MemberClient(ReplayChatCompletionClient):
+    """A replay client that answers with its name after `delay` seconds and fails its first `failures` requests."""
+
+    def __init__(self, name: str, delay: float = 0.0, failures: int = 0) -> None:
+        super().__init__([name] * 20)
+        self.set_cached_bool_value(False)
+        self.delay = delay
+        self.failures = failures
+        self.cancelled = 0
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("The deployment is unavailable.")
+        sleep: asyncio.Future[None] = asyncio.ensure_future(asyncio.sleep(self.delay))
+        if cancellation_token is not None:
+            cancellation_token.link_future(sleep)
+        try:
+            await sleep
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return await super().create(messages, tools=tools)
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        if self.failures > 0:
+            self.failures -= 1
+
+            async def _failing() -> AsyncGenerator[Union[str, CreateResult], None]:
+                raise RuntimeError("The deployment is unavailable.")
+                yield ""
+
+            return _failing()
+        return super().create_stream(messages, tools=tools)
+
+
+@pytest.mark.asyncio
+async def test_router_least_outstanding() -> None:
+    members = [_MemberClient(f"member {i}", delay=0.05) for i in range(3)]
+    router = RouterChatCompletionClient(members)
+
+    results = await asyncio.gather(*[router.create(_MESSAGES) for _ in range(6)])
+    assert sorted(result.content for result in results) == sorted([f"member {i}" for i in range(3)] * 2)
+    stats = router.member_stats
+    assert [member.requests for member in stats] == [2, 2, 2]
+    assert all(member.outstanding == 0 and member.errors == 0 for member in stats)
+    assert all(member.ewma_latency_seconds is not None and member.ewma_latency_seconds >= 0.04 for member in stats)
+
+
+@pytest.mark.asyncio
+async def test_router_latency_ewma() -> None:
+    router = RouterChatCompletionClient(
+        [_MemberClient("slow", delay=0.05), _MemberClient("fast")], strategy="latency_ewma"
+    )
+    # Members without a latency are tried first.
+    assert (await router.create(_MESSAGES)).content == "slow"
+    assert (await router.create(_MESSAGES)).content == "fast"
+    for _ in range(3):
+        assert (await router.create(_MESSAGES)).content == "fast"
+
+
+@pytest.mark.asyncio
+async def test_router_failover_and_circuit_breaker() -> None:
+    flaky = _MemberClient("flaky", failures=2)
+    router = RouterChatCompletionClient([flaky, _MemberClient("stable")], failure_threshold=2, recovery_timeout=0.1)
+
+    assert (await router.create(_MESSAGES)).content == "stable"
+    assert (await router.create(_MESSAGES)).content == "stable"
+    assert router.member_stats[0].circuit_state == "open"
+    assert router.member_stats[0].errors == 2
+    # The open circuit keeps requests away from the flaky member.
+    assert (await router.create(_MESSAGES)).content == "stable"
+    assert router.member_stats[0].requests == 2
+
+    # After the recovery timeout a trial request is let through and closes the circuit.
+    await asyncio.sleep(0.1)
+    assert (await router.create(_MESSAGES)).content == "flaky"
+    assert router.member_stats[0].circuit_state == "closed"
+
+    failing = RouterChatCompletionClient([_MemberClient("a", failures=1), _MemberClient("b", failures=1)])
+    with pytest.raises(RuntimeError):
+        await failing.create(_MESSAGES)
+    assert [member.errors for member in failing.member_stats] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_router_hedged_request() -> None:
+    slow = _MemberClient("slow", delay=1.0)
+    router = RouterChatCompletionClient([slow, _MemberClient("fast")], hedging=True, hedge_delay=0.05)
+
+    start = time.monotonic()
+    cancellation_token = CancellationToken()
+    result = await router.create(_MESSAGES, cancellation_token=cancellation_token)
+    assert result.content == "fast"
+    assert time.monotonic() - start < 0.5
+    await asyncio.sleep(0.01)
+    # The slow request was cancelled through its cancellation token.
+    assert slow.cancelled == 1
+    # The caller's token no longer refers to the attempts.
+    assert cancellation_token._callbacks == []  # type: ignore[reportPrivateUsage]
+    assert router.member_stats[0].outstanding == 0
+    assert router.member_stats[0].errors == 0
+
+
+@pytest.mark.asyncio
+async def test_router_stream_failover() -> None:
+    router = RouterChatCompletionClient([_MemberClient("flaky", failures=1), _MemberClient("stable")])
+    chunks = [chunk async for chunk in router.create_stream(_MESSAGES)]
+    assert isinstance(chunks[-1], CreateResult)
+    assert chunks[-1].content == "stable"
+    assert [member.errors for member in router.member_stats] == [1, 0]
+
+
+def test_router_serialization() -> None:
+    router = RouterChatCompletionClient(
+        [ReplayChatCompletionClient(["a"]), ReplayChatCompletionClient(["b"])],
+        strategy="latency_ewma",
+        hedging=True,
+        failure_threshold=3,
+    )
+    config = router.dump_component()
+    assert config.provider == "autogen_ext.models.router.RouterChatCompletionClient"
+
+    loaded = ChatCompletionClient.load_component(config)
+    assert isinstance(loaded, RouterChatCompletionClient)
+    assert len(loaded.model_clients) == 2
+    assert loaded.dump_component().config == config.config
+
+    with pytest.raises(ValueError):
+        RouterChatCompletionClient([])
+
+
+@pytest.mark.asyncio
+async def test_router_usage_includes_cached_prompt_tokens() -> None:
+    usage = RequestUsage(prompt_tokens=1, completion_tokens=1, cached_prompt_tokens=1)
+    members = [
+        ReplayChatCompletionClient([CreateResult(finish_reason="stop", content=name, usage=usage, cached=False)])
+        for name in ["a", "b"]
+    ]
+    router = RouterChatCompletionClient(members)
+    await asyncio.gather(router.create(_MESSAGES), router.create(_MESSAGES))
+    assert router.total_usage().cached_prompt_tokens == 2
+    assert router.actual_usage().cached_prompt_tokens == 2
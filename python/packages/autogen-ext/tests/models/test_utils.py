@@ -1,5 +1,13 @@
+import gc
+from typing import List
+
 import pytest
+import tiktoken
+from autogen_core.models import LLMMessage, UserMessage
+from autogen_core.tools import ToolSchema
+from autogen_ext.models._utils.message_cache import MessageConversionCache
 from autogen_ext.models._utils.parse_r1_content import parse_r1_content
+from autogen_ext.models._utils.tokenizer import TokenCounter
 
 
 def test_parse_r1_content() -> None:
@@ -10,7 +18,7 @@ def test_parse_r1_content() -> None:
 
     with pytest.warns(
         UserWarning,
-        match="Could not find <think>..</think> field in model response content. " "No thought was extracted.",
+        match="Could not find <think>..</think> field in model response content. No thought was extracted.",
     ):
         content = "Hello, world How are you?"
         thought, content = parse_r1_content(content)
@@ -19,7 +27,7 @@ def test_parse_r1_content() -> None:
 
     with pytest.warns(
         UserWarning,
-        match="Could not find <think>..</think> field in model response content. " "No thought was extracted.",
+        match="Could not find <think>..</think> field in model response content. No thought was extracted.",
     ):
         content = "Hello, <think>world How are you?"
         thought, content = parse_r1_content(content)
@@ -27,7 +35,7 @@ def test_parse_r1_content() -> None:
         assert content == "Hello, <think>world How are you?"
 
     with pytest.warns(
-        UserWarning, match="Found </think> before <think> in model response content. " "No thought was extracted."
+        UserWarning, match="Found </think> before <think> in model response content. No thought was extracted."
     ):
         content = "</think>Hello, <think>world</think>"
         thought, content = parse_r1_content(content)
@@ -35,9 +43,105 @@ def test_parse_r1_content() -> None:
         assert content == "</think>Hello, <think>world</think>"
 
     with pytest.warns(
-        UserWarning, match="Found </think> before <think> in model response content. " "No thought was extracted."
+        UserWarning, match="Found </think> before <think> in model response content. No thought was extracted."
     ):
         content = "</think>Hello, <think>world"
         thought, content = parse_r1_content(content)
         assert thought is None
         assert content == "</think>Hello, <think>world"
+
+
+def _byte_encoding() -> tiktoken.Encoding:
+    # One token per byte, so the expected counts are known without downloading an encoding.
+    return tiktoken.Encoding(
+        name="test_bytes", pat_str=r"\S+|\s+", mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={}
+    )
+
+
+def test_token_counter_caches_counts() -> None:
+    encoding = _byte_encoding()
+    counter = TokenCounter(encoding, maxsize=2)
+    assert counter.count("hello") == 5
+    assert counter.count("hello") == 5
+    assert len(counter._text_counts) == 1  # pyright: ignore[reportPrivateUsage]
+
+    # The least recently used count is evicted.
+    counter.count("a")
+    counter.count("hello")
+    counter.count("bc")
+    assert len(counter._text_counts) == 2  # pyright: ignore[reportPrivateUsage]
+    assert counter._text_counts.get("a") is None  # pyright: ignore[reportPrivateUsage]
+    assert counter._text_counts.get("hello") == 5  # pyright: ignore[reportPrivateUsage]
+
+
+def test_token_counter_count_batch() -> None:
+    counter = TokenCounter(_byte_encoding())
+    # Enough distinct texts to use encode_batch, with duplicates and previously counted texts mixed in.
+    texts = [f"text {i}" for i in range(40)] + ["text 1", "", "text 2"]
+    counter.count("text 1")
+    assert counter.count_batch(texts) == [len(text) for text in texts]
+    assert counter.count_batch(["abc", "abc"]) == [3, 3]
+    assert counter.count_batch([]) == []
+
+
+def test_token_counter_tool_counts() -> None:
+    counter = TokenCounter(_byte_encoding())
+    schema: ToolSchema = {"name": "tool", "description": "A tool.", "parameters": {"type": "object", "properties": {}}}
+    assert counter.get_tool_count("openai", schema) is None
+    counter.put_tool_count("openai", schema, 10)
+    assert counter.get_tool_count("openai", dict(schema)) == 10  # type: ignore[arg-type]
+    assert counter.get_tool_count("ollama", schema) is None
+
+
+def test_message_conversion_cache() -> None:
+    cache = MessageConversionCache[str](maxsize=2)
+    converted: List[LLMMessage] = []
+
+    def convert(message: LLMMessage) -> str:
+        converted.append(message)
+        assert isinstance(message, UserMessage)
+        return f"{message.source}: {message.content}"
+
+    message = UserMessage(content="Hello", source="user")
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "user: Hello"
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "user: Hello"
+    assert len(converted) == 1
+
+    # Another key, an equal message and a reassigned field are converted again.
+    cache.get_or_convert(message, "claude", convert)
+    cache.get_or_convert(UserMessage(content="Hello", source="user"), "gpt-4o", convert)
+    assert len(converted) == 3
+    message.content = "Goodbye"
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "user: Goodbye"
+    assert len(converted) == 4
+    assert len(cache) == 2
+
+
+def test_message_conversion_cache_in_place_changes() -> None:
+    cache = MessageConversionCache[str]()
+    converted: List[LLMMessage] = []
+
+    def convert(message: LLMMessage) -> str:
+        converted.append(message)
+        assert isinstance(message, UserMessage)
+        return " ".join(str(part) for part in message.content)
+
+    # Content lists modified in place are converted again.
+    message = UserMessage(content=["Hello"], source="user")
+    assert isinstance(message.content, list)
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "Hello"
+    message.content.append("world")
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "Hello world"
+    message.content[1] = "there"
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "Hello there"
+    assert cache.get_or_convert(message, "gpt-4o", convert) == "Hello there"
+    assert len(converted) == 3
+
+    # Entries are dropped when their messages are collected.
+    other_message = UserMessage(content="Goodbye", source="user")
+    cache.get_or_convert(other_message, "gpt-4o", convert)
+    assert len(cache) == 2
+    converted.clear()
+    del message
+    gc.collect()
+    assert len(cache) == 1
@@ -406,7 +406,7 @@ async def test_disconnected_agent() -> None:
     # to some private properties. This needs to be updated once they are available publicly
 
     def get_current_subscriptions() -> List[Subscription]:
-        return host._servicer._subscription_manager._subscriptions  # type: ignore[reportPrivateUsage]
+        return list(host._servicer._subscription_manager.subscriptions)  # type: ignore[reportPrivateUsage]
 
     async def get_subscribed_recipients() -> List[AgentId]:
         return await host._servicer._subscription_manager.get_subscribed_recipients(DefaultTopicId())  # type: ignore[reportPrivateUsage]
@@ -0,0 +1,119 @@
+"""Measure the per-chunk cost of streaming with OpenAIChatCompletionClient.
+
+The OpenAI API is replaced by an in-memory stream of prebuilt chunks, so only the client's own
+work is measured. Throughput is reported as chunks per second of CPU time of this process, which
+is the number of chunks one core can handle. The old way of reading the stream, which linked a new
+future to the cancellation token for every chunk, is measured next to the direct iteration used now,
+and `create_stream` is measured with and without delta coalescing.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, List
+
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice, ChoiceDelta
+
+
+def make_chunks(num_chunks: int) -> List[ChatCompletionChunk]:
+    chunks = [
+        ChatCompletionChunk(
+            id="benchmark",
+            choices=[Choice(index=0, delta=ChoiceDelta(content=" token", role="assistant"), finish_reason=None)],
+            created=0,
+            model="gpt-4o",
+            object="chat.completion.chunk",
+        )
+        for _ in range(num_chunks)
+    ]
+    chunks.append(
+        ChatCompletionChunk(
+            id="benchmark",
+            choices=[Choice(index=0, delta=ChoiceDelta(content=None, role="assistant"), finish_reason="stop")],
+            created=0,
+            model="gpt-4o",
+            object="chat.completion.chunk",
+        )
+    )
+    return chunks
+
+
+async def fake_stream(chunks: List[ChatCompletionChunk]) -> AsyncGenerator[ChatCompletionChunk, None]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def per_chunk_futures(
+    stream: AsyncIterator[ChatCompletionChunk], cancellation_token: CancellationToken
+) -> AsyncGenerator[ChatCompletionChunk, None]:
+    while True:
+        try:
+            chunk_future = asyncio.ensure_future(anext(stream))
+            cancellation_token.link_future(chunk_future)
+            yield await chunk_future
+        except StopAsyncIteration:
+            break
+
+
+async def direct(
+    stream: AsyncIterator[ChatCompletionChunk], cancellation_token: CancellationToken
+) -> AsyncGenerator[ChatCompletionChunk, None]:
+    async for chunk in stream:
+        yield chunk
+
+
+async def read_stream(
+    reader: Callable[
+        [AsyncIterator[ChatCompletionChunk], CancellationToken], AsyncGenerator[ChatCompletionChunk, None]
+    ],
+    chunks: List[ChatCompletionChunk],
+) -> float:
+    start = time.process_time()
+    async for _ in reader(fake_stream(chunks), CancellationToken()):
+        pass
+    return len(chunks) / (time.process_time() - start)
+
+
+async def create_stream(client: OpenAIChatCompletionClient, chunks: List[ChatCompletionChunk]) -> float:
+    async def _create(*args: Any, **kwargs: Any) -> AsyncGenerator[ChatCompletionChunk, None]:
+        return fake_stream(chunks)
+
+    client._client.chat.completions.create = _create  # type: ignore
+    start = time.process_time()
+    async for _ in client.create_stream(
+        [UserMessage(content="Hello", source="user")], cancellation_token=CancellationToken()
+    ):
+        pass
+    return len(chunks) / (time.process_time() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000, help="Number of chunks per stream.")
+    parser.add_argument("--coalesce-chars", type=int, default=64, help="stream_coalesce_chars of the coalescing run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best run is reported.")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks)
+    client = OpenAIChatCompletionClient(model="gpt-4o", api_key="benchmark")
+    coalescing_client = OpenAIChatCompletionClient(
+        model="gpt-4o", api_key="benchmark", stream_coalesce_chars=args.coalesce_chars
+    )
+
+    results = {
+        "per-chunk futures chunks/sec": max([await read_stream(per_chunk_futures, chunks) for _ in range(args.repeat)]),
+        "direct iteration chunks/sec": max([await read_stream(direct, chunks) for _ in range(args.repeat)]),
+        "create_stream chunks/sec": max([await create_stream(client, chunks) for _ in range(args.repeat)]),
+        "create_stream coalesced chunks/sec": max(
+            [await create_stream(coalescing_client, chunks) for _ in range(args.repeat)]
+        ),
+    }
+    for name, value in results.items():
+        print(f"{name:>36} | {value:>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
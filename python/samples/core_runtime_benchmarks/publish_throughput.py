@@ -0,0 +1,95 @@
+"""Measure how many published messages per second SingleThreadedAgentRuntime delivers.
+
+A number of publisher agents each publish a burst of messages to one shared topic,
+which is consumed by a few counting agents. The benchmark is run for several values
+of `message_batch_size` so the effect of batched envelope draining can be compared.
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from autogen_core import (
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+SHARED_TOPIC = TopicId("shared", "default")
+
+
+@dataclass
+class Start:
+    count: int
+
+
+@dataclass
+class Tick:
+    value: int
+
+
+class Publisher(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Publishes a burst of messages to the shared topic.")
+
+    @message_handler
+    async def on_start(self, message: Start, ctx: MessageContext) -> None:
+        for i in range(message.count):
+            await self.publish_message(Tick(i), SHARED_TOPIC)
+
+
+class Consumer(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts the messages published to the shared topic.")
+        self.received = 0
+
+    @message_handler
+    async def on_tick(self, message: Tick, ctx: MessageContext) -> None:
+        self.received += 1
+
+
+async def run_once(num_agents: int, messages_per_agent: int, num_consumers: int, message_batch_size: int) -> float:
+    runtime = SingleThreadedAgentRuntime(message_batch_size=message_batch_size)
+    await Publisher.register(runtime, "publisher", Publisher, skip_class_subscriptions=True)
+    await runtime.add_subscription(TypeSubscription("start", "publisher"))
+    for i in range(num_consumers):
+        await Consumer.register(runtime, f"consumer_{i}", Consumer, skip_class_subscriptions=True)
+        await runtime.add_subscription(TypeSubscription(SHARED_TOPIC.type, f"consumer_{i}"))
+
+    runtime.start()
+    start = time.perf_counter()
+    for key in range(num_agents):
+        await runtime.publish_message(Start(messages_per_agent), TopicId("start", str(key)))
+    await runtime.stop_when_idle()
+    elapsed = time.perf_counter() - start
+    await runtime.close()
+
+    # Every tick is delivered to every consumer, plus one start message per publisher.
+    delivered = num_agents * messages_per_agent * num_consumers + num_agents
+    return delivered / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=1000, help="Number of publisher agents.")
+    parser.add_argument("--messages", type=int, default=10, help="Messages published by each agent.")
+    parser.add_argument("--consumers", type=int, default=4, help="Number of agents subscribed to the shared topic.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per batch size; the best run is reported.")
+    args = parser.parse_args()
+
+    print(f"{'message_batch_size':>18} | {'messages/sec':>12}")
+    for message_batch_size in args.batch_sizes:
+        results: List[float] = []
+        for _ in range(args.repeat):
+            results.append(await run_once(args.agents, args.messages, args.consumers, message_batch_size))
+        print(f"{message_batch_size:>18} | {max(results):>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Measure the cost of creating RoutedAgent instances and of dispatching messages to their handlers.
+
+Agents are created directly inside an agent instantiation context, the same way a runtime creates
+an agent the first time a message is sent to a new key. Dispatch calls `on_message` on one agent
+for a message type with a handler of its own and for a subclass that is routed to the handler of
+its base class.
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from autogen_core import (
+    AgentId,
+    AgentInstantiationContext,
+    CancellationToken,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    event,
+    rpc,
+)
+
+
+@dataclass
+class Ping:
+    value: int
+
+
+@dataclass
+class SpecialPing(Ping):
+    pass
+
+
+@dataclass
+class Status:
+    pass
+
+
+@dataclass
+class Reset:
+    pass
+
+
+@dataclass
+class Configure:
+    option: str
+
+
+class BenchmarkAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent with a few handlers.")
+        self.count = 0
+
+    @event
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> None:
+        self.count += 1
+
+    @rpc
+    async def on_status(self, message: Status, ctx: MessageContext) -> int:
+        return self.count
+
+    @event
+    async def on_reset(self, message: Reset, ctx: MessageContext) -> None:
+        self.count = 0
+
+    @event(match=lambda message, ctx: message.option != "")  # type: ignore
+    async def on_configure(self, message: Configure, ctx: MessageContext) -> None:
+        pass
+
+
+def instantiate(runtime: SingleThreadedAgentRuntime, num_agents: int) -> float:
+    start = time.perf_counter()
+    for key in range(num_agents):
+        with AgentInstantiationContext.populate_context((runtime, AgentId("benchmark", str(key)))):
+            BenchmarkAgent()
+    return num_agents / (time.perf_counter() - start)
+
+
+async def dispatch(agent: BenchmarkAgent, message: Ping, num_messages: int) -> float:
+    ctx = MessageContext(
+        sender=None,
+        topic_id=None,
+        is_rpc=False,
+        cancellation_token=CancellationToken(),
+        message_id="benchmark",
+    )
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await agent.on_message(message, ctx)
+    return num_messages / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=100_000, help="Number of agents to instantiate.")
+    parser.add_argument("--messages", type=int, default=100_000, help="Number of messages to dispatch.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best run is reported.")
+    args = parser.parse_args()
+
+    runtime = SingleThreadedAgentRuntime()
+    with AgentInstantiationContext.populate_context((runtime, AgentId("benchmark", "dispatch"))):
+        agent = BenchmarkAgent()
+
+    results = {
+        "instantiate agents/sec": max(instantiate(runtime, args.agents) for _ in range(args.repeat)),
+        "dispatch exact type msgs/sec": max(
+            [await dispatch(agent, Ping(0), args.messages) for _ in range(args.repeat)]
+        ),
+        "dispatch subclass msgs/sec": max(
+            [await dispatch(agent, SpecialPing(0), args.messages) for _ in range(args.repeat)]
+        ),
+    }
+    for name, value in results.items():
+        print(f"{name:>30} | {value:>12,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())